@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Union
+
+from common.constants.temporal import DATE_FORMAT_IN_JSON, MAX_DATE_IN_DATA, MIN_DATE_IN_DATA
+from common.error_msgs import print_errors_list
+from utils.basic_utils import cast_str_to_bool, is_str_bool
+
+
+@dataclass
+class AdequacyStudyParams:
+    # scenarios: all (target year, climatic year) combinations; all available values if None
+    target_years: Optional[List[int]] = None
+    climatic_years: Optional[List[int]] = None
+    # also run stress-test climatic years, if climatic_years is None
+    with_stress_test_cys: Union[str, bool] = False  # N.B. 'true'/'false' str in JSON file; bool after processing
+    # simulated period of each scenario - full year of data if None
+    period_start: Union[str, datetime] = None
+    period_end: Union[str, datetime] = None
+    # each period split in chunks - solved successively, with storage State-of-Charge handoff between them (final
+    # SoC of each chunk being at least its initial one)
+    chunk_days: int = 28
+    # scenarios run in parallel processes; number of CPUs if None
+    n_workers: Optional[int] = None
+    # peak memory expected for a worker (MB) - number of workers limited to available memory divided by it, and
+    # warning if exceeded by a worker; no limit if None
+    memory_budget_per_worker_mb: Optional[float] = None
+    confidence_level: float = 0.95  # of LOLE and EENS confidence intervals
+
+    def process(self):
+        if is_str_bool(bool_str=self.with_stress_test_cys):
+            self.with_stress_test_cys = cast_str_to_bool(bool_str=self.with_stress_test_cys)
+        if self.period_start is None:
+            self.period_start = MIN_DATE_IN_DATA
+        elif isinstance(self.period_start, str):
+            self.period_start = datetime.strptime(self.period_start, DATE_FORMAT_IN_JSON)
+        if self.period_end is None:
+            self.period_end = MAX_DATE_IN_DATA
+        elif isinstance(self.period_end, str):
+            self.period_end = datetime.strptime(self.period_end, DATE_FORMAT_IN_JSON)
+
+    def coherence_check(self):
+        errors_list = []
+        for attr_name in ['target_years', 'climatic_years']:
+            attr_value = getattr(self, attr_name)
+            if attr_value is not None and (not isinstance(attr_value, list)
+                                           or not all(isinstance(val, int) for val in attr_value)):
+                errors_list.append(f'{attr_name} must be a list of int or null; not {attr_value}')
+        if not isinstance(self.with_stress_test_cys, bool):
+            errors_list.append(f'with_stress_test_cys must be a bool ("true"/"false" in JSON file); '
+                               f'not {self.with_stress_test_cys}')
+        if not MIN_DATE_IN_DATA <= self.period_start < self.period_end <= MAX_DATE_IN_DATA:
+            errors_list.append(f'Period [{self.period_start:%Y/%m/%d}, {self.period_end:%Y/%m/%d}] not in '
+                               f'period of data [{MIN_DATE_IN_DATA:%Y/%m/%d}, {MAX_DATE_IN_DATA:%Y/%m/%d}]')
+        if not isinstance(self.chunk_days, int) or self.chunk_days < 1:
+            errors_list.append(f'chunk_days must be a positive int; not {self.chunk_days}')
+        if self.n_workers is not None and (not isinstance(self.n_workers, int) or self.n_workers < 1):
+            errors_list.append(f'n_workers must be a positive int or null; not {self.n_workers}')
+        if self.memory_budget_per_worker_mb is not None \
+                and (not isinstance(self.memory_budget_per_worker_mb, (int, float))
+                     or self.memory_budget_per_worker_mb <= 0):
+            errors_list.append(f'memory_budget_per_worker_mb must be a positive number or null; '
+                               f'not {self.memory_budget_per_worker_mb}')
+        if not isinstance(self.confidence_level, float) or not 0 < self.confidence_level < 1:
+            errors_list.append(f'confidence_level must be a float in ]0, 1[; not {self.confidence_level}')
+        if len(errors_list) > 0:
+            print_errors_list(error_name='in JSON adequacy study params', errors_list=errors_list)
@@ -0,0 +1,94 @@
+from dataclasses import dataclass, field
+from typing import List, Union
+
+from common.error_msgs import print_errors_list
+from utils.basic_utils import cast_str_to_bool, is_str_bool
+
+
+@dataclass
+class BenchmarkHorizons:
+    week: str = '1-week'
+    month: str = '1-month'
+    year: str = '1-year'
+
+
+BENCHMARK_HORIZONS = BenchmarkHorizons()
+BENCHMARK_HORIZON_N_DAYS = {BENCHMARK_HORIZONS.week: 7, BENCHMARK_HORIZONS.month: 31, BENCHMARK_HORIZONS.year: 365}
+
+
+@dataclass
+class BenchmarkStages:
+    get_countries_data: str = 'get_countries_data'
+    get_generation_units_data: str = 'get_generation_units_data'
+    create_pypsa_network_model: str = 'create_pypsa_network_model'
+    optimize_network: str = 'optimize_network'
+    result_extraction: str = 'result_extraction'
+    set_uc_summary_metrics: str = 'set_uc_summary_metrics'
+    csv_writers: str = 'csv_writers'
+    figure_writers: str = 'figure_writers'
+
+
+BENCHMARK_STAGES = BenchmarkStages()
+
+
+@dataclass
+class BenchmarkMemoryModes:
+    none: str = 'none'
+    rss: str = 'rss'  # peak RSS per stage, at almost no cost on durations
+    full: str = 'full'  # RSS and Python allocations (tracemalloc), durations being then much less representative
+
+
+BENCHMARK_MEMORY_MODES = BenchmarkMemoryModes()
+
+
+@dataclass
+class BenchmarkParams:
+    # matrix of cases: each (horizon, number of zones, number of climatic years) combination is run
+    horizons: List[str] = field(default_factory=lambda: [BENCHMARK_HORIZONS.week])
+    n_zones: List[int] = field(default_factory=lambda: [10])
+    n_climatic_years: List[int] = field(default_factory=lambda: [1])  # each climatic year being a UC run
+    n_repeats: int = 1  # per case; min. duration (resp. max. memory peak) over repeats kept for each stage
+    memory_mode: str = BENCHMARK_MEMORY_MODES.rss
+    with_figures: Union[str, bool] = True  # N.B. 'true'/'false' str in JSON file; bool after processing
+    seed: int = 0  # of synthetic data
+    # relative increase above which a stage duration (resp. memory peak) is flagged as a regression...
+    duration_tolerance: float = 0.25
+    memory_tolerance: float = 0.25
+    # ... if also above these absolute increases (not to flag noise on short stages)
+    min_duration_increase: float = 0.2  # s
+    min_memory_increase: float = 50  # MB
+    baseline_file: str = None  # if None, default file in output/benchmark will be used
+    update_baseline: Union[str, bool] = False  # overwrite baseline with current results (e.g. after an optim.)
+
+    def process(self):
+        for attr_name in ['with_figures', 'update_baseline']:
+            if is_str_bool(bool_str=getattr(self, attr_name)):
+                setattr(self, attr_name, cast_str_to_bool(bool_str=getattr(self, attr_name)))
+
+    def coherence_check(self):
+        errors_list = []
+        unknown_horizons = [horizon for horizon in self.horizons if horizon not in BENCHMARK_HORIZON_N_DAYS]
+        if len(unknown_horizons) > 0:
+            errors_list.append(f'Unknown horizon(s) {unknown_horizons}; available ones are '
+                               f'{list(BENCHMARK_HORIZON_N_DAYS)}')
+        for attr_name in ['n_zones', 'n_climatic_years']:
+            attr_value = getattr(self, attr_name)
+            if not isinstance(attr_value, list) or not all(isinstance(val, int) and val > 0 for val in attr_value):
+                errors_list.append(f'{attr_name} must be a list of positive int; not {attr_value}')
+        if not isinstance(self.n_repeats, int) or self.n_repeats < 1:
+            errors_list.append(f'n_repeats must be a positive int; not {self.n_repeats}')
+        if self.memory_mode not in BENCHMARK_MEMORY_MODES.__dict__.values():
+            errors_list.append(f'Unknown memory mode {self.memory_mode}; available ones are '
+                               f'{list(BENCHMARK_MEMORY_MODES.__dict__.values())}')
+        for attr_name in ['with_figures', 'update_baseline']:
+            attr_value = getattr(self, attr_name)
+            if not isinstance(attr_value, bool):
+                errors_list.append(f'{attr_name} must be a bool ("true"/"false" in JSON file); not {attr_value}')
+        for attr_name in ['duration_tolerance', 'memory_tolerance', 'min_duration_increase', 'min_memory_increase']:
+            attr_value = getattr(self, attr_name)
+            if not isinstance(attr_value, (int, float)) or attr_value < 0:
+                errors_list.append(f'{attr_name} must be a non-negative number; not {attr_value}')
+        if self.baseline_file is not None and not isinstance(self.baseline_file, str):
+            errors_list.append(f'baseline_file must be a str or null; not {self.baseline_file}')
+        if len(errors_list) > 0:
+            print_errors_list(error_name='in JSON benchmark params', errors_list=errors_list)
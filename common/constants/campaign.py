@@ -0,0 +1,82 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Union
+
+from common.error_msgs import print_errors_list
+from utils.basic_utils import cast_str_to_bool, is_str_bool
+
+# name of the variant with the capacities of JSON UC run params only, if no capacity variant in params
+BASE_CAPACITY_VARIANT = 'base'
+
+
+@dataclass
+class JobStatuses:
+    pending: str = 'pending'  # to be run, possibly after a retry delay
+    running: str = 'running'
+    done: str = 'done'
+    failed: str = 'failed'  # all attempts failed
+    obsolete: str = 'obsolete'  # not in current campaign anymore (e.g., after a change of its params)
+
+
+JOB_STATUSES = JobStatuses()
+AVAILABLE_JOB_STATUSES = list(JOB_STATUSES.__dict__.values())
+
+
+@dataclass
+class CampaignParams:
+    # name of the campaign, identifying its jobs in the queue - to resume it
+    name: str = 'campaign'
+    # jobs: all (target year, climatic year, capacity variant) combinations; all available years if None
+    target_years: Optional[List[int]] = None
+    climatic_years: Optional[List[int]] = None
+    # also run stress-test climatic years, if climatic_years is None
+    with_stress_test_cys: Union[str, bool] = False  # N.B. 'true'/'false' str in JSON file; bool after processing
+    # {variant name: capacities overwritten, as capacities_tb_overwritten in JSON (per-country) UC params - on top of
+    # the ones of these files}; a unique variant with JSON capacities if empty
+    capacity_variants: Dict[str, Dict[str, Dict[str, float]]] = field(default_factory=dict)
+    # local worker processes pulling jobs from the queue; number of CPUs if None
+    n_workers: Optional[int] = None
+    # a failed job is retried after retry_delay seconds, doubled after each failed attempt, up to max_attempts
+    max_attempts: int = 3
+    retry_delay: float = 60
+    # put jobs failed in a previous session (all attempts) back in the queue when resuming the campaign
+    retry_failed_jobs: Union[str, bool] = False
+    # save figure/data outputs of each job - otherwise only its UC summary metrics, stored in the queue
+    with_outputs: Union[str, bool] = False
+    queue_file: str = None  # if None, default file in output/long_term_uc will be used
+
+    def process(self):
+        for attr_name in ['with_stress_test_cys', 'retry_failed_jobs', 'with_outputs']:
+            if is_str_bool(bool_str=getattr(self, attr_name)):
+                setattr(self, attr_name, cast_str_to_bool(bool_str=getattr(self, attr_name)))
+        if len(self.capacity_variants) == 0:
+            self.capacity_variants = {BASE_CAPACITY_VARIANT: {}}
+
+    def coherence_check(self):
+        errors_list = []
+        if not isinstance(self.name, str) or len(self.name) == 0:
+            errors_list.append(f'name must be a non-empty str; not {self.name}')
+        for attr_name in ['target_years', 'climatic_years']:
+            attr_value = getattr(self, attr_name)
+            if attr_value is not None and (not isinstance(attr_value, list)
+                                           or not all(isinstance(val, int) for val in attr_value)):
+                errors_list.append(f'{attr_name} must be a list of int or null; not {attr_value}')
+        for attr_name in ['with_stress_test_cys', 'retry_failed_jobs', 'with_outputs']:
+            attr_value = getattr(self, attr_name)
+            if not isinstance(attr_value, bool):
+                errors_list.append(f'{attr_name} must be a bool ("true"/"false" in JSON file); not {attr_value}')
+        uncoherent_variants = [variant for variant, capacities in self.capacity_variants.items()
+                               if not isinstance(capacities, dict)
+                               or not all(isinstance(country_capas, dict) for country_capas in capacities.values())]
+        if len(uncoherent_variants) > 0:
+            errors_list.append(f'Capacity variants must be dicts {{country: {{prod. type: capacity}}}}; not the case '
+                               f'for {uncoherent_variants}')
+        if self.n_workers is not None and (not isinstance(self.n_workers, int) or self.n_workers < 1):
+            errors_list.append(f'n_workers must be a positive int or null; not {self.n_workers}')
+        if not isinstance(self.max_attempts, int) or self.max_attempts < 1:
+            errors_list.append(f'max_attempts must be a positive int; not {self.max_attempts}')
+        if not isinstance(self.retry_delay, (int, float)) or self.retry_delay < 0:
+            errors_list.append(f'retry_delay must be a non-negative number (of seconds); not {self.retry_delay}')
+        if self.queue_file is not None and not isinstance(self.queue_file, str):
+            errors_list.append(f'queue_file must be a str or null; not {self.queue_file}')
+        if len(errors_list) > 0:
+            print_errors_list(error_name='in JSON campaign params', errors_list=errors_list)
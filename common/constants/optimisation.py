@@ -1,4 +1,8 @@
 from dataclasses import dataclass
+from typing import Optional, Union
+
+from common.error_msgs import print_errors_list
+from utils.basic_utils import cast_str_to_bool, is_str_bool
 
 
 @dataclass
@@ -11,15 +15,79 @@ class OptimSolvers:
 class OptimResolStatus:
     optimal: str = 'optimal'
     infeasible: str = 'infeasible'
+    # feasible solution without optimality guarantee (e.g. zone decomposition not converged) -> results are output,
+    # but neither cached nor stored in results warehouse
+    suboptimal: str = 'suboptimal'
     
 
 OPTIM_RESOL_STATUS = OptimResolStatus()
 
 
+@dataclass
+class SolverIOApis:
+    lp: str = 'lp'
+    mps: str = 'mps'
+    # model passed in memory to the solver Python API (highspy, gurobipy), and solution read back as arrays
+    # -> no LP/MPS file written then parsed by the solver
+    direct: str = 'direct'
+
+
+@dataclass
+class ModelBackends:
+    pypsa: str = 'pypsa'
+    # LP built directly from dataset - as sparse matrices - and solved via HiGHS Python API
+    direct_lp: str = 'direct_lp'
+    # same LP, decomposed into per-zone subproblems coordinated on interco. flows (Lagrangian relaxation)
+    zone_decomposition: str = 'zone_decomposition'
+
+
+@dataclass
+class ZoneDecompositionParams:
+    # convergence tolerance on the relative gap between best feasible (upper bound) and Lagrangian dual
+    # (lower bound) objective values
+    tolerance: float = 1e-3
+    max_iter: int = 500
+    step_size_factor: float = 1.0  # initial factor (in ]0, 2]) of Polyak subgradient step, halved when stalling
+    recovery_period: int = 10  # number of iterations between two primal recoveries - flows fixed, zone LPs solved
+    # number of zone subproblems solved in parallel (threads); if None, number of CPUs
+    # N.B. speed-up not benchmarked yet (single-CPU runs only) -> it relies on HiGHS releasing the GIL while solving
+    n_workers: Optional[int] = None
+    # N.B. 'true'/'false' str in JSON file; bool after processing
+    # solve also the monolithic LP, to report the gap of decomposition objective versus it
+    calc_monolithic_gap: Union[str, bool] = False
+
+    def process(self):
+        if is_str_bool(bool_str=self.calc_monolithic_gap):
+            self.calc_monolithic_gap = cast_str_to_bool(bool_str=self.calc_monolithic_gap)
+
+    def coherence_check(self):
+        errors_list = []
+        if not isinstance(self.tolerance, (int, float)) or self.tolerance <= 0:
+            errors_list.append(f'tolerance must be a positive number; not {self.tolerance}')
+        if not isinstance(self.step_size_factor, (int, float)) or not 0 < self.step_size_factor <= 2:
+            errors_list.append(f'step_size_factor must be in ]0, 2]; not {self.step_size_factor}')
+        for param_name in ['max_iter', 'recovery_period']:
+            param_value = getattr(self, param_name)
+            if not isinstance(param_value, int) or param_value < 1:
+                errors_list.append(f'{param_name} must be a positive int; not {param_value}')
+        if self.n_workers is not None and (not isinstance(self.n_workers, int) or self.n_workers < 1):
+            errors_list.append(f'n_workers must be a positive int or null; not {self.n_workers}')
+        if not isinstance(self.calc_monolithic_gap, bool):
+            errors_list.append(f'calc_monolithic_gap must be a bool ("true"/"false" in JSON file); '
+                               f'not {self.calc_monolithic_gap}')
+        if len(errors_list) > 0:
+            print_errors_list(error_name='in JSON zone decomposition params', errors_list=errors_list)
+
+
 @dataclass
 class SolverParams:
     name: str = 'highs'
     license_file: str = None
+    io_api: str = None  # way the model is passed to the solver; if None, linopy default (LP file) used
+    save_lp_file: bool = True  # save model in an .lp output file (independently of io_api)
+    model_backend: str = ModelBackends.pypsa  # way the UC model is built
+    # only used with zone_decomposition model backend
+    zone_decomposition: ZoneDecompositionParams = None
 
 
 DEFAULT_OPTIM_SOLVER_PARAMS = SolverParams(name=OptimSolvers.highs)
@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+from importlib.util import find_spec
+from typing import Optional
+
+from common.error_msgs import print_errors_list
+from utils.basic_utils import cast_str_to_bool, is_str_bool
+
+
+@dataclass
+class OutputFormats:
+    csv: str = 'csv'
+    # columnar (binary) formats, with files partitioned by (target) year, climatic year and period start
+    parquet: str = 'parquet'
+    feather: str = 'feather'
+
+
+OUTPUT_FORMATS = OutputFormats()
+COLUMNAR_COMPRESSIONS = {OUTPUT_FORMATS.parquet: ['snappy', 'gzip', 'brotli', 'zstd', 'lz4', 'none'],
+                         OUTPUT_FORMATS.feather: ['zstd', 'lz4', 'uncompressed']}
+
+
+@dataclass
+class OutputParams:
+    output_format: str = OUTPUT_FORMATS.csv
+    compression: str = 'zstd'  # only for columnar formats
+    # max. absolute error (€/MWh) accepted to store marginal prices in float32 - float64 kept if exceeded;
+    # if None, always float64
+    prices_float32_tol: Optional[float] = 1e-3
+    # output tasks (figures, data files) run in background workers - the UC run going on without waiting for them;
+    # figures rendered in a process pool (matplotlib not thread-safe), data files written in a thread pool
+    async_output: bool = False
+    n_writer_threads: int = 2
+    n_figure_processes: Optional[int] = 2  # if None, number of CPUs
+
+    def process(self):
+        if is_str_bool(bool_str=self.async_output):
+            self.async_output = cast_str_to_bool(bool_str=self.async_output)
+
+    def coherence_check(self):
+        errors_list = []
+        if not isinstance(self.async_output, bool):
+            errors_list.append(f'async_output must be a boolean; not {self.async_output}')
+        if not isinstance(self.n_writer_threads, int) or self.n_writer_threads < 1:
+            errors_list.append(f'n_writer_threads must be a positive integer; not {self.n_writer_threads}')
+        if self.n_figure_processes is not None \
+                and (not isinstance(self.n_figure_processes, int) or self.n_figure_processes < 1):
+            errors_list.append(f'n_figure_processes must be a positive integer or null; '
+                               f'not {self.n_figure_processes}')
+        all_formats = list(OUTPUT_FORMATS.__dict__.values())
+        if self.output_format not in all_formats:
+            errors_list.append(f'output_format must be in {all_formats}; not {self.output_format}')
+        elif self.output_format in COLUMNAR_COMPRESSIONS \
+                and self.compression not in COLUMNAR_COMPRESSIONS[self.output_format]:
+            errors_list.append(f'compression for {self.output_format} format must be in '
+                               f'{COLUMNAR_COMPRESSIONS[self.output_format]}; not {self.compression}')
+        if self.output_format in COLUMNAR_COMPRESSIONS and find_spec('pyarrow') is None:
+            errors_list.append(f'pyarrow package needed for {self.output_format} output format; not installed')
+        if self.prices_float32_tol is not None \
+                and (not isinstance(self.prices_float32_tol, (int, float)) or self.prices_float32_tol < 0):
+            errors_list.append(f'prices_float32_tol must be a non-negative number or null; '
+                               f'not {self.prices_float32_tol}')
+        if len(errors_list) > 0:
+            print_errors_list(error_name='in JSON output params', errors_list=errors_list)
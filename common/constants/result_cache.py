@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+from typing import Union
+
+from common.error_msgs import print_errors_list
+from utils.basic_utils import cast_str_to_bool, is_str_bool
+
+# to be incremented if content of stored results changes -> previous cache entries will not be used anymore
+RESULT_CACHE_FORMAT_VERSION = 1
+
+
+@dataclass
+class ResultCacheParams:
+    # N.B. 'true'/'false' str in JSON file; bool after processing
+    activated: Union[str, bool] = False
+    max_n_entries: int = 50  # maximal number of cached (solved) runs
+    max_size_mb: float = 2000  # maximal total size of the cache folder
+    cache_dir: str = None  # if None, default folder in output/long_term_uc will be used
+
+    def process(self):
+        if is_str_bool(bool_str=self.activated):
+            self.activated = cast_str_to_bool(bool_str=self.activated)
+
+    def coherence_check(self):
+        errors_list = []
+        if not isinstance(self.activated, bool):
+            errors_list.append(f'activated must be a bool ("true"/"false" in JSON file); not {self.activated}')
+        if not isinstance(self.max_n_entries, int) or self.max_n_entries < 1:
+            errors_list.append(f'max_n_entries must be a positive int; not {self.max_n_entries}')
+        if not isinstance(self.max_size_mb, (int, float)) or self.max_size_mb <= 0:
+            errors_list.append(f'max_size_mb must be a positive number; not {self.max_size_mb}')
+        if len(errors_list) > 0:
+            print_errors_list(error_name='in JSON result cache params', errors_list=errors_list)
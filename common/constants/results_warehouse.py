@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from typing import Union
+
+from common.error_msgs import print_errors_list
+from utils.basic_utils import cast_str_to_bool, is_str_bool
+
+# to be incremented if the structure of warehouse tables changes
+RESULTS_WAREHOUSE_SCHEMA_VERSION = 1
+
+
+@dataclass
+class ResultsWarehouseParams:
+    # N.B. 'true'/'false' str in JSON file; bool after processing
+    activated: Union[str, bool] = False
+    # also store hourly series (optimal decisions, marginal prices) of each run, as compressed blobs
+    store_hourly_series: Union[str, bool] = False
+    db_file: str = None  # if None, default file in output/long_term_uc will be used
+
+    def process(self):
+        for attr_name in ['activated', 'store_hourly_series']:
+            if is_str_bool(bool_str=getattr(self, attr_name)):
+                setattr(self, attr_name, cast_str_to_bool(bool_str=getattr(self, attr_name)))
+
+    def coherence_check(self):
+        errors_list = []
+        for attr_name in ['activated', 'store_hourly_series']:
+            attr_value = getattr(self, attr_name)
+            if not isinstance(attr_value, bool):
+                errors_list.append(f'{attr_name} must be a bool ("true"/"false" in JSON file); not {attr_value}')
+        if self.db_file is not None and not isinstance(self.db_file, str):
+            errors_list.append(f'db_file must be a str or null; not {self.db_file}')
+        if len(errors_list) > 0:
+            print_errors_list(error_name='in JSON results warehouse params', errors_list=errors_list)
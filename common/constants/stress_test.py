@@ -0,0 +1,54 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from common.constants.temporal import DATE_FORMAT_IN_JSON
+from common.error_msgs import print_errors_list
+
+
+@dataclass
+class StressTestTypes:
+    unit_outage: str = 'unit_outage'  # p_min_pu/p_max_pu of generators and storage units
+    interco_derating: str = 'interco_derating'  # p_min_pu/p_max_pu of links, i.e. p_nom derating over the window
+    demand_scaling: str = 'demand_scaling'  # p_set of loads
+    res_drought: str = 'res_drought'  # p_max_pu (capacity factors) of RES generators
+
+
+STRESS_TEST_TYPES = StressTestTypes()
+AVAILABLE_STRESS_TEST_TYPES = list(STRESS_TEST_TYPES.__dict__.values())
+STRESS_TEST_DATE_ATTRS = ['start_date', 'end_date']
+
+
+@dataclass
+class StressTestsParams:
+    # stress tests evaluated in parallel processes; number of CPUs if None
+    n_workers: Optional[int] = None
+    # each stress test a dict with its name, type - among STRESS_TEST_TYPES - and optionally countries,
+    # per_country_prod_types, start_date/end_date (as UC period in JSON UC params, end date excluded) and factor
+    stress_tests: List[dict] = field(default_factory=list)
+
+    def process(self):
+        for stress_test in self.stress_tests:
+            for date_attr in STRESS_TEST_DATE_ATTRS:
+                if isinstance(stress_test.get(date_attr), str):
+                    stress_test[date_attr] = datetime.strptime(stress_test[date_attr], DATE_FORMAT_IN_JSON)
+
+    def coherence_check(self):
+        errors_list = []
+        if self.n_workers is not None and (not isinstance(self.n_workers, int) or self.n_workers < 1):
+            errors_list.append(f'n_workers must be a positive int or null; not {self.n_workers}')
+        if len(self.stress_tests) == 0:
+            errors_list.append('No stress test defined')
+        stress_test_names = [stress_test.get('name') for stress_test in self.stress_tests]
+        if None in stress_test_names:
+            errors_list.append('All stress tests must have a name')
+        duplicate_names = {name for name in stress_test_names if name is not None and stress_test_names.count(name) > 1}
+        if len(duplicate_names) > 0:
+            errors_list.append(f'Stress test names must be unique; duplicates: {sorted(duplicate_names)}')
+        unknown_types = [stress_test.get('type') for stress_test in self.stress_tests
+                         if stress_test.get('type') not in AVAILABLE_STRESS_TEST_TYPES]
+        if len(unknown_types) > 0:
+            errors_list.append(f'Unknown stress test type(s) {unknown_types}; available ones are '
+                               f'{AVAILABLE_STRESS_TEST_TYPES}')
+        if len(errors_list) > 0:
+            print_errors_list(error_name='in JSON stress tests params', errors_list=errors_list)
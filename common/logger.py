@@ -2,8 +2,12 @@ import os
 import sys
 import traceback
 import logging
+import multiprocessing
 import warnings
-from logging.handlers import RotatingFileHandler
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Iterator
 
 
 LOG_LEVEL_STR_TO_INT = {name: value for name, value in vars(logging).items() if
@@ -92,3 +96,41 @@ def stop_logger():
     for handler in handlers:
         handler.close()
         logger.removeHandler(handler)
+
+
+def start_log_queue_listener(log_queue) -> QueueListener:
+    """
+    Listener writing - with the handlers of current (root) logger - the log records that worker processes put in
+    log_queue; to be stopped at the end of the parallel tasks
+    """
+    log_listener = QueueListener(log_queue, *logging.getLogger().handlers, respect_handler_level=True)
+    log_listener.start()
+    return log_listener
+
+
+def init_worker_logger(log_queue, log_level: str):
+    """
+    Initialize logger of a worker process, sending all its records to the queue of the parent process
+    """
+    log = logging.getLogger()
+    for handler in log.handlers[:]:
+        log.removeHandler(handler)
+    log.addHandler(QueueHandler(log_queue))
+    log.setLevel(LOG_LEVEL_STR_TO_INT.get(log_level.upper(), logging.INFO))
+
+
+@contextmanager
+def logged_process_pool(n_workers: int, log_level: str) -> Iterator[ProcessPoolExecutor]:
+    """
+    Pool of (spawned) worker processes whose logs are merged into the ones of current process, through a queue of
+    a multiprocessing manager - listener and manager being stopped when leaving the context
+    """
+    with multiprocessing.Manager() as manager:
+        log_queue = manager.Queue()
+        log_listener = start_log_queue_listener(log_queue=log_queue)
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=init_worker_logger, initargs=(log_queue, log_level)) as executor:
+                yield executor
+        finally:
+            log_listener.stop()
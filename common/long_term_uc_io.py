@@ -1,7 +1,8 @@
 import os
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterator, List
+from typing import Iterator, List, Optional
 
 from common.constants.countries import set_country_trigram
 from common.constants.datatypes import DATATYPE_NAMES
@@ -121,6 +122,29 @@ OUTPUT_FOLDER_LT = f'{OUTPUT_FOLDER}/long_term_uc'
 OUTPUT_SUBFOLDER_DATA = 'data'
 OUTPUT_SUBFOLDER_FIG = 'figures'
 OUTPUT_DATA_ANALYSIS_FOLDER = f'{OUTPUT_FOLDER}/data_analysis'
+OUTPUT_RESULT_CACHE_FOLDER = f'{OUTPUT_FOLDER_LT}/result_cache'
+OUTPUT_RESULTS_WAREHOUSE_FILE = f'{OUTPUT_FOLDER_LT}/results_warehouse.sqlite'
+OUTPUT_JOB_QUEUE_FILE = f'{OUTPUT_FOLDER_LT}/job_queue.sqlite'
+OUTPUT_SYNTHETIC_DATA_FOLDER = f'{OUTPUT_FOLDER}/synthetic_data'
+OUTPUT_BENCHMARK_FOLDER = f'{OUTPUT_FOLDER}/benchmark'
+OUTPUT_SUBFOLDER_COLUMNAR = 'columnar'
+COLUMNAR_SCHEMA_FILE = 'schema.json'
+# subfolder of multizones output folder of the current UC runs, e.g. one per campaign job for concurrent runs not to
+# write the same files; set with lt_uc_output_subfolder
+LT_UC_OUTPUT_SUBFOLDER = None
+
+
+@dataclass
+class UCOutputTables:
+    opt_power: str = 'opt_power'
+    storage_opt_decisions: str = 'storage_opt_decisions'
+    link_flow_opt_decisions: str = 'link-flow_opt_decisions'
+    marginal_prices: str = 'marginal_prices'
+
+
+UC_OUTPUT_TABLES = UCOutputTables()
+# partitioning of columnar output files (Hive-style subfolders, e.g. year=2025)
+COLUMNAR_PARTITION_COLS = ['year', 'climatic_year', 'period_start']
 
 
 def check_uc_input_folder_content(all_countries: List[str]):
@@ -148,6 +172,15 @@ def get_json_eraa_avail_values_file() -> str:
     return uniformize_path_os(path_str=os.path.join(INPUT_LT_UC_SUBFOLDER, 'elec-europe_eraa-available-values.json'))
 
 
+def get_synthetic_eraa_avail_values_file(data_folder: str) -> str:
+    # N.B. same format as the one of ERAA data, but in the folder of synthetic data
+    return uniformize_path_os(path_str=os.path.join(data_folder, 'eraa-available-values.json'))
+
+
+def get_synthetic_gps_coordinates_file(data_folder: str) -> str:
+    return uniformize_path_os(path_str=os.path.join(data_folder, 'gps-coordinates.json'))
+
+
 def get_json_params_tb_modif_file() -> str:
     return uniformize_path_os(path_str=os.path.join(INPUT_LT_UC_SUBFOLDER, 'elec-europe_params_to-be-modif.json'))
 
@@ -156,6 +189,34 @@ def get_json_solver_params_file() -> str:
     return uniformize_path_os(path_str=os.path.join(INPUT_LT_UC_SUBFOLDER, 'solver_params.json'))
 
 
+def get_json_result_cache_params_file() -> str:
+    return uniformize_path_os(path_str=os.path.join(INPUT_LT_UC_SUBFOLDER, 'result_cache_params.json'))
+
+
+def get_json_results_warehouse_params_file() -> str:
+    return uniformize_path_os(path_str=os.path.join(INPUT_LT_UC_SUBFOLDER, 'results_warehouse_params.json'))
+
+
+def get_json_benchmark_params_file() -> str:
+    return uniformize_path_os(path_str=os.path.join(INPUT_LT_UC_SUBFOLDER, 'benchmark_params.json'))
+
+
+def get_json_adequacy_study_params_file() -> str:
+    return uniformize_path_os(path_str=os.path.join(INPUT_LT_UC_SUBFOLDER, 'adequacy_study_params.json'))
+
+
+def get_json_stress_tests_params_file() -> str:
+    return uniformize_path_os(path_str=os.path.join(INPUT_LT_UC_SUBFOLDER, 'stress_tests_params.json'))
+
+
+def get_json_campaign_params_file() -> str:
+    return uniformize_path_os(path_str=os.path.join(INPUT_LT_UC_SUBFOLDER, 'campaign_params.json'))
+
+
+def get_json_output_params_file() -> str:
+    return uniformize_path_os(path_str=os.path.join(INPUT_LT_UC_SUBFOLDER, 'output_params.json'))
+
+
 def get_json_fuel_sources_tb_modif_file() -> str:
     return uniformize_path_os(path_str=os.path.join(INPUT_LT_UC_SUBFOLDER, 'fuel_sources_to-be_modif.json'))
 
@@ -225,6 +286,7 @@ class FigNamesPrefix:
     capacity: str = 'capa'
     production: str = 'prod'
     prices: str = 'prices'
+    prices_duration_curves: str = 'prices-duration-curves'
 
 
 def get_output_figure(fig_name: str, country: str, year: int, climatic_year: int = None, start_horizon: datetime = None,
@@ -240,11 +302,34 @@ def get_output_figure(fig_name: str, country: str, year: int, climatic_year: int
 def set_full_lt_uc_output_folder(folder_type: str = None, country: str = None, toy_model_output: bool = False) -> str:
     subfolder = f'monozone_{set_country_trigram(country=country)}' if toy_model_output else 'multizones_eur'
     folders_tb_join = [OUTPUT_FOLDER_LT, subfolder]
+    if not toy_model_output and LT_UC_OUTPUT_SUBFOLDER is not None:
+        folders_tb_join.append(LT_UC_OUTPUT_SUBFOLDER)
     if folder_type is not None:
         folders_tb_join.append(OUTPUT_SUBFOLDER_DATA if folder_type == OutputFolderNames.data else OUTPUT_SUBFOLDER_FIG)
     return '/'.join(folders_tb_join)
 
 
+def get_lt_uc_output_subfolder() -> Optional[str]:
+    return LT_UC_OUTPUT_SUBFOLDER
+
+
+@contextmanager
+def lt_uc_output_subfolder(subfolder: str) -> Iterator[str]:
+    """
+    Write the multizones outputs of the UC runs made in this context in a subfolder of their output folder
+    N.B. process-wide setting -> the runs of concurrent processes can use different subfolders, not the ones of
+    concurrent threads of a process
+    :returns: full output folder of the runs in this context
+    """
+    global LT_UC_OUTPUT_SUBFOLDER
+    previous_subfolder = LT_UC_OUTPUT_SUBFOLDER
+    LT_UC_OUTPUT_SUBFOLDER = subfolder
+    try:
+        yield set_full_lt_uc_output_folder()
+    finally:
+        LT_UC_OUTPUT_SUBFOLDER = previous_subfolder
+
+
 # TODO: merge 2 following functions
 def get_csv_file_named(name: str, country: str, year: int, climatic_year: int, start_horizon: datetime,
                        toy_model_output: bool = False, create_subdir: bool = True) -> str:
@@ -266,28 +351,98 @@ def get_json_file_named(name: str, country: str, year: int, climatic_year: int,
 
 def get_opt_power_file(country: str, year: int, climatic_year: int, start_horizon: datetime,
                        toy_model_output: bool = False) -> str:
-    return get_csv_file_named(name='opt_power', country=country, year=year, climatic_year=climatic_year, 
+    return get_csv_file_named(name=UC_OUTPUT_TABLES.opt_power, country=country, year=year, climatic_year=climatic_year, 
                               start_horizon=start_horizon, toy_model_output=toy_model_output)
 
 
 def get_storage_opt_dec_file(country: str, year: int, climatic_year: int, start_horizon: datetime,
                              toy_model_output: bool = False) -> str:
-    return get_csv_file_named(name='storage_opt_decisions', country=country, year=year, climatic_year=climatic_year, 
+    return get_csv_file_named(name=UC_OUTPUT_TABLES.storage_opt_decisions, country=country, year=year, climatic_year=climatic_year, 
                               start_horizon=start_horizon, toy_model_output=toy_model_output)
 
 
 def get_link_flow_opt_dec_file(country: str, year: int, climatic_year: int, start_horizon: datetime,
                                toy_model_output: bool= False) -> str:
-    return get_csv_file_named(name='link-flow_opt_decisions', country=country, year=year, climatic_year=climatic_year, 
+    return get_csv_file_named(name=UC_OUTPUT_TABLES.link_flow_opt_decisions, country=country, year=year, climatic_year=climatic_year, 
                               start_horizon=start_horizon, toy_model_output=toy_model_output)
     
 
 def get_marginal_prices_file(country: str, year: int, climatic_year: int, start_horizon: datetime,
                              toy_model_output: bool = False) -> str:
-    return get_csv_file_named(name='marginal_prices', country=country, year=year, climatic_year=climatic_year, 
+    return get_csv_file_named(name=UC_OUTPUT_TABLES.marginal_prices, country=country, year=year, climatic_year=climatic_year, 
                               start_horizon=start_horizon, toy_model_output=toy_model_output)
 
+
+def get_columnar_output_folder(country: str, toy_model_output: bool = False) -> str:
+    output_folder = set_full_lt_uc_output_folder(folder_type='data', country=country, toy_model_output=toy_model_output)
+    return f'{output_folder}/{OUTPUT_SUBFOLDER_COLUMNAR}'
+
+
+def get_columnar_output_file(table_name: str, output_format: str, country: str, year: int, climatic_year: int,
+                             start_horizon: datetime, toy_model_output: bool = False) -> str:
+    partition_vals = [year, climatic_year, start_horizon.strftime(DATE_FORMAT_FILE)]
+    partition_folders = [f'{col}={val}' for col, val in zip(COLUMNAR_PARTITION_COLS, partition_vals)]
+    output_folder = '/'.join([get_columnar_output_folder(country=country, toy_model_output=toy_model_output),
+                              table_name] + partition_folders)
+    make_dir(full_path=output_folder)
+    return f'{output_folder}/{country}.{output_format}'
+
+
+def get_columnar_schema_file(country: str, toy_model_output: bool = False) -> str:
+    return f'{get_columnar_output_folder(country=country, toy_model_output=toy_model_output)}/{COLUMNAR_SCHEMA_FILE}'
+
+
+def get_adequacy_report_file(country: str, year: int, toy_model_output: bool = False) -> str:
+    # N.B. aggregated over climatic years (and periods) -> no such suffix in file name
+    return get_csv_file_named(name='adequacy-report', country=country, year=year, climatic_year=None,
+                              start_horizon=None, toy_model_output=toy_model_output)
+
+
+def get_stress_test_impacts_file(country: str, year: int, climatic_year: int, start_horizon: datetime,
+                                 toy_model_output: bool = False) -> str:
+    return get_csv_file_named(name='stress-test-impacts', country=country, year=year, climatic_year=climatic_year,
+                              start_horizon=start_horizon, toy_model_output=toy_model_output)
+
+
+def get_duration_curve_stats_file(country: str, year: int, climatic_year: int, start_horizon: datetime,
+                                  toy_model_output: bool = False) -> str:
+    return get_csv_file_named(name='duration-curve-stats', country=country, year=year, climatic_year=climatic_year,
+                              start_horizon=start_horizon, toy_model_output=toy_model_output)
+
+
 def get_uc_summary_file(country: str, year: int, climatic_year: int, start_horizon: datetime,
                         toy_model_output: bool = False) -> str:
     return get_json_file_named(name='uc-summary', country=country, year=year, climatic_year=climatic_year,
                                start_horizon=start_horizon, toy_model_output=toy_model_output)
+
+
+def get_solver_stats_file(country: str, year: int, climatic_year: int, start_horizon: datetime,
+                          toy_model_output: bool = False) -> str:
+    return get_json_file_named(name='solver-stats', country=country, year=year, climatic_year=climatic_year,
+                               start_horizon=start_horizon, toy_model_output=toy_model_output)
+
+
+def get_run_trace_file(country: str, year: int, climatic_year: int, start_horizon: datetime,
+                       toy_model_output: bool = False) -> str:
+    return get_json_file_named(name='run-trace', country=country, year=year, climatic_year=climatic_year,
+                               start_horizon=start_horizon, toy_model_output=toy_model_output)
+
+
+def get_run_profile_file(country: str, year: int, climatic_year: int, start_horizon: datetime,
+                         toy_model_output: bool = False) -> str:
+    output_folder = set_full_lt_uc_output_folder(folder_type='data', country=country, toy_model_output=toy_model_output)
+    make_dir(full_path=output_folder)
+    return get_output_file_named(name='run-profile', extension='prof', output_dir=output_folder, country=country,
+                                 year=year, climatic_year=climatic_year, start_horizon=start_horizon)
+
+
+def get_benchmark_results_file(run_datetime: datetime) -> str:
+    make_dir(full_path=OUTPUT_BENCHMARK_FOLDER)
+    return uniformize_path_os(path_str=os.path.join(OUTPUT_BENCHMARK_FOLDER,
+                                                    f'benchmark-results_{run_datetime:%Y-%m-%d_%H-%M-%S}.json'))
+
+
+def get_benchmark_baseline_file() -> str:
+    # N.B. durations being machine-dependent, baseline is local to the machine on which benchmarks are run
+    make_dir(full_path=OUTPUT_BENCHMARK_FOLDER)
+    return uniformize_path_os(path_str=os.path.join(OUTPUT_BENCHMARK_FOLDER, 'benchmark-baseline.json'))
@@ -120,8 +120,12 @@ class FigureStyle:
     date_xtick_fontsize: int = 12
     date_xtick_rotation: int = 45
     n_curves_max: int = 8
+    # downsample curves to (min, max) envelope per pixel column of the figure - when more points than pixels
+    downsample: bool = True
 
     def process(self):
+        if isinstance(self.downsample, str):
+            self.downsample = self.downsample.lower() == 'true'
         if self.plot_dims_order is None:
             self.plot_dims_order = DEFAULT_PLOT_DIMS_ORDER
         else:
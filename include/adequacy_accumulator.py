@@ -0,0 +1,202 @@
+import logging
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from common.constants.countries import set_country_trigram
+from common.long_term_uc_io import get_adequacy_report_file
+from common.uc_run_params import UCRunParams
+from include.uc_summary_metrics import FAILURE_POWER_TOL, FAILURE_UNIT_SUFFIX, UCSummaryMetrics
+from utils.streaming_stats import StreamingHistogram
+
+DEFAULT_PRICE_BIN_WIDTH = 0.1  # €/MWh, i.e. max. error of price quantiles 0.05 €/MWh
+DEFAULT_PRICE_QUANTILES = [0.5, 0.9, 0.99]
+
+
+@dataclass
+class AdequacyReportCols:
+    n_scenarios: str = 'n_scenarios'
+    n_hours: str = 'n_hours'  # total simulated hours over all scenarios
+    lole: str = 'lole'  # Loss Of Load Expectation, mean number of failure hours per scenario
+    lole_std_err: str = 'lole_std_err'  # standard error of the previous mean (Monte Carlo convergence)
+    eens: str = 'eens'  # Expected Energy Not Served (GWh), mean ENS per scenario
+    eens_std_err: str = 'eens_std_err'
+    # bounds of confidence intervals of the previous means - normal approx. -, if a confidence level is given
+    lole_ci_low: str = 'lole_ci_low'
+    lole_ci_high: str = 'lole_ci_high'
+    eens_ci_low: str = 'eens_ci_low'
+    eens_ci_high: str = 'eens_ci_high'
+    share_of_failure_scenarios: str = 'share_of_failure_scenarios'  # with at least one failure hour
+    max_failure_power: str = 'max_failure_power'  # MW, over all hours and scenarios
+    mean_operational_cost: str = 'mean_operational_cost'  # M€ per scenario, from UCSummaryMetrics
+    price_mean: str = 'price_mean'  # €/MWh
+    price_max: str = 'price_max'
+
+
+ADEQUACY_REPORT_COLS = AdequacyReportCols()
+
+
+def get_price_quantile_col(q: float) -> str:
+    return f'price_q{100 * q:g}'
+
+
+def calc_std_err(sum_values: float, sum_squares: float, n_values: int) -> float:
+    if n_values < 2:
+        return np.nan
+    variance = max(sum_squares / n_values - (sum_values / n_values) ** 2, 0) * n_values / (n_values - 1)
+    return float(np.sqrt(variance / n_values))
+
+
+def calc_confidence_interval(mean: float, std_err: float, confidence_level: float) -> Tuple[float, float]:
+    """
+    Confidence interval of a mean estimated over Monte Carlo scenarios - normal approximation, lower bound clipped
+    to 0 (non-negative metrics)
+    """
+    half_width = NormalDist().inv_cdf(0.5 + confidence_level / 2) * std_err
+    return max(mean - half_width, 0), mean + half_width
+
+
+@dataclass
+class CountryAdequacyStats:
+    """
+    Running sums/counts - and marginal price sketch - of a country over the scenarios seen so far
+    """
+    price_sketch: StreamingHistogram
+    n_scenarios: int = 0
+    n_hours: int = 0
+    n_failure_scenarios: int = 0
+    sum_failure_hours: float = 0.0
+    sum_sq_failure_hours: float = 0.0
+    sum_ens: float = 0.0  # MWh
+    sum_sq_ens: float = 0.0
+    max_failure_power: float = 0.0
+    sum_operational_cost: float = 0.0
+    n_operational_costs: int = 0
+
+    def merge(self, other: 'CountryAdequacyStats'):
+        self.price_sketch.merge(other=other.price_sketch)
+        for attr_name in ['n_scenarios', 'n_hours', 'n_failure_scenarios', 'sum_failure_hours',
+                          'sum_sq_failure_hours', 'sum_ens', 'sum_sq_ens', 'sum_operational_cost',
+                          'n_operational_costs']:
+            setattr(self, attr_name, getattr(self, attr_name) + getattr(other, attr_name))
+        self.max_failure_power = max(self.max_failure_power, other.max_failure_power)
+
+
+@dataclass
+class AdequacyAccumulator:
+    """
+    Streaming aggregation of adequacy metrics - LOLE, EENS, marginal price quantiles - over the (Monte Carlo)
+    scenarios of UC runs, e.g. all climatic years and stress-test ones. Each scenario is summarized in
+    running sums/counts and a price sketch when it completes -> hourly results are not kept in memory
+    """
+    price_bin_width: float = DEFAULT_PRICE_BIN_WIDTH
+    price_quantiles: List[float] = field(default_factory=lambda: list(DEFAULT_PRICE_QUANTILES))
+    per_country_stats: Dict[str, CountryAdequacyStats] = field(default_factory=dict)
+    climatic_years: List[int] = field(default_factory=list)
+    n_stress_test_scenarios: int = 0
+
+    def get_country_stats(self, country: str) -> CountryAdequacyStats:
+        if country not in self.per_country_stats:
+            self.per_country_stats[country] = \
+                CountryAdequacyStats(price_sketch=StreamingHistogram(bin_width=self.price_bin_width))
+        return self.per_country_stats[country]
+
+    def update(self, uc_run_params: UCRunParams, prod_var_opt: pd.DataFrame, sde_dual_var_opt: pd.DataFrame,
+               uc_summary_metrics: Optional[UCSummaryMetrics] = None):
+        """
+        Add the results of one (solved) scenario
+        :param uc_run_params: of this scenario
+        :param prod_var_opt: optimal production, with failure units used for ENS and failure hours
+        :param sde_dual_var_opt: marginal prices, with bus names (country trigrams) as columns
+        :param uc_summary_metrics: if provided, used for per-country operational cost
+        """
+        logging.info(f'Add scenario (year {uc_run_params.selected_target_year}, climatic year '
+                     f'{uc_run_params.selected_climatic_year}) to adequacy metrics')
+        self.climatic_years.append(uc_run_params.selected_climatic_year)
+        if uc_run_params.is_stress_test:
+            self.n_stress_test_scenarios += 1
+        for country in uc_run_params.selected_countries:
+            country_stats = self.get_country_stats(country=country)
+            country_trigram = set_country_trigram(country=country)
+            failure_unit = f'{country_trigram}{FAILURE_UNIT_SUFFIX}'
+            failure_power = prod_var_opt[failure_unit].values if failure_unit in prod_var_opt.columns \
+                else np.zeros(len(prod_var_opt))
+            n_failure_hours = int((failure_power > FAILURE_POWER_TOL).sum())
+            ens = float(failure_power.sum())
+            country_stats.n_scenarios += 1
+            country_stats.n_hours += len(prod_var_opt)
+            country_stats.n_failure_scenarios += int(n_failure_hours > 0)
+            country_stats.sum_failure_hours += n_failure_hours
+            country_stats.sum_sq_failure_hours += n_failure_hours ** 2
+            country_stats.sum_ens += ens
+            country_stats.sum_sq_ens += ens ** 2
+            country_stats.max_failure_power = max(country_stats.max_failure_power,
+                                                  float(failure_power.max(initial=0)))
+            if country_trigram in sde_dual_var_opt.columns:
+                country_stats.price_sketch.update(values=sde_dual_var_opt[country_trigram].values)
+            if uc_summary_metrics is not None and uc_summary_metrics.per_country_total_operational_cost is not None:
+                country_stats.sum_operational_cost += \
+                    uc_summary_metrics.per_country_total_operational_cost.get(country_trigram, 0)
+                country_stats.n_operational_costs += 1
+
+    def merge(self, other: 'AdequacyAccumulator'):
+        """
+        Merge with an accumulator of other scenarios, e.g. run in another process
+        """
+        for country, country_stats in other.per_country_stats.items():
+            self.get_country_stats(country=country).merge(other=country_stats)
+        self.climatic_years.extend(other.climatic_years)
+        self.n_stress_test_scenarios += other.n_stress_test_scenarios
+
+    def get_report(self, confidence_level: float = None) -> pd.DataFrame:
+        """
+        Per-country adequacy report, over all scenarios added so far
+        :param confidence_level: if provided (e.g. 0.95), confidence intervals of LOLE and EENS are added
+        """
+        report_rows = {}
+        for country, stats in self.per_country_stats.items():
+            n_scen = stats.n_scenarios
+            report_rows[country] = {
+                ADEQUACY_REPORT_COLS.n_scenarios: n_scen,
+                ADEQUACY_REPORT_COLS.n_hours: stats.n_hours,
+                ADEQUACY_REPORT_COLS.lole: stats.sum_failure_hours / n_scen,
+                ADEQUACY_REPORT_COLS.lole_std_err: calc_std_err(sum_values=stats.sum_failure_hours,
+                                                                sum_squares=stats.sum_sq_failure_hours,
+                                                                n_values=n_scen),
+                ADEQUACY_REPORT_COLS.eens: stats.sum_ens / n_scen / 1e3,
+                ADEQUACY_REPORT_COLS.eens_std_err: calc_std_err(sum_values=stats.sum_ens, sum_squares=stats.sum_sq_ens,
+                                                                n_values=n_scen) / 1e3,
+                ADEQUACY_REPORT_COLS.share_of_failure_scenarios: stats.n_failure_scenarios / n_scen,
+                ADEQUACY_REPORT_COLS.max_failure_power: stats.max_failure_power,
+                ADEQUACY_REPORT_COLS.mean_operational_cost:
+                    stats.sum_operational_cost / stats.n_operational_costs if stats.n_operational_costs > 0
+                    else np.nan,
+                ADEQUACY_REPORT_COLS.price_mean: stats.price_sketch.mean(),
+                ADEQUACY_REPORT_COLS.price_max: stats.price_sketch.max_value if stats.price_sketch.n_values > 0
+                else np.nan,
+                **dict(zip([get_price_quantile_col(q=q) for q in self.price_quantiles],
+                           stats.price_sketch.quantiles(q_values=self.price_quantiles)))
+            }
+        report = pd.DataFrame.from_dict(report_rows, orient='index').rename_axis('country')
+        if confidence_level is not None:
+            for mean_col, std_err_col, ci_low_col, ci_high_col in \
+                    [(ADEQUACY_REPORT_COLS.lole, ADEQUACY_REPORT_COLS.lole_std_err, ADEQUACY_REPORT_COLS.lole_ci_low,
+                      ADEQUACY_REPORT_COLS.lole_ci_high),
+                     (ADEQUACY_REPORT_COLS.eens, ADEQUACY_REPORT_COLS.eens_std_err, ADEQUACY_REPORT_COLS.eens_ci_low,
+                      ADEQUACY_REPORT_COLS.eens_ci_high)]:
+                ci_bounds = [calc_confidence_interval(mean=mean, std_err=std_err, confidence_level=confidence_level)
+                             for mean, std_err in zip(report[mean_col], report[std_err_col])]
+                report.insert(report.columns.get_loc(std_err_col) + 1, ci_low_col, [elt[0] for elt in ci_bounds])
+                report.insert(report.columns.get_loc(ci_low_col) + 1, ci_high_col, [elt[1] for elt in ci_bounds])
+        return report
+
+    def save_report(self, year: int, country: str = 'europe', toy_model_output: bool = False,
+                    confidence_level: float = None) -> str:
+        report_file = get_adequacy_report_file(country=country, year=year, toy_model_output=toy_model_output)
+        logging.info(f'Save adequacy report over {len(self.climatic_years)} scenario(s) '
+                     f'({self.n_stress_test_scenarios} stress-test one(s)) to {report_file}')
+        self.get_report(confidence_level=confidence_level).to_csv(report_file)
+        return report_file
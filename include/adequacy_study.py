@@ -0,0 +1,110 @@
+import logging
+import os
+from copy import deepcopy
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Tuple, Union
+
+from common.constants.adequacy_study import AdequacyStudyParams
+from common.constants.campaign import CampaignParams
+from common.constants.extract_eraa_data import ERAADatasetDescr
+from common.error_msgs import print_errors_list
+from common.uc_run_params import UCRunParams
+from utils.memory_tracker import get_available_memory
+
+# UCRunParams fields set for each chunk of a scenario - other ones being the ones of JSON UC run params
+CHUNK_RUN_PARAMS_FIELDS = ['selected_target_year', 'selected_climatic_year', 'uc_period_start', 'uc_period_end',
+                           'is_stress_test']
+
+
+@dataclass(frozen=True)
+class AdequacyScenario:
+    target_year: int
+    climatic_year: int
+    is_stress_test: bool = False
+
+    @property
+    def name(self) -> str:
+        return f'{self.target_year}-cy{self.climatic_year}'
+
+
+def set_period_chunks(period_start: datetime, period_end: datetime, chunk_days: int) \
+        -> List[Tuple[datetime, datetime]]:
+    """
+    Split [period_start, period_end[ into successive chunks of chunk_days - last one possibly shorter
+    """
+    chunks = []
+    chunk_start = period_start
+    while chunk_start < period_end:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days), period_end)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end
+    return chunks
+
+
+def set_adequacy_scenarios(params: Union[AdequacyStudyParams, CampaignParams], eraa_data_descr: ERAADatasetDescr) \
+        -> List[AdequacyScenario]:
+    """
+    All (target year, climatic year) combinations of the study (or campaign) - all available values if not given in
+    params
+    """
+    avail_cys_stress_test = eraa_data_descr.available_climatic_years_stress_test or []
+    target_years = params.target_years if params.target_years is not None \
+        else eraa_data_descr.available_target_years
+    if params.climatic_years is not None:
+        climatic_years = params.climatic_years
+    else:
+        climatic_years = list(eraa_data_descr.available_climatic_years)
+        if params.with_stress_test_cys:
+            climatic_years.extend(avail_cys_stress_test)
+    errors_list = []
+    unknown_target_years = set(target_years) - set(eraa_data_descr.available_target_years)
+    if len(unknown_target_years) > 0:
+        errors_list.append(f'Unknown target year(s) {sorted(unknown_target_years)}; available ones are '
+                           f'{eraa_data_descr.available_target_years}')
+    unknown_cys = set(climatic_years) - set(eraa_data_descr.available_climatic_years) - set(avail_cys_stress_test)
+    if len(unknown_cys) > 0:
+        errors_list.append(f'Unknown climatic year(s) {sorted(unknown_cys)}; available ones are '
+                           f'{eraa_data_descr.available_climatic_years} (and {avail_cys_stress_test} for '
+                           f'stress tests)')
+    if len(errors_list) > 0:
+        print_errors_list(error_name='in (target year, climatic year) scenarios', errors_list=errors_list)
+    return [AdequacyScenario(target_year=target_year, climatic_year=climatic_year,
+                             is_stress_test=climatic_year in avail_cys_stress_test)
+            for target_year in target_years for climatic_year in climatic_years]
+
+
+def set_scenario_uc_run_params(base_uc_run_params: UCRunParams, scenario: AdequacyScenario,
+                               period_start: datetime, period_end: datetime) -> UCRunParams:
+    """
+    UC run params of a scenario over a given period - only CHUNK_RUN_PARAMS_FIELDS being set (with countries and
+    prod. types of base params), to impose them in a UC run
+    N.B. new object, base (processed) params not being processed again
+    """
+    return UCRunParams(selected_climatic_year=scenario.climatic_year,
+                       selected_countries=base_uc_run_params.selected_countries,
+                       selected_target_year=scenario.target_year,
+                       selected_prod_types=deepcopy(base_uc_run_params.selected_prod_types),
+                       uc_period_start=period_start, uc_period_end=period_end, is_stress_test=scenario.is_stress_test)
+
+
+def get_n_workers(params: AdequacyStudyParams, n_scenarios: int) -> int:
+    """
+    Number of worker processes: the one in params (or number of CPUs), not more than the number of scenarios, and
+    limited by available memory if a memory budget per worker is given
+    """
+    n_workers = params.n_workers if params.n_workers is not None else (os.cpu_count() or 1)
+    n_workers = min(n_workers, n_scenarios)
+    if params.memory_budget_per_worker_mb is not None:
+        available_memory = get_available_memory()
+        if available_memory is None:
+            logging.warning('Available memory unknown on this platform -> number of workers not limited by memory '
+                            'budget per worker')
+        else:
+            n_workers_in_budget = int(available_memory / 1e6 // params.memory_budget_per_worker_mb)
+            if n_workers_in_budget < n_workers:
+                logging.info(f'Number of workers limited to {max(1, n_workers_in_budget)} (instead of {n_workers}) '
+                             f'by available memory {available_memory / 1e6:.0f}MB, with a budget of '
+                             f'{params.memory_budget_per_worker_mb}MB per worker')
+                n_workers = n_workers_in_budget
+    return max(1, n_workers)
@@ -0,0 +1,77 @@
+import os
+from copy import deepcopy
+from dataclasses import replace
+from typing import Dict
+
+from common.constants.campaign import CampaignParams
+from common.constants.extract_eraa_data import ERAADatasetDescr
+from common.constants.optimisation import SolverParams
+from common.fuel_sources import FuelSource
+from common.uc_run_params import UCRunParams
+from include.adequacy_study import set_adequacy_scenarios
+from utils.hasher import get_hash
+
+# UCRunParams fields set for each job of a campaign - other ones being the ones of JSON UC run params
+JOB_RUN_PARAMS_FIELDS = ['selected_target_year', 'selected_climatic_year', 'is_stress_test',
+                         'capacities_tb_overwritten']
+
+
+def set_campaign_jobs_inputs(params: CampaignParams, base_uc_run_params: UCRunParams,
+                             eraa_data_descr: ERAADatasetDescr, fuel_sources: Dict[str, FuelSource],
+                             solver_params: SolverParams) -> Dict[str, dict]:
+    """
+    Inputs of all (target year, climatic year, capacity variant) jobs of a campaign, with their hash - of these
+    inputs and of the ones common to all jobs, i.e. JSON UC run params (but the years), fuel sources and solver
+    params -, for a job to be run again only if one of them changed
+    N.B. ERAA data files not included in the hash
+    :returns: {inputs hash: inputs (JSON-serializable)}
+    """
+    common_hash_inputs = {'uc_run_params': replace(base_uc_run_params, selected_target_year=None,
+                                                   selected_climatic_year=None, is_stress_test=None),
+                          'fuel_sources': fuel_sources, 'solver_params': solver_params}
+    jobs_inputs = {}
+    for scenario in set_adequacy_scenarios(params=params, eraa_data_descr=eraa_data_descr):
+        for variant_name, variant_capacities in params.capacity_variants.items():
+            job_inputs = {'target_year': scenario.target_year, 'climatic_year': scenario.climatic_year,
+                          'is_stress_test': scenario.is_stress_test, 'capacity_variant': variant_name,
+                          'capacities_tb_overwritten': variant_capacities}
+            jobs_inputs[get_hash(obj={**common_hash_inputs, 'job': job_inputs})] = job_inputs
+    return jobs_inputs
+
+
+def set_job_uc_run_params(base_uc_run_params: UCRunParams, job_inputs: dict) -> UCRunParams:
+    """
+    UC run params of a job - only JOB_RUN_PARAMS_FIELDS being set (with countries, prod. types and period of base
+    params), to impose them in a UC run; capacities of the job variant being applied on top of the JSON ones
+    N.B. new object, base (processed) params not being processed again
+    """
+    capacities_tb_overwritten = deepcopy(base_uc_run_params.capacities_tb_overwritten)
+    for country, country_capas in job_inputs['capacities_tb_overwritten'].items():
+        capacities_tb_overwritten[country] = {**(capacities_tb_overwritten.get(country) or {}), **country_capas}
+    return UCRunParams(selected_climatic_year=job_inputs['climatic_year'],
+                       selected_countries=base_uc_run_params.selected_countries,
+                       selected_target_year=job_inputs['target_year'],
+                       selected_prod_types=deepcopy(base_uc_run_params.selected_prod_types),
+                       uc_period_start=base_uc_run_params.uc_period_start,
+                       uc_period_end=base_uc_run_params.uc_period_end, is_stress_test=job_inputs['is_stress_test'],
+                       capacities_tb_overwritten=capacities_tb_overwritten)
+
+
+def get_job_name(job_inputs: dict) -> str:
+    return f'{job_inputs["target_year"]}-cy{job_inputs["climatic_year"]}-{job_inputs["capacity_variant"]}'
+
+
+def get_job_output_subfolder(campaign: str, job_id: int, job_inputs: dict) -> str:
+    """
+    Output subfolder of a job - with its id, unique in the queue, for jobs differing only by their capacity variant
+    (or of different campaigns) not to write the same files
+    """
+    return f'{campaign}/job{job_id}_{get_job_name(job_inputs=job_inputs)}'
+
+
+def get_n_workers(params: CampaignParams, n_jobs: int) -> int:
+    """
+    Number of worker processes: the one in params (or number of CPUs), not more than the number of jobs to be run
+    """
+    n_workers = params.n_workers if params.n_workers is not None else (os.cpu_count() or 1)
+    return max(1, min(n_workers, n_jobs))
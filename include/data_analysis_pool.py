@@ -0,0 +1,149 @@
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from common.constants.datatypes import DATATYPE_NAMES
+from common.constants.extract_eraa_data import ERAADatasetDescr
+from common.uc_run_params import UCRunParams
+from include.dataset import Dataset
+from include.dataset_analyzer import DataAnalExtraParams, DataAnalysis
+from utils.dates import get_period_str
+from utils.hasher import to_canonical_repr
+
+# Dataset attribute in which data of each datatype analysed is obtained
+DATASET_ATTR_PER_DT = {DATATYPE_NAMES.demand: 'demand', DATATYPE_NAMES.capa_factor: 'agg_cf_data',
+                       DATATYPE_NAMES.net_demand: 'net_demand'}
+
+
+@dataclass(frozen=True)
+class DataSliceKey:
+    """
+    All that defines data read for a country - but the country itself; data of the different countries with the
+    same key being read at once
+    """
+    data_type: str
+    subdt_selec: Optional[Tuple[str, ...]]
+    year: int
+    climatic_year: int
+    period_start: datetime
+    period_end: datetime
+    extra_params: str  # canonical JSON of extra-params values, '{}' if None
+
+
+def get_analysis_subdt_selec(data_analysis: DataAnalysis) -> Optional[List[str]]:
+    return data_analysis.aggreg_prod_types if not data_analysis.aggreg_prod_types == [None] else None
+
+
+def iter_analysis_cases(data_analysis: DataAnalysis, uc_run_params: UCRunParams,
+                        eraa_data_descr: ERAADatasetDescr) \
+        -> Iterator[Tuple[int, int, Optional[DataAnalExtraParams], DataSliceKey]]:
+    """
+    Loop over (year, climatic year, extra-params) cases of a data analysis, setting uc_run_params accordingly
+    :return: iterator of (year, climatic year, extra-params, key of data slice to be used)
+    """
+    uc_run_params.set_countries(countries=data_analysis.countries)
+    uc_run_params.set_uc_period(start=data_analysis.period_start, end=data_analysis.period_end)
+    subdt_selec = get_analysis_subdt_selec(data_analysis=data_analysis)
+    for year in data_analysis.years:
+        for clim_year in data_analysis.climatic_years:
+            for current_extra_params in data_analysis.extra_params:
+                uc_run_params.set_target_year(year=year)
+                uc_run_params.set_climatic_year(climatic_year=clim_year)
+                # Attention check at each time if stress test based on the set year
+                uc_run_params.set_is_stress_test(
+                    avail_cy_stress_test=eraa_data_descr.available_climatic_years_stress_test
+                )
+                # And if coherent climatic year, i.e. in list of available data
+                uc_run_params.coherence_check_ty_and_cy(eraa_data_descr=eraa_data_descr, stop_if_error=True)
+                extra_params_vals = {} if current_extra_params is None else current_extra_params.values
+                slice_key = DataSliceKey(data_type=data_analysis.data_type,
+                                         subdt_selec=tuple(sorted(subdt_selec)) if subdt_selec is not None else None,
+                                         year=year, climatic_year=clim_year,
+                                         period_start=uc_run_params.uc_period_start,
+                                         period_end=uc_run_params.uc_period_end,
+                                         extra_params=json.dumps(to_canonical_repr(extra_params_vals),
+                                                                 sort_keys=True))
+                yield year, clim_year, current_extra_params, slice_key
+
+
+@dataclass
+class DataAnalysisPool:
+    """
+    Data of a batch of analyses, each (data slice key, country) being read once - whatever the number of analyses
+    using it - before the analyses read it from this pool
+    """
+    eraa_data_descr: ERAADatasetDescr
+    per_country_data: Dict[Tuple[DataSliceKey, str], pd.DataFrame] = field(default_factory=dict)
+    n_reads: int = 0  # number of get_countries_data calls
+
+    def plan(self, data_analyses: List[DataAnalysis], uc_run_params: UCRunParams) \
+            -> Dict[DataSliceKey, Tuple[List[str], Optional[DataAnalExtraParams]]]:
+        """
+        Union of the data needs of all analyses
+        :return: {data slice key: (list of countries, extra-params to be used for reading)}
+        """
+        data_needs = {}
+        for elt_analysis in data_analyses:
+            for _, _, current_extra_params, slice_key in (
+                    iter_analysis_cases(data_analysis=elt_analysis, uc_run_params=uc_run_params,
+                                        eraa_data_descr=self.eraa_data_descr)):
+                needed_countries = data_needs.setdefault(slice_key, ([], current_extra_params))[0]
+                needed_countries.extend([country for country in elt_analysis.countries
+                                         if country not in needed_countries])
+        return data_needs
+
+    def load(self, data_analyses: List[DataAnalysis], uc_run_params: UCRunParams):
+        data_needs = self.plan(data_analyses=data_analyses, uc_run_params=uc_run_params)
+        n_country_slices = sum(len(countries) for countries, _ in data_needs.values())
+        logging.info(f'Read ERAA ({self.eraa_data_descr.eraa_edition}) data needed by {len(data_analyses)} '
+                     f'analysis(es): {n_country_slices} (datatype, country, year, climatic year, period, '
+                     f'extra-params) slice(s), in {len(data_needs)} read(s)')
+        for slice_key, (countries, current_extra_params) in data_needs.items():
+            self.read_slice(slice_key=slice_key, countries=countries, extra_params=current_extra_params,
+                            uc_run_params=uc_run_params)
+
+    def read_slice(self, slice_key: DataSliceKey, countries: List[str], extra_params: Optional[DataAnalExtraParams],
+                   uc_run_params: UCRunParams):
+        uc_run_params.set_countries(countries=countries)
+        uc_run_params.set_uc_period(start=slice_key.period_start, end=slice_key.period_end)
+        uc_run_params.set_target_year(year=slice_key.year)
+        uc_run_params.set_climatic_year(climatic_year=slice_key.climatic_year)
+        uc_run_params.set_is_stress_test(avail_cy_stress_test=self.eraa_data_descr.available_climatic_years_stress_test)
+        uc_period_msg = get_period_str(period_start=slice_key.period_start, period_end=slice_key.period_end)
+        logging.info(f'Read {slice_key.data_type} data for {countries}, year {slice_key.year}, climatic year '
+                     f'{slice_key.climatic_year} and period {uc_period_msg}')
+        eraa_dataset = Dataset(source=f'eraa_{self.eraa_data_descr.eraa_edition}',
+                               agg_prod_types_with_cf_data=self.eraa_data_descr.agg_prod_types_with_cf_data,
+                               is_stress_test=uc_run_params.is_stress_test)
+        extra_params_vals = {} if extra_params is None else extra_params.values
+        eraa_dataset.get_countries_data(uc_run_params=uc_run_params,
+                                        aggreg_prod_types_def=self.eraa_data_descr.aggreg_prod_types_def,
+                                        datatypes_selec=[slice_key.data_type],
+                                        subdt_selec=list(slice_key.subdt_selec) if slice_key.subdt_selec is not None
+                                        else None, **extra_params_vals)
+        eraa_dataset.complete_data()
+        self.n_reads += 1
+        dataset_attr = DATASET_ATTR_PER_DT.get(slice_key.data_type)
+        for country in countries:
+            self.per_country_data[(slice_key, country)] = \
+                getattr(eraa_dataset, dataset_attr)[country] if dataset_attr is not None else None
+
+    def get_analysis_data(self, data_analysis: DataAnalysis, uc_run_params: UCRunParams) \
+            -> Dict[Tuple[str, int, int, Optional[int]], pd.DataFrame]:
+        """
+        Data of an analysis, in the format of DataAnalysis.apply_analysis per_case_data arg.
+        N.B. dfs shared with other analyses -> not to be modified
+        """
+        per_case_data = {}
+        for year, clim_year, current_extra_params, slice_key in (
+                iter_analysis_cases(data_analysis=data_analysis, uc_run_params=uc_run_params,
+                                    eraa_data_descr=self.eraa_data_descr)):
+            extra_params_idx = current_extra_params.index if current_extra_params is not None else None
+            for country in data_analysis.countries:
+                per_case_data[(country, year, clim_year, extra_params_idx)] = \
+                    self.per_country_data[(slice_key, country)]
+        return per_case_data
@@ -0,0 +1,93 @@
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from common.constants.datatypes import DATATYPE_NAMES
+from common.logger import logged_process_pool
+from common.plot_params import PlotParams
+from common.uc_run_params import UCRunParams
+from include.data_analysis_pool import DataAnalysisPool
+from include.dataset_analyzer import DataAnalysis
+from include.uc_timeseries import set_uc_ts_name
+from utils.plot import FigureStyle
+
+
+@dataclass
+class DataAnalysisTask:
+    """
+    A data analysis with its data (from pool) -> independent of other tasks, and picklable to be run in a worker
+    """
+    data_analysis: DataAnalysis
+    per_case_data: Dict[Tuple[str, int, int, Optional[int]], pd.DataFrame]
+    extra_params_labels: Dict[int, str]
+    dt_suffix_for_output: Optional[str] = None
+
+    def get_output_key(self) -> tuple:
+        """
+        What output file names are based on -> tasks with same key write the same files
+        """
+        analysis = self.data_analysis
+        uc_ts_name = set_uc_ts_name(data_type=analysis.data_type, countries=analysis.countries, years=analysis.years,
+                                    climatic_years=analysis.climatic_years, extra_params=analysis.extra_params,
+                                    aggreg_prod_types=analysis.aggreg_prod_types)
+        return (analysis.analysis_type, uc_ts_name, self.dt_suffix_for_output, analysis.period_start,
+                analysis.period_end)
+
+
+def set_data_analysis_task(data_analysis: DataAnalysis, data_analysis_pool: DataAnalysisPool,
+                           uc_run_params: UCRunParams) -> DataAnalysisTask:
+    # get - from pool - data to be analyzed/plotted hereafter, per (country, year, clim_year, extra-params idx) tuple
+    per_case_data = data_analysis_pool.get_analysis_data(data_analysis=data_analysis, uc_run_params=uc_run_params)
+    dt_suffix_for_output = None  # suffix to be added to datatype in output files to identify them in specific cases
+    # ATTENTION TRICKY ASPECT: agg. prod. types only used for net demand calculation,
+    # not to have 1 curve/block of data per case -> set this attr. to [None] after data selection
+    if data_analysis.data_type == DATATYPE_NAMES.net_demand and not data_analysis.aggreg_prod_types == [None]:
+        logging.debug('Aggreg. prod. types attr. set to None after data selection for net demand analysis')
+        # save first a "datatype-suffix" to identify this case in filename saved
+        n_agg_pt = len(data_analysis.aggreg_prod_types)
+        if n_agg_pt == 1:
+            dt_suffix_for_output = f'incl_{data_analysis.aggreg_prod_types[0]}'
+        else:
+            dt_suffix_for_output = f'incl_{n_agg_pt}-aggpts'
+        data_analysis.set_agg_prod_types_to_default_val()
+    return DataAnalysisTask(data_analysis=data_analysis, per_case_data=per_case_data,
+                            extra_params_labels=data_analysis.get_extra_args_idx_to_label_corresp(),
+                            dt_suffix_for_output=dt_suffix_for_output)
+
+
+def apply_data_analysis_tasks(tasks: List[DataAnalysisTask], fig_style: FigureStyle,
+                              per_dim_plot_params: Dict[str, PlotParams]):
+    for task in tasks:
+        logging.info(task.data_analysis)
+        task.data_analysis.apply_analysis(per_case_data=task.per_case_data, fig_style=fig_style,
+                                          per_dim_plot_params=per_dim_plot_params,
+                                          extra_params_labels=task.extra_params_labels,
+                                          dt_suffix_for_output=task.dt_suffix_for_output)
+
+
+def run_data_analysis_tasks(tasks: List[DataAnalysisTask], fig_style: FigureStyle,
+                            per_dim_plot_params: Dict[str, PlotParams], n_workers: int = 1, log_level: str = 'info'):
+    """
+    Apply data analyses, in a pool of n_workers processes if n_workers > 1 - their logs being merged into the ones
+    of current process through a queue
+    N.B. tasks writing the same output files are run in the same worker, in their order in the list -> same
+    outputs as a sequential run
+    """
+    if n_workers <= 1 or len(tasks) <= 1:
+        apply_data_analysis_tasks(tasks=tasks, fig_style=fig_style, per_dim_plot_params=per_dim_plot_params)
+        return
+
+    per_output_tasks = {}
+    for task in tasks:
+        per_output_tasks.setdefault(task.get_output_key(), []).append(task)
+    n_workers = min(n_workers, len(per_output_tasks))
+    logging.info(f'Run {len(tasks)} data analysis(es) in a pool of {n_workers} processes')
+    with logged_process_pool(n_workers=n_workers, log_level=log_level) as executor:
+        futures = [executor.submit(apply_data_analysis_tasks, tasks=output_tasks, fig_style=fig_style,
+                                   per_dim_plot_params=per_dim_plot_params)
+                   for output_tasks in per_output_tasks.values()]
+        # results in submission order, to stop on the first failed analysis as in a sequential run
+        for future in futures:
+            future.result()
@@ -12,18 +12,20 @@ from common.constants.aggreg_operations import AggregOpeNames
 from common.constants.datatypes import DATATYPE_NAMES
 from common.constants.eraa_data import ERAAParamNames
 from common.constants.prod_types import ProdTypeNames
+from common.constants.pypsa_params import GEN_UNITS_PYPSA_PARAMS
 from common.error_msgs import print_errors_list
 from common.long_term_uc_io import COLUMN_NAMES, DT_FILE_PREFIX, DT_SUBFOLDERS, FILES_FORMAT, \
     GEN_CAPA_SUBDT_COLS, INPUT_CY_STRESS_TEST_SUBFOLDER, INPUT_ERAA_FOLDER, HYDRO_KEY_COLUMNS, \
     HYDRO_VALUE_COLUMNS, HYDRO_TS_GRANULARITY, HYDRO_DATA_RESAMPLE_METHODS, HYDRO_LEVELS_RESAMPLE_FILLNA_VALS
 from common.uc_run_params import UCRunParams
-from include.dataset_builder import GenerationUnitData, GEN_UNITS_PYPSA_PARAMS, set_gen_unit_name
+from include.generation_unit_data import GenerationUnitData, set_gen_unit_name
 from utils.basic_utils import get_intersection_of_lists
 from utils.df_utils import create_dict_from_cols_in_df, selec_in_df_based_on_list, set_aggreg_col_based_on_corresp, \
     create_dict_from_df_row, resample_and_distribute
 from utils.dir_utils import uniformize_path_os
 from utils.eraa_data_reader import filter_input_data, gen_capa_pt_str_sanitizer, select_interco_capas, \
     set_aggreg_cf_prod_types_data, read_and_process_hydro_data
+from utils.run_trace import trace_span
 from utils.write import json_dump
 
 N_SPACES_MSG = 2
@@ -148,7 +150,8 @@ def get_installed_gen_capas_data(folder: str, file_suffix: str, country: str, ag
 
 
 def set_final_hydro_key_cols(hydro_dt: str) -> List[str]:
-    key_cols = HYDRO_KEY_COLUMNS[hydro_dt]
+    # copy, not to modify the constant (read data a second time would then fail)
+    key_cols = list(HYDRO_KEY_COLUMNS[hydro_dt])
     # week and day idx columns have been removed when reading and processing
     for col in [COLUMN_NAMES.day, COLUMN_NAMES.week]:
         if col in key_cols:
@@ -382,6 +385,8 @@ class Dataset:
     agg_prod_types_with_cf_data: List[str]
     source: str = 'eraa_2023.2'
     is_stress_test: bool = False
+    # root folder of input data, with ERAA data layout (e.g. synthetic data for benchmarks)
+    data_folder: str = INPUT_ERAA_FOLDER
     demand: Dict[str, pd.DataFrame] = None  # {country: df of data}
     net_demand: Dict[str, pd.DataFrame] = None  # idem
     agg_cf_data: Dict[str, pd.DataFrame] = None  # idem
@@ -417,11 +422,11 @@ class Dataset:
             capas_aggreg_pt_with_cf = {}
 
         # get - per datatype - folder names
-        demand_folder = os.path.join(INPUT_ERAA_FOLDER, DT_SUBFOLDERS.demand)
-        res_cf_folder = os.path.join(INPUT_ERAA_FOLDER, DT_SUBFOLDERS.res_capa_factors)
-        gen_capas_folder = os.path.join(INPUT_ERAA_FOLDER, DT_SUBFOLDERS.generation_capas)
-        interco_capas_folder = os.path.join(INPUT_ERAA_FOLDER, DT_SUBFOLDERS.interco_capas)
-        hydro_folder = os.path.join(INPUT_ERAA_FOLDER, DT_SUBFOLDERS.hydro)
+        demand_folder = os.path.join(self.data_folder, DT_SUBFOLDERS.demand)
+        res_cf_folder = os.path.join(self.data_folder, DT_SUBFOLDERS.res_capa_factors)
+        gen_capas_folder = os.path.join(self.data_folder, DT_SUBFOLDERS.generation_capas)
+        interco_capas_folder = os.path.join(self.data_folder, DT_SUBFOLDERS.interco_capas)
+        hydro_folder = os.path.join(self.data_folder, DT_SUBFOLDERS.hydro)
 
         self.demand = {}
         self.net_demand = {}
@@ -443,27 +448,30 @@ class Dataset:
         # TODO: merge/loop (how to for assignment depending on hydro datatype?)
         if DATATYPE_NAMES.hydro_ror in dts_tb_read:
             if subdt_selec is None or DATATYPE_NAMES.hydro_ror in subdt_selec:
-                self.hydro_ror_data \
-                    = get_hydro_data(hydro_dt=DATATYPE_NAMES.hydro_ror, folder=hydro_folder,
-                                     countries=uc_run_params.selected_countries,
-                                     climatic_year=uc_run_params.selected_climatic_year,
-                                     period=(uc_run_params.uc_period_start, uc_run_params.uc_period_end)
-                                     )
+                with trace_span(f'read {DATATYPE_NAMES.hydro_ror}'):
+                    self.hydro_ror_data \
+                        = get_hydro_data(hydro_dt=DATATYPE_NAMES.hydro_ror, folder=hydro_folder,
+                                         countries=uc_run_params.selected_countries,
+                                         climatic_year=uc_run_params.selected_climatic_year,
+                                         period=(uc_run_params.uc_period_start, uc_run_params.uc_period_end)
+                                         )
         if DATATYPE_NAMES.hydro_inflows in dts_tb_read:
-            self.hydro_inflows_data = (
-                get_hydro_data(hydro_dt=DATATYPE_NAMES.hydro_inflows, folder=hydro_folder,
-                               countries=uc_run_params.selected_countries,
-                               climatic_year=uc_run_params.selected_climatic_year,
-                               period=(uc_run_params.uc_period_start, uc_run_params.uc_period_end))
-            )
+            with trace_span(f'read {DATATYPE_NAMES.hydro_inflows}'):
+                self.hydro_inflows_data = (
+                    get_hydro_data(hydro_dt=DATATYPE_NAMES.hydro_inflows, folder=hydro_folder,
+                                   countries=uc_run_params.selected_countries,
+                                   climatic_year=uc_run_params.selected_climatic_year,
+                                   period=(uc_run_params.uc_period_start, uc_run_params.uc_period_end))
+                )
         # both extr levels data in same file -> get data once
         if DATATYPE_NAMES.hydro_levels_min in dts_tb_read or DATATYPE_NAMES.hydro_levels_max in dts_tb_read:
-            hydro_extr_levels_data = (
-                get_hydro_data(hydro_dt=DATATYPE_NAMES.hydro_levels_min, folder=hydro_folder,
-                               countries=uc_run_params.selected_countries,
-                               climatic_year=uc_run_params.selected_climatic_year,
-                               period=(uc_run_params.uc_period_start, uc_run_params.uc_period_end))
-            )
+            with trace_span(f'read {DATATYPE_NAMES.hydro_levels_min}/{DATATYPE_NAMES.hydro_levels_max}'):
+                hydro_extr_levels_data = (
+                    get_hydro_data(hydro_dt=DATATYPE_NAMES.hydro_levels_min, folder=hydro_folder,
+                                   countries=uc_run_params.selected_countries,
+                                   climatic_year=uc_run_params.selected_climatic_year,
+                                   period=(uc_run_params.uc_period_start, uc_run_params.uc_period_end))
+                )
             # from {country: df containing both min and max levels data} to two separate dictionaries
             self.hydro_reservoir_levels_min_data, self.hydro_reservoir_levels_max_data = (
                 separate_hydro_extr_levels_data(hydro_extr_levels_data=hydro_extr_levels_data)
@@ -476,10 +484,12 @@ class Dataset:
             current_suffix = f'{uc_run_params.selected_target_year}_{country}'  # common suffix to all ERAA data files
             if DATATYPE_NAMES.demand in dts_tb_read:
                 # get demand
-                current_df_demand = get_demand_data(folder=demand_folder, file_suffix=current_suffix,
-                                                    climatic_year=uc_run_params.selected_climatic_year,
-                                                    period=(uc_run_params.uc_period_start, uc_run_params.uc_period_end),
-                                                    is_stress_test=self.is_stress_test)
+                with trace_span(f'read {DATATYPE_NAMES.demand}', country=country):
+                    current_df_demand = get_demand_data(folder=demand_folder, file_suffix=current_suffix,
+                                                        climatic_year=uc_run_params.selected_climatic_year,
+                                                        period=(uc_run_params.uc_period_start,
+                                                                uc_run_params.uc_period_end),
+                                                        is_stress_test=self.is_stress_test)
                 # if demand selected add it to dataset
                 if DATATYPE_NAMES.demand in datatypes_selec:
                     self.demand[country] = current_df_demand
@@ -496,14 +506,16 @@ class Dataset:
                                                   subdt_selec=subdt_selec)
                 )
                 # get RES CF data for these prod. types
-                agg_cf_data_read = (
-                    get_res_capa_factors_data(folder=res_cf_folder, file_suffix=current_suffix,
-                                              climatic_year=uc_run_params.selected_climatic_year,
-                                              cf_agg_prod_types_tb_read=cf_agg_prod_types_tb_read,
-                                              aggreg_pt_cf_def=aggreg_prod_types_def[DATATYPE_NAMES.capa_factor],
-                                              period=(uc_run_params.uc_period_start, uc_run_params.uc_period_end),
-                                              is_stress_test=self.is_stress_test)
-                )
+                with trace_span(f'read {DATATYPE_NAMES.capa_factor}', country=country):
+                    agg_cf_data_read = (
+                        get_res_capa_factors_data(folder=res_cf_folder, file_suffix=current_suffix,
+                                                  climatic_year=uc_run_params.selected_climatic_year,
+                                                  cf_agg_prod_types_tb_read=cf_agg_prod_types_tb_read,
+                                                  aggreg_pt_cf_def=aggreg_prod_types_def[DATATYPE_NAMES.capa_factor],
+                                                  period=(uc_run_params.uc_period_start,
+                                                          uc_run_params.uc_period_end),
+                                                  is_stress_test=self.is_stress_test)
+                    )
 
                 if len(cf_agg_prod_types_tb_read) > 0 and agg_cf_data_read is None:
                     logging.warning(
@@ -519,13 +531,15 @@ class Dataset:
                                     f'accounted for: {capas_aggreg_pt_with_cf} -> replaced by values provided in arg, '
                                     f'for net demand calculation only')
                 # get ERAA capas for gen. assets
-                current_df_gen_capa = (
-                    get_installed_gen_capas_data(folder=gen_capas_folder, file_suffix=current_suffix,
-                                                 country=country,
-                                                 aggreg_pt_gen_capa_def=
-                                                 aggreg_prod_types_def[DATATYPE_NAMES.installed_capa],
-                                                 selected_agg_prod_types=uc_run_params.selected_prod_types[country])
-                )
+                with trace_span(f'read {DATATYPE_NAMES.installed_capa}', country=country):
+                    current_df_gen_capa = (
+                        get_installed_gen_capas_data(folder=gen_capas_folder, file_suffix=current_suffix,
+                                                     country=country,
+                                                     aggreg_pt_gen_capa_def=
+                                                     aggreg_prod_types_def[DATATYPE_NAMES.installed_capa],
+                                                     selected_agg_prod_types=
+                                                     uc_run_params.selected_prod_types[country])
+                    )
                 # add failure fictive one
                 if ProdTypeNames.failure in uc_run_params.selected_prod_types[country]:
                     current_df_gen_capa = (
@@ -557,10 +571,11 @@ class Dataset:
                                                       capas_aggreg_pt_with_cf=capas_aggreg_pt_with_cf)
 
         if DATATYPE_NAMES.interco_capa in datatypes_selec:
-            interco_capas = (
-                get_interco_capas_data(folder=interco_capas_folder, countries=uc_run_params.selected_countries,
-                                       year=uc_run_params.selected_target_year)
-            )
+            with trace_span(f'read {DATATYPE_NAMES.interco_capa}'):
+                interco_capas = (
+                    get_interco_capas_data(folder=interco_capas_folder, countries=uc_run_params.selected_countries,
+                                           year=uc_run_params.selected_target_year)
+                )
             # add interco capas values set by user
             if interco_capas is not None:
                 interco_capas |= uc_run_params.interco_capas_tb_overwritten
@@ -702,6 +717,26 @@ class Dataset:
         logging.info(f'Set committable PyPSA parameter to False, i.e. run without dynamic constraints; '
                      f'modified values (True -> False) for units: {per_country_modif_values}')
 
+    def set_storage_soc_init(self, soc_init: Dict[str, float]):
+        """
+        Set storage units non-cyclic, with initial State-of-Charge from soc_init - e.g. final SoC of previous period
+        when chaining runs over successive periods
+        :param soc_init: {unit name: initial SoC (MWh)}; default initial SoC kept for units not in it
+        """
+        n_storage_units, n_soc_set = 0, 0
+        for units_data in self.generation_units_data.values():
+            for unit_data in units_data:
+                # storage units identified via the presence of max_hours param
+                if unit_data.max_hours is None:
+                    continue
+                n_storage_units += 1
+                unit_data.cyclic_state_of_charge = False
+                if unit_data.name in soc_init:
+                    unit_data.state_of_charge_initial = soc_init[unit_data.name]
+                    n_soc_set += 1
+        logging.info(f'Set {n_storage_units} storage units non-cyclic, with initial SoC provided for {n_soc_set} '
+                     f'of them')
+
     def control_min_pypsa_params_per_gen_units(self, pypsa_min_unit_params_per_agg_pt: Dict[str, List[str]]):
         """
         Control that minimal PyPSA parameter infos has been provided before creating generation units
@@ -380,8 +380,9 @@ class DataAnalysis:
                                               per_dim_plot_params=per_dim_plot_params,
                                               extra_params_labels=extra_params_labels,
                                               dt_suffix_for_output=dt_suffix_for_output)
-        elif self.analysis_type in [ANALYSIS_TYPES.extract, ANALYSIS_TYPES.extract_to_mat]:
-            # TODO[debug]: to_matrix_format not an arg of this method..., complem_columns missing...
-            to_matrix = True if self.analysis_type == ANALYSIS_TYPES.extract_to_mat else False
+        elif self.analysis_type == ANALYSIS_TYPES.extract_to_mat:
+            uc_timeseries.to_matrix_csv(output_dir=OUTPUT_DATA_ANALYSIS_FOLDER, extra_params_labels=extra_params_labels,
+                                        dt_suffix_for_output=dt_suffix_for_output)
+        elif self.analysis_type == ANALYSIS_TYPES.extract:
             uc_timeseries.to_csv(output_dir=OUTPUT_DATA_ANALYSIS_FOLDER, extra_params_labels=extra_params_labels,
                                  dt_suffix_for_output=dt_suffix_for_output)
@@ -1,4 +1,6 @@
+import json
 import os
+import tempfile
 import warnings
 from itertools import product
 from pathlib import Path
@@ -7,71 +9,41 @@ import pandas as pd
 import numpy as np
 import logging
 from typing import Dict, List, Tuple, Optional, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import pypsa
-import matplotlib.pyplot as plt
+import xarray as xr
+from pypsa.descriptors import get_bounds_pu, get_switchable_as_dense
 from copy import deepcopy
 
 from common.constants.countries import set_country_trigram
-from common.constants.optimisation import OptimSolvers, DEFAULT_OPTIM_SOLVER_PARAMS, SolverParams
+from common.constants.optimisation import OptimSolvers, DEFAULT_OPTIM_SOLVER_PARAMS, SolverParams, \
+    OPTIM_RESOL_STATUS, SolverIOApis
+from common.constants.output_params import OutputParams
 from common.constants.pypsa_params import GEN_UNITS_PYPSA_PARAMS
 from common.error_msgs import print_errors_list
 from common.fuel_sources import FuelSource
 from common.long_term_uc_io import (get_marginal_prices_file, get_network_figure, get_opt_power_file,
                                     get_storage_opt_dec_file, get_link_flow_opt_dec_file, get_figure_file_named, 
-                                    FigNamesPrefix, get_output_figure, get_uc_summary_file)
+                                    FigNamesPrefix, get_output_figure, get_uc_summary_file, get_columnar_output_file,
+                                    get_columnar_schema_file, get_duration_curve_stats_file, get_solver_stats_file,
+                                    UC_OUTPUT_TABLES)
 from common.plot_params import PlotParams
-from include.uc_summary_metrics import UCSummaryMetrics
+from include.duration_curves import set_duration_curves_from_df
+from include.generation_unit_data import (GEN_UNITS_DATA_TYPE, UNIT_NAME_SEP, GenerationUnitData,
+                                          check_gen_unit_params, get_prod_type_from_unit_name, set_gen_unit_name)
+from include.uc_summary_metrics import (FAILURE_UNIT_SUFFIX, GEN_UNITS_INDEX_COLS, UCSummaryMetrics,
+                                        calc_uc_summary_metrics, set_gen_units_index)
+from utils.columnar_io import (cast_to_float32_if_lossless, downcast_int_cols, update_columnar_schema,
+                               write_columnar_file)
 from utils.basic_utils import lexico_compar_str, rm_elts_with_none_val, rm_elts_in_str, sort_lexicographically, format_with_spaces
 from utils.df_utils import rename_df_columns, sort_out_cols_with_zero_values
 from utils.dir_utils import make_dir
-from utils.pypsa_utils import get_network_obj_value
-from utils.serializer import array_serializer
+from utils.plot import CurveStyleAttrs, FigureStyle, downsample_df_for_plot
+from utils.pypsa_utils import get_network_obj_value, set_constraint_rhs
+from utils.run_trace import add_span_attrs, trace_span
+from utils.solver_stats import get_solver_presolved_size, get_solver_run_stats
 
 
-@dataclass
-class GenerationUnitData:
-    name: str
-    type: str
-    carrier: str = None
-    p_nom: Union[float, np.ndarray] = None
-    p_min_pu: Union[float, np.ndarray] = None
-    p_max_pu: Union[float, np.ndarray] = None
-    efficiency: float = None
-    efficiency_store: float = None
-    efficiency_dispatch: float = None
-    marginal_cost: float = None
-    committable: bool = False
-    max_hours: float = None
-    cyclic_state_of_charge: bool = None
-    inflow: np.ndarray = None
-    state_of_charge_initial: float = None
-
-    def get_non_none_attr_names(self):
-        return [key for key, val in self.__dict__.items() if val is not None]
-
-    def serialize(self) -> dict:
-        unit_data_dict = self.__dict__
-        # (1d) nd array to list
-        unit_data_dict = {key: array_serializer(my_array=val, stat_repres=True) if isinstance(val, np.ndarray) else val
-                          for key, val in unit_data_dict.items()}
-        return unit_data_dict
-
-
-UNIT_NAME_SEP = '_'
-
-
-def get_prod_type_from_unit_name(prod_unit_name: str) -> str:
-    len_country_suffix = 3 + len(UNIT_NAME_SEP)
-    return prod_unit_name[len_country_suffix:]
-
-
-def set_gen_unit_name(country: str, agg_prod_type: str) -> str:
-    country_trigram = set_country_trigram(country=country)
-    return f'{country_trigram}{UNIT_NAME_SEP}{agg_prod_type}'
-
-
-GEN_UNITS_DATA_TYPE = Dict[str, List[GenerationUnitData]]
 PYPSA_RESULT_TYPE = Tuple[str, str]
 
 
@@ -83,24 +55,16 @@ def set_col_order_for_plot(df: pd.DataFrame, cols_ordered: List[str]) -> pd.Data
 
 
 def set_full_coll_for_storage_df(df: pd.DataFrame, col_suffix: str) -> pd.DataFrame:
-    old_cols = list(df.columns)
-    new_cols = {col: f'{col}_{col_suffix}' for col in old_cols}
-    df = rename_df_columns(df=df, old_to_new_cols=new_cols)
-    return df
+    # N.B. on a copy of the columns, not to modify the (optimal decision) df provided - e.g. saved multiple times
+    return df.set_axis([f'{col}_{col_suffix}' for col in df.columns], axis=1)
 
 
 OUTPUT_DATE_COL = 'date'
-
-
-def check_gen_unit_params(params: dict, n_ts: int) -> bool:
-    # check that max and min power pu are either constant or of the length of considered horizon
-    for param_name in [GEN_UNITS_PYPSA_PARAMS.min_power_pu, GEN_UNITS_PYPSA_PARAMS.max_power_pu]:
-        if param_name in params:
-            param_value = params[param_name]
-            if isinstance(param_value, list) or isinstance(param_value, np.ndarray):
-                if not len(param_value) == n_ts:
-                    return False
-    return True
+# default initial State-of-Charge of storage units, as a share of their energy capacity
+DEFAULT_SOC_INIT_SHARE = 0.8
+# PypsaModel attributes containing optimal decisions/dual variables (dfs) - e.g. to be stored in/loaded from a cache
+OPT_RESULT_ATTRS = ['prod_var_opt', 'sde_dual_var_opt', 'storage_prod_var_opt', 'storage_cons_var_opt',
+                    'storage_soc_opt', 'link_flow_var_opt_direct', 'link_flow_var_opt_reverse']
 
 
 def set_per_bus_asset_msg(asset_names: List[str]):
@@ -145,6 +109,25 @@ def set_per_origin_bus_links_msg(link_names: List[str]) -> str:
     return links_msg
 
 
+def add_storage_final_soc_min_constraint(network: pypsa.Network, snapshots: pd.Index):
+    """
+    Extra functionality of PyPSA optimisation: final SoC of non-cyclic storage units at least their initial one -
+    capped to their energy capacity
+    """
+    storage_units = network.storage_units
+    noncyclic_units = storage_units[~storage_units['cyclic_state_of_charge'].astype(bool)]
+    if len(noncyclic_units) == 0:
+        return
+    final_soc_min = np.minimum(noncyclic_units[GEN_UNITS_PYPSA_PARAMS.soc_init],
+                               noncyclic_units[GEN_UNITS_PYPSA_PARAMS.nominal_power]
+                               * noncyclic_units[GEN_UNITS_PYPSA_PARAMS.max_hours])
+    final_soc = network.model.variables['StorageUnit-state_of_charge'].sel(snapshot=snapshots[-1],
+                                                                           StorageUnit=noncyclic_units.index)
+    network.model.add_constraints(final_soc >= xr.DataArray(final_soc_min.values,
+                                                            coords={'StorageUnit': noncyclic_units.index}),
+                                  name='StorageUnit-final_soc_min')
+
+
 @dataclass
 class PypsaModel:
     # TODO: json dump to have an aggreg. view of such a model in saved files (and check stress test effect rapidly)
@@ -158,7 +141,13 @@ class PypsaModel:
     link_flow_var_opt_direct: pd.DataFrame = None  # flow in the links at optimum, direct direction
     link_flow_var_opt_reverse: pd.DataFrame = None  # reverse direction
     uc_summary_metrics: UCSummaryMetrics = None  # UC summary metrics (ENS, nber of failure hours, costs...)
+    solver_stats: dict = None  # run statistics of the solver (problem sizes, iterations, time...), if available
+    gen_units_index: pd.DataFrame = None  # unit -> bus/marginal cost/CO2 emissions, for summary metrics
     optim_solver_params: SolverParams = None
+    basis_file: str = None  # optimal basis of last resolution, to warm-start re-solves
+    # final SoC of non-cyclic storage units at least their initial one - e.g. for chained periods not to drain
+    # storages at the end of each of them
+    storage_final_soc_min: bool = False
     DEFAULT_CARRIER = 'ac'
 
     def init_pypsa_network(self, date_idx: pd.Index, date_range: pd.DatetimeIndex = None):
@@ -214,7 +203,7 @@ class PypsaModel:
                         # initial SoC fixed to 80% statically here
                         logging.info(f'Default value set for {pypsa_gen_unit_dict[GEN_UNITS_PYPSA_PARAMS.name]} init. SOC as 80% of energy storage capa.')
                         init_soc = (pypsa_gen_unit_dict[GEN_UNITS_PYPSA_PARAMS.power_capa]
-                                    * pypsa_gen_unit_dict[GEN_UNITS_PYPSA_PARAMS.max_hours] * 0.8)
+                                    * pypsa_gen_unit_dict[GEN_UNITS_PYPSA_PARAMS.max_hours] * DEFAULT_SOC_INIT_SHARE)
                         pypsa_gen_unit_dict[GEN_UNITS_PYPSA_PARAMS.soc_init] = init_soc
                     self.network.add('StorageUnit', bus=f'{country_bus_name}', **pypsa_gen_unit_dict)
                 else:
@@ -244,52 +233,10 @@ class PypsaModel:
             carrier_name = self.DEFAULT_CARRIER
 
         logging.info(f'Add interco. links - between the selected countries: {countries}')
-        links = []
-        symmetric_links = []
-        links_wo_capa_msg = []
-        for country_origin, country_dest in product(countries, countries):
-            link_tuple = (country_origin, country_dest)
-            # do not add link for (country, country); neither for symmetric links already treated 
-            # (as bidirectional setting p_min_pu=-1)
-            if not country_origin == country_dest and link_tuple not in symmetric_links:
-                # TODO: fix AC/DC.... all AC here in names but not true (cf. CS students data)
-                current_interco_capa, is_sym_interco = \
-                    get_current_interco_capa(interco_capas=interco_capas, country_origin=country_origin,
-                                             country_dest=country_dest)
-                if current_interco_capa is None:
-                    # if symmetrical interco order lexicographically to fit with input data format
-                    if is_sym_interco:
-                        link_wo_capa = lexico_compar_str(string1=country_origin,
-                                                         string2=country_dest, return_tuple=True)
-                    else:
-                        link_wo_capa = link_tuple
-                    link_wo_capa_msg = f'({link_wo_capa[0]}, {link_wo_capa[1]})'
-                    if link_wo_capa_msg not in links_wo_capa_msg:
-                        links_wo_capa_msg.append(f'({link_wo_capa[0]}, {link_wo_capa[1]})')
-                else:
-                    country_origin_bus_name = get_country_bus_name(country=country_origin)
-                    country_dest_bus_name = get_country_bus_name(country=country_dest)
-                    if is_sym_interco:
-                        p_min_pu, p_max_pu = -1, 1
-                        symmetric_links.append(link_tuple)
-                    else:
-                        p_min_pu, p_max_pu = 0, 1
-                    links.append({GEN_UNITS_PYPSA_PARAMS.name:
-                                      f'{country_origin_bus_name}-{country_dest_bus_name}_{carrier_name}',
-                                  f'{GEN_UNITS_PYPSA_PARAMS.bus}0': country_origin_bus_name,
-                                  f'{GEN_UNITS_PYPSA_PARAMS.bus}1': country_dest_bus_name,
-                                  GEN_UNITS_PYPSA_PARAMS.nominal_power: current_interco_capa,
-                                  GEN_UNITS_PYPSA_PARAMS.min_power_pu: p_min_pu,
-                                  GEN_UNITS_PYPSA_PARAMS.max_power_pu: p_max_pu,
-                                  GEN_UNITS_PYPSA_PARAMS.carrier: carrier_name}
-                                 )
-        if len(links_wo_capa_msg) > 0:
-            print_errors_list(error_name='-> interco. links without capacity data', errors_list=links_wo_capa_msg)
-
+        links = set_interco_links_data(countries=countries, interco_capas=interco_capas, carrier_name=carrier_name)
         # add to PyPSA network
         for link in links:
-            if link[GEN_UNITS_PYPSA_PARAMS.power_capa] > 0:
-                self.network.add('Link', **link)
+            self.network.add('Link', **link)
         link_names = self.get_link_names()
         logging.info(f'Considered links - the ones with nonzero capacity ({len(link_names)}), in alphabetic order '
                      f'of origin: {set_per_origin_bus_links_msg(link_names=link_names)}')
@@ -317,6 +264,7 @@ class PypsaModel:
         return link_names
 
     def plot_network(self, toy_model_output: bool = False, country: str = None):
+        import matplotlib.pyplot as plt  # at first use, not to be paid when importing this module
         # catch DeprecationWarnings TODO: fix/more robust way to catch them?
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
@@ -355,21 +303,219 @@ class PypsaModel:
                         self.set_default_optim_solver(warning_msg=warning_msg)
                     else:
                         os.environ[f'{self.optim_solver_params.name.upper()}_LICENSE_FILE'] = solver_license_file
+            # check way the model is passed to the solver; otherwise set default (file-based) one
+            all_io_apis = SolverIOApis.__dict__.values()
+            solver_io_api = self.optim_solver_params.io_api
+            if solver_io_api is not None and solver_io_api not in all_io_apis:
+                logging.warning(f'Solver IO API {solver_io_api} not in allowed list {all_io_apis} '
+                                f'-> default (file-based) one will be used instead')
+                # N.B. copy, not to modify the params of the caller - possibly shared with other runs
+                self.optim_solver_params = replace(self.optim_solver_params, io_api=None)
+
+    def get_solve_kwargs(self) -> dict:
+        """
+        Get keyword args. to be passed to linopy solve - in addition to solver name
+        """
+        solve_kwargs = {}
+        if self.optim_solver_params.io_api is not None:
+            solve_kwargs['io_api'] = self.optim_solver_params.io_api
+        return solve_kwargs
 
     def optimize_network(self, year: int, n_countries: int, period_start: datetime, save_lp_file: bool = True,
-                         toy_model_output: bool = False, countries: List[str] = None) -> PYPSA_RESULT_TYPE:
+                         toy_model_output: bool = False, countries: List[str] = None,
+                         save_basis: bool = False) -> PYPSA_RESULT_TYPE:
         """
         Solve the optimization UC problem associated to current network
+        :param save_basis: save optimal basis (in a temporary file), to warm-start later re-solves of this model
+        - see resolve_with_capacity_changes; file to be deleted with delete_basis_file when done
         :returns a tuple (xxx, status of resolution)
         """
         logging.info('Optimise "network" - i.e. solve associated UC problem')
-        result = self.network.optimize(solver_name=self.optim_solver_params.name)
+        solve_kwargs = self.get_solve_kwargs()
+        if save_basis:
+            self.delete_basis_file()
+            basis_fd, self.basis_file = tempfile.mkstemp(prefix='uc_basis_', suffix='.bas')
+            os.close(basis_fd)
+            solve_kwargs['basis_fn'] = self.basis_file
+        if self.storage_final_soc_min:
+            solve_kwargs['extra_functionality'] = add_storage_final_soc_min_constraint
+        # N.B. PyPSA builds the (linopy) LP model and solves it in the same call -> a unique span
+        with trace_span('LP build and solver', solver=self.optim_solver_params.name) as solver_span:
+            result = self.network.optimize(solver_name=self.optim_solver_params.name, **solve_kwargs)
+            linopy_model = self.network.model
+            add_span_attrs(n_variables=linopy_model.nvars, n_constraints=linopy_model.ncons)
+            # N.B. solver model only kept by linopy with direct IO API
+            solver_model = getattr(linopy_model, 'solver_model', None)
+            self.solver_stats = get_solver_run_stats(solver_model=solver_model)
+        if self.solver_stats is not None:
+            # N.B. out of solver span, presolve being run again to get the size of the presolved problem
+            self.solver_stats |= get_solver_presolved_size(solver_model=solver_model)
+            if solver_span is not None:
+                solver_span.attrs.update(self.solver_stats)
         logging.info(f'Obtained result: {result}')
+        if self.solver_stats is not None:
+            logging.info(f'Solver run statistics: {self.solver_stats}')
         if save_lp_file:
             save_lp_model(self.network, year=year, n_countries=n_countries, period_start=period_start,
                           toy_model_output=toy_model_output, countries=countries)
         return result
 
+    def delete_basis_file(self):
+        """
+        Delete the temporary file of the optimal basis saved at last resolution - to be called when this model is not
+        re-solved anymore
+        """
+        if self.basis_file is not None and os.path.isfile(self.basis_file):
+            os.remove(self.basis_file)
+        self.basis_file = None
+
+    def update_nominal_powers_in_model(self, component: str, new_p_noms: Dict[str, float]):
+        """
+        Update nominal power of some assets of a given component, both in the network and - in place - in the
+        bounds of the already built (linopy) model
+        :param component: 'Generator', 'StorageUnit' or 'Link'
+        :param new_p_noms: {asset name: new p_nom}
+        """
+        linopy_model = self.network.model
+        static_df = self.network.static(component)
+        asset_names = pd.Index(list(new_p_noms))
+        if component == 'StorageUnit':
+            # initial SoC of non-cyclic storages kept at the same share of their energy capacity. N.B. it appears
+            # in the rhs of the energy balance constraint, at first snapshot
+            soc_init_name = GEN_UNITS_PYPSA_PARAMS.soc_init
+            noncyclic_names = [name for name in asset_names if not static_df.at[name, 'cyclic_state_of_charge']
+                               and static_df.at[name, GEN_UNITS_PYPSA_PARAMS.nominal_power] > 0]
+            energy_balance_rhs = {}
+            for name in noncyclic_names:
+                old_soc_init = static_df.at[name, soc_init_name]
+                new_soc_init = (old_soc_init * new_p_noms[name]
+                                / static_df.at[name, GEN_UNITS_PYPSA_PARAMS.nominal_power])
+                static_df.at[name, soc_init_name] = new_soc_init
+                current_rhs = linopy_model.constraints['StorageUnit-energy_balance'].rhs.sel(StorageUnit=name)
+                energy_balance_rhs[name] = current_rhs.values.copy()
+                energy_balance_rhs[name][0] -= new_soc_init - old_soc_init
+            if len(energy_balance_rhs) > 0:
+                set_constraint_rhs(linopy_model=linopy_model, cstr_name='StorageUnit-energy_balance',
+                                   per_asset_rhs=energy_balance_rhs)
+        static_df.loc[asset_names, GEN_UNITS_PYPSA_PARAMS.nominal_power] = pd.Series(new_p_noms)
+        self.update_dispatch_bounds_in_model(component=component, asset_names=asset_names)
+
+    def update_dispatch_bounds_in_model(self, component: str, asset_names: pd.Index):
+        """
+        Set - in place - the bounds of the dispatch variables of some assets in the already built (linopy) model,
+        from their current nominal power and per unit bounds in the network
+        :param component: 'Generator', 'StorageUnit' or 'Link'
+        :param asset_names: of this component
+        """
+        linopy_model = self.network.model
+        snapshots = self.network.snapshots
+        bounded_vars = ['p_dispatch', 'p_store', 'state_of_charge'] if component == 'StorageUnit' else ['p']
+        p_noms = self.network.static(component).loc[asset_names, GEN_UNITS_PYPSA_PARAMS.nominal_power]
+        for var_name in bounded_vars:
+            min_pu, max_pu = get_bounds_pu(self.network, component, snapshots, index=asset_names, attr=var_name)
+            set_constraint_rhs(linopy_model=linopy_model, cstr_name=f'{component}-fix-{var_name}-lower',
+                               per_asset_rhs={name: min_pu[name].values * p_noms[name] for name in asset_names})
+            set_constraint_rhs(linopy_model=linopy_model, cstr_name=f'{component}-fix-{var_name}-upper',
+                               per_asset_rhs={name: max_pu[name].values * p_noms[name] for name in asset_names})
+
+    def set_per_unit_bounds_in_model(self, component: str, p_min_pu: pd.DataFrame, p_max_pu: pd.DataFrame):
+        """
+        Set time-varying per unit bounds of some assets, both in the network and - in place - in the already built
+        (linopy) model
+        :param component: 'Generator', 'StorageUnit' or 'Link'
+        :param p_min_pu: (snapshot, asset name) new p_min_pu values
+        :param p_max_pu: idem for p_max_pu, with the same assets
+        """
+        dynamic_data = self.network.dynamic(component)
+        for attr_name, values in [('p_min_pu', p_min_pu), ('p_max_pu', p_max_pu)]:
+            dynamic_data[attr_name] = pd.concat([dynamic_data[attr_name].drop(columns=values.columns, errors='ignore'),
+                                                 values], axis=1)
+        self.update_dispatch_bounds_in_model(component=component, asset_names=p_max_pu.columns)
+
+    def set_loads_in_model(self, p_set: pd.DataFrame):
+        """
+        Set demand of some loads, both in the network and - in place - in the rhs of the nodal balance constraints
+        of the already built (linopy) model
+        :param p_set: (snapshot, load name) new p_set values
+        """
+        network = self.network
+        loads_p_set = network.loads_t.p_set
+        network.loads_t.p_set = pd.concat([loads_p_set.drop(columns=p_set.columns, errors='ignore'), p_set], axis=1)
+        # N.B. same rhs as in PyPSA (sign -1 for loads)
+        per_bus_rhs = ((-get_switchable_as_dense(network, 'Load', 'p_set', network.snapshots) * network.loads.sign)
+                       .T.groupby(network.loads.bus).sum().T)
+        buses = network.loads.loc[p_set.columns, GEN_UNITS_PYPSA_PARAMS.bus].unique()
+        set_constraint_rhs(linopy_model=network.model, cstr_name='Bus-nodal_balance',
+                           per_asset_rhs={bus: per_bus_rhs[bus].values for bus in buses})
+
+    def resolve_with_capacity_changes(self, failure_penalty: float, capacity_changes: Dict[str, float] = None,
+                                      link_capacity_changes: Dict[str, float] = None) -> Optional[UCSummaryMetrics]:
+        """
+        Apply capacity changes to the already solved model - in place, without rebuilding it - and re-solve it,
+        warm-started from previous optimal basis if it has been saved (see save_basis in optimize_network)
+        :param failure_penalty: used to calculate operational cost in UC summary metrics
+        :param capacity_changes: {generator/storage unit name, e.g. 'fra_nuclear': new p_nom}
+        :param link_capacity_changes: {link name, e.g. 'fra-ger_ac': new p_nom}. N.B. only links with nonzero
+        capacity in the initial network can be modified
+        :returns the updated UC summary metrics; None if the re-solve is not optimal
+        """
+        if not self.network.is_solved:
+            raise Exception(f'Network {self.name} must be optimized before being re-solved with capacity '
+                            f'changes -> STOP')
+        if capacity_changes is None:
+            capacity_changes = {}
+        if link_capacity_changes is None:
+            link_capacity_changes = {}
+        generator_names = self.get_generator_names()
+        storage_unit_names = self.get_storage_unit_names()
+        link_names = list(self.network.links.index)
+        per_component_changes = {
+            'Generator': {name: val for name, val in capacity_changes.items() if name in generator_names},
+            'StorageUnit': {name: val for name, val in capacity_changes.items() if name in storage_unit_names},
+            'Link': {name: val for name, val in link_capacity_changes.items() if name in link_names}
+        }
+        unknown_assets = [name for name in capacity_changes
+                          if name not in generator_names and name not in storage_unit_names]
+        unknown_assets.extend([name for name in link_capacity_changes if name not in link_names])
+        if len(unknown_assets) > 0:
+            print_errors_list(error_name=f'-> unknown assets in capacity changes for network {self.name}',
+                              errors_list=unknown_assets)
+
+        logging.info(f'Apply capacity changes in place: {capacity_changes | link_capacity_changes}')
+        for component, new_p_noms in per_component_changes.items():
+            if len(new_p_noms) > 0:
+                self.update_nominal_powers_in_model(component=component, new_p_noms=new_p_noms)
+        return self.resolve(failure_penalty=failure_penalty)
+
+    def resolve(self, failure_penalty: float) -> Optional[UCSummaryMetrics]:
+        """
+        Re-solve the already built (linopy) model - e.g. after in place changes -, warm-started from previous optimal
+        basis if it has been saved (see save_basis in optimize_network)
+        :param failure_penalty: used to calculate operational cost in UC summary metrics
+        :returns the updated UC summary metrics; None if the re-solve is not optimal
+        """
+        solve_kwargs = self.get_solve_kwargs()
+        if self.basis_file is not None and os.path.isfile(self.basis_file):
+            logging.info(f'Re-solve UC problem, warm-started from previous optimal basis {self.basis_file}')
+            solve_kwargs['warmstart_fn'] = self.basis_file
+            solve_kwargs['basis_fn'] = self.basis_file
+        else:
+            logging.warning('No optimal basis saved at previous resolution (see save_basis in optimize_network) '
+                            '-> re-solve from scratch')
+        result = self.network.optimize.solve_model(solver_name=self.optim_solver_params.name, **solve_kwargs)
+        logging.info(f'Obtained result: {result}')
+        if not result[1] == OPTIM_RESOL_STATUS.optimal:
+            logging.warning(f'Optimisation resolution status is not {OPTIM_RESOL_STATUS.optimal} after model '
+                            f'changes -> None UCSummaryMetrics returned')
+            return None
+        objective_value = self.get_opt_value(pypsa_resol_status=result[1])
+        self.get_prod_var_opt()
+        self.get_storage_vars_opt()
+        self.get_link_flow_vars_opt()
+        self.get_sde_dual_var_opt()
+        self.set_uc_summary_metrics(total_cost=objective_value, failure_penalty=failure_penalty)
+        return self.uc_summary_metrics
+
     def get_prod_var_opt(self):
         self.prod_var_opt = self.network.generators_t.p
 
@@ -406,6 +552,31 @@ class PypsaModel:
         # Retrieve the dual value (shadow price)
         # dual_value = linopy_model.dual[con_obj]
 
+    def get_opt_results(self) -> Dict[str, pd.DataFrame]:
+        """
+        Get optimal decisions/dual variables dfs, after they have been obtained from the solved network
+        """
+        return {attr_name: getattr(self, attr_name) for attr_name in OPT_RESULT_ATTRS}
+
+    def set_opt_results(self, opt_results: Dict[str, pd.DataFrame]):
+        """
+        Set optimal decisions/dual variables dfs without solving the network, e.g. from previously stored results
+        """
+        for attr_name in OPT_RESULT_ATTRS:
+            setattr(self, attr_name, opt_results[attr_name])
+
+    def get_results_copy(self) -> 'PypsaModel':
+        """
+        Copy of optimal results and UC summary metrics, without the network -> light and picklable object, e.g.
+        for output tasks run in background while this model is further used/modified
+        """
+        results_copy = PypsaModel(name=self.name)
+        results_copy.set_opt_results(opt_results={attr_name: df.copy() if df is not None else None
+                                                  for attr_name, df in self.get_opt_results().items()})
+        results_copy.uc_summary_metrics = deepcopy(self.uc_summary_metrics)
+        results_copy.solver_stats = deepcopy(self.solver_stats)
+        return results_copy
+
     def get_opt_value(self, pypsa_resol_status: str) -> float:
         objective_value = get_network_obj_value(network=self.network)
         objective_value_refmted = format_with_spaces(number=int(objective_value/1e6))
@@ -414,61 +585,48 @@ class PypsaModel:
             f'{objective_value_refmted} (M€) -> output data (resp. figures) can be generated')
         return objective_value
 
+    def set_gen_units_index(self):
+        """
+        Unit -> bus/marginal cost/CO2 emissions index, built once after the solve
+        """
+        generators = self.network.generators
+        self.gen_units_index = set_gen_units_index(
+            buses=generators.bus, marginal_costs=generators.marginal_cost,
+            co2_emissions=generators.carrier.map(self.network.carriers.co2_emissions)
+        )
+
+    def get_per_unit_weighted_prod(self) -> pd.Series:
+        if self.gen_units_index is None:
+            self.set_gen_units_index()
+        return self.prod_var_opt.multiply(self.network.snapshot_weightings.generators, axis=0).sum()
+
     def calc_co2_emissions(self, per_country: bool = False) -> Union[float, Dict[str, float]]:
+        per_unit_co2_emissions = \
+            self.get_per_unit_weighted_prod() * self.gen_units_index[GEN_UNITS_INDEX_COLS.co2_emissions]
         if per_country:
-            countries = self.get_bus_names()
-            per_country_co2_emissions = {}
-            for country in countries:
-                current_prod_var_opt = self.get_prod_var_opt_given_bus(bus_name=country)
-                per_country_co2_emissions[country] = float(current_prod_var_opt.multiply(self.network.snapshot_weightings.generators, axis=0).multiply(self.network.generators.carrier.map(self.network.carriers.co2_emissions), axis=1).sum().sum())
-            return per_country_co2_emissions
-        return self.prod_var_opt.multiply(self.network.snapshot_weightings.generators, axis=0).multiply(self.network.generators.carrier.map(self.network.carriers.co2_emissions), axis=1).sum().sum()
+            return {country: float(val) for country, val in
+                    per_unit_co2_emissions.groupby(self.gen_units_index[GEN_UNITS_INDEX_COLS.bus]).sum().items()}
+        return float(per_unit_co2_emissions.sum())
 
     def calc_per_country_total_cost(self, is_operational_cost: bool = False) -> Dict[str, float]:
         """
         Calculate per-country (bus) total cost over the considered horizon: sum_t sum_{prod unit i} marginal cost(i) *prod(i,t)
         :param is_operational_cost: in this case do not integrate failure penalty cost in this calculation
         """
-        countries = self.get_bus_names()
-        per_country_total_cost = {}
-        for country in countries:
-            current_prod_var_opt = self.get_prod_var_opt_given_bus(bus_name=country)
-            if is_operational_cost:
-                # drop failure column from df TODO: set failure column name from constants (functions)
-                current_prod_var_opt = current_prod_var_opt.drop(f'{country}_failure', axis=1)
-            per_country_total_cost[country] = float(current_prod_var_opt.multiply(self.network.snapshot_weightings.generators, axis=0).multiply(self.network.generators.marginal_cost, axis=1).sum().sum())
-        return per_country_total_cost
-    
+        per_unit_cost = self.get_per_unit_weighted_prod() * self.gen_units_index[GEN_UNITS_INDEX_COLS.marginal_cost]
+        if is_operational_cost:
+            per_unit_cost = per_unit_cost.where(~self.gen_units_index[GEN_UNITS_INDEX_COLS.is_failure], 0)
+        return {country: float(val) for country, val in
+                per_unit_cost.groupby(self.gen_units_index[GEN_UNITS_INDEX_COLS.bus]).sum().items()}
+
     def set_uc_summary_metrics(self, total_cost: float, failure_penalty: float = None):
         logging.info('Set UC summary metrics')
-        failure_prod_cols = [col for col in self.prod_var_opt.columns if col.endswith('_failure')]
-        df_failure_opt = self.prod_var_opt[failure_prod_cols]
-        per_country_ens = {key: float(val) for key, val in dict(df_failure_opt.sum()).items()}
-        per_country_n_failure_h = {key: int(val) for key, val in dict((df_failure_opt > 0).sum(axis=0)).items()}
-        # remove '_failure' suffix from two previous dict. keys
-        per_country_ens = {key.split('_')[0]: val for key, val in per_country_ens.items()}
-        per_country_n_failure_h = {key.split('_')[0]: val for key, val in per_country_n_failure_h.items()} 
-        if failure_penalty is not None:
-            eur_failure_volume = sum(per_country_ens.values())
-            eur_total_ope_cost = total_cost - failure_penalty * eur_failure_volume
-        else:
-            eur_total_ope_cost = None
-        # co2 emissions
-        total_co2_emissions = self.calc_co2_emissions()
-        per_country_co2_emissions = self.calc_co2_emissions(per_country=True)
-        per_country_total_cost = self.calc_per_country_total_cost()
-        per_country_total_operational_cost = self.calc_per_country_total_cost(is_operational_cost=True)
-        # attention convert to GWh/M€ and int to get smaller values for synthesis. TODO: check CO2 emissions unit!
-        cost_conversion_factor = 1e-6
-        co2_emis_conversion_factor = 1e-3
-        self.uc_summary_metrics = UCSummaryMetrics(per_country_ens={c: int(val/1e3) for c, val in per_country_ens.items()}, 
-                                                   per_country_n_failure_hours=per_country_n_failure_h,
-                                                   total_cost=int(total_cost * cost_conversion_factor), 
-                                                   total_operational_cost=int(eur_total_ope_cost * cost_conversion_factor),
-                                                   total_co2_emissions=int(total_co2_emissions * co2_emis_conversion_factor),
-                                                   per_country_total_cost={c: int(val * cost_conversion_factor) for c, val in per_country_total_cost.items()},
-                                                   per_country_total_operational_cost={c: int(val * cost_conversion_factor) for c, val in per_country_total_operational_cost.items()},
-                                                   per_country_co2_emissions={c: int(val * co2_emis_conversion_factor) for c, val in per_country_co2_emissions.items()})
+        if self.gen_units_index is None:
+            self.set_gen_units_index()
+        self.uc_summary_metrics = \
+            calc_uc_summary_metrics(prod_var_opt=self.prod_var_opt, gen_units_index=self.gen_units_index,
+                                    total_cost=total_cost, failure_penalty=failure_penalty,
+                                    snapshot_weightings=self.network.snapshot_weightings.generators)
 
     def json_dump_uc_summary_metrics(self, year: int, climatic_year: int, start_horizon: datetime, 
                                      country: str = 'europe', toy_model_output: bool = False):
@@ -477,7 +635,16 @@ class PypsaModel:
                                         toy_model_output=toy_model_output)
         self.uc_summary_metrics.json_dump(file=json_file)
 
+    def json_dump_solver_stats(self, year: int, climatic_year: int, start_horizon: datetime,
+                               country: str = 'europe', toy_model_output: bool = False):
+        json_file = get_solver_stats_file(country=country, year=year, climatic_year=climatic_year,
+                                          start_horizon=start_horizon, toy_model_output=toy_model_output)
+        logging.info(f'Save solver run statistics to {json_file}')
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(self.solver_stats, f, indent=2)
+
     def plot_installed_capas(self, country: str, year: int, toy_model_output: bool = False):
+        import matplotlib.pyplot as plt
         country_trigram = set_country_trigram(country=country)
         # catch DeprecationWarnings TODO: fix/more robust way to catch them?
         with warnings.catch_warnings():
@@ -498,6 +665,7 @@ class PypsaModel:
         """ 
         Plot 'stack' of optimized production profiles
         """
+        import matplotlib.pyplot as plt
         # catch DeprecationWarnings TODO: fix/more robust way to catch them?
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
@@ -513,6 +681,8 @@ class PypsaModel:
                                                           cols_ordered=plot_params_agg_pt.order)
             if rm_all_zero_curves:
                 current_prod_var_opt = sort_out_cols_with_zero_values(df=current_prod_var_opt, abs_val_threshold=1e-2)
+            # same points for all prod. units, for stacking
+            current_prod_var_opt = downsample_df_for_plot(df=current_prod_var_opt)
             current_prod_var_opt.div(1e3).plot.area(subplots=False, ylabel='GW',
                                                     color=plot_params_agg_pt.per_case_color)
             plt.tight_layout()
@@ -555,6 +725,7 @@ class PypsaModel:
 
     def plot_failure_at_opt(self, country: str, year: int, climatic_year: int, start_horizon: datetime,
                             toy_model_output: bool = False):
+        import matplotlib.pyplot as plt
         # catch DeprecationWarnings TODO: fix/more robust way to catch them?
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
@@ -568,12 +739,15 @@ class PypsaModel:
 
     def plot_marginal_price(self, plot_params_zone: PlotParams, year: int, climatic_year: int, start_horizon: datetime,
                             country: str = 'europe', toy_model_output: bool = False):
+        import matplotlib.pyplot as plt
         # catch DeprecationWarnings TODO: fix/more robust way to catch them?
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
             sde_dual_var_opt_plot = set_col_order_for_plot(df=self.sde_dual_var_opt,
                                                            cols_ordered=plot_params_zone.order)
-            sde_dual_var_opt_plot.plot.line(figsize=(8, 3), ylabel='Euro per MWh',
+            fig_size = (8, 3)
+            sde_dual_var_opt_plot = downsample_df_for_plot(df=sde_dual_var_opt_plot, fig_width=fig_size[0])
+            sde_dual_var_opt_plot.plot.line(figsize=fig_size, ylabel='Euro per MWh',
                                             color=plot_params_zone.per_case_color)
             plt.tight_layout()
             plt.savefig(get_output_figure(fig_name=FigNamesPrefix.prices, country=country, year=year,
@@ -582,58 +756,74 @@ class PypsaModel:
                         )
             plt.close()
 
-    def save_opt_decisions_to_csv(self, year: int, climatic_year: int, start_horizon: datetime,
-                                  rename_snapshot_col: bool = True, toy_model_output: bool = False,
-                                  country: str = 'europe'):
-        # TODO: check if unique country and in this case (i) suppress country prefix in asset names
+    def get_opt_decisions_dfs(self, rename_snapshot_col: bool = True) -> Dict[str, pd.DataFrame]:
+        """
+        Get output tables of optimal decisions - for all but Storage assets, Storage assets and link flows
+        """
         # opt prod decisions for all but Storage assets
-        opt_p_csv_file = get_opt_power_file(country=country, year=year, climatic_year=climatic_year,
-                                            start_horizon=start_horizon, toy_model_output=toy_model_output)
-        logging.info(f'Save - all but Storage assets - optimal dispatch decisions to csv file {opt_p_csv_file}')
         df_prod_opt = self.prod_var_opt
         if rename_snapshot_col:
             df_prod_opt.index.name = OUTPUT_DATE_COL
         # cast to int to avoid useless numeric precisions and associated... issues!
         df_prod_opt = df_prod_opt.astype(int)
-        df_prod_opt.to_csv(opt_p_csv_file)
         # then storage assets decisions
-        storage_opt_dec_csv_file = \
-            get_storage_opt_dec_file(country=country, year=year, climatic_year=climatic_year,
-                                     start_horizon=start_horizon, toy_model_output=toy_model_output)
-        logging.info(f'Save Storage optimal decisions to csv file {storage_opt_dec_csv_file}')
         # join the 3 Storage result dfs
-        df_prod_opt = self.storage_prod_var_opt
+        df_storage_prod_opt = self.storage_prod_var_opt
         df_cons_opt = self.storage_cons_var_opt
         df_soc_opt = self.storage_soc_opt
         # rename first the different columns -> adding prod/cons/soc suffixes
-        df_prod_opt = set_full_coll_for_storage_df(df=df_prod_opt, col_suffix='prod')
+        df_storage_prod_opt = set_full_coll_for_storage_df(df=df_storage_prod_opt, col_suffix='prod')
         df_cons_opt = set_full_coll_for_storage_df(df=df_cons_opt, col_suffix='cons')
         df_soc_opt = set_full_coll_for_storage_df(df=df_soc_opt, col_suffix='soc')
-        df_storage_all_decs = df_prod_opt.join(df_cons_opt).join(df_soc_opt)
+        df_storage_all_decs = df_storage_prod_opt.join(df_cons_opt).join(df_soc_opt)
         if rename_snapshot_col:
             df_storage_all_decs.index.name = OUTPUT_DATE_COL
         # cast to int to avoid useless numeric precisions and associated... issues!
         df_storage_all_decs = df_storage_all_decs.astype(int)
-        df_storage_all_decs.to_csv(storage_opt_dec_csv_file)
         # and finally link flow decisions
-        link_flow_opt_dec_csv_file = \
-            get_link_flow_opt_dec_file(country=country, year=year, climatic_year=climatic_year,
-                                       start_horizon=start_horizon, toy_model_output=toy_model_output)
-        logging.info(f'Save link flow optimal decisions to csv file {link_flow_opt_dec_csv_file}')
         df_link_flow_opt_direct = self.link_flow_var_opt_direct
         df_link_flow_opt_reverse = self.link_flow_var_opt_reverse
-        # add reverse suffix to reverse flows
+        # add reverse suffix to reverse flows. N.B. on a copy of the columns, not to modify the attribute of this
+        # object (e.g., in case it is saved again or stored in cache)
         new_cols = []
         for flow_col in df_link_flow_opt_reverse.columns:
             flow_col_split = flow_col.split('_')
             new_cols.append(f'{flow_col_split[0]}-reverse_{flow_col_split[1]}')
-        df_link_flow_opt_reverse.columns = new_cols
+        df_link_flow_opt_reverse = df_link_flow_opt_reverse.set_axis(new_cols, axis=1)
         df_link_flow_opt = pd.concat([df_link_flow_opt_direct, df_link_flow_opt_reverse], axis=1) 
         if rename_snapshot_col:
             df_link_flow_opt.index.name = OUTPUT_DATE_COL
         # cast to int to avoid useless numeric precisions and associated... issues!
-        df_link_flow_opt = df_link_flow_opt.astype(int)        
-        df_link_flow_opt.to_csv(link_flow_opt_dec_csv_file)
+        df_link_flow_opt = df_link_flow_opt.astype(int)
+        return {UC_OUTPUT_TABLES.opt_power: df_prod_opt,
+                UC_OUTPUT_TABLES.storage_opt_decisions: df_storage_all_decs,
+                UC_OUTPUT_TABLES.link_flow_opt_decisions: df_link_flow_opt}
+
+    def get_marginal_prices_df(self, rename_snapshot_col: bool = True) -> pd.DataFrame:
+        df_sde_dual_var_opt = self.sde_dual_var_opt
+        if rename_snapshot_col:
+            df_sde_dual_var_opt.index.name = OUTPUT_DATE_COL
+        return df_sde_dual_var_opt
+
+    def save_opt_decisions_to_csv(self, year: int, climatic_year: int, start_horizon: datetime,
+                                  rename_snapshot_col: bool = True, toy_model_output: bool = False,
+                                  country: str = 'europe'):
+        # TODO: check if unique country and in this case (i) suppress country prefix in asset names
+        opt_decisions_dfs = self.get_opt_decisions_dfs(rename_snapshot_col=rename_snapshot_col)
+        opt_p_csv_file = get_opt_power_file(country=country, year=year, climatic_year=climatic_year,
+                                            start_horizon=start_horizon, toy_model_output=toy_model_output)
+        logging.info(f'Save - all but Storage assets - optimal dispatch decisions to csv file {opt_p_csv_file}')
+        opt_decisions_dfs[UC_OUTPUT_TABLES.opt_power].to_csv(opt_p_csv_file)
+        storage_opt_dec_csv_file = \
+            get_storage_opt_dec_file(country=country, year=year, climatic_year=climatic_year,
+                                     start_horizon=start_horizon, toy_model_output=toy_model_output)
+        logging.info(f'Save Storage optimal decisions to csv file {storage_opt_dec_csv_file}')
+        opt_decisions_dfs[UC_OUTPUT_TABLES.storage_opt_decisions].to_csv(storage_opt_dec_csv_file)
+        link_flow_opt_dec_csv_file = \
+            get_link_flow_opt_dec_file(country=country, year=year, climatic_year=climatic_year,
+                                       start_horizon=start_horizon, toy_model_output=toy_model_output)
+        logging.info(f'Save link flow optimal decisions to csv file {link_flow_opt_dec_csv_file}')
+        opt_decisions_dfs[UC_OUTPUT_TABLES.link_flow_opt_decisions].to_csv(link_flow_opt_dec_csv_file)
 
     def save_marginal_prices_to_csv(self, year: int, climatic_year: int, start_horizon: datetime,
                                     rename_snapshot_col: bool = True, toy_model_output: bool = False,
@@ -643,12 +833,60 @@ class PypsaModel:
                                                             climatic_year=climatic_year,
                                                             start_horizon=start_horizon,
                                                             toy_model_output=toy_model_output)
-        df_sde_dual_var_opt = self.sde_dual_var_opt
-        if rename_snapshot_col:
-            df_sde_dual_var_opt.index.name = OUTPUT_DATE_COL
         # do NOT cast this df, given that price values can be accurate at some decimals 
         # -> may be useful to observe the correspondence with (input) marginal cost values
-        df_sde_dual_var_opt.to_csv(marginal_prices_csv_file)
+        self.get_marginal_prices_df(rename_snapshot_col=rename_snapshot_col).to_csv(marginal_prices_csv_file)
+
+    def save_duration_curves(self, plot_params_zone: PlotParams, year: int, climatic_year: int,
+                             start_horizon: datetime, country: str = 'europe', toy_model_output: bool = False):
+        """
+        Per-zone duration curves of marginal prices and failure: characteristic points (peak, P95, number of
+        time-slots above failure power tolerance, etc.) saved to a .csv file - and figure of price ones
+        """
+        logging.info('Save marginal price and failure duration curves')
+        sde_dual_var_opt_plot = set_col_order_for_plot(df=self.sde_dual_var_opt, cols_ordered=plot_params_zone.order)
+        price_duration_curves = set_duration_curves_from_df(df=sde_dual_var_opt_plot)
+        failure_cols = [col for col in self.prod_var_opt.columns if col.endswith(FAILURE_UNIT_SUFFIX)]
+        all_stats = {'marginal_price': price_duration_curves.get_stats()}
+        if len(failure_cols) > 0:
+            all_stats['failure'] = set_duration_curves_from_df(df=self.prod_var_opt, cols=failure_cols).get_stats()
+        df_stats = pd.concat(all_stats, names=['quantity', 'case'])
+        df_stats.to_csv(get_duration_curve_stats_file(country=country, year=year, climatic_year=climatic_year,
+                                                      start_horizon=start_horizon, toy_model_output=toy_model_output))
+        fig_file = get_output_figure(fig_name=FigNamesPrefix.prices_duration_curves, country=country, year=year,
+                                     climatic_year=climatic_year, start_horizon=start_horizon,
+                                     toy_model_output=toy_model_output)
+        price_curve_colors = {col: CurveStyleAttrs(color=plot_params_zone.per_case_color[col])
+                              for col in price_duration_curves.case_keys if col in plot_params_zone.per_case_color}
+        fig_style = FigureStyle(size=(8, 4), legend_font_size=10)
+        fig_style.process()
+        price_duration_curves.plot(fig_file=fig_file, title='Marginal price duration curves', ylabel='Euro per MWh',
+                                   fig_style=fig_style, curve_style_attrs=price_curve_colors
+                                   if len(price_curve_colors) == len(price_duration_curves.case_keys) else None)
+
+    def save_results_to_columnar_files(self, year: int, climatic_year: int, start_horizon: datetime,
+                                       output_params: OutputParams, rename_snapshot_col: bool = True,
+                                       toy_model_output: bool = False, country: str = 'europe'):
+        """
+        Save optimal decisions and marginal prices - same tables as in csv files - to columnar (Parquet/Feather)
+        files, partitioned by (target) year, climatic year and period start; with a schema file describing them
+        """
+        output_tables = {table_name: downcast_int_cols(df=df) for table_name, df in
+                         self.get_opt_decisions_dfs(rename_snapshot_col=rename_snapshot_col).items()}
+        # prices in float32 only if lossless enough (cf. correspondence with input marginal cost values)
+        output_tables[UC_OUTPUT_TABLES.marginal_prices] = \
+            cast_to_float32_if_lossless(df=self.get_marginal_prices_df(rename_snapshot_col=rename_snapshot_col),
+                                        abs_tol=output_params.prices_float32_tol)
+        schema_file = get_columnar_schema_file(country=country, toy_model_output=toy_model_output)
+        for table_name, df in output_tables.items():
+            output_file = get_columnar_output_file(table_name=table_name, output_format=output_params.output_format,
+                                                   country=country, year=year, climatic_year=climatic_year,
+                                                   start_horizon=start_horizon, toy_model_output=toy_model_output)
+            logging.info(f'Save {table_name} table to {output_params.output_format} file {output_file}')
+            write_columnar_file(df=df, file=output_file, output_format=output_params.output_format,
+                                compression=output_params.compression)
+            update_columnar_schema(schema_file=schema_file, table_name=table_name, df=df,
+                                   output_format=output_params.output_format, compression=output_params.compression)
 
 
 # def overwrite_gen_units_fuel_src_params(generation_units_data: GEN_UNITS_DATA_TYPE, updated_fuel_sources_params: Dict[
@@ -700,6 +938,56 @@ def get_current_interco_capa(interco_capas: Dict[Tuple[str, str], float], countr
     return current_interco_capa, is_sym_interco
 
 
+def set_interco_links_data(countries: List[str], interco_capas: Dict[Tuple[str, str], float],
+                           carrier_name: str) -> List[dict]:
+    """
+    Set (PyPSA) parameters of the interco. links between the selected countries - only the ones with nonzero capacity
+    """
+    links = []
+    symmetric_links = []
+    links_wo_capa_msg = []
+    for country_origin, country_dest in product(countries, countries):
+        link_tuple = (country_origin, country_dest)
+        # do not add link for (country, country); neither for symmetric links already treated 
+        # (as bidirectional setting p_min_pu=-1)
+        if not country_origin == country_dest and link_tuple not in symmetric_links:
+            # TODO: fix AC/DC.... all AC here in names but not true (cf. CS students data)
+            current_interco_capa, is_sym_interco = \
+                get_current_interco_capa(interco_capas=interco_capas, country_origin=country_origin,
+                                         country_dest=country_dest)
+            if current_interco_capa is None:
+                # if symmetrical interco order lexicographically to fit with input data format
+                if is_sym_interco:
+                    link_wo_capa = lexico_compar_str(string1=country_origin,
+                                                     string2=country_dest, return_tuple=True)
+                else:
+                    link_wo_capa = link_tuple
+                link_wo_capa_msg = f'({link_wo_capa[0]}, {link_wo_capa[1]})'
+                if link_wo_capa_msg not in links_wo_capa_msg:
+                    links_wo_capa_msg.append(f'({link_wo_capa[0]}, {link_wo_capa[1]})')
+            else:
+                country_origin_bus_name = get_country_bus_name(country=country_origin)
+                country_dest_bus_name = get_country_bus_name(country=country_dest)
+                if is_sym_interco:
+                    p_min_pu, p_max_pu = -1, 1
+                    symmetric_links.append(link_tuple)
+                else:
+                    p_min_pu, p_max_pu = 0, 1
+                links.append({GEN_UNITS_PYPSA_PARAMS.name:
+                                  f'{country_origin_bus_name}-{country_dest_bus_name}_{carrier_name}',
+                              f'{GEN_UNITS_PYPSA_PARAMS.bus}0': country_origin_bus_name,
+                              f'{GEN_UNITS_PYPSA_PARAMS.bus}1': country_dest_bus_name,
+                              GEN_UNITS_PYPSA_PARAMS.nominal_power: current_interco_capa,
+                              GEN_UNITS_PYPSA_PARAMS.min_power_pu: p_min_pu,
+                              GEN_UNITS_PYPSA_PARAMS.max_power_pu: p_max_pu,
+                              GEN_UNITS_PYPSA_PARAMS.carrier: carrier_name}
+                             )
+    if len(links_wo_capa_msg) > 0:
+        print_errors_list(error_name='-> interco. links without capacity data', errors_list=links_wo_capa_msg)
+
+    return [link for link in links if link[GEN_UNITS_PYPSA_PARAMS.power_capa] > 0]
+
+
 def set_period_start_file(year: int, period_start: datetime) -> str:
     return datetime(year=year, month=period_start.month, day=period_start.day).strftime('%Y-%m-%d')
 
@@ -709,7 +997,8 @@ def save_lp_model(network: pypsa.Network, year: int, period_start: datetime, cou
     import pypsa.optimization as opt
     from common.long_term_uc_io import set_full_lt_uc_output_folder, OutputFolderNames
 
-    m = opt.create_model(network)
+    # if network already optimized, write the model that has been solved rather than building it again
+    m = network.model if network.is_solved else opt.create_model(network)
 
     # set prefix
     n_countries_max_in_prefix = 3
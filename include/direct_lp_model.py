@@ -0,0 +1,380 @@
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import highspy
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from common.constants.optimisation import OPTIM_RESOL_STATUS, OptimSolvers, SolverParams
+from common.constants.pypsa_params import GEN_UNITS_PYPSA_PARAMS
+from common.fuel_sources import FuelSource
+from include.dataset_builder import (DEFAULT_SOC_INIT_SHARE, OPT_RESULT_ATTRS, PYPSA_RESULT_TYPE, GenerationUnitData,
+                                     check_gen_unit_params, get_country_bus_name, set_interco_links_data)
+from include.uc_summary_metrics import UCSummaryMetrics, calc_uc_summary_metrics, set_gen_units_index
+from utils.basic_utils import format_with_spaces, rm_elts_with_none_val
+from utils.run_trace import add_span_attrs, trace_span
+from utils.solver_stats import get_solver_presolved_size, get_solver_run_stats
+
+
+@dataclass
+class DirectLPVarBlocks:
+    gen_prod: str = 'gen_prod'
+    storage_prod: str = 'storage_prod'
+    storage_cons: str = 'storage_cons'
+    storage_soc: str = 'storage_soc'
+    storage_spill: str = 'storage_spill'
+    link_flow: str = 'link_flow'
+
+
+VAR_BLOCKS = DirectLPVarBlocks()
+# default values of PyPSA params, when not provided in generation units data
+DEFAULT_UNIT_PARAMS = {GEN_UNITS_PYPSA_PARAMS.min_power_pu: 0, GEN_UNITS_PYPSA_PARAMS.max_power_pu: 1,
+                       GEN_UNITS_PYPSA_PARAMS.marginal_cost: 0}
+DEFAULT_STORAGE_PARAMS = {GEN_UNITS_PYPSA_PARAMS.min_power_pu: -1, GEN_UNITS_PYPSA_PARAMS.max_power_pu: 1,
+                          GEN_UNITS_PYPSA_PARAMS.marginal_cost: 0, 'efficiency_store': 1,
+                          'efficiency_dispatch': 1, 'cyclic_state_of_charge': False, 'inflow': 0}
+
+
+def set_ts_param(param_value, n_ts: int) -> np.ndarray:
+    """
+    Constant or time-dependent param. value to a vector of length the number of time-slots
+    """
+    return np.broadcast_to(np.asarray(param_value, dtype=float), (n_ts,))
+
+
+def set_highs_lp(cost: np.ndarray, lb: np.ndarray, ub: np.ndarray, a_matrix: sparse.csc_matrix,
+                 b: np.ndarray) -> highspy.HighsLp:
+    """
+    Set HiGHS LP - min cost.x s.t. a_matrix.x = b, lb <= x <= ub - with matrix passed column-wise
+    """
+    lp = highspy.HighsLp()
+    lp.num_col_ = a_matrix.shape[1]
+    lp.num_row_ = a_matrix.shape[0]
+    lp.col_cost_ = cost
+    lp.col_lower_ = lb
+    lp.col_upper_ = ub
+    lp.row_lower_ = b
+    lp.row_upper_ = b
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.start_ = a_matrix.indptr
+    lp.a_matrix_.index_ = a_matrix.indices
+    lp.a_matrix_.value_ = a_matrix.data
+    return lp
+
+
+@dataclass
+class DirectLPModel:
+    """
+    Lightweight alternative to PypsaModel for the European UC model - using only buses, generators, storage units
+    with inflow and cyclic SoC, bidirectional links and loads. The LP is built directly from dataset data as sparse
+    matrices - with variable blocks indexed by (asset, time-slot) - and solved through HiGHS Python API
+    """
+    name: str
+    snapshots: pd.DatetimeIndex = None
+    bus_names: List[str] = None
+    # static params of generators, storage units and links - one row per asset
+    generators: pd.DataFrame = None
+    storage_units: pd.DataFrame = None
+    links: pd.DataFrame = None
+    # time-dependent params, as (time-slot, asset) arrays
+    generators_t: Dict[str, np.ndarray] = None
+    storage_units_t: Dict[str, np.ndarray] = None
+    demand: np.ndarray = None  # (time-slot, bus)
+    carriers_co2_emissions: Dict[str, float] = None
+    # optimal decisions/dual variables, in the same format as the ones of PypsaModel
+    prod_var_opt: pd.DataFrame = None
+    sde_dual_var_opt: pd.DataFrame = None
+    storage_prod_var_opt: pd.DataFrame = None
+    storage_cons_var_opt: pd.DataFrame = None
+    storage_soc_opt: pd.DataFrame = None
+    link_flow_var_opt_direct: pd.DataFrame = None
+    link_flow_var_opt_reverse: pd.DataFrame = None
+    objective_value: float = None
+    uc_summary_metrics: UCSummaryMetrics = None
+    solver_stats: dict = None
+    # final SoC of non-cyclic storage units at least their initial one, as in PypsaModel
+    storage_final_soc_min: bool = False
+    DEFAULT_CARRIER = 'ac'
+
+    def set_snapshots(self, date_range: pd.DatetimeIndex):
+        self.snapshots = pd.DatetimeIndex(date_range, name='snapshot')
+
+    def add_buses(self, countries: List[str]):
+        logging.info('Add buses')
+        self.bus_names = [get_country_bus_name(country=country) for country in countries]
+
+    def add_energy_carriers(self, fuel_sources: Dict[str, FuelSource]):
+        logging.info('Add energy carriers')
+        self.carriers_co2_emissions = {carrier: fuel_source.co2_emissions / 1000
+                                       for carrier, fuel_source in fuel_sources.items()}
+
+    def add_generators(self, generators_data: Dict[str, List[GenerationUnitData]]):
+        logging.info('Add generators and storage units - associated to their respective buses')
+        n_ts = len(self.snapshots)
+        gen_rows, storage_rows = [], []
+        gen_ts = {GEN_UNITS_PYPSA_PARAMS.min_power_pu: [], GEN_UNITS_PYPSA_PARAMS.max_power_pu: []}
+        storage_ts = {GEN_UNITS_PYPSA_PARAMS.min_power_pu: [], GEN_UNITS_PYPSA_PARAMS.max_power_pu: [], 'inflow': []}
+        for country, gen_units_data in generators_data.items():
+            country_bus_name = get_country_bus_name(country=country)
+            for gen_unit_data in gen_units_data:
+                unit_params = rm_elts_with_none_val(my_dict=gen_unit_data.__dict__)
+                if not check_gen_unit_params(params=unit_params, n_ts=n_ts):
+                    logging.warning(f'Pb with generator parameters {unit_params} '
+                                    f'\n-> generator not added to the direct LP model')
+                    continue
+                # case of storage units, identified via the presence of max_hours param
+                is_storage = unit_params.get(GEN_UNITS_PYPSA_PARAMS.max_hours, None) is not None
+                unit_params = (DEFAULT_STORAGE_PARAMS if is_storage else DEFAULT_UNIT_PARAMS) | unit_params
+                unit_params[GEN_UNITS_PYPSA_PARAMS.bus] = country_bus_name
+                current_ts = storage_ts if is_storage else gen_ts
+                for param_name in current_ts:
+                    current_ts[param_name].append(set_ts_param(param_value=unit_params.pop(param_name), n_ts=n_ts))
+                if is_storage:
+                    if unit_params.get(GEN_UNITS_PYPSA_PARAMS.soc_init, None) is None:
+                        unit_params[GEN_UNITS_PYPSA_PARAMS.soc_init] = \
+                            (unit_params[GEN_UNITS_PYPSA_PARAMS.power_capa]
+                             * unit_params[GEN_UNITS_PYPSA_PARAMS.max_hours] * DEFAULT_SOC_INIT_SHARE)
+                    storage_rows.append(unit_params)
+                else:
+                    gen_rows.append(unit_params)
+        self.generators = pd.DataFrame(gen_rows).set_index(GEN_UNITS_PYPSA_PARAMS.name)
+        self.generators_t = {param_name: np.column_stack(ts_vals) for param_name, ts_vals in gen_ts.items()}
+        self.storage_units = pd.DataFrame(storage_rows).set_index(GEN_UNITS_PYPSA_PARAMS.name)
+        self.storage_units_t = {param_name: np.column_stack(ts_vals) for param_name, ts_vals in storage_ts.items()}
+        logging.info(f'Considered generators ({len(self.generators)}) and storage units ({len(self.storage_units)})')
+
+    def add_loads(self, demand: Dict[str, pd.DataFrame]):
+        logging.info('Add loads - associated to their respective buses')
+        per_bus_demand = {get_country_bus_name(country=country): demand[country]['value'].values
+                          for country in demand}
+        self.demand = np.column_stack([per_bus_demand[bus_name] for bus_name in self.bus_names]).astype(float)
+
+    def add_interco_links(self, countries: List[str], interco_capas: Dict[Tuple[str, str], float],
+                          carrier_name: str = None):
+        if carrier_name is None:
+            carrier_name = self.DEFAULT_CARRIER
+        logging.info(f'Add interco. links - between the selected countries: {countries}')
+        links = set_interco_links_data(countries=countries, interco_capas=interco_capas, carrier_name=carrier_name)
+        self.links = pd.DataFrame(links,
+                                  columns=[GEN_UNITS_PYPSA_PARAMS.name, f'{GEN_UNITS_PYPSA_PARAMS.bus}0',
+                                           f'{GEN_UNITS_PYPSA_PARAMS.bus}1', GEN_UNITS_PYPSA_PARAMS.nominal_power,
+                                           GEN_UNITS_PYPSA_PARAMS.min_power_pu, GEN_UNITS_PYPSA_PARAMS.max_power_pu,
+                                           GEN_UNITS_PYPSA_PARAMS.carrier]
+                                  ).set_index(GEN_UNITS_PYPSA_PARAMS.name)
+
+    def get_var_blocks_offsets(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Get (offset, number of assets) of each variable block; variable of (asset i, time-slot t) of a block being
+        at index offset + i * n_ts + t
+        """
+        n_storages = len(self.storage_units)
+        n_assets_per_block = {VAR_BLOCKS.gen_prod: len(self.generators), VAR_BLOCKS.storage_prod: n_storages,
+                              VAR_BLOCKS.storage_cons: n_storages, VAR_BLOCKS.storage_soc: n_storages,
+                              VAR_BLOCKS.storage_spill: n_storages, VAR_BLOCKS.link_flow: len(self.links)}
+        offsets = {}
+        current_offset = 0
+        for block_name, n_assets in n_assets_per_block.items():
+            offsets[block_name] = (current_offset, n_assets)
+            current_offset += n_assets * len(self.snapshots)
+        return offsets
+
+    def build_lp(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, sparse.csc_matrix, np.ndarray]:
+        """
+        Build LP: min c.x s.t. A.x = b, lb <= x <= ub. First rows are the nodal balance ones - indexed by
+        (bus, time-slot), then the storage energy balance ones - indexed by (storage unit, time-slot)
+        :returns c, lb, ub, A, b
+        """
+        n_ts = len(self.snapshots)
+        ts = np.arange(n_ts)
+        offsets = self.get_var_blocks_offsets()
+        n_vars = sum(n_assets * n_ts for _, n_assets in offsets.values())
+
+        def block_cols(block_name: str) -> np.ndarray:
+            offset, n_assets = offsets[block_name]
+            return offset + (np.arange(n_assets)[:, None] * n_ts + ts).ravel()
+
+        def per_asset_to_block(values: np.ndarray) -> np.ndarray:
+            # (time-slot, asset) array -> values in (asset, time-slot) order of variable blocks
+            return np.asarray(values, dtype=float).T.ravel()
+
+        cost, lb, ub = np.zeros(n_vars), np.zeros(n_vars), np.zeros(n_vars)
+        # generators
+        gen_cols = block_cols(VAR_BLOCKS.gen_prod)
+        gen_p_nom = self.generators[GEN_UNITS_PYPSA_PARAMS.power_capa].values.astype(float)
+        lb[gen_cols] = per_asset_to_block(self.generators_t[GEN_UNITS_PYPSA_PARAMS.min_power_pu] * gen_p_nom)
+        ub[gen_cols] = per_asset_to_block(self.generators_t[GEN_UNITS_PYPSA_PARAMS.max_power_pu] * gen_p_nom)
+        cost[gen_cols] = np.repeat(self.generators[GEN_UNITS_PYPSA_PARAMS.marginal_cost].values.astype(float), n_ts)
+        # storage units
+        sto_prod_cols = block_cols(VAR_BLOCKS.storage_prod)
+        sto_cons_cols = block_cols(VAR_BLOCKS.storage_cons)
+        sto_soc_cols = block_cols(VAR_BLOCKS.storage_soc)
+        sto_spill_cols = block_cols(VAR_BLOCKS.storage_spill)
+        sto_p_nom = self.storage_units[GEN_UNITS_PYPSA_PARAMS.power_capa].values.astype(float)
+        ub[sto_prod_cols] = per_asset_to_block(self.storage_units_t[GEN_UNITS_PYPSA_PARAMS.max_power_pu] * sto_p_nom)
+        ub[sto_cons_cols] = per_asset_to_block(
+            np.maximum(-self.storage_units_t[GEN_UNITS_PYPSA_PARAMS.min_power_pu], 0) * sto_p_nom)
+        ub[sto_soc_cols] = np.repeat(
+            self.storage_units[GEN_UNITS_PYPSA_PARAMS.max_hours].values.astype(float) * sto_p_nom, n_ts)
+        ub[sto_spill_cols] = per_asset_to_block(np.maximum(self.storage_units_t['inflow'], 0))
+        cost[sto_prod_cols] = np.repeat(self.storage_units[GEN_UNITS_PYPSA_PARAMS.marginal_cost].values.astype(float),
+                                        n_ts)
+        # links
+        link_cols = block_cols(VAR_BLOCKS.link_flow)
+        link_p_nom = self.links[GEN_UNITS_PYPSA_PARAMS.nominal_power].values.astype(float)
+        lb[link_cols] = np.repeat(self.links[GEN_UNITS_PYPSA_PARAMS.min_power_pu].values * link_p_nom, n_ts)
+        ub[link_cols] = np.repeat(self.links[GEN_UNITS_PYPSA_PARAMS.max_power_pu].values * link_p_nom, n_ts)
+
+        # nodal balance: sum prod - storage cons + imports - exports = demand
+        bus_idx = {bus_name: i for i, bus_name in enumerate(self.bus_names)}
+
+        def nodal_rows(asset_buses: pd.Series) -> np.ndarray:
+            return (asset_buses.map(bus_idx).values[:, None] * n_ts + ts).ravel()
+
+        sto_nodal_rows = nodal_rows(asset_buses=self.storage_units[GEN_UNITS_PYPSA_PARAMS.bus])
+        rows = [nodal_rows(asset_buses=self.generators[GEN_UNITS_PYPSA_PARAMS.bus]), sto_nodal_rows, sto_nodal_rows,
+                nodal_rows(asset_buses=self.links[f'{GEN_UNITS_PYPSA_PARAMS.bus}0']),
+                nodal_rows(asset_buses=self.links[f'{GEN_UNITS_PYPSA_PARAMS.bus}1'])]
+        cols = [gen_cols, sto_prod_cols, sto_cons_cols, link_cols, link_cols]
+        vals = [np.ones(len(gen_cols)), np.ones(len(sto_prod_cols)), -np.ones(len(sto_cons_cols)),
+                -np.ones(len(link_cols)), np.ones(len(link_cols))]
+        n_nodal_rows = len(self.bus_names) * n_ts
+        b_nodal = per_asset_to_block(self.demand)
+
+        # storage energy balance: soc(t) - soc(t-1) + prod(t) / eff_dispatch - eff_store * cons(t) + spill(t) = inflow(t)
+        # with soc(-1) = soc(n_ts - 1) for cyclic units, and initial SoC in rhs for the other ones
+        n_storages = len(self.storage_units)
+        sto_rows = n_nodal_rows + np.arange(n_storages * n_ts)
+        cyclic = self.storage_units['cyclic_state_of_charge'].values.astype(bool)
+        prev_ts = np.tile(np.roll(ts, 1), n_storages)
+        prev_soc_cols = np.repeat(np.arange(n_storages) * n_ts, n_ts) + offsets[VAR_BLOCKS.storage_soc][0] + prev_ts
+        with_prev_soc = np.repeat(cyclic, n_ts) | (np.tile(ts, n_storages) > 0)
+        rows.extend([sto_rows, sto_rows[with_prev_soc], sto_rows, sto_rows, sto_rows])
+        cols.extend([sto_soc_cols, prev_soc_cols[with_prev_soc], sto_prod_cols, sto_cons_cols, sto_spill_cols])
+        vals.extend([np.ones(len(sto_rows)), -np.ones(with_prev_soc.sum()),
+                     np.repeat(1 / self.storage_units['efficiency_dispatch'].values.astype(float), n_ts),
+                     np.repeat(-self.storage_units['efficiency_store'].values.astype(float), n_ts),
+                     np.ones(len(sto_rows))])
+        b_storage = per_asset_to_block(self.storage_units_t['inflow'])
+        soc_init = self.storage_units[GEN_UNITS_PYPSA_PARAMS.soc_init].values.astype(float)
+        b_storage[np.arange(n_storages)[~cyclic] * n_ts] += soc_init[~cyclic]
+        if self.storage_final_soc_min:
+            # as a lower bound of last SoC variable, capped to energy capacity
+            final_soc_cols = sto_soc_cols.reshape(n_storages, n_ts)[~cyclic, -1]
+            lb[final_soc_cols] = np.minimum(soc_init[~cyclic], ub[final_soc_cols])
+
+        a_matrix = sparse.csc_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                                     shape=(n_nodal_rows + n_storages * n_ts, n_vars))
+        return cost, lb, ub, a_matrix, np.concatenate([b_nodal, b_storage])
+
+    def get_zone_cols_and_rows(self, bus_name: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get indices of the LP columns/rows of a given zone (bus): its generators and storage units variables, the
+        flows of its incident links, its nodal balance and storage energy balance rows
+        :returns cols, rows, link_cols (the latter being the subset of cols corresponding to incident link flows)
+        """
+        n_ts = len(self.snapshots)
+        ts = np.arange(n_ts)
+        offsets = self.get_var_blocks_offsets()
+
+        def assets_cols(block_name: str, assets_mask: np.ndarray) -> np.ndarray:
+            return offsets[block_name][0] + (np.flatnonzero(assets_mask)[:, None] * n_ts + ts).ravel()
+
+        zone_storages = (self.storage_units[GEN_UNITS_PYPSA_PARAMS.bus] == bus_name).values
+        link_cols = assets_cols(block_name=VAR_BLOCKS.link_flow,
+                                assets_mask=((self.links[f'{GEN_UNITS_PYPSA_PARAMS.bus}0'] == bus_name)
+                                             | (self.links[f'{GEN_UNITS_PYPSA_PARAMS.bus}1'] == bus_name)).values)
+        cols = np.concatenate(
+            [assets_cols(block_name=VAR_BLOCKS.gen_prod,
+                         assets_mask=(self.generators[GEN_UNITS_PYPSA_PARAMS.bus] == bus_name).values)]
+            + [assets_cols(block_name=block_name, assets_mask=zone_storages)
+               for block_name in [VAR_BLOCKS.storage_prod, VAR_BLOCKS.storage_cons, VAR_BLOCKS.storage_soc,
+                                  VAR_BLOCKS.storage_spill]]
+            + [link_cols]
+        )
+        n_nodal_rows = len(self.bus_names) * n_ts
+        rows = np.concatenate([self.bus_names.index(bus_name) * n_ts + ts,
+                               n_nodal_rows + (np.flatnonzero(zone_storages)[:, None] * n_ts + ts).ravel()])
+        return cols, rows, link_cols
+
+    def solve(self, solver_params: SolverParams = None) -> PYPSA_RESULT_TYPE:
+        """
+        Solve LP via HiGHS Python API - matrices passed in memory, and solution read back as arrays
+        :returns a tuple (status, status of resolution), as PyPSA
+        """
+        if solver_params is not None and not solver_params.name == OptimSolvers.highs:
+            logging.warning(f'Solver {solver_params.name} not available with direct LP model '
+                            f'-> {OptimSolvers.highs} used instead')
+        logging.info('Build direct LP model - as sparse matrices')
+        with trace_span('LP build'):
+            cost, lb, ub, a_matrix, b = self.build_lp()
+            add_span_attrs(n_variables=a_matrix.shape[1], n_constraints=a_matrix.shape[0], n_nonzeros=a_matrix.nnz)
+        logging.info(f'LP with {a_matrix.shape[1]} variables, {a_matrix.shape[0]} constraints '
+                     f'and {a_matrix.nnz} nonzeros')
+        highs = highspy.Highs()
+        highs.passModel(set_highs_lp(cost=cost, lb=lb, ub=ub, a_matrix=a_matrix, b=b))
+        logging.info('Solve direct LP model - i.e. associated UC problem')
+        with trace_span('solver', solver=OptimSolvers.highs) as solver_span:
+            highs.run()
+            self.solver_stats = get_solver_run_stats(solver_model=highs)
+        # N.B. out of solver span, presolve being run again to get the size of the presolved problem
+        self.solver_stats |= get_solver_presolved_size(solver_model=highs)
+        if solver_span is not None:
+            solver_span.attrs.update(self.solver_stats)
+        logging.info(f'Solver run statistics: {self.solver_stats}')
+        model_status = highs.getModelStatus()
+        if not model_status == highspy.HighsModelStatus.kOptimal:
+            result = ('warning', highs.modelStatusToString(model_status).lower())
+            logging.info(f'Obtained result: {result}')
+            return result
+        with trace_span('solution retrieval'):
+            solution = highs.getSolution()
+            self.objective_value = highs.getInfo().objective_function_value
+            self.set_opt_results(col_values=np.array(solution.col_value), row_duals=np.array(solution.row_dual))
+        result = ('ok', OPTIM_RESOL_STATUS.optimal)
+        logging.info(f'Obtained result: {result}')
+        return result
+
+    def set_opt_results(self, col_values: np.ndarray, row_duals: np.ndarray):
+        n_ts = len(self.snapshots)
+        offsets = self.get_var_blocks_offsets()
+
+        def block_df(block_name: str, asset_names: pd.Index) -> pd.DataFrame:
+            offset, n_assets = offsets[block_name]
+            values = col_values[offset:offset + n_assets * n_ts].reshape(n_assets, n_ts).T
+            return pd.DataFrame(values, index=self.snapshots, columns=asset_names)
+
+        self.prod_var_opt = block_df(block_name=VAR_BLOCKS.gen_prod, asset_names=self.generators.index)
+        self.storage_prod_var_opt = block_df(block_name=VAR_BLOCKS.storage_prod,
+                                             asset_names=self.storage_units.index)
+        self.storage_cons_var_opt = block_df(block_name=VAR_BLOCKS.storage_cons,
+                                             asset_names=self.storage_units.index)
+        self.storage_soc_opt = block_df(block_name=VAR_BLOCKS.storage_soc, asset_names=self.storage_units.index)
+        self.link_flow_var_opt_direct = block_df(block_name=VAR_BLOCKS.link_flow, asset_names=self.links.index)
+        self.link_flow_var_opt_reverse = -self.link_flow_var_opt_direct
+        # dual variables of nodal balance constraints - first rows of the LP
+        n_buses = len(self.bus_names)
+        self.sde_dual_var_opt = pd.DataFrame(row_duals[:n_buses * n_ts].reshape(n_buses, n_ts).T,
+                                             index=self.snapshots, columns=self.bus_names)
+
+    def get_opt_results(self) -> Dict[str, pd.DataFrame]:
+        return {attr_name: getattr(self, attr_name) for attr_name in OPT_RESULT_ATTRS}
+
+    def get_opt_value(self) -> float:
+        objective_value_refmted = format_with_spaces(number=int(self.objective_value / 1e6))
+        logging.info(f'Optimisation resolution status is {OPTIM_RESOL_STATUS.optimal} with objective value '
+                     f'(cost) = {objective_value_refmted} (M€) -> output data (resp. figures) can be generated')
+        return self.objective_value
+
+    def set_uc_summary_metrics(self, failure_penalty: float = None):
+        logging.info('Set UC summary metrics')
+        gen_units_index = set_gen_units_index(
+            buses=self.generators[GEN_UNITS_PYPSA_PARAMS.bus],
+            marginal_costs=self.generators[GEN_UNITS_PYPSA_PARAMS.marginal_cost],
+            co2_emissions=self.generators[GEN_UNITS_PYPSA_PARAMS.carrier].map(self.carriers_co2_emissions)
+        )
+        self.uc_summary_metrics = calc_uc_summary_metrics(prod_var_opt=self.prod_var_opt,
+                                                          gen_units_index=gen_units_index,
+                                                          total_cost=self.get_opt_value(),
+                                                          failure_penalty=failure_penalty)
@@ -0,0 +1,159 @@
+import logging
+import warnings
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from include.uc_summary_metrics import FAILURE_POWER_TOL
+from utils.plot import CurveStyleAttrs, FigureStyle, simple_plot
+
+DEFAULT_DURATION_CURVE_QUANTILES = [0.95]
+# N.B. number of time-slots above failure power tolerance is the number of failure hours for failure curves - as in
+# UC summary metrics
+DEFAULT_DURATION_CURVE_THRESHOLDS = [FAILURE_POWER_TOL]
+
+
+@dataclass
+class DurationCurveStatsCols:
+    n_time_slots: str = 'n_time_slots'
+    peak: str = 'peak'
+    mean: str = 'mean'
+    min: str = 'min'
+
+
+DURATION_CURVE_STATS_COLS = DurationCurveStatsCols()
+
+
+def get_quantile_col(q: float) -> str:
+    return f'p{100 * q:g}'
+
+
+def get_n_above_threshold_col(threshold: float) -> str:
+    return f'n_time_slots_above_{threshold:g}'
+
+
+def calc_duration_curves(values: np.ndarray) -> np.ndarray:
+    """
+    Duration curves of a (case x time-slot) matrix, i.e. each row sorted in descending order - in a unique sort
+    call over all cases. N.B. NaN values (e.g. padding of cases with less time-slots) put at the end of rows
+    """
+    return -np.sort(-np.asarray(values, dtype=float), axis=1)
+
+
+def to_padded_matrix(values: List[np.ndarray]) -> np.ndarray:
+    """
+    (case x time-slot) matrix from per-case vectors, shorter ones being padded with NaN
+    """
+    n_max = max(len(vals) for vals in values)
+    matrix = np.full((len(values), n_max), np.nan)
+    for i_case, vals in enumerate(values):
+        matrix[i_case, :len(vals)] = vals
+    return matrix
+
+
+@dataclass
+class DurationCurves:
+    """
+    Duration curves of a set of cases - e.g. (country, year, clim. year) net demands, or per-zone marginal
+    prices of UC outputs - computed and characterized in batch over a (case x time-slot) matrix
+    """
+    case_keys: list
+    sorted_values: np.ndarray  # (case x time-slot), each row in descending order
+
+    @property
+    def n_time_slots(self) -> int:
+        return self.sorted_values.shape[1]
+
+    def get_durations(self, as_a_percentage: bool = False) -> np.ndarray:
+        """
+        x-axis of duration curves, assuming uniform time-slot duration
+        :param as_a_percentage: share of time-slots (%) i.o. number of time-slots
+        """
+        durations = np.arange(1, self.n_time_slots + 1)
+        if as_a_percentage:
+            return 100 * durations / self.n_time_slots
+        return durations
+
+    def get_stats(self, quantiles: List[float] = None, thresholds: List[float] = None) -> pd.DataFrame:
+        """
+        Characteristic points of each duration curve: peak, mean, min, quantiles and number of time-slots above
+        thresholds - 1 row per case
+        """
+        if quantiles is None:
+            quantiles = DEFAULT_DURATION_CURVE_QUANTILES
+        if thresholds is None:
+            thresholds = DEFAULT_DURATION_CURVE_THRESHOLDS
+        values = self.sorted_values
+        # all NaN rows -> NaN stats, without warnings
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            stats = {DURATION_CURVE_STATS_COLS.n_time_slots: (~np.isnan(values)).sum(axis=1),
+                     DURATION_CURVE_STATS_COLS.peak: values[:, 0] if values.shape[1] > 0 else np.nan,
+                     DURATION_CURVE_STATS_COLS.mean: np.nanmean(values, axis=1),
+                     DURATION_CURVE_STATS_COLS.min: np.nanmin(values, axis=1)}
+            quantile_vals = np.nanquantile(values, q=quantiles, axis=1)
+        for q, q_vals in zip(quantiles, quantile_vals):
+            stats[get_quantile_col(q=q)] = q_vals
+        # (threshold x case) counts in a unique broadcast comparison
+        n_above = (values[None, :, :] > np.asarray(thresholds, dtype=float)[:, None, None]).sum(axis=2)
+        for threshold, threshold_n_above in zip(thresholds, n_above):
+            stats[get_n_above_threshold_col(threshold=threshold)] = threshold_n_above
+        return pd.DataFrame(stats, index=self.get_case_index())
+
+    def get_case_index(self) -> pd.Index:
+        if len(self.case_keys) > 0 and isinstance(self.case_keys[0], tuple):
+            return pd.MultiIndex.from_tuples(self.case_keys)
+        return pd.Index(self.case_keys, name='case')
+
+    def save_stats(self, output_file: str, quantiles: List[float] = None, thresholds: List[float] = None,
+                   index_names: List[str] = None):
+        """
+        :param index_names: of case key components, if tuple case keys
+        """
+        df_stats = self.get_stats(quantiles=quantiles, thresholds=thresholds)
+        if index_names is not None:
+            df_stats.index.names = index_names
+        logging.debug(f'Save duration curves characteristic points of {len(df_stats)} case(s) to {output_file}')
+        df_stats.to_csv(output_file)
+
+    def plot(self, fig_file: str, title: str, ylabel: str, curve_labels: List[str] = None,
+             as_a_percentage: bool = False, fig_style: FigureStyle = None,
+             curve_style_attrs: Union[Dict[str, CurveStyleAttrs], CurveStyleAttrs] = None):
+        """
+        :param curve_labels: labels of the cases in plot legend; case keys if None
+        """
+        if curve_labels is None:
+            curve_labels = [str(elt) for elt in self.case_keys]
+        xlabel = 'Duration (%)' if as_a_percentage else 'Duration (nber of time-slots - hours)'
+        if len(curve_labels) == 1:
+            y = self.sorted_values[0]
+            if isinstance(curve_style_attrs, dict):
+                curve_style_attrs = curve_style_attrs.get(curve_labels[0])
+        else:
+            y = {label: self.sorted_values[i_case] for i_case, label in enumerate(curve_labels)}
+        # catch DeprecationWarnings TODO: fix/more robust way to catch them?
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            simple_plot(x=self.get_durations(as_a_percentage=as_a_percentage), y=y, fig_file=fig_file, title=title,
+                        xlabel=xlabel, ylabel=ylabel, fig_style=fig_style, curve_style_attrs=curve_style_attrs)
+
+
+def set_duration_curves(values: Union[np.ndarray, List[np.ndarray]], case_keys: list) -> DurationCurves:
+    """
+    :param values: (case x time-slot) matrix, or list of per-case vectors (possibly of different lengths)
+    :param case_keys: in the order of values
+    """
+    if not isinstance(values, np.ndarray):
+        values = to_padded_matrix(values=values)
+    return DurationCurves(case_keys=list(case_keys), sorted_values=calc_duration_curves(values=values))
+
+
+def set_duration_curves_from_df(df: pd.DataFrame, cols: Optional[List[str]] = None) -> DurationCurves:
+    """
+    Duration curves of df columns, e.g. per-zone marginal prices; time-slots in index
+    """
+    if cols is None:
+        cols = list(df.columns)
+    return set_duration_curves(values=df[cols].to_numpy(dtype=float).T, case_keys=cols)
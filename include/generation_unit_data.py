@@ -0,0 +1,67 @@
+"""
+Data of generation units - independent of PyPSA, to be used by the data layer (e.g. Dataset) without importing it
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Union
+
+import numpy as np
+
+from common.constants.countries import set_country_trigram
+from common.constants.pypsa_params import GEN_UNITS_PYPSA_PARAMS
+from utils.serializer import array_serializer
+
+
+@dataclass
+class GenerationUnitData:
+    name: str
+    type: str
+    carrier: str = None
+    p_nom: Union[float, np.ndarray] = None
+    p_min_pu: Union[float, np.ndarray] = None
+    p_max_pu: Union[float, np.ndarray] = None
+    efficiency: float = None
+    efficiency_store: float = None
+    efficiency_dispatch: float = None
+    marginal_cost: float = None
+    committable: bool = False
+    max_hours: float = None
+    cyclic_state_of_charge: bool = None
+    inflow: np.ndarray = None
+    state_of_charge_initial: float = None
+
+    def get_non_none_attr_names(self):
+        return [key for key, val in self.__dict__.items() if val is not None]
+
+    def serialize(self) -> dict:
+        unit_data_dict = self.__dict__
+        # (1d) nd array to list
+        unit_data_dict = {key: array_serializer(my_array=val, stat_repres=True) if isinstance(val, np.ndarray) else val
+                          for key, val in unit_data_dict.items()}
+        return unit_data_dict
+
+
+UNIT_NAME_SEP = '_'
+
+
+def get_prod_type_from_unit_name(prod_unit_name: str) -> str:
+    len_country_suffix = 3 + len(UNIT_NAME_SEP)
+    return prod_unit_name[len_country_suffix:]
+
+
+def set_gen_unit_name(country: str, agg_prod_type: str) -> str:
+    country_trigram = set_country_trigram(country=country)
+    return f'{country_trigram}{UNIT_NAME_SEP}{agg_prod_type}'
+
+
+GEN_UNITS_DATA_TYPE = Dict[str, List[GenerationUnitData]]
+
+
+def check_gen_unit_params(params: dict, n_ts: int) -> bool:
+    # check that max and min power pu are either constant or of the length of considered horizon
+    for param_name in [GEN_UNITS_PYPSA_PARAMS.min_power_pu, GEN_UNITS_PYPSA_PARAMS.max_power_pu]:
+        if param_name in params:
+            param_value = params[param_name]
+            if isinstance(param_value, list) or isinstance(param_value, np.ndarray):
+                if not len(param_value) == n_ts:
+                    return False
+    return True
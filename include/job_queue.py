@@ -0,0 +1,272 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from common.constants.campaign import JOB_STATUSES
+from common.long_term_uc_io import OUTPUT_JOB_QUEUE_FILE
+from utils.dir_utils import make_dir
+
+# waiting time (s) for the lock of the queue file, when several worker processes access it at the same time
+JOB_QUEUE_LOCK_TIMEOUT = 60
+# a running job whose lease (s) has not been renewed by its worker - e.g. crashed with its PID since reused - is
+# considered as interrupted; renewed LEASE_RENEWALS_PER_DURATION times per lease duration while the job runs
+JOB_LEASE_DURATION = 600
+LEASE_RENEWALS_PER_DURATION = 5
+JOBS_TABLE = 'jobs'
+JOB_QUEUE_DDL = [
+    # N.B. next_attempt_at and lease_expires_at as timestamps (s), to be compared to current time; other times as
+    # ISO str
+    f"""CREATE TABLE IF NOT EXISTS {JOBS_TABLE} (
+        job_id INTEGER PRIMARY KEY, campaign TEXT NOT NULL, inputs_hash TEXT NOT NULL,
+        inputs TEXT NOT NULL, status TEXT NOT NULL, n_attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at REAL NOT NULL DEFAULT 0, worker TEXT, started_at TEXT, lease_expires_at REAL, ended_at TEXT,
+        error TEXT, output_locations TEXT, result TEXT, created_at TEXT NOT NULL, UNIQUE (campaign, inputs_hash))""",
+    f'CREATE INDEX IF NOT EXISTS idx_jobs_status ON {JOBS_TABLE}(campaign, status, next_attempt_at)',
+]
+# columns added after the first version of the queue, to be added to existing queue files
+JOB_QUEUE_ADDED_COLUMNS = {'lease_expires_at': 'REAL'}
+
+
+def get_worker_name() -> str:
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def is_worker_alive(worker: str) -> bool:
+    """
+    Whether the process of a worker (named as in get_worker_name) is still running
+    N.B. workers of other hosts cannot be checked -> considered as alive
+    """
+    host, pid = worker.rsplit(':', 1)
+    if host != socket.gethostname():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # process of another user
+        return True
+    return True
+
+
+@dataclass
+class Job:
+    job_id: int
+    campaign: str
+    inputs_hash: str
+    inputs: dict
+    n_attempts: int  # including current one
+
+
+@dataclass
+class JobQueue:
+    """
+    Persistent local queue of the (UC run) jobs of campaigns, in a SQLite file - with their status, inputs hash,
+    worker and output locations -, from which several local worker processes can pull jobs; to interrupt and
+    resume a campaign without re-running its completed jobs
+    """
+    db_file: str = None  # if None, default file in output/long_term_uc will be used
+    # a failed job is retried after retry_delay seconds, doubled after each failed attempt, up to max_attempts
+    max_attempts: int = 3
+    retry_delay: float = 60
+    lease_duration: float = JOB_LEASE_DURATION
+
+    def get_db_file(self) -> str:
+        return self.db_file if self.db_file is not None else OUTPUT_JOB_QUEUE_FILE
+
+    def connect(self) -> sqlite3.Connection:
+        db_file = self.get_db_file()
+        make_dir(full_path=os.path.dirname(os.path.abspath(db_file)))
+        connection = sqlite3.connect(db_file, timeout=JOB_QUEUE_LOCK_TIMEOUT)
+        # Write-Ahead Logging, for the status reads of workers not to be blocked by the writes of the other ones
+        connection.execute('PRAGMA journal_mode = WAL')
+        for ddl_statement in JOB_QUEUE_DDL:
+            connection.execute(ddl_statement)
+        existing_columns = [row[1] for row in connection.execute(f'PRAGMA table_info({JOBS_TABLE})')]
+        for column, column_type in JOB_QUEUE_ADDED_COLUMNS.items():
+            if column not in existing_columns:
+                connection.execute(f'ALTER TABLE {JOBS_TABLE} ADD COLUMN {column} {column_type}')
+        return connection
+
+    def add_jobs(self, campaign: str, jobs_inputs: Dict[str, dict]) -> int:
+        """
+        Add the jobs of a campaign not already in the queue - in particular the done ones are kept as is, not to
+        re-run them -, and set its jobs not in the given ones - and not done - as obsolete
+        :param jobs_inputs: {inputs hash: inputs (JSON-serializable)} of the jobs
+        :returns: number of new jobs - or obsolete ones put back in the queue
+        """
+        created_at = datetime.now().isoformat()
+        with closing(self.connect()) as connection, connection:
+            n_changes_before = connection.total_changes
+            connection.executemany(f'INSERT INTO {JOBS_TABLE} (campaign, inputs_hash, inputs, status, created_at) '
+                                   f'VALUES (?, ?, ?, ?, ?) ON CONFLICT (campaign, inputs_hash) '
+                                   f'DO UPDATE SET status = excluded.status WHERE status = ?',
+                                   [(campaign, inputs_hash, json.dumps(inputs, sort_keys=True), JOB_STATUSES.pending,
+                                     created_at, JOB_STATUSES.obsolete)
+                                    for inputs_hash, inputs in jobs_inputs.items()])
+            n_added_jobs = connection.total_changes - n_changes_before
+            current_hashes = set(jobs_inputs)
+            obsolete_job_ids = [job_id for job_id, inputs_hash in connection.execute(
+                f'SELECT job_id, inputs_hash FROM {JOBS_TABLE} WHERE campaign = ? AND status IN (?, ?)',
+                (campaign, JOB_STATUSES.pending, JOB_STATUSES.failed)) if inputs_hash not in current_hashes]
+            connection.executemany(f'UPDATE {JOBS_TABLE} SET status = ? WHERE job_id = ?',
+                                   [(JOB_STATUSES.obsolete, job_id) for job_id in obsolete_job_ids])
+        if len(obsolete_job_ids) > 0:
+            logging.info(f'{len(obsolete_job_ids)} pending/failed job(s) of campaign {campaign} not in its current '
+                         f'jobs (e.g. after a change of its params) set as {JOB_STATUSES.obsolete}')
+        return n_added_jobs
+
+    def requeue_interrupted_jobs(self, campaign: str) -> int:
+        """
+        Put back in the queue the running jobs of a campaign whose worker process is not running anymore - e.g.
+        after a crash or an interruption of the campaign -, or whose lease has expired (e.g. PID of a crashed worker
+        reused by another process, or worker of another host)
+        N.B. the interrupted attempt is counted, not to retry endlessly a job which makes its worker crash (e.g. out
+        of memory)
+        :returns: number of requeued jobs
+        """
+        now = time.time()
+        with closing(self.connect()) as connection, connection:
+            interrupted_job_ids = [job_id for job_id, worker, lease_expires_at in connection.execute(
+                f'SELECT job_id, worker, lease_expires_at FROM {JOBS_TABLE} WHERE campaign = ? AND status = ?',
+                (campaign, JOB_STATUSES.running))
+                if lease_expires_at is None or lease_expires_at < now or not is_worker_alive(worker=worker)]
+            connection.executemany(f'UPDATE {JOBS_TABLE} SET status = CASE WHEN n_attempts < ? THEN ? ELSE ? END, '
+                                   f'next_attempt_at = 0, error = ? WHERE job_id = ?',
+                                   [(self.max_attempts, JOB_STATUSES.pending, JOB_STATUSES.failed,
+                                     'Worker process interrupted', job_id) for job_id in interrupted_job_ids])
+        return len(interrupted_job_ids)
+
+    def reset_failed_jobs(self, campaign: str) -> int:
+        """
+        Put back in the queue the failed jobs of a campaign, with a new set of attempts
+        :returns: number of reset jobs
+        """
+        with closing(self.connect()) as connection, connection:
+            cursor = connection.execute(f'UPDATE {JOBS_TABLE} SET status = ?, n_attempts = 0, next_attempt_at = 0 '
+                                        f'WHERE campaign = ? AND status = ?',
+                                        (JOB_STATUSES.pending, campaign, JOB_STATUSES.failed))
+            return cursor.rowcount
+
+    def claim_job(self, campaign: str, worker: str) -> Optional[Job]:
+        """
+        Take the first pending job of a campaign which can be attempted now - setting it as run by this worker
+        N.B. in a single statement, so that a job cannot be claimed by two workers
+        :returns: None if no such job
+        """
+        with closing(self.connect()) as connection, connection:
+            now = time.time()
+            row = connection.execute(
+                f'UPDATE {JOBS_TABLE} SET status = ?, worker = ?, n_attempts = n_attempts + 1, started_at = ?, '
+                f'lease_expires_at = ?, ended_at = NULL WHERE job_id = (SELECT job_id FROM {JOBS_TABLE} '
+                f'WHERE campaign = ? AND status = ? AND next_attempt_at <= ? ORDER BY job_id LIMIT 1) '
+                f'RETURNING job_id, campaign, inputs_hash, inputs, n_attempts',
+                (JOB_STATUSES.running, worker, datetime.now().isoformat(), now + self.lease_duration, campaign,
+                 JOB_STATUSES.pending, now)).fetchone()
+        if row is None:
+            return None
+        job_id, campaign, inputs_hash, inputs, n_attempts = row
+        return Job(job_id=job_id, campaign=campaign, inputs_hash=inputs_hash, inputs=json.loads(inputs),
+                   n_attempts=n_attempts)
+
+    def renew_lease(self, job_id: int, worker: str) -> bool:
+        """
+        :returns: whether the lease of the job has been renewed - i.e. the job is still run by this worker
+        """
+        with closing(self.connect()) as connection, connection:
+            cursor = connection.execute(f'UPDATE {JOBS_TABLE} SET lease_expires_at = ? '
+                                        f'WHERE job_id = ? AND worker = ? AND status = ?',
+                                        (time.time() + self.lease_duration, job_id, worker, JOB_STATUSES.running))
+            return cursor.rowcount > 0
+
+    @contextmanager
+    def keep_lease(self, job_id: int, worker: str) -> Iterator[None]:
+        """
+        Renew the lease of a job in a background thread, while it is run in this context
+        """
+        stop_event = threading.Event()
+
+        def renew_lease_periodically():
+            while not stop_event.wait(timeout=self.lease_duration / LEASE_RENEWALS_PER_DURATION):
+                try:
+                    self.renew_lease(job_id=job_id, worker=worker)
+                except sqlite3.Error:  # e.g. queue file locked -> next renewal
+                    logging.warning(f'Lease of job {job_id} not renewed', exc_info=True)
+
+        lease_thread = threading.Thread(target=renew_lease_periodically, name=f'job-{job_id}-lease', daemon=True)
+        lease_thread.start()
+        try:
+            yield
+        finally:
+            stop_event.set()
+            lease_thread.join()
+
+    def mark_done(self, job_id: int, output_locations: Dict[str, str] = None, result: dict = None):
+        """
+        :param output_locations: {output name: file/folder} of the job
+        :param result: (JSON-serializable) main results of the job, e.g. its UC summary metrics
+        """
+        with closing(self.connect()) as connection, connection:
+            connection.execute(f'UPDATE {JOBS_TABLE} SET status = ?, ended_at = ?, error = NULL, '
+                               f'output_locations = ?, result = ? WHERE job_id = ?',
+                               (JOB_STATUSES.done, datetime.now().isoformat(), json.dumps(output_locations),
+                                json.dumps(result), job_id))
+
+    def mark_failed(self, job_id: int, error: str) -> Optional[float]:
+        """
+        Put back a failed job in the queue, after an exponential backoff delay - or set it as failed if all its
+        attempts have been made
+        :returns: delay (s) before next attempt; None if no more attempt
+        """
+        with closing(self.connect()) as connection, connection:
+            n_attempts, = connection.execute(f'SELECT n_attempts FROM {JOBS_TABLE} WHERE job_id = ?',
+                                             (job_id,)).fetchone()
+            retry_delay = self.retry_delay * 2 ** (n_attempts - 1) if n_attempts < self.max_attempts else None
+            status = JOB_STATUSES.pending if retry_delay is not None else JOB_STATUSES.failed
+            next_attempt_at = time.time() + retry_delay if retry_delay is not None else 0
+            connection.execute(f'UPDATE {JOBS_TABLE} SET status = ?, ended_at = ?, error = ?, next_attempt_at = ? '
+                               f'WHERE job_id = ?',
+                               (status, datetime.now().isoformat(), error, next_attempt_at, job_id))
+        return retry_delay
+
+    def get_next_attempt_wait(self, campaign: str) -> Optional[float]:
+        """
+        :returns: waiting time (s) before the next pending job of a campaign can be attempted; None if no pending job
+        """
+        with closing(self.connect()) as connection:
+            next_attempt_at, = connection.execute(f'SELECT MIN(next_attempt_at) FROM {JOBS_TABLE} '
+                                                  f'WHERE campaign = ? AND status = ?',
+                                                  (campaign, JOB_STATUSES.pending)).fetchone()
+        return max(0., next_attempt_at - time.time()) if next_attempt_at is not None else None
+
+    def count_jobs(self, campaign: str) -> Dict[str, int]:
+        with closing(self.connect()) as connection:
+            return dict(connection.execute(f'SELECT status, COUNT(*) FROM {JOBS_TABLE} WHERE campaign = ? '
+                                           f'GROUP BY status', (campaign,)).fetchall())
+
+    def get_jobs(self, campaign: str, statuses: List[str] = None, inputs_hashes: List[str] = None) -> pd.DataFrame:
+        """
+        Get the jobs of a campaign - one row per job, with its inputs, output locations and result as JSON str
+        :param statuses: only jobs with these statuses, if provided
+        :param inputs_hashes: only jobs with these inputs hashes, if provided - e.g. the current jobs of the
+        campaign, the done jobs of previous versions of its params being kept in the queue
+        """
+        query = f'SELECT * FROM {JOBS_TABLE} WHERE campaign = ?'
+        query_params = [campaign]
+        if statuses is not None:
+            query += f' AND status IN ({", ".join("?" * len(statuses))})'
+            query_params.extend(statuses)
+        with closing(self.connect()) as connection:
+            jobs = pd.read_sql_query(f'{query} ORDER BY job_id', connection, params=query_params, index_col='job_id')
+        if inputs_hashes is not None:
+            jobs = jobs[jobs['inputs_hash'].isin(inputs_hashes)]
+        return jobs
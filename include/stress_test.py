@@ -1,31 +1,361 @@
 import logging
-from datetime import datetime
-from typing import List, Dict
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
+import pandas as pd
+from pypsa.descriptors import get_switchable_as_dense
+
+from common.constants.countries import set_country_trigram
+from common.constants.optimisation import OPTIM_RESOL_STATUS
+from common.constants.prod_types import ProdTypeNames
+from common.constants.pypsa_params import GEN_UNITS_PYPSA_PARAMS
+from common.constants.stress_test import STRESS_TEST_TYPES, StressTestsParams
+from common.logger import logged_process_pool
 from include.dataset_builder import PypsaModel
+from include.generation_unit_data import set_gen_unit_name
+from include.uc_summary_metrics import FAILURE_UNIT_SUFFIX, UCSummaryMetrics
+
+RES_DROUGHT_DEFAULT_PROD_TYPES = [ProdTypeNames.solar_pv, ProdTypeNames.wind_offshore, ProdTypeNames.wind_onshore]
+# values of a stress test, per (PyPSA component, attribute): (snapshot, asset name) df
+STRESS_TEST_VALUES_TYPE = Dict[Tuple[str, str], pd.DataFrame]
+UC_TIME_SLOT_DURATION = timedelta(hours=1)
 
 
-# TODO: heritage? Per type of stress test
-class StressTest:
+class StressTest(ABC):
+    """
+    Perturbation of some assets of a PyPSA model over a time window [start_date, end_date[ - multiplying an
+    attribute of these assets by a factor -, applied in place as vectorized edits of both network data and the
+    already built (linopy) model, so that it can be evaluated by a re-solve, then reverted, without rebuilding the
+    model. Per type of stress test in child classes
+    """
+    type: str = None
+    default_factor: Optional[float] = None
+
     def __init__(self, name: str, countries: List[str] = None, per_country_prod_types: Dict[str, List[str]] = None,
-                 start_date: datetime = None, end_date: datetime = None):
+                 start_date: datetime = None, end_date: datetime = None, factor: Union[float, List[float]] = None):
         self.name = name
         self.countries = countries
+        self.per_country_prod_types = per_country_prod_types
         self.start_date = start_date  # default will be to apply stress test to whole UC model period
-        self.end_date = end_date
+        self.end_date = end_date  # excluded, as the end of UC period
+        # over the time window - scalar, or one value per time-slot of the window (e.g. a drought profile)
+        self.factor = factor if factor is not None else self.default_factor
+        self.initial_values = None  # values before application of the stress test, to revert it
+
+    def __repr__(self) -> str:
+        return f'{self.type} stress test {self.name}'
 
     def process(self, all_countries: List[str], uc_dates: List[datetime]):
         # stress test to be applied to all countries
-        if self.countries == ['europe']:
+        if self.countries is None or self.countries == ['europe']:
             self.countries = all_countries
         if self.start_date is None:
             self.start_date = min(uc_dates)
         if self.end_date is None:
-            self.end_date = max(uc_dates)
+            self.end_date = max(uc_dates) + UC_TIME_SLOT_DURATION
+        # N.B. dates possibly given in the year of ERAA data, as the UC period -> set in the year of UC horizon
+        uc_year = min(uc_dates).year
+        self.start_date = self.start_date.replace(year=uc_year)
+        self.end_date = self.end_date.replace(year=uc_year)
+        if self.factor is None:
+            raise Exception(f'A factor must be provided for {self} -> STOP')
+        n_window_dates = len([date for date in uc_dates if self.start_date <= date < self.end_date])
+        if not np.isscalar(self.factor) and len(self.factor) != n_window_dates:
+            raise Exception(f'Factor profile of {self} must have one value per time-slot of its window '
+                            f'({n_window_dates}); not {len(self.factor)} -> STOP')
+
+    def get_country_trigrams(self) -> List[str]:
+        return [set_country_trigram(country=country) for country in self.countries]
+
+    def get_window_factors(self, snapshots: pd.DatetimeIndex) -> np.ndarray:
+        factors = np.ones(len(snapshots))
+        factors[(snapshots >= self.start_date) & (snapshots < self.end_date)] = self.factor
+        return factors
+
+    @abstractmethod
+    def get_initial_values(self, pypsa_model: PypsaModel) -> STRESS_TEST_VALUES_TYPE:
+        """
+        Values of the attributes modified by this stress test, for the concerned assets - before its application
+        """
+
+    @abstractmethod
+    def set_values(self, pypsa_model: PypsaModel, values: STRESS_TEST_VALUES_TYPE):
+        """
+        Set values of the attributes modified by this stress test, in network data and in the built model
+        """
 
     def apply(self, pypsa_model: PypsaModel) -> PypsaModel:
         """
         Apply stress test to PypsaModel -> on generators, interconnections, etc.
         """
-        logging.info(f'Apply stress test {self.name} on PyPSA model {pypsa_model.name}')
+        logging.info(f'Apply {self} on PyPSA model {pypsa_model.name}')
+        self.initial_values = self.get_initial_values(pypsa_model=pypsa_model)
+        if len(self.initial_values) == 0:
+            logging.warning(f'No asset of PyPSA model {pypsa_model.name} concerned by {self} -> no change applied')
+            return pypsa_model
+        factors = self.get_window_factors(snapshots=pypsa_model.network.snapshots)
+        self.set_values(pypsa_model=pypsa_model,
+                        values={key: values.mul(factors, axis=0) for key, values in self.initial_values.items()})
         return pypsa_model
+
+    def revert(self, pypsa_model: PypsaModel) -> PypsaModel:
+        """
+        Set back values of PypsaModel before application of this stress test
+        """
+        if self.initial_values is not None and len(self.initial_values) > 0:
+            logging.info(f'Revert {self} on PyPSA model {pypsa_model.name}')
+            self.set_values(pypsa_model=pypsa_model, values=self.initial_values)
+        self.initial_values = None
+        return pypsa_model
+
+
+class PerUnitBoundsStressTest(StressTest):
+    """
+    Stress test on per unit bounds (p_min_pu and p_max_pu) of some assets - both scaled, to keep them coherent
+    """
+    @abstractmethod
+    def get_per_component_assets(self, pypsa_model: PypsaModel) -> Dict[str, List[str]]:
+        """
+        Names of the assets concerned by this stress test, per PyPSA component
+        """
+
+    def get_initial_values(self, pypsa_model: PypsaModel) -> STRESS_TEST_VALUES_TYPE:
+        network = pypsa_model.network
+        initial_values = {}
+        for component, asset_names in self.get_per_component_assets(pypsa_model=pypsa_model).items():
+            if len(asset_names) == 0:
+                continue
+            for attr_name in ['p_min_pu', 'p_max_pu']:
+                initial_values[(component, attr_name)] = \
+                    get_switchable_as_dense(network, component, attr_name, network.snapshots,
+                                            inds=pd.Index(asset_names))
+        return initial_values
+
+    def set_values(self, pypsa_model: PypsaModel, values: STRESS_TEST_VALUES_TYPE):
+        for component in {component for component, _ in values}:
+            pypsa_model.set_per_unit_bounds_in_model(component=component,
+                                                     p_min_pu=values[(component, 'p_min_pu')],
+                                                     p_max_pu=values[(component, 'p_max_pu')])
+
+    def get_unit_names(self, pypsa_model: PypsaModel, component: str,
+                       per_country_prod_types: Dict[str, List[str]]) -> List[str]:
+        unit_names = [set_gen_unit_name(country=country, agg_prod_type=prod_type)
+                      for country in self.countries for prod_type in per_country_prod_types.get(country, [])]
+        return [name for name in unit_names if name in pypsa_model.network.static(component).index]
+
+
+class UnitOutage(PerUnitBoundsStressTest):
+    """
+    Outage of generation/storage units - availability reduced to factor (0 for a full outage) over the window
+    """
+    type = STRESS_TEST_TYPES.unit_outage
+    default_factor = 0.
+
+    def process(self, all_countries: List[str], uc_dates: List[datetime]):
+        super().process(all_countries=all_countries, uc_dates=uc_dates)
+        if self.per_country_prod_types is None:
+            raise Exception(f'Per country prod. types of the units in outage must be provided for {self} -> STOP')
+
+    def get_per_component_assets(self, pypsa_model: PypsaModel) -> Dict[str, List[str]]:
+        return {component: self.get_unit_names(pypsa_model=pypsa_model, component=component,
+                                               per_country_prod_types=self.per_country_prod_types)
+                for component in ['Generator', 'StorageUnit']}
+
+
+class ResDrought(PerUnitBoundsStressTest):
+    """
+    Capacity factors of RES generators scaled by factor - possibly a profile - over the window
+    """
+    type = STRESS_TEST_TYPES.res_drought
+
+    def get_per_component_assets(self, pypsa_model: PypsaModel) -> Dict[str, List[str]]:
+        per_country_prod_types = self.per_country_prod_types if self.per_country_prod_types is not None \
+            else {country: RES_DROUGHT_DEFAULT_PROD_TYPES for country in self.countries}
+        return {'Generator': self.get_unit_names(pypsa_model=pypsa_model, component='Generator',
+                                                 per_country_prod_types=per_country_prod_types)}
+
+
+class IntercoDerating(PerUnitBoundsStressTest):
+    """
+    Capacity of the interconnections between countries - in both directions - scaled by factor over the window
+    (equivalent to a p_nom derating if the window is the whole UC period)
+    """
+    type = STRESS_TEST_TYPES.interco_derating
+    default_factor = 0.
+
+    def get_per_component_assets(self, pypsa_model: PypsaModel) -> Dict[str, List[str]]:
+        links = pypsa_model.network.links
+        country_trigrams = self.get_country_trigrams()
+        return {'Link': list(links.index[links[f'{GEN_UNITS_PYPSA_PARAMS.bus}0'].isin(country_trigrams)
+                                         & links[f'{GEN_UNITS_PYPSA_PARAMS.bus}1'].isin(country_trigrams)])}
+
+
+class DemandScaling(StressTest):
+    """
+    Demand of countries scaled by factor over the window
+    """
+    type = STRESS_TEST_TYPES.demand_scaling
+
+    def get_initial_values(self, pypsa_model: PypsaModel) -> STRESS_TEST_VALUES_TYPE:
+        network = pypsa_model.network
+        load_names = network.loads.index[network.loads[GEN_UNITS_PYPSA_PARAMS.bus].isin(self.get_country_trigrams())]
+        if len(load_names) == 0:
+            return {}
+        return {('Load', 'p_set'): get_switchable_as_dense(network, 'Load', 'p_set', network.snapshots,
+                                                           inds=load_names)}
+
+    def set_values(self, pypsa_model: PypsaModel, values: STRESS_TEST_VALUES_TYPE):
+        pypsa_model.set_loads_in_model(p_set=values[('Load', 'p_set')])
+
+
+STRESS_TEST_CLASSES = {stress_test_class.type: stress_test_class
+                       for stress_test_class in [UnitOutage, ResDrought, IntercoDerating, DemandScaling]}
+
+
+def set_stress_tests(params: StressTestsParams) -> List[StressTest]:
+    return [STRESS_TEST_CLASSES[stress_test['type']](**{key: val for key, val in stress_test.items() if key != 'type'})
+            for stress_test in params.stress_tests]
+
+
+@dataclass
+class StressTestImpactCols:
+    rank: str = 'rank'
+    stress_test: str = 'stress_test'
+    type: str = 'type'
+    ens: str = 'ens'  # GWh
+    ens_impact: str = 'ens_impact'
+    n_failure_hours: str = 'n_failure_hours'
+    n_failure_hours_impact: str = 'n_failure_hours_impact'
+    operational_cost_impact: str = 'operational_cost_impact'
+    most_impacted_country: str = 'most_impacted_country'  # with the max. ENS impact
+
+
+STRESS_TEST_IMPACT_COLS = StressTestImpactCols()
+
+
+@dataclass
+class StressTestRunResults:
+    uc_summary_metrics: UCSummaryMetrics
+    # ENS (MWh) per country (bus name), not rounded - as the one of UC summary metrics (whole GWh) - for small
+    # impacts to be ranked
+    per_country_ens: Dict[str, float]
+
+
+def get_per_country_ens(prod_var_opt: pd.DataFrame) -> Dict[str, float]:
+    return {col[:-len(FAILURE_UNIT_SUFFIX)]: float(prod_var_opt[col].sum()) for col in prod_var_opt.columns
+            if col.endswith(FAILURE_UNIT_SUFFIX)}
+
+
+def solve_stress_tests_base_model(pypsa_model: PypsaModel, failure_penalty: float) -> StressTestRunResults:
+    """
+    Solve the model without stress test, saving its optimal basis to warm-start the re-solves with stress tests
+    """
+    snapshots = pypsa_model.network.snapshots
+    result = pypsa_model.optimize_network(year=snapshots[0].year, n_countries=len(pypsa_model.get_bus_names()),
+                                          period_start=snapshots[0], save_lp_file=False, save_basis=True)
+    if result[1] != OPTIM_RESOL_STATUS.optimal:
+        raise Exception(f'UC problem without stress test not solved to optimality (status {result[1]}) -> STOP')
+    objective_value = pypsa_model.get_opt_value(pypsa_resol_status=result[1])
+    pypsa_model.get_prod_var_opt()
+    pypsa_model.set_uc_summary_metrics(total_cost=objective_value, failure_penalty=failure_penalty)
+    return StressTestRunResults(uc_summary_metrics=pypsa_model.uc_summary_metrics,
+                                per_country_ens=get_per_country_ens(prod_var_opt=pypsa_model.prod_var_opt))
+
+
+def evaluate_stress_tests_batch(pypsa_model: PypsaModel, stress_tests: List[StressTest], failure_penalty: float) \
+        -> Tuple[StressTestRunResults, List[Optional[StressTestRunResults]]]:
+    """
+    Solve the model without stress test, then re-solve it with each stress test successively - each one being
+    reverted before the next one
+    :returns: results without stress test, and with each stress test (None if not optimal)
+    """
+    try:
+        base_results = solve_stress_tests_base_model(pypsa_model=pypsa_model, failure_penalty=failure_penalty)
+        per_test_results = []
+        for stress_test in stress_tests:
+            stress_test.apply(pypsa_model=pypsa_model)
+            try:
+                uc_summary_metrics = pypsa_model.resolve(failure_penalty=failure_penalty)
+                per_test_results.append(
+                    StressTestRunResults(uc_summary_metrics=uc_summary_metrics,
+                                         per_country_ens=get_per_country_ens(prod_var_opt=pypsa_model.prod_var_opt))
+                    if uc_summary_metrics is not None else None
+                )
+            finally:
+                stress_test.revert(pypsa_model=pypsa_model)
+    finally:
+        pypsa_model.delete_basis_file()
+    return base_results, per_test_results
+
+
+def set_stress_test_impacts(stress_tests: List[StressTest], base_results: StressTestRunResults,
+                            per_test_results: List[Optional[StressTestRunResults]]) -> pd.DataFrame:
+    """
+    Impacts of stress tests w.r.t. the model without stress test, ranked by decreasing ENS impact - stress tests
+    whose re-solve is not optimal being last, with NaN impacts
+    N.B. ENS (impacts) in GWh, from unrounded ENS - for small impacts not to be truncated to 0
+    """
+    cols = STRESS_TEST_IMPACT_COLS
+    base_uc_summary_metrics = base_results.uc_summary_metrics
+    base_ens = base_results.per_country_ens
+    base_n_failure_hours = base_uc_summary_metrics.per_country_n_failure_hours
+    rows = []
+    for stress_test, results in zip(stress_tests, per_test_results):
+        row = {cols.stress_test: stress_test.name, cols.type: stress_test.type}
+        if results is not None:
+            uc_summary_metrics = results.uc_summary_metrics
+            per_country_ens_impact = {country: (ens - base_ens.get(country, 0)) / 1e3
+                                      for country, ens in results.per_country_ens.items()}
+            most_impacted_country = max(per_country_ens_impact, key=per_country_ens_impact.get)
+            total_n_failure_hours = sum(uc_summary_metrics.per_country_n_failure_hours.values())
+            row |= {cols.ens: sum(results.per_country_ens.values()) / 1e3,
+                    cols.ens_impact: sum(per_country_ens_impact.values()),
+                    cols.n_failure_hours: total_n_failure_hours,
+                    cols.n_failure_hours_impact: total_n_failure_hours - sum(base_n_failure_hours.values()),
+                    cols.operational_cost_impact: uc_summary_metrics.total_operational_cost
+                    - base_uc_summary_metrics.total_operational_cost,
+                    cols.most_impacted_country: most_impacted_country
+                    if per_country_ens_impact[most_impacted_country] > 0 else None}
+        rows.append(row)
+    impacts = pd.DataFrame(rows, columns=[col for col in cols.__dict__.values() if col != cols.rank])
+    impacts = impacts.sort_values(by=[cols.ens_impact, cols.operational_cost_impact], ascending=False,
+                                  na_position='last')
+    impacts.index = pd.RangeIndex(start=1, stop=len(impacts) + 1, name=cols.rank)
+    return impacts
+
+
+def evaluate_stress_tests(pypsa_model: PypsaModel, stress_tests: List[StressTest], failure_penalty: float,
+                          n_workers: int = 1, log_level: str = 'info') -> pd.DataFrame:
+    """
+    Evaluate stress tests on a built PyPSA model - with its solver set -, in a pool of n_workers processes if
+    n_workers > 1 - their logs being merged into the ones of current process through a queue
+    N.B. each worker solves the model without stress test once (from a copy of the network), then re-solves it
+    warm-started for each stress test of its batch
+    :returns: ranked table of stress test impacts
+    """
+    n_workers = min(n_workers, len(stress_tests))
+    logging.info(f'Evaluate {len(stress_tests)} stress test(s): {[stress_test.name for stress_test in stress_tests]}')
+    if n_workers <= 1:
+        base_results, per_test_results = evaluate_stress_tests_batch(pypsa_model=pypsa_model,
+                                                                     stress_tests=stress_tests,
+                                                                     failure_penalty=failure_penalty)
+    else:
+        logging.info(f'Run stress tests in a pool of {n_workers} processes')
+        # N.B. network copy without (linopy) model, to be sent to workers - solver model of an already solved
+        # network having to be dropped for it to be copied
+        if pypsa_model.network.is_solved and hasattr(pypsa_model.network.model, 'solver_model'):
+            del pypsa_model.network.model.solver_model
+        worker_model = PypsaModel(name=pypsa_model.name, network=pypsa_model.network.copy(),
+                                  optim_solver_params=pypsa_model.optim_solver_params)
+        batches = [stress_tests[i_worker::n_workers] for i_worker in range(n_workers)]
+        per_test_results = [None] * len(stress_tests)
+        with logged_process_pool(n_workers=n_workers, log_level=log_level) as executor:
+            futures = [executor.submit(evaluate_stress_tests_batch, pypsa_model=worker_model, stress_tests=batch,
+                                       failure_penalty=failure_penalty) for batch in batches]
+            for i_worker, future in enumerate(futures):
+                base_results, per_test_results[i_worker::n_workers] = future.result()
+    return set_stress_test_impacts(stress_tests=stress_tests, base_results=base_results,
+                                   per_test_results=per_test_results)
@@ -0,0 +1,464 @@
+import logging
+import os
+import string
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+from common.constants.datatypes import DATATYPE_NAMES
+from common.constants.eraa_data import ERAAParamNames
+from common.constants.extract_eraa_data import FICTIVE_CALENDAR_YEAR
+from common.long_term_uc_io import COLUMN_NAMES, DATE_FORMAT, DT_FILE_PREFIX, DT_SUBFOLDERS, FILES_FORMAT, \
+    HYDRO_FILES, HYDRO_VALUE_COLUMNS, INTERCO_STR_SEP, OUTPUT_SYNTHETIC_DATA_FOLDER, \
+    get_synthetic_eraa_avail_values_file, get_synthetic_gps_coordinates_file
+from utils.eraa_data_reader import gen_capa_pt_str_sanitizer
+from utils.write import json_dump
+
+N_HOURS_IN_YEAR = 8760
+N_DAYS_IN_YEAR = 365
+N_WEEKS_IN_HYDRO_DATA = 53  # as in ERAA (PECD) hydro data; the last week being dropped when read
+N_ZONE_CODE_LETTERS = 3  # zone names must have distinct trigrams, used as country keys hereafter
+ZONE_NAME_SUFFIX = '-zone'
+DEFAULT_SYNTHETIC_CLIMATIC_YEARS = [1982, 1989, 1996, 2003, 2010, 2016]
+DEFAULT_SYNTHETIC_TARGET_YEARS = [2025]
+# box in which zones are randomly located (lon. min, lon. max, lat. min, lat. max) - roughly the one of Europe
+ZONES_GPS_BOX = (-10.0, 30.0, 36.0, 65.0)
+MEAN_DEMAND_RANGE = (5000, 60000)  # MW
+DEMAND_GROWTH_PER_YEAR = 0.01
+FIRST_DAY_IS_MONDAY = True  # 1900, Jan. 1st
+# ERAA production type labels - as in generation capa. files - for each aggreg. prod. type
+RAW_GEN_CAPA_PROD_TYPES = {'batteries': 'Batteries', 'biofuel': 'Biofuel', 'coal': 'Hard Coal',
+                           'dsr': 'Demand Side Response capacity', 'gas': 'Gas ', 'hydro_pondage': 'Hydro - Pondage',
+                           'hydro_pump_storage_closed_loop': 'Hydro - Pump Storage Closed Loop',
+                           'hydro_pump_storage_open_loop': 'Hydro - Pump Storage Open Loop',
+                           'hydro_reservoir': 'Hydro - Reservoir', 'hydro_run_of_river': 'Hydro - Run of River',
+                           'nuclear': 'Nuclear', 'oil': 'Oil', 'others_fatal': 'Others non-renewable',
+                           'solar_pv': 'Solar PV', 'solar_thermal': 'Solar Thermal', 'wind_offshore': 'Wind Offshore',
+                           'wind_onshore': 'Wind Onshore'}
+GEN_CAPA_COLS = [ERAAParamNames.power_capacity, ERAAParamNames.power_capacity_turbine,
+                 ERAAParamNames.power_capacity_pumping, ERAAParamNames.power_capacity_injection,
+                 ERAAParamNames.power_capacity_offtake, ERAAParamNames.energy_capacity]
+HYDRO_STORAGE_PROD_TYPES = ['hydro_pondage', 'hydro_reservoir', 'hydro_pump_storage_closed_loop',
+                            'hydro_pump_storage_open_loop']
+
+
+@dataclass
+class SyntheticCapaParams:
+    share_of_mean_demand: float  # mean capacity, relative to mean demand of the zone
+    presence_proba: float = 1.0  # probability that a zone has this prod. type
+    # energy capa./power capa. (h) for storage-like assets; None for the other ones
+    max_hours: float = None
+
+
+# orders of magnitude of the ERAA zones; turbine (resp. injection) power capacity for hydro (resp. batteries)
+SYNTHETIC_CAPA_PARAMS = {
+    'batteries': SyntheticCapaParams(share_of_mean_demand=0.03, presence_proba=0.8, max_hours=2),
+    'biofuel': SyntheticCapaParams(share_of_mean_demand=0.03, presence_proba=0.5),
+    'coal': SyntheticCapaParams(share_of_mean_demand=0.2, presence_proba=0.5),
+    'dsr': SyntheticCapaParams(share_of_mean_demand=0.05, presence_proba=0.8),
+    'gas': SyntheticCapaParams(share_of_mean_demand=0.7),
+    'hydro_pondage': SyntheticCapaParams(share_of_mean_demand=0.02, presence_proba=0.2, max_hours=14),
+    'hydro_pump_storage_closed_loop': SyntheticCapaParams(share_of_mean_demand=0.04, presence_proba=0.6, max_hours=6),
+    'hydro_pump_storage_open_loop': SyntheticCapaParams(share_of_mean_demand=0.04, presence_proba=0.5, max_hours=50),
+    'hydro_reservoir': SyntheticCapaParams(share_of_mean_demand=0.15, presence_proba=0.5, max_hours=1000),
+    'hydro_run_of_river': SyntheticCapaParams(share_of_mean_demand=0.08, presence_proba=0.8),
+    'nuclear': SyntheticCapaParams(share_of_mean_demand=0.6, presence_proba=0.5),
+    'oil': SyntheticCapaParams(share_of_mean_demand=0.03, presence_proba=0.6),
+    'others_fatal': SyntheticCapaParams(share_of_mean_demand=0.05),
+    'solar_pv': SyntheticCapaParams(share_of_mean_demand=0.6),
+    'solar_thermal': SyntheticCapaParams(share_of_mean_demand=0.03, presence_proba=0.2),
+    'wind_offshore': SyntheticCapaParams(share_of_mean_demand=0.15, presence_proba=0.5),
+    'wind_onshore': SyntheticCapaParams(share_of_mean_demand=0.5)
+}
+# capa. factors: mean and (weather) variability per raw prod. type with CF data
+WIND_CF_PARAMS = {'wind_onshore': (-1.3, 1.1), 'wind_offshore': (0.0, 1.4)}  # (offset, scale) in logistic function
+SOLAR_CF_PEAKS = {'solar_pv': 0.85, 'csp_nostorage': 0.7}
+
+
+@dataclass
+class RngStreams:
+    zone: int = 0
+    gen_capas: int = 1
+    intercos: int = 2
+    demand: int = 3
+    hydro: int = 4
+    capa_factors: int = 5  # + index of the raw prod. type in RES CF def.
+
+
+RNG_STREAMS = RngStreams()
+
+
+def get_zone_names(n_zones: int) -> List[str]:
+    """
+    Synthetic zone names, e.g. 'aab-zone', with distinct first 3 letters
+    """
+    letters = string.ascii_lowercase
+    max_n_zones = len(letters) ** N_ZONE_CODE_LETTERS
+    if n_zones > max_n_zones:
+        raise Exception(f'Number of synthetic zones {n_zones} above max. number {max_n_zones} -> STOP')
+    return [''.join(code) + ZONE_NAME_SUFFIX
+            for code in list(product(letters, repeat=N_ZONE_CODE_LETTERS))[:n_zones]]
+
+
+def get_ar1_series(rng: np.random.Generator, n: int, phi: float) -> np.ndarray:
+    """
+    Stationary AR(1) series with unit variance
+    :param phi: auto-correlation coeff., between consecutive time-slots
+    """
+    innovations = rng.standard_normal(n) * np.sqrt(1 - phi ** 2)
+    # first value drawn in stationary distrib.
+    innovations[0] /= np.sqrt(1 - phi ** 2)
+    return lfilter([1.0], [1.0, -phi], innovations)
+
+
+@dataclass
+class SyntheticDataParams:
+    n_zones: int
+    climatic_years: List[int] = field(default_factory=lambda: list(DEFAULT_SYNTHETIC_CLIMATIC_YEARS))
+    target_years: List[int] = field(default_factory=lambda: list(DEFAULT_SYNTHETIC_TARGET_YEARS))
+    # aggreg. prod. types that may be installed in the zones; all the ones of generation capas data if None
+    agg_prod_types: List[str] = None
+    n_hours: int = N_HOURS_IN_YEAR  # from the start of fictive calendar year
+    n_neighbours: int = 3  # each zone being interconnected to its nearest neighbours
+    seed: int = 0
+    output_folder: str = None
+
+    def process(self):
+        if self.agg_prod_types is None:
+            self.agg_prod_types = list(SYNTHETIC_CAPA_PARAMS)
+        if self.output_folder is None:
+            n_cys = len(self.climatic_years)
+            self.output_folder = os.path.join(OUTPUT_SYNTHETIC_DATA_FOLDER,
+                                              f'{self.n_zones}-zones_{n_cys}-cys_{self.n_hours}h_seed-{self.seed}')
+
+    def coherence_check(self, aggreg_prod_types_def: Dict[str, Dict[str, List[str]]]):
+        """
+        :param aggreg_prod_types_def: the one of JSON fixed params, the synthetic data being read with it
+        """
+        errors_list = []
+        if self.n_zones < 1:
+            errors_list.append(f'Number of zones must be positive; but value read {self.n_zones}')
+        if not (24 <= self.n_hours <= N_HOURS_IN_YEAR):
+            errors_list.append(f'Number of hours must be in [24, {N_HOURS_IN_YEAR}]; but value read {self.n_hours}')
+        unknown_agg_pts = list(set(self.agg_prod_types) - set(SYNTHETIC_CAPA_PARAMS))
+        if len(unknown_agg_pts) > 0:
+            errors_list.append(f'Unknown aggreg. prod. types for synthetic data: {unknown_agg_pts}')
+        # check that raw ERAA labels are read back as the expected aggreg. prod. types
+        gen_capa_def = aggreg_prod_types_def[DT_SUBFOLDERS.generation_capas]
+        for agg_pt, raw_pt in RAW_GEN_CAPA_PROD_TYPES.items():
+            if gen_capa_pt_str_sanitizer(gen_capa_prod_type=raw_pt) not in gen_capa_def.get(agg_pt, []):
+                errors_list.append(f'Raw prod. type {raw_pt} not part of aggreg. prod. type {agg_pt} def.')
+        if len(errors_list) > 0:
+            raise Exception(f'Incoherent synthetic data params: {errors_list} -> STOP')
+
+
+@dataclass
+class SyntheticZone:
+    name: str
+    gps_coords: Tuple[float, float]
+    mean_demand: float
+    # {target year: {aggreg. prod. type: {ERAA capa. param name: value}}} - only installed prod. types
+    gen_capas: Dict[int, Dict[str, Dict[str, float]]] = field(default_factory=dict)
+
+    def get_turbine_capa(self, year: int, agg_pt: str) -> float:
+        return self.gen_capas[year].get(agg_pt, {}).get(ERAAParamNames.power_capacity_turbine, 0)
+
+
+class SyntheticERAADataGenerator:
+    """
+    Synthetic but realistic-looking dataset, with the ERAA data layout read by Dataset: demand, RES capa. factors,
+    generation and interco. capas, (PECD) hydro files and JSON available values - for benchmarks with any number
+    of zones, climatic years and hours
+    """
+    def __init__(self, params: SyntheticDataParams, aggreg_prod_types_def: Dict[str, Dict[str, List[str]]]):
+        self.params = params
+        self.aggreg_prod_types_def = aggreg_prod_types_def
+        self.zones: List[SyntheticZone] = []
+        self.intercos: Dict[Tuple[str, str], float] = {}
+        self.hourly_dates = pd.date_range(start=f'{FICTIVE_CALENDAR_YEAR}-01-01', periods=params.n_hours,
+                                          freq='h').strftime(DATE_FORMAT)
+        self.hours = np.arange(params.n_hours)
+
+    def get_rng(self, stream: int, zone_idx: int = 0, year: int = 0) -> np.random.Generator:
+        """
+        Random generator specific to a (stream, zone idx, target/climatic year) case -> data of a case does not
+        depend on the number of zones or climatic years generated
+        N.B. fixed-length keys, seed sequences with trailing zeros giving the same streams
+        """
+        return np.random.default_rng([self.params.seed, stream, zone_idx, year])
+
+    def generate(self) -> str:
+        """
+        :returns: folder of generated data
+        """
+        logging.info(f'Generate synthetic ERAA-like data, for {self.params.n_zones} zones, '
+                     f'{len(self.params.climatic_years)} climatic years and {self.params.n_hours} hours, '
+                     f'in {self.params.output_folder}')
+        for subfolder in [DT_SUBFOLDERS.demand, DT_SUBFOLDERS.res_capa_factors, DT_SUBFOLDERS.generation_capas,
+                          DT_SUBFOLDERS.interco_capas, DT_SUBFOLDERS.hydro]:
+            os.makedirs(os.path.join(self.params.output_folder, subfolder), exist_ok=True)
+        self.set_zones()
+        self.set_intercos()
+        for zone_idx, zone in enumerate(self.zones):
+            logging.debug(f'- zone {zone.name}')
+            self.write_demand(zone_idx=zone_idx, zone=zone)
+            self.write_capa_factors(zone_idx=zone_idx, zone=zone)
+            self.write_gen_capas(zone=zone)
+        self.write_interco_capas()
+        self.write_hydro_data()
+        self.write_avail_values_and_gps_coordinates()
+        return self.params.output_folder
+
+    def set_zones(self):
+        lon_min, lon_max, lat_min, lat_max = ZONES_GPS_BOX
+        for zone_idx, zone_name in enumerate(get_zone_names(n_zones=self.params.n_zones)):
+            rng = self.get_rng(stream=RNG_STREAMS.zone, zone_idx=zone_idx)
+            zone = SyntheticZone(name=zone_name,
+                                 gps_coords=(round(rng.uniform(lon_min, lon_max), 4),
+                                             round(rng.uniform(lat_min, lat_max), 4)),
+                                 mean_demand=rng.uniform(*MEAN_DEMAND_RANGE))
+            # same installed prod. types over target years, with capacities drawn per year
+            installed_agg_pts = [agg_pt for agg_pt in self.params.agg_prod_types
+                                 if rng.uniform() < SYNTHETIC_CAPA_PARAMS[agg_pt].presence_proba]
+            for year in self.params.target_years:
+                year_rng = self.get_rng(stream=RNG_STREAMS.gen_capas, zone_idx=zone_idx, year=year)
+                zone.gen_capas[year] = {agg_pt: self.get_capa_values(rng=year_rng, agg_pt=agg_pt,
+                                                                     mean_demand=zone.mean_demand)
+                                        for agg_pt in installed_agg_pts}
+            self.zones.append(zone)
+
+    @staticmethod
+    def get_capa_values(rng: np.random.Generator, agg_pt: str, mean_demand: float) -> Dict[str, float]:
+        capa_params = SYNTHETIC_CAPA_PARAMS[agg_pt]
+        power_capa = round(capa_params.share_of_mean_demand * mean_demand * rng.uniform(0.5, 1.5))
+        capa_values = {capa_col: 0.0 for capa_col in GEN_CAPA_COLS}
+        if agg_pt == 'batteries':
+            capa_values[ERAAParamNames.power_capacity_injection] = power_capa
+            capa_values[ERAAParamNames.power_capacity_offtake] = power_capa
+        elif agg_pt in HYDRO_STORAGE_PROD_TYPES or agg_pt == 'hydro_run_of_river':
+            capa_values[ERAAParamNames.power_capacity_turbine] = power_capa
+            if agg_pt.startswith('hydro_pump_storage'):
+                capa_values[ERAAParamNames.power_capacity_pumping] = -power_capa
+        else:
+            capa_values[ERAAParamNames.power_capacity] = power_capa
+        if capa_params.max_hours is not None:
+            capa_values[ERAAParamNames.energy_capacity] = power_capa * capa_params.max_hours
+        return capa_values
+
+    def set_intercos(self):
+        """
+        Interconnect each zone to its nearest neighbours, in both directions
+        """
+        if len(self.zones) < 2:
+            return
+        coords = np.array([zone.gps_coords for zone in self.zones])
+        distances = np.linalg.norm(coords[:, None, :] - coords[None, :, :], axis=2)
+        np.fill_diagonal(distances, np.inf)
+        n_neighbours = min(self.params.n_neighbours, len(self.zones) - 1)
+        rng = self.get_rng(stream=RNG_STREAMS.intercos)
+        for zone_idx, neighbour_idxs in enumerate(np.argsort(distances, axis=1)[:, :n_neighbours]):
+            for neighbour_idx in neighbour_idxs:
+                zone_pair = tuple(sorted([self.zones[zone_idx].name, self.zones[neighbour_idx].name]))
+                if zone_pair in self.intercos:
+                    continue
+                min_mean_demand = min(self.zones[zone_idx].mean_demand, self.zones[neighbour_idx].mean_demand)
+                self.intercos[zone_pair] = round(rng.uniform(0.05, 0.25) * min_mean_demand, -2)
+
+    def write_climatic_years_csv(self, values_per_cy: Dict[int, np.ndarray], csv_file: str, float_format: str):
+        """
+        Hourly values of all climatic years, stacked, in ERAA format
+        """
+        n_hours = self.params.n_hours
+        df = pd.DataFrame({COLUMN_NAMES.climatic_year: np.repeat(list(values_per_cy), n_hours),
+                           COLUMN_NAMES.date: np.tile(self.hourly_dates, len(values_per_cy)),
+                           COLUMN_NAMES.value: np.concatenate(list(values_per_cy.values()))})
+        df.to_csv(csv_file, sep=FILES_FORMAT.column_sep, decimal=FILES_FORMAT.decimal_sep, index=False,
+                  float_format=float_format)
+
+    def get_demand_profile(self, zone_idx: int, climatic_year: int, mean_demand: float) -> np.ndarray:
+        """
+        Seasonal, weekly and daily shapes, and a persistent weather-driven noise
+        """
+        hours = self.hours
+        day_idx = hours // 24
+        hour_of_day = hours % 24
+        seasonal = 1 + 0.2 * np.cos(2 * np.pi * (day_idx - 15) / N_DAYS_IN_YEAR)
+        daily = (1 + 0.12 * np.sin(2 * np.pi * (hour_of_day - 6) / 24)
+                 + 0.05 * np.sin(4 * np.pi * (hour_of_day - 3) / 24))
+        day_of_week = day_idx % 7 if FIRST_DAY_IS_MONDAY else (day_idx + 1) % 7
+        weekly = np.where(day_of_week >= 5, 0.88, 1.0)
+        weather = get_ar1_series(rng=self.get_rng(stream=RNG_STREAMS.demand, zone_idx=zone_idx, year=climatic_year),
+                                 n=len(hours), phi=0.995)
+        return mean_demand * seasonal * daily * weekly * (1 + 0.05 * weather)
+
+    def write_demand(self, zone_idx: int, zone: SyntheticZone):
+        for year in self.params.target_years:
+            year_mean_demand = zone.mean_demand * (1 + DEMAND_GROWTH_PER_YEAR * (year - self.params.target_years[0]))
+            demand_per_cy = {cy: np.round(self.get_demand_profile(zone_idx=zone_idx, climatic_year=cy,
+                                                                  mean_demand=year_mean_demand)).astype(int)
+                             for cy in self.params.climatic_years}
+            demand_file = os.path.join(self.params.output_folder, DT_SUBFOLDERS.demand,
+                                       f'{DT_FILE_PREFIX.demand}_{year}_{zone.name}.csv')
+            self.write_climatic_years_csv(values_per_cy=demand_per_cy, csv_file=demand_file, float_format='%d')
+
+    def get_solar_cf(self, rng: np.random.Generator, latitude: float, peak_cf: float) -> np.ndarray:
+        """
+        Daylight bell shape - with day length depending on season and latitude - times a daily cloudiness factor
+        """
+        hours = self.hours
+        day_idx = hours // 24
+        hour_of_day = hours % 24 + 0.5
+        # summer solstice around June 21st (day 172)
+        day_length = 12 + (4 + 4 * (latitude - 36) / 29) * np.cos(2 * np.pi * (day_idx - 172) / N_DAYS_IN_YEAR)
+        sunrise = 12 - day_length / 2
+        daylight = np.clip(np.sin(np.pi * (hour_of_day - sunrise) / day_length), 0, None) \
+            * ((hour_of_day > sunrise) & (hour_of_day < sunrise + day_length))
+        n_days = day_idx[-1] + 1
+        clearness = np.clip(0.65 + 0.3 * get_ar1_series(rng=rng, n=n_days, phi=0.7), 0.1, 1)[day_idx]
+        return peak_cf * daylight * clearness
+
+    def get_wind_cf(self, rng: np.random.Generator, offset: float, scale: float) -> np.ndarray:
+        """
+        Persistent weather regime (AR(1) with ~2 days memory) with more wind in winter, through a logistic function
+        """
+        seasonal = 0.4 * np.cos(2 * np.pi * (self.hours // 24 - 15) / N_DAYS_IN_YEAR)
+        weather = get_ar1_series(rng=rng, n=len(self.hours), phi=0.98)
+        return 1 / (1 + np.exp(-(offset + seasonal + scale * weather)))
+
+    def write_capa_factors(self, zone_idx: int, zone: SyntheticZone):
+        cf_def = self.aggreg_prod_types_def[DT_SUBFOLDERS.res_capa_factors]
+        # CF data written for all years, if prod. type installed in at least one of them
+        installed_agg_pts = set().union(*[zone.gen_capas[year] for year in self.params.target_years])
+        raw_pts = [(agg_pt, raw_pt) for agg_pt, raw_pts in cf_def.items() for raw_pt in raw_pts]
+        for raw_pt_idx, (agg_pt, raw_pt) in enumerate(raw_pts):
+            if agg_pt not in installed_agg_pts:
+                continue
+            cf_per_cy = {}
+            for cy in self.params.climatic_years:
+                rng = self.get_rng(stream=RNG_STREAMS.capa_factors + raw_pt_idx, zone_idx=zone_idx, year=cy)
+                if raw_pt in WIND_CF_PARAMS:
+                    offset, scale = WIND_CF_PARAMS[raw_pt]
+                    cf_per_cy[cy] = self.get_wind_cf(rng=rng, offset=offset, scale=scale)
+                else:
+                    cf_per_cy[cy] = self.get_solar_cf(rng=rng, latitude=zone.gps_coords[1],
+                                                      peak_cf=SOLAR_CF_PEAKS.get(raw_pt, 0.8))
+            for year in self.params.target_years:
+                cf_file = os.path.join(self.params.output_folder, DT_SUBFOLDERS.res_capa_factors,
+                                       f'{DT_FILE_PREFIX.res_capa_factors}_{raw_pt}_{year}_{zone.name}.csv')
+                self.write_climatic_years_csv(values_per_cy=cf_per_cy, csv_file=cf_file, float_format='%.3f')
+
+    def write_gen_capas(self, zone: SyntheticZone):
+        for year in self.params.target_years:
+            # all ERAA prod. types in file, with zero capa. for not installed ones
+            gen_capa_rows = []
+            for agg_pt, raw_pt in RAW_GEN_CAPA_PROD_TYPES.items():
+                capa_values = zone.gen_capas[year].get(agg_pt, {capa_col: 0.0 for capa_col in GEN_CAPA_COLS})
+                gen_capa_rows.append({COLUMN_NAMES.zone: zone.name, COLUMN_NAMES.production_type: raw_pt}
+                                     | capa_values)
+            gen_capa_file = os.path.join(self.params.output_folder, DT_SUBFOLDERS.generation_capas,
+                                         f'{DT_FILE_PREFIX.generation_capas}_{year}_{zone.name}.csv')
+            pd.DataFrame(gen_capa_rows).to_csv(gen_capa_file, sep=FILES_FORMAT.column_sep,
+                                               decimal=FILES_FORMAT.decimal_sep, index=False, float_format='%.1f')
+
+    def write_interco_capas(self):
+        """
+        N.B. with zero capa. rows for non-interconnected zones, UC model needing a capa. value for each pair of
+        selected zones
+        """
+        interco_rows = []
+        zone_names = [zone.name for zone in self.zones]
+        for origin, destination in product(zone_names, zone_names):
+            if origin == destination:
+                continue
+            capa = self.intercos.get(tuple(sorted([origin, destination])), 0)
+            interco_rows.append({COLUMN_NAMES.zone_origin: origin, COLUMN_NAMES.zone_destination: destination,
+                                 'type': 'ac', COLUMN_NAMES.value: int(capa)})
+        df_intercos = pd.DataFrame(interco_rows, columns=[COLUMN_NAMES.zone_origin, COLUMN_NAMES.zone_destination,
+                                                          'type', COLUMN_NAMES.value])
+        for year in self.params.target_years:
+            interco_file = os.path.join(self.params.output_folder, DT_SUBFOLDERS.interco_capas,
+                                        f'{DT_FILE_PREFIX.interco_capas}_{year}.csv')
+            df_intercos.to_csv(interco_file, sep=FILES_FORMAT.column_sep, decimal=FILES_FORMAT.decimal_sep,
+                               index=False)
+
+    def write_hydro_data(self):
+        """
+        PECD-like files - same values for all target years, as in ERAA: daily RoR generation (GWh), weekly inflows
+        (GWh) and weekly min./max. reservoir levels (pu)
+        """
+        # N.B. hydro capas are taken from first target year
+        year = self.params.target_years[0]
+        days = np.arange(1, N_DAYS_IN_YEAR + 1)
+        weeks = np.arange(1, N_WEEKS_IN_HYDRO_DATA + 1)
+        # more water in spring (snow melting)
+        day_seasonality = 1 + 0.4 * np.cos(2 * np.pi * (days - 130) / N_DAYS_IN_YEAR)
+        week_seasonality = 1 + 0.6 * np.cos(2 * np.pi * (weeks - 19) / 52)
+        ror_dfs, inflow_dfs, levels_dfs = [], [], []
+        for zone_idx, zone in enumerate(self.zones):
+            ror_capa = zone.get_turbine_capa(year=year, agg_pt='hydro_run_of_river')
+            reservoir_capa = zone.get_turbine_capa(year=year, agg_pt='hydro_reservoir')
+            open_loop_capa = zone.get_turbine_capa(year=year, agg_pt='hydro_pump_storage_open_loop')
+            for cy in self.params.climatic_years:
+                rng = self.get_rng(stream=RNG_STREAMS.hydro, zone_idx=zone_idx, year=cy)
+                if ror_capa > 0:
+                    load_factor = np.clip(0.45 * day_seasonality
+                                          * (1 + 0.15 * get_ar1_series(rng=rng, n=len(days), phi=0.9)), 0.05, 0.95)
+                    # N.B. in PECD data, week column of daily RoR data contains the day index
+                    ror_dfs.append(pd.DataFrame({COLUMN_NAMES.zone: zone.name, COLUMN_NAMES.day: days,
+                                                 COLUMN_NAMES.week: days, COLUMN_NAMES.climatic_year: cy,
+                                                 COLUMN_NAMES.value: ror_capa * 24 * load_factor / 1000}))
+                if reservoir_capa > 0 or open_loop_capa > 0:
+                    weather = np.clip(1 + 0.2 * get_ar1_series(rng=rng, n=len(weeks), phi=0.6), 0.2, None)
+                    inflow_shape = 168 * week_seasonality * weather / 1000
+                    inflow_dfs.append(pd.DataFrame(
+                        {COLUMN_NAMES.zone: zone.name, COLUMN_NAMES.week: weeks, COLUMN_NAMES.climatic_year: cy}
+                        | dict(zip(HYDRO_VALUE_COLUMNS[DATATYPE_NAMES.hydro_inflows],
+                                   [0.3 * reservoir_capa * inflow_shape, 0.05 * open_loop_capa * inflow_shape]))
+                    ))
+            if reservoir_capa > 0:
+                # lowest levels at the end of winter
+                levels_seasonality = np.cos(2 * np.pi * (weeks - 14) / 52)
+                levels_dfs.append(pd.DataFrame({COLUMN_NAMES.zone: zone.name, COLUMN_NAMES.week: weeks,
+                                                COLUMN_NAMES.min_value: 0.25 - 0.1 * levels_seasonality,
+                                                COLUMN_NAMES.max_value: 0.85 - 0.1 * levels_seasonality}))
+        hydro_data = {DATATYPE_NAMES.hydro_ror: ror_dfs, DATATYPE_NAMES.hydro_inflows: inflow_dfs,
+                      DATATYPE_NAMES.hydro_levels_min: levels_dfs}
+        for hydro_dt, hydro_dfs in hydro_data.items():
+            # files not written if no zone with the corresponding hydro asset - as missing files handled in reader
+            if len(hydro_dfs) == 0:
+                continue
+            hydro_file = os.path.join(self.params.output_folder, DT_SUBFOLDERS.hydro, HYDRO_FILES[hydro_dt])
+            pd.concat(hydro_dfs, ignore_index=True).to_csv(hydro_file, sep=FILES_FORMAT.column_sep,
+                                                           decimal=FILES_FORMAT.decimal_sep, index=False,
+                                                           float_format='%.3f')
+
+    def write_avail_values_and_gps_coordinates(self):
+        avail_values = {
+            'climatic_years': self.params.climatic_years,
+            'countries': [zone.name for zone in self.zones],
+            'aggreg_prod_types': {zone.name: {str(year): list(zone.gen_capas[year])
+                                              for year in self.params.target_years}
+                                  for zone in self.zones},
+            'target_years': self.params.target_years,
+            'intercos': [f'{origin}{INTERCO_STR_SEP}{destination}' for zone_pair in self.intercos
+                         for origin, destination in [zone_pair, zone_pair[::-1]]],
+            'climatic_years_stress_test': []
+        }
+        json_dump(data=avail_values, filepath=get_synthetic_eraa_avail_values_file(self.params.output_folder))
+        json_dump(data={zone.name: list(zone.gps_coords) for zone in self.zones},
+                  filepath=get_synthetic_gps_coordinates_file(self.params.output_folder))
+
+
+def generate_synthetic_eraa_data(params: SyntheticDataParams,
+                                 aggreg_prod_types_def: Dict[str, Dict[str, List[str]]]) -> str:
+    """
+    :param aggreg_prod_types_def: of JSON fixed params
+    :returns: folder of generated data, to be used as Dataset data_folder
+    """
+    params.process()
+    params.coherence_check(aggreg_prod_types_def=aggreg_prod_types_def)
+    return SyntheticERAADataGenerator(params=params, aggreg_prod_types_def=aggreg_prod_types_def).generate()
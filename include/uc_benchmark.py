@@ -0,0 +1,200 @@
+import json
+import logging
+import os
+import platform
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from itertools import product
+from typing import Dict, List, Optional
+
+from common.constants.benchmark import BENCHMARK_MEMORY_MODES, BenchmarkParams
+from common.long_term_uc_io import get_benchmark_baseline_file, get_benchmark_results_file
+from utils.run_trace import PROFILING_MODES, RunTrace
+
+# to be incremented if the structure of benchmark results changes - results of another version not compared
+BENCHMARK_RESULTS_VERSION = 1
+BENCHMARK_PROFILING = {BENCHMARK_MEMORY_MODES.none: [], BENCHMARK_MEMORY_MODES.rss: [PROFILING_MODES.rss],
+                       BENCHMARK_MEMORY_MODES.full: [PROFILING_MODES.memory]}
+# memory stats compared to baseline: peak above memory at stage start, not to depend on previous cases
+MEMORY_METRICS = ['rss_peak_increase_mb', 'traced_peak_increase_mb']
+
+
+@dataclass
+class BenchmarkCase:
+    horizon: str
+    n_zones: int
+    n_climatic_years: int
+
+    @property
+    def name(self) -> str:
+        return f'{self.horizon}_{self.n_zones}-zones_{self.n_climatic_years}-cys'
+
+
+def set_benchmark_cases(params: BenchmarkParams) -> List[BenchmarkCase]:
+    return [BenchmarkCase(horizon=horizon, n_zones=n_zones, n_climatic_years=n_cys)
+            for horizon, n_zones, n_cys in product(params.horizons, params.n_zones, params.n_climatic_years)]
+
+
+def get_machine_info() -> dict:
+    return {'python_version': platform.python_version(), 'platform': platform.platform(),
+            'processor': platform.processor(), 'n_cpus': os.cpu_count()}
+
+
+def get_stage_results(run_traces: List[RunTrace]) -> Dict[str, dict]:
+    """
+    Per-stage results of the repeats of a benchmark case - stages being the top-level spans of their run traces:
+    min. over repeats of total duration (over the calls of the stage, e.g. one per climatic year), and max. of
+    memory stats
+    """
+    stage_results = {}
+    for run_trace in run_traces:
+        for stage, stage_durations in run_trace.get_per_stage_durations(max_depth=0).items():
+            current_results = stage_results.setdefault(stage, {'duration': stage_durations['duration'],
+                                                               'n_calls': stage_durations['n_calls']})
+            current_results['duration'] = min(current_results['duration'], stage_durations['duration'])
+        for elt_span in run_trace.spans:
+            if elt_span.depth > 0 or elt_span.memory is None:
+                continue
+            for metric in MEMORY_METRICS:
+                if metric in elt_span.memory:
+                    stage_results[elt_span.name][metric] = max(stage_results[elt_span.name].get(metric, 0),
+                                                               elt_span.memory[metric])
+    return stage_results
+
+
+@dataclass
+class BenchmarkRegression:
+    case: str
+    stage: str
+    metric: str
+    baseline_value: float
+    current_value: float
+
+    def __str__(self) -> str:
+        ratio = self.current_value / self.baseline_value if self.baseline_value > 0 else float('inf')
+        return (f'{self.case} - {self.stage}: {self.metric} {self.baseline_value:.3f} -> {self.current_value:.3f} '
+                f'(x{ratio:.2f})')
+
+
+def compare_to_baseline(results: dict, baseline: dict, params: BenchmarkParams) -> List[BenchmarkRegression]:
+    """
+    Regressions of current results w.r.t. baseline ones, on the (case, stage) in both of them: increase of
+    duration (resp. memory peak) above both relative and absolute tolerances. Durations only compared if
+    obtained with the same memory mode
+    """
+    metric_tolerances = {metric: (params.memory_tolerance, params.min_memory_increase) for metric in MEMORY_METRICS}
+    # durations obtained with another memory mode not comparable - tracemalloc slowing the run down
+    baseline_memory_mode = baseline['params']['memory_mode']
+    if baseline_memory_mode == params.memory_mode:
+        metric_tolerances['duration'] = (params.duration_tolerance, params.min_duration_increase)
+    else:
+        logging.warning(f'Benchmark baseline obtained with memory mode {baseline_memory_mode}, not the current one '
+                        f'({params.memory_mode}) -> durations not compared')
+    regressions = []
+    for case_name, case_results in results['cases'].items():
+        if case_name not in baseline['cases']:
+            logging.info(f'Benchmark case {case_name} not in baseline -> not compared')
+            continue
+        baseline_stages = baseline['cases'][case_name]['stages']
+        for stage, stage_results in case_results['stages'].items():
+            if stage not in baseline_stages:
+                continue
+            for metric, (rel_tolerance, min_increase) in metric_tolerances.items():
+                if metric not in stage_results or metric not in baseline_stages[stage]:
+                    continue
+                baseline_value = baseline_stages[stage][metric]
+                increase = stage_results[metric] - baseline_value
+                if increase > rel_tolerance * baseline_value and increase > min_increase:
+                    regressions.append(BenchmarkRegression(case=case_name, stage=stage, metric=metric,
+                                                           baseline_value=baseline_value,
+                                                           current_value=stage_results[metric]))
+    return regressions
+
+
+def log_comparison(results: dict, baseline: dict):
+    summary_lines = []
+    for case_name, case_results in results['cases'].items():
+        baseline_stages = baseline['cases'].get(case_name, {}).get('stages', {})
+        summary_lines.append(f'- {case_name}:')
+        for stage, stage_results in case_results['stages'].items():
+            baseline_msg = ''
+            if stage in baseline_stages and baseline_stages[stage]['duration'] > 0:
+                baseline_msg = f' (baseline {baseline_stages[stage]["duration"]:.2f}s, ' \
+                               f'x{stage_results["duration"] / baseline_stages[stage]["duration"]:.2f})'
+            summary_lines.append(f'  * {stage}: {stage_results["duration"]:.2f}s{baseline_msg}')
+    logging.info('Benchmark durations, per case and stage:\n' + '\n'.join(summary_lines))
+
+
+def load_benchmark_results(json_file: str) -> Optional[dict]:
+    if not os.path.exists(json_file):
+        return None
+    with open(json_file, 'r') as f:
+        results = json.load(f)
+    if results.get('version') != BENCHMARK_RESULTS_VERSION:
+        logging.warning(f'Benchmark results in {json_file} of version {results.get("version")}, not the current one '
+                        f'({BENCHMARK_RESULTS_VERSION}) -> ignored')
+        return None
+    return results
+
+
+def save_benchmark_results(results: dict, json_file: str):
+    logging.info(f'Save benchmark results ({len(results["cases"])} cases) to {json_file}')
+    with open(json_file, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
+
+
+@dataclass
+class BenchmarkResults:
+    params: BenchmarkParams
+    run_datetime: datetime = None
+    cases: Dict[str, dict] = None  # {case name: case descr., problem size and per-stage results}
+    regressions: List[BenchmarkRegression] = None
+
+    def __post_init__(self):
+        if self.run_datetime is None:
+            self.run_datetime = datetime.now()
+        if self.cases is None:
+            self.cases = {}
+
+    def add_case(self, case: BenchmarkCase, run_traces: List[RunTrace], problem_size: dict):
+        stage_results = get_stage_results(run_traces=run_traces)
+        self.cases[case.name] = asdict(case) | {'problem_size': problem_size,
+                                                'total_duration': sum(elt['duration']
+                                                                      for elt in stage_results.values()),
+                                                'stages': stage_results}
+
+    def to_dict(self) -> dict:
+        results = {'version': BENCHMARK_RESULTS_VERSION, 'datetime': self.run_datetime.isoformat(timespec='seconds'),
+                   'machine': get_machine_info(), 'params': asdict(self.params), 'cases': self.cases}
+        if self.regressions is not None:
+            results['regressions'] = [asdict(regression) for regression in self.regressions]
+        return results
+
+    def compare_to_baseline_and_save(self) -> List[BenchmarkRegression]:
+        """
+        Compare to baseline - which is set with current results if not existing, or if asked in params - and
+        save results
+        :returns: list of regressions
+        """
+        baseline_file = self.params.baseline_file if self.params.baseline_file is not None \
+            else get_benchmark_baseline_file()
+        baseline = load_benchmark_results(json_file=baseline_file)
+        self.regressions = []
+        if baseline is None:
+            logging.info(f'No (valid) benchmark baseline in {baseline_file} -> current results will be the baseline')
+        else:
+            if baseline['machine'] != get_machine_info():
+                logging.warning(f'Benchmark baseline obtained on another machine ({baseline["machine"]}) '
+                                f'-> comparison not meaningful')
+            log_comparison(results=self.to_dict(), baseline=baseline)
+            self.regressions = compare_to_baseline(results=self.to_dict(), baseline=baseline, params=self.params)
+            if len(self.regressions) > 0:
+                logging.warning(f'{len(self.regressions)} performance regression(s) w.r.t. baseline of '
+                                f'{baseline["datetime"]}:\n' + '\n'.join(f'- {elt}' for elt in self.regressions))
+            else:
+                logging.info(f'No performance regression w.r.t. baseline of {baseline["datetime"]}')
+        results = self.to_dict()
+        save_benchmark_results(results=results, json_file=get_benchmark_results_file(run_datetime=self.run_datetime))
+        if baseline is None or self.params.update_baseline:
+            save_benchmark_results(results=results, json_file=baseline_file)
+        return self.regressions
@@ -0,0 +1,108 @@
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from common.constants.output_params import OutputParams
+from common.logger import TITLE_LOG_SEP
+from common.long_term_uc_io import get_lt_uc_output_subfolder, lt_uc_output_subfolder
+from utils.run_trace import trace_span
+
+
+@dataclass
+class OutputTaskKinds:
+    data: str = 'data'
+    figure: str = 'figure'
+
+
+OUTPUT_TASK_KINDS = OutputTaskKinds()
+
+
+def run_in_output_subfolder(func: Callable, output_subfolder: Optional[str], **kwargs):
+    """
+    Run an output task in a worker process, with the output subfolder of the process which submitted it - e.g. the
+    one of a campaign job
+    N.B. this subfolder is a module-level setting, not inherited by spawned processes
+    """
+    with lt_uc_output_subfolder(subfolder=output_subfolder):
+        return func(**kwargs)
+
+
+@dataclass
+class UCOutputWriter:
+    """
+    Execution of output tasks of UC runs (figures, data files). If async_output in params, they are handed to
+    background workers - figures rendered in a process pool (matplotlib is not thread-safe), data files written
+    in a thread pool - and flush() waits for all of them; otherwise they are run at submission.
+    Failures of background tasks are logged and kept in failed_tasks, without stopping the run(s)
+    N.B. tasks sent to the process pool must be picklable, e.g. methods of a results-only PypsaModel copy
+    """
+    params: OutputParams
+    pending_tasks: List[Tuple[str, Future]] = field(default_factory=list)
+    failed_tasks: Dict[str, str] = field(default_factory=dict)
+    thread_pool: ThreadPoolExecutor = None
+    process_pool: ProcessPoolExecutor = None
+
+    def get_pool(self, task_kind: str):
+        if task_kind == OUTPUT_TASK_KINDS.figure:
+            if self.process_pool is None:
+                # spawn - not fork - as the parent process may have running solver/writer threads
+                self.process_pool = ProcessPoolExecutor(max_workers=self.params.n_figure_processes,
+                                                        mp_context=multiprocessing.get_context('spawn'))
+            return self.process_pool
+        if self.thread_pool is None:
+            self.thread_pool = ThreadPoolExecutor(max_workers=self.params.n_writer_threads,
+                                                  thread_name_prefix='uc_output')
+        return self.thread_pool
+
+    def submit(self, task_name: str, task_kind: str, func: Callable, **kwargs):
+        """
+        :param task_name: used in logs, e.g. to identify failed tasks
+        :param task_kind: data or figure, cf. OUTPUT_TASK_KINDS
+        :param func: output function, called with kwargs
+        """
+        if not self.params.async_output:
+            with trace_span(f'{task_kind} output', task=task_name):
+                func(**kwargs)
+            return
+        logging.debug(f'Submit {task_kind} output task {task_name}')
+        if task_kind == OUTPUT_TASK_KINDS.figure:
+            future = self.get_pool(task_kind=task_kind).submit(
+                run_in_output_subfolder, func, get_lt_uc_output_subfolder(), **kwargs)
+        else:
+            future = self.get_pool(task_kind=task_kind).submit(func, **kwargs)
+        self.pending_tasks.append((task_name, future))
+
+    def flush(self) -> Dict[str, str]:
+        """
+        Wait for all submitted output tasks to be done, and log the failed ones
+        :return: dict {task name: error message} of the failures since last flush
+        """
+        if len(self.pending_tasks) == 0:
+            return {}
+        logging.info(f'Wait for {len(self.pending_tasks)} output task(s) to be done')
+        current_failures = {}
+        # N.B. background tasks are not traced individually -> only the wait for their completion
+        with trace_span('wait for background output tasks', n_tasks=len(self.pending_tasks)):
+            for task_name, future in self.pending_tasks:
+                exc = future.exception()
+                if exc is not None:
+                    current_failures[task_name] = f'{type(exc).__name__}: {exc}'
+                    logging.error(f'Output task {task_name} failed -> {current_failures[task_name]}')
+        self.pending_tasks = []
+        self.failed_tasks.update(current_failures)
+        return current_failures
+
+    def close(self):
+        """
+        Flush pending tasks then shut the worker pools down
+        """
+        self.flush()
+        for pool in [self.thread_pool, self.process_pool]:
+            if pool is not None:
+                pool.shutdown(wait=True)
+        self.thread_pool, self.process_pool = None, None
+        if len(self.failed_tasks) > 0:
+            logging.warning(f'{TITLE_LOG_SEP} {len(self.failed_tasks)} output task(s) failed - UC results (summary '
+                            f'metrics) not affected: {list(self.failed_tasks)} {TITLE_LOG_SEP}')
@@ -0,0 +1,125 @@
+import logging
+import os
+import shutil
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from common.constants.optimisation import SolverParams
+from common.constants.result_cache import RESULT_CACHE_FORMAT_VERSION, ResultCacheParams
+from common.fuel_sources import FuelSource
+from common.long_term_uc_io import OUTPUT_RESULT_CACHE_FOLDER
+from common.uc_run_params import UCRunParams
+from include.dataset import Dataset
+from include.dataset_builder import PypsaModel
+from include.uc_summary_metrics import UCSummaryMetrics
+from utils.dir_utils import make_dir
+from utils.hasher import get_hash
+
+
+def set_uc_run_hash(uc_run_params: UCRunParams, eraa_dataset: Dataset, fuel_sources: Dict[str, FuelSource],
+                    solver_params: SolverParams) -> str:
+    """
+    Deterministic hash over all the inputs that define the UC optimisation pb - and then its solution
+    :param uc_run_params: effective ones, i.e. after having applied possible overwriting of JSON values
+    :param eraa_dataset: after generation units data have been obtained
+    :param fuel_sources
+    :param solver_params
+    """
+    # N.B. order of units in per-country lists is not deterministic (built from sets) -> sorted by name here
+    gen_units_data = {country: sorted(units_data, key=lambda x: x.name)
+                      for country, units_data in eraa_dataset.generation_units_data.items()}
+    hash_inputs = {'format_version': RESULT_CACHE_FORMAT_VERSION,
+                   'uc_run_params': uc_run_params,
+                   'generation_units_data': gen_units_data,
+                   'demand': eraa_dataset.demand,
+                   'interco_capas': eraa_dataset.interco_capas,
+                   'fuel_sources': fuel_sources,
+                   'solver_params': solver_params}
+    return get_hash(obj=hash_inputs)
+
+
+@dataclass
+class CachedUCResults:
+    opt_results: Dict[str, pd.DataFrame]
+    uc_summary_metrics: UCSummaryMetrics
+    solver_stats: Optional[dict] = None  # None for entries stored without them
+
+
+@dataclass
+class UCResultCache:
+    """
+    Local store of solved UC results, one subfolder per run hash; with LRU eviction based on the number of
+    entries and total size of the cache
+    """
+    params: ResultCacheParams
+    RESULTS_FILE = 'opt_results.pkl'
+
+    def get_cache_dir(self) -> str:
+        return self.params.cache_dir if self.params.cache_dir is not None else OUTPUT_RESULT_CACHE_FOLDER
+
+    def get_results_file(self, run_hash: str) -> str:
+        return os.path.join(self.get_cache_dir(), run_hash, self.RESULTS_FILE)
+
+    def load(self, run_hash: str) -> Optional[CachedUCResults]:
+        results_file = self.get_results_file(run_hash=run_hash)
+        if not os.path.isfile(results_file):
+            logging.info(f'No cached UC results for run hash {run_hash}')
+            return None
+        try:
+            stored_results = pd.read_pickle(results_file)
+        except Exception as e:
+            logging.warning(f'Cached UC results file {results_file} cannot be read ({e}) -> ignored')
+            return None
+        # update access time, used for LRU eviction
+        os.utime(results_file)
+        logging.info(f'Cached UC results found for run hash {run_hash}: {results_file}')
+        return CachedUCResults(opt_results=stored_results['opt_results'],
+                               uc_summary_metrics=UCSummaryMetrics(**stored_results['uc_summary_metrics']),
+                               solver_stats=stored_results.get('solver_stats'))
+
+    def store(self, run_hash: str, pypsa_model: PypsaModel):
+        if pypsa_model.uc_summary_metrics is None:
+            logging.warning(f'UC summary metrics not set -> results of run {run_hash} not stored in cache')
+            return
+        results_file = self.get_results_file(run_hash=run_hash)
+        make_dir(full_path=os.path.dirname(results_file))
+        logging.info(f'Store UC results in cache: {results_file}')
+        pd.to_pickle({'opt_results': pypsa_model.get_opt_results(),
+                      'uc_summary_metrics': asdict(pypsa_model.uc_summary_metrics),
+                      'solver_stats': pypsa_model.solver_stats}, results_file)
+        self.evict()
+
+    def get_entries(self) -> List[Tuple[str, float, int]]:
+        """
+        Get list of (run hash, last access time, size in bytes) of current cache entries
+        """
+        cache_dir = self.get_cache_dir()
+        if not os.path.isdir(cache_dir):
+            return []
+        entries = []
+        for run_hash in os.listdir(cache_dir):
+            results_file = self.get_results_file(run_hash=run_hash)
+            if os.path.isfile(results_file):
+                file_stat = os.stat(results_file)
+                entries.append((run_hash, file_stat.st_mtime, file_stat.st_size))
+        return entries
+
+    def evict(self):
+        """
+        Remove least recently used entries until both number of entries and size limits are respected
+        """
+        entries = sorted(self.get_entries(), key=lambda x: x[1])
+        max_size = self.params.max_size_mb * 1e6
+        total_size = sum(elt_entry[2] for elt_entry in entries)
+        while len(entries) > 0 and (len(entries) > self.params.max_n_entries or total_size > max_size):
+            run_hash, _, entry_size = entries.pop(0)
+            logging.info(f'Evict UC results of run hash {run_hash} from cache')
+            shutil.rmtree(os.path.join(self.get_cache_dir(), run_hash), ignore_errors=True)
+            total_size -= entry_size
+
+    def clear(self):
+        cache_dir = self.get_cache_dir()
+        if os.path.isdir(cache_dir):
+            shutil.rmtree(cache_dir)
@@ -0,0 +1,280 @@
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import zlib
+from contextlib import closing
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+from itertools import product
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from common.constants.countries import set_country_trigram
+from common.constants.optimisation import SolverParams
+from common.constants.results_warehouse import RESULTS_WAREHOUSE_SCHEMA_VERSION, ResultsWarehouseParams
+from common.fuel_sources import FuelSource
+from common.long_term_uc_io import OUTPUT_RESULTS_WAREHOUSE_FILE
+from common.uc_run_params import UCRunParams
+from include.uc_summary_metrics import UCSummaryMetrics
+from utils.basic_utils import get_all_attr_names
+from utils.dir_utils import make_dir
+from utils.hasher import get_hash, to_canonical_repr
+
+
+def set_uc_config_hash(uc_run_params: UCRunParams, fuel_sources: Dict[str, FuelSource],
+                       solver_params: SolverParams) -> str:
+    """
+    Hash of a UC run 'configuration', i.e. of its inputs but the climatic year -> same value for the runs of a set
+    of climatic years, to compare/aggregate them
+    """
+    hash_inputs = {'format_version': RESULTS_WAREHOUSE_SCHEMA_VERSION,
+                   'uc_run_params': replace(uc_run_params, selected_climatic_year=None),
+                   'fuel_sources': fuel_sources,
+                   'solver_params': solver_params}
+    return get_hash(obj=hash_inputs)
+
+
+def get_param_overrides(uc_run_params: UCRunParams, fixed_uc_run_params: Optional[UCRunParams],
+                        fixed_run_params_fields: Optional[List[str]]) -> Dict:
+    """
+    (JSON-serializable) values of the UCRunParams fields imposed in arg. of run - i.e. overwriting JSON inputs
+    :param uc_run_params: effective ones, after overwriting
+    :param fixed_uc_run_params, fixed_run_params_fields: as in run args; all fields overwritten if the latter is None
+    """
+    if fixed_uc_run_params is None:
+        return {}
+    if fixed_run_params_fields is None:
+        fixed_run_params_fields = get_all_attr_names(obj=UCRunParams)
+    return to_canonical_repr({field_name: getattr(uc_run_params, field_name)
+                              for field_name in fixed_run_params_fields})
+
+
+def series_to_blob(df: pd.DataFrame) -> bytes:
+    return zlib.compress(pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def blob_to_series(blob: bytes) -> pd.DataFrame:
+    return pickle.loads(zlib.decompress(blob))
+
+
+@dataclass
+class WarehouseTables:
+    runs: str = 'runs'
+    country_metrics: str = 'country_metrics'
+    hourly_series: str = 'hourly_series'
+    solver_stats: str = 'solver_stats'
+
+
+WAREHOUSE_TABLES = WarehouseTables()
+# per-country metrics, as named in country_metrics table -> corresponding UCSummaryMetrics attribute
+COUNTRY_METRICS = {'ens': 'per_country_ens', 'n_failure_hours': 'per_country_n_failure_hours',
+                   'total_cost': 'per_country_total_cost',
+                   'total_operational_cost': 'per_country_total_operational_cost',
+                   'co2_emissions': 'per_country_co2_emissions'}
+# run columns joined to solver stats, to identify the scenarios which are slow to solve
+SOLVER_STATS_RUN_COLS = ['run_hash', 'config_hash', 'target_year', 'climatic_year', 'period_start', 'countries']
+WAREHOUSE_DDL = [
+    f"""CREATE TABLE IF NOT EXISTS {WAREHOUSE_TABLES.runs} (
+        run_hash TEXT PRIMARY KEY, config_hash TEXT NOT NULL, target_year INTEGER NOT NULL,
+        climatic_year INTEGER NOT NULL, period_start TEXT NOT NULL, period_end TEXT, countries TEXT NOT NULL,
+        param_overrides TEXT NOT NULL, uc_run_params TEXT NOT NULL, total_cost REAL, total_operational_cost REAL,
+        total_co2_emissions REAL, uc_summary_metrics TEXT NOT NULL, ingested_at TEXT NOT NULL)""",
+    f"""CREATE TABLE IF NOT EXISTS {WAREHOUSE_TABLES.country_metrics} (
+        run_hash TEXT NOT NULL REFERENCES {WAREHOUSE_TABLES.runs}(run_hash) ON DELETE CASCADE,
+        country TEXT NOT NULL, {', '.join(f'{metric} REAL' for metric in COUNTRY_METRICS)},
+        PRIMARY KEY (run_hash, country))""",
+    f"""CREATE TABLE IF NOT EXISTS {WAREHOUSE_TABLES.hourly_series} (
+        run_hash TEXT NOT NULL REFERENCES {WAREHOUSE_TABLES.runs}(run_hash) ON DELETE CASCADE,
+        series_name TEXT NOT NULL, data BLOB NOT NULL, PRIMARY KEY (run_hash, series_name))""",
+    # N.B. stats stored as JSON, their set depending on the solver
+    f"""CREATE TABLE IF NOT EXISTS {WAREHOUSE_TABLES.solver_stats} (
+        run_hash TEXT PRIMARY KEY REFERENCES {WAREHOUSE_TABLES.runs}(run_hash) ON DELETE CASCADE,
+        solver TEXT, stats TEXT NOT NULL)""",
+    f'CREATE INDEX IF NOT EXISTS idx_runs_config ON {WAREHOUSE_TABLES.runs}(config_hash, climatic_year)',
+    f'CREATE INDEX IF NOT EXISTS idx_runs_years ON {WAREHOUSE_TABLES.runs}(target_year, climatic_year)',
+    f'CREATE INDEX IF NOT EXISTS idx_runs_countries ON {WAREHOUSE_TABLES.runs}(countries)',
+    f'CREATE INDEX IF NOT EXISTS idx_runs_overrides ON {WAREHOUSE_TABLES.runs}(param_overrides)',
+    f'CREATE INDEX IF NOT EXISTS idx_country_metrics_country ON {WAREHOUSE_TABLES.country_metrics}(country)',
+]
+
+
+@dataclass
+class UCResultsWarehouse:
+    """
+    Local SQLite store of the results of UC runs - summary metrics and, optionally, hourly series - indexed on
+    run hash, configuration hash (all inputs but climatic year), countries, target/climatic years and
+    parameter overrides; to query/compare many runs without parsing output files
+    """
+    params: ResultsWarehouseParams
+
+    def get_db_file(self) -> str:
+        return self.params.db_file if self.params.db_file is not None else OUTPUT_RESULTS_WAREHOUSE_FILE
+
+    def connect(self) -> sqlite3.Connection:
+        db_file = self.get_db_file()
+        make_dir(full_path=os.path.dirname(os.path.abspath(db_file)))
+        connection = sqlite3.connect(db_file)
+        connection.execute('PRAGMA foreign_keys = ON')
+        for ddl_statement in WAREHOUSE_DDL:
+            connection.execute(ddl_statement)
+        return connection
+
+    def ingest(self, run_hash: str, config_hash: str, uc_run_params: UCRunParams,
+               uc_summary_metrics: UCSummaryMetrics, param_overrides: Dict = None,
+               hourly_series: Dict[str, pd.DataFrame] = None, solver_stats: Dict = None):
+        """
+        Insert (or replace, if run hash already present) the results of a run
+        :param run_hash: cf. set_uc_run_hash
+        :param config_hash: cf. set_uc_config_hash
+        :param uc_run_params: effective ones
+        :param uc_summary_metrics
+        :param param_overrides: UCRunParams values imposed in arg. of run, cf. get_param_overrides
+        :param hourly_series: {name: df} of optimal decisions/prices, stored only if store_hourly_series in params
+        :param solver_stats: run statistics of the solver, cf. get_solver_run_stats; None if not available (e.g.
+        results loaded from cache), the ones of a previous ingestion of this run being then kept
+        """
+        if param_overrides is None:
+            param_overrides = {}
+        logging.info(f'Ingest results of run {run_hash} in results warehouse {self.get_db_file()}')
+        summary_dict = asdict(uc_summary_metrics)
+        run_row = {'run_hash': run_hash, 'config_hash': config_hash,
+                   'target_year': uc_run_params.selected_target_year,
+                   'climatic_year': uc_run_params.selected_climatic_year,
+                   'period_start': to_canonical_repr(uc_run_params.uc_period_start),
+                   'period_end': to_canonical_repr(uc_run_params.uc_period_end),
+                   'countries': ','.join(sorted(uc_run_params.selected_countries)),
+                   'param_overrides': json.dumps(param_overrides, sort_keys=True),
+                   'uc_run_params': json.dumps(to_canonical_repr(uc_run_params), sort_keys=True),
+                   'total_cost': uc_summary_metrics.total_cost,
+                   'total_operational_cost': uc_summary_metrics.total_operational_cost,
+                   'total_co2_emissions': uc_summary_metrics.total_co2_emissions,
+                   'uc_summary_metrics': json.dumps(summary_dict), 'ingested_at': datetime.now().isoformat()}
+        # N.B. per-country metrics are indexed by bus name, i.e. country trigram
+        country_rows = [(run_hash, country, *[(summary_dict[attr_name] or {}).get(set_country_trigram(country=country))
+                                              for attr_name in COUNTRY_METRICS.values()])
+                        for country in uc_run_params.selected_countries]
+        with closing(self.connect()) as connection, connection:
+            solver_stats_row = (run_hash, solver_stats.get('solver'), json.dumps(solver_stats)) \
+                if solver_stats is not None else None
+            # solver stats of a previous ingestion kept if not available now (e.g. results loaded from cache)
+            if solver_stats_row is None:
+                solver_stats_row = connection.execute(f'SELECT * FROM {WAREHOUSE_TABLES.solver_stats} '
+                                                      f'WHERE run_hash = ?', (run_hash,)).fetchone()
+            # delete first, so that previous country metrics/series of this run are removed (cascade)
+            connection.execute(f'DELETE FROM {WAREHOUSE_TABLES.runs} WHERE run_hash = ?', (run_hash,))
+            connection.execute(f'INSERT INTO {WAREHOUSE_TABLES.runs} ({", ".join(run_row)}) '
+                               f'VALUES ({", ".join("?" * len(run_row))})', tuple(run_row.values()))
+            connection.executemany(f'INSERT INTO {WAREHOUSE_TABLES.country_metrics} '
+                                   f'VALUES ({", ".join("?" * (2 + len(COUNTRY_METRICS)))})', country_rows)
+            if self.params.store_hourly_series and hourly_series is not None:
+                connection.executemany(f'INSERT INTO {WAREHOUSE_TABLES.hourly_series} VALUES (?, ?, ?)',
+                                       [(run_hash, series_name, series_to_blob(df=df))
+                                        for series_name, df in hourly_series.items() if df is not None])
+            if solver_stats_row is not None:
+                connection.execute(f'INSERT INTO {WAREHOUSE_TABLES.solver_stats} VALUES (?, ?, ?)', solver_stats_row)
+
+    def get_runs(self, config_hash: str = None, target_year: int = None, climatic_year: int = None,
+                 country: str = None, param_overrides: Dict = None) -> pd.DataFrame:
+        """
+        Get the runs - one row per run, with Europe-level metrics - matching all provided criteria
+        :param country: runs including this country
+        :param param_overrides: exact set of UCRunParams overrides, cf. get_param_overrides
+        """
+        conditions, query_params = [], []
+        for col_name, value in [('config_hash', config_hash), ('target_year', target_year),
+                                ('climatic_year', climatic_year)]:
+            if value is not None:
+                conditions.append(f'{col_name} = ?')
+                query_params.append(value)
+        if param_overrides is not None:
+            conditions.append('param_overrides = ?')
+            query_params.append(json.dumps(param_overrides, sort_keys=True))
+        if country is not None:
+            conditions.append(f'run_hash IN (SELECT run_hash FROM {WAREHOUSE_TABLES.country_metrics} '
+                              f'WHERE country = ?)')
+            query_params.append(country)
+        where_clause = f' WHERE {" AND ".join(conditions)}' if len(conditions) > 0 else ''
+        with closing(self.connect()) as connection:
+            return pd.read_sql_query(f'SELECT * FROM {WAREHOUSE_TABLES.runs}{where_clause} '
+                                     f'ORDER BY target_year, climatic_year, period_start',
+                                     connection, params=query_params)
+
+    def get_per_country_metric(self, metric: str = 'ens', config_hash: str = None,
+                               target_year: int = None) -> pd.DataFrame:
+        """
+        Per-country metric across climatic years (and periods), e.g. ENS per country over all CYs of a configuration
+        :param metric: in COUNTRY_METRICS keys
+        :return: df with (climatic year, period start) index - preceded by configuration hash if config_hash is
+        None - and countries as columns
+        """
+        if metric not in COUNTRY_METRICS:
+            raise Exception(f'Unknown per-country metric {metric}; must be in {list(COUNTRY_METRICS)} -> STOP')
+        conditions, query_params = [], []
+        for col_name, value in [('r.config_hash', config_hash), ('r.target_year', target_year)]:
+            if value is not None:
+                conditions.append(f'{col_name} = ?')
+                query_params.append(value)
+        where_clause = f' WHERE {" AND ".join(conditions)}' if len(conditions) > 0 else ''
+        with closing(self.connect()) as connection:
+            df = pd.read_sql_query(f'SELECT r.config_hash, r.climatic_year, r.period_start, c.country, c.{metric} '
+                                   f'FROM {WAREHOUSE_TABLES.country_metrics} c '
+                                   f'JOIN {WAREHOUSE_TABLES.runs} r ON r.run_hash = c.run_hash{where_clause}',
+                                   connection, params=query_params)
+        index_cols = ['climatic_year', 'period_start']
+        if config_hash is None:
+            index_cols.insert(0, 'config_hash')
+        return df.pivot(index=index_cols, columns='country', values=metric)
+
+    def get_solver_stats(self, config_hash: str = None, target_year: int = None) -> pd.DataFrame:
+        """
+        Solver run statistics - one row per run, with the columns identifying it - of the runs matching all
+        provided criteria
+        """
+        conditions, query_params = [], []
+        for col_name, value in [('r.config_hash', config_hash), ('r.target_year', target_year)]:
+            if value is not None:
+                conditions.append(f'{col_name} = ?')
+                query_params.append(value)
+        where_clause = f' WHERE {" AND ".join(conditions)}' if len(conditions) > 0 else ''
+        with closing(self.connect()) as connection:
+            df = pd.read_sql_query(f'SELECT {", ".join(f"r.{col}" for col in SOLVER_STATS_RUN_COLS)}, s.stats '
+                                   f'FROM {WAREHOUSE_TABLES.solver_stats} s '
+                                   f'JOIN {WAREHOUSE_TABLES.runs} r ON r.run_hash = s.run_hash{where_clause} '
+                                   f'ORDER BY r.target_year, r.climatic_year, r.period_start',
+                                   connection, params=query_params)
+        stats_df = pd.DataFrame([json.loads(stats) for stats in df['stats']], index=df.index)
+        return pd.concat([df.drop(columns='stats'), stats_df], axis=1)
+
+    def get_aggregated_solver_stats(self, group_by: List[str] = None, config_hash: str = None,
+                                    target_year: int = None) -> pd.DataFrame:
+        """
+        Solver run statistics aggregated over runs (e.g. the climatic years of a sweep): number of runs, and mean/max
+        of each numeric statistic
+        :param group_by: run columns (in SOLVER_STATS_RUN_COLS) defining the groups of runs; per configuration
+        hash and solver if None
+        """
+        if group_by is None:
+            group_by = ['config_hash', 'solver']
+        solver_stats = self.get_solver_stats(config_hash=config_hash, target_year=target_year)
+        if len(solver_stats) == 0:
+            logging.warning('No solver stats stored in results warehouse for the provided criteria')
+            return pd.DataFrame()
+        numeric_cols = [col for col in solver_stats.select_dtypes('number').columns
+                        if col not in SOLVER_STATS_RUN_COLS + group_by]
+        grouped_stats = solver_stats.groupby(group_by)
+        return pd.concat([grouped_stats.size().rename('n_runs'),
+                          grouped_stats[numeric_cols].agg(['mean', 'max']).set_axis(
+                              [f'{col}_{agg}' for col, agg in product(numeric_cols, ['mean', 'max'])], axis=1)],
+                         axis=1)
+
+    def get_hourly_series(self, run_hash: str, series_name: str) -> Optional[pd.DataFrame]:
+        with closing(self.connect()) as connection:
+            row = connection.execute(f'SELECT data FROM {WAREHOUSE_TABLES.hourly_series} '
+                                     f'WHERE run_hash = ? AND series_name = ?', (run_hash, series_name)).fetchone()
+        if row is None:
+            logging.warning(f'No hourly series {series_name} stored for run {run_hash}')
+            return None
+        return blob_to_series(blob=row[0])
@@ -1,9 +1,27 @@
-from dataclasses import dataclass, asdict
-from typing import Dict
+from dataclasses import dataclass, asdict, fields
+from typing import Dict, List, Optional
 import json
 
+import numpy as np
+import pandas as pd
+
 from utils.basic_utils import format_with_spaces
 
+FAILURE_UNIT_SUFFIX = '_failure'
+# min. failure power (MW) for an hour to be counted as a failure one - below, LP solver numerical noise
+FAILURE_POWER_TOL = 1e-3
+
+
+@dataclass
+class GenUnitsIndexCols:
+    bus: str = 'bus'
+    marginal_cost: str = 'marginal_cost'
+    co2_emissions: str = 'co2_emissions'  # per unit of produced energy, from carrier
+    is_failure: str = 'is_failure'
+
+
+GEN_UNITS_INDEX_COLS = GenUnitsIndexCols()
+
 
 def dict_to_str(d: Dict[str, float], nbers_with_spaces: bool = False) -> str:
     """
@@ -59,3 +77,90 @@ class UCSummaryMetrics:
         summary_dict = {key: val for key, val in summary_dict.items() if val is not None}
         with open(file, "w", encoding="utf-8") as f:
             json.dump(summary_dict, f)
+
+
+def set_gen_units_index(buses: pd.Series, marginal_costs: pd.Series, co2_emissions: pd.Series) -> pd.DataFrame:
+    """
+    Unit -> bus/marginal cost/CO2 emissions (and failure flag) index, built once after the solve to calculate all
+    per-country summary metrics in a vectorized way
+    :param buses: indexed by gen. unit name
+    :param marginal_costs: idem
+    :param co2_emissions: idem, per unit of produced energy (obtained from unit carrier)
+    """
+    gen_units_index = pd.DataFrame({GEN_UNITS_INDEX_COLS.bus: buses,
+                                    GEN_UNITS_INDEX_COLS.marginal_cost: marginal_costs.astype(float),
+                                    GEN_UNITS_INDEX_COLS.co2_emissions: co2_emissions.astype(float).fillna(0)})
+    gen_units_index[GEN_UNITS_INDEX_COLS.is_failure] = gen_units_index.index.str.endswith(FAILURE_UNIT_SUFFIX)
+    return gen_units_index
+
+
+def calc_uc_summary_metrics(prod_var_opt: pd.DataFrame, gen_units_index: pd.DataFrame, total_cost: float,
+                            failure_penalty: float = None,
+                            snapshot_weightings: Optional[pd.Series] = None) -> UCSummaryMetrics:
+    """
+    Calculate UC summary metrics with a single (snapshot-)weighted matrix product and a groupby on buses
+    :param prod_var_opt: optimal production, with snapshots in rows and gen. units in columns
+    :param gen_units_index: cf. set_gen_units_index
+    :param total_cost: objective value of the solved UC pb
+    :param failure_penalty: used to deduce operational cost from total one
+    :param snapshot_weightings: if None, all snapshots have weight 1
+    """
+    gen_units_index = gen_units_index.loc[prod_var_opt.columns]
+    prod_values = prod_var_opt.values
+    weights = np.ones(len(prod_var_opt)) if snapshot_weightings is None else snapshot_weightings.values
+    weighted_prod = weights @ prod_values
+    is_failure = gen_units_index[GEN_UNITS_INDEX_COLS.is_failure].values
+    unit_cost = weighted_prod * gen_units_index[GEN_UNITS_INDEX_COLS.marginal_cost].values
+    # failure hours not counting LP noise
+    n_above_failure_tol = (prod_values > FAILURE_POWER_TOL).sum(axis=0)
+    per_unit_metrics = pd.DataFrame({'cost': unit_cost,
+                                     'ope_cost': np.where(is_failure, 0, unit_cost),
+                                     'co2_emissions': weighted_prod
+                                     * gen_units_index[GEN_UNITS_INDEX_COLS.co2_emissions].values,
+                                     # N.B. ENS and failure hours only over failure units (and not weighted)
+                                     'ens': np.where(is_failure, prod_values.sum(axis=0), 0),
+                                     'n_failure_hours': np.where(is_failure, n_above_failure_tol, 0)},
+                                    index=prod_var_opt.columns)
+    per_country_metrics = per_unit_metrics.groupby(gen_units_index[GEN_UNITS_INDEX_COLS.bus].values).sum()
+    failure_buses = gen_units_index.loc[is_failure, GEN_UNITS_INDEX_COLS.bus].unique()
+    if failure_penalty is not None:
+        eur_total_ope_cost = total_cost - failure_penalty * per_country_metrics['ens'].sum()
+    else:
+        eur_total_ope_cost = None
+    # attention convert to GWh/M€ and int to get smaller values for synthesis. TODO: check CO2 emissions unit!
+    cost_conversion_factor = 1e-6
+    co2_emis_conversion_factor = 1e-3
+    return UCSummaryMetrics(
+        per_country_ens={c: int(val / 1e3) for c, val in per_country_metrics.loc[failure_buses, 'ens'].items()},
+        per_country_n_failure_hours={c: int(val) for c, val in
+                                     per_country_metrics.loc[failure_buses, 'n_failure_hours'].items()},
+        total_cost=int(total_cost * cost_conversion_factor),
+        total_operational_cost=int(eur_total_ope_cost * cost_conversion_factor) if eur_total_ope_cost is not None
+        else None,
+        total_co2_emissions=int(per_country_metrics['co2_emissions'].sum() * co2_emis_conversion_factor),
+        per_country_total_cost={c: int(val * cost_conversion_factor)
+                                for c, val in per_country_metrics['cost'].items()},
+        per_country_total_operational_cost={c: int(val * cost_conversion_factor)
+                                            for c, val in per_country_metrics['ope_cost'].items()},
+        per_country_co2_emissions={c: int(val * co2_emis_conversion_factor)
+                                   for c, val in per_country_metrics['co2_emissions'].items()}
+    )
+
+
+def sum_uc_summary_metrics(uc_summary_metrics_list: List[UCSummaryMetrics]) -> UCSummaryMetrics:
+    """
+    UC summary metrics over successive periods - e.g. the chunks of a year - all of them being additive over time
+    """
+    summed_values = {}
+    for attr_name in [elt.name for elt in fields(UCSummaryMetrics)]:
+        values = [getattr(elt, attr_name) for elt in uc_summary_metrics_list]
+        if any(val is None for val in values):
+            summed_values[attr_name] = None
+        elif isinstance(values[0], dict):
+            summed_values[attr_name] = {}
+            for per_country_values in values:
+                for country, val in per_country_values.items():
+                    summed_values[attr_name][country] = summed_values[attr_name].get(country, 0) + val
+        else:
+            summed_values[attr_name] = sum(values)
+    return UCSummaryMetrics(**summed_values)
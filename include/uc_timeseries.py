@@ -1,7 +1,7 @@
 import logging
 import os
 import warnings
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Union, Tuple, Optional
 import numpy as np
@@ -10,13 +10,15 @@ import pandas as pd
 from common.constants.data_analysis_types import COMMON_PLOT_YEAR
 from common.constants.datatypes import PLOT_YLABEL_PER_DT
 from common.plot_params import PlotParams
+from include.duration_curves import DurationCurves, set_duration_curves
 from utils.basic_utils import set_years_suffix, CLIM_YEARS_SUFFIX
 from utils.dates import set_year_in_date, set_temporal_period_str
-from utils.df_utils import set_key_columns
 from utils.plot import simple_plot, set_temporal_period_title, FigureStyle, set_curve_style_attrs, CurveStyleAttrs
 
 NAME_SEP = '_'
 SUBNAME_SEP = '-'
+# names of the components of (tuple) case keys of UCTimeseries values/dates dicts
+CASE_KEY_COLS = ['country', 'year', 'climatic_year', 'extra_params', 'aggreg_prod_type']
 
 
 def set_uc_ts_name(data_type: Tuple[str, List[str]], countries: List[str], years: List[int],
@@ -126,6 +128,45 @@ class UCTimeseries:
     # can be a dict. {(country, year, clim year): dates}, in case multiple
     # (country, year, climatic year) be considered
     dates: Union[List[datetime], Dict[Tuple[str, int, int], List[datetime]]] = None
+    # if values is a dict. with same-length vectors: (case x time) matrix of these values, in the order of
+    # case_keys -> vectors of values dict being views on its rows
+    values_matrix: Optional[np.ndarray] = field(default=None, repr=False)
+    case_keys: Optional[List[tuple]] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        self.set_values_matrix()
+
+    def set_values_matrix(self):
+        """
+        Store per-case values in a unique (case x time) matrix - if all cases have the same number of values
+        """
+        if not isinstance(self.values, dict) or len(self.values) == 0:
+            return
+        self.case_keys = list(self.values)
+        n_values = {len(vals) for vals in self.values.values()}
+        if len(n_values) > 1:
+            logging.debug(f'Cases of UC timeseries {self.name} with different number of values -> not stored in '
+                          f'a matrix')
+            self.values_matrix = None
+            return
+        self.values_matrix = np.vstack([np.asarray(vals, dtype=float) for vals in self.values.values()])
+        self.values = {key: self.values_matrix[i_case] for i_case, key in enumerate(self.case_keys)}
+
+    def get_key_table(self, extra_params_labels: Dict[int, str] = None) -> pd.DataFrame:
+        """
+        Table of the (country, year, clim year, extra-params, agg. pt) cases - 1 row per case, in values order -,
+        extra-params indices being replaced by their labels
+        """
+        # TODO: make this -2 adaptative to order of key names in tuple?
+        case_keys = [elt_tuple if elt_tuple[-2] is None
+                     else elt_tuple[:-2] + (extra_params_labels[elt_tuple[-2]], elt_tuple[-1])
+                     for elt_tuple in self.case_keys]
+        return pd.DataFrame(case_keys, columns=CASE_KEY_COLS, dtype=object)
+
+    def get_n_values_per_case(self) -> np.ndarray:
+        if self.values_matrix is not None:
+            return np.full(len(self.case_keys), self.values_matrix.shape[1])
+        return np.array([len(self.values[key]) for key in self.case_keys])
 
     def from_df_col(self, df: pd.DataFrame, col_name: str, unit: str = None):
         self.name = col_name
@@ -154,9 +195,8 @@ class UCTimeseries:
             if first_key is not None:
                 # saving to csv file -> concatenate the dates of all (country, year, cy, extra-params, agg pt) cases
                 if not is_plot:
-                    output_dates = []
-                    for key, dates_val in self.dates.items():
-                        output_dates.extend(dates_val)
+                    output_dates = np.concatenate([np.asarray(self.dates[key], dtype='datetime64[us]')
+                                                   for key in self.case_keys])
                 else:
                     output_dates = self.dates[first_key]
                     # reset year to common values
@@ -170,9 +210,8 @@ class UCTimeseries:
         if isinstance(self.values, dict):
             # saving to csv file -> concatenate the values of all (country, year, clim year, ...) cases
             if not is_plot:
-                output_vals = []
-                for key, vals in self.values.items():
-                    output_vals.extend(vals)
+                output_vals = self.values_matrix.ravel() if self.values_matrix is not None \
+                    else np.concatenate([self.values[key] for key in self.case_keys])
             # plot -> dict. except if of length 1 and not treated before...
             # TODO: manage it more properly before (normally should be the case for RES CF plot
             #  with unique agg prod type selected)
@@ -202,47 +241,70 @@ class UCTimeseries:
         :param extra_params_labels: {idx: label} corresp. for extra-parameters (no corresp. for None extra-params)
         :param dt_suffix_for_output: suffix to be added to datatype in output files to identify them in specific cases
         """
-        with_temp_period_suffix = True
         output_dates = self.set_output_dates(is_plot=False)
         date_col = set_date_col(first_date=output_dates[0])
-        extra_params_col = 'extra_params'
-        agg_prod_type_col = 'aggreg_prod_type'
         output_vals = self.set_output_values(is_plot=False)
         values_dict = {date_col: output_dates, 'value': output_vals}
         if complem_columns is not None:
             for col_name, col_vals in complem_columns.items():
                 values_dict[col_name] = col_vals
         df_to_csv = pd.DataFrame(values_dict)
-        # add "key" columns corresp. to the (country, ty, cy, extra-params) tuples
-        if isinstance(self.dates, dict):
-            all_keys = []
-            # tuple keys of dates dict, replacing last but one component (extra-params) by label, if not None
-            for elt_tuple in self.dates:
-                # TODO: make this -2 adaptative to order of key names in tuple?
-                if elt_tuple[-2] is None:
-                    all_keys.append(elt_tuple)
-                else:
-                    all_keys.append(elt_tuple[:-1] + (extra_params_labels[elt_tuple[-1]],))
-            n_dates = len(self.dates[all_keys[0]])
-            column_names = ['country', 'year', 'climatic_year', extra_params_col, agg_prod_type_col]
-            df_keys = set_key_columns(col_names=column_names, tuple_values=all_keys, n_repeat=n_dates)
-            df_to_csv = pd.concat([df_keys, df_to_csv], axis=1)
-        if with_temp_period_suffix:
-            min_date = min(output_dates)
-            max_date = max(output_dates)
-            temp_period_str = set_temporal_period_str(min_date=min_date, max_date=max_date,
-                                                      print_year=False, date_sep='-')
-            temp_period_suffix = f'_{temp_period_str}'
+        # add "key" columns corresp. to the (country, ty, cy, extra-params) tuples -> key table rows repeated
+        # along the time dim.
+        if isinstance(self.values, dict):
+            key_table = self.get_key_table(extra_params_labels=extra_params_labels)
+            df_keys = key_table.iloc[np.repeat(np.arange(len(key_table)), self.get_n_values_per_case())]
+            df_to_csv = pd.concat([df_keys.reset_index(drop=True), df_to_csv], axis=1)
+            # remove extra-params/aggreg. prod. type column if unique value is None (i.e., no extra-params applied)
+            for col in CASE_KEY_COLS[-2:]:
+                if df_to_csv[col].isna().all():
+                    del df_to_csv[col]
+        output_file = self.set_csv_file(output_dir=output_dir, min_date=df_to_csv[date_col].min(),
+                                        max_date=df_to_csv[date_col].max(), dt_suffix_for_output=dt_suffix_for_output)
+        df_to_csv.to_csv(output_file, index=None)
+
+    def to_matrix_csv(self, output_dir: str, extra_params_labels: Dict[int, str] = None,
+                      dt_suffix_for_output: str = None):
+        """
+        Save values on "matrix format": 1 column per (country, year, clim year, extra-params, agg. pt) case
+        :param output_dir: in which csv must be saved
+        :param extra_params_labels: {idx: label} corresp. for extra-parameters (no corresp. for None extra-params)
+        :param dt_suffix_for_output: suffix to be added to datatype in output files to identify them in specific cases
+        """
+        if isinstance(self.values, dict):
+            if self.values_matrix is None:
+                raise Exception(f'UC timeseries {self.name} cases have different number of values -> cannot be '
+                                f'saved on matrix format -> STOP')
+            key_table = self.get_key_table(extra_params_labels=extra_params_labels)
+            # case columns named with their not-None key components
+            case_cols = [NAME_SEP.join([str(elt) for elt in case_key if elt is not None])
+                         for case_key in key_table.itertuples(index=False)]
+            values_matrix = self.values_matrix
+            all_dates = list(self.dates.values()) if isinstance(self.dates, dict) else [self.dates]
         else:
-            temp_period_suffix = ''
+            case_cols = ['value']
+            values_matrix = np.asarray(self.values, dtype=float).reshape(1, -1)
+            all_dates = [self.dates]
+        n_time_slots = values_matrix.shape[1]
+        # common dates if they are the same for all cases (e.g. unique year), time-slots index otherwise
+        if all_dates[0] is not None and all(elt_dates == all_dates[0] for elt_dates in all_dates[1:]):
+            time_index = pd.Index(all_dates[0], name='date')
+        else:
+            time_index = pd.Index(np.arange(n_time_slots) + 1, name='time_slot')
+        df_to_csv = pd.DataFrame(data=values_matrix.T, index=time_index, columns=case_cols)
+        first_dates = all_dates[0] if all_dates[0] is not None else list(time_index)
+        output_file = self.set_csv_file(output_dir=output_dir, min_date=min(first_dates), max_date=max(first_dates),
+                                        dt_suffix_for_output=dt_suffix_for_output, is_matrix_format=True)
+        df_to_csv.to_csv(output_file)
+
+    def set_csv_file(self, output_dir: str, min_date: Union[int, datetime], max_date: Union[int, datetime],
+                     dt_suffix_for_output: str = None, is_matrix_format: bool = False) -> str:
+        temp_period_str = set_temporal_period_str(min_date=min_date, max_date=max_date, print_year=False,
+                                                  date_sep='-')
         # get name with added suffix to identify this specific file
         name_with_added_suffix = self.get_name_with_added_dt_suffix(data_type_suffix=dt_suffix_for_output)
-        output_file = os.path.join(output_dir, f'{name_with_added_suffix.lower()}{temp_period_suffix}.csv')
-        # remove extra-params/aggreg. prod. type column if unique value is None (i.e., no extra-params applied)
-        for col in [extra_params_col, agg_prod_type_col]:
-            if df_to_csv[col].isna().all():
-                del df_to_csv[col]
-        df_to_csv.to_csv(output_file, index=None)
+        matrix_suffix = '_mat' if is_matrix_format else ''
+        return os.path.join(output_dir, f'{name_with_added_suffix.lower()}_{temp_period_str}{matrix_suffix}.csv')
 
     def set_plot_ylabel(self) -> str:
         ylabel = PLOT_YLABEL_PER_DT[self.data_type]
@@ -354,9 +416,21 @@ class UCTimeseries:
             simple_plot(x=x, y=y, fig_file=fig_file, title=self.set_plot_title(), xlabel=xlabel,
                         ylabel=self.set_plot_ylabel(), fig_style=fig_style, curve_style_attrs=curve_style_attrs)
 
+    def get_duration_curves(self) -> DurationCurves:
+        """
+        Duration curves of all cases, sorted in a unique call over the (case x time) values matrix
+        """
+        if isinstance(self.values, dict):
+            values = self.values_matrix if self.values_matrix is not None \
+                else [self.values[key] for key in self.case_keys]
+            return set_duration_curves(values=values, case_keys=self.case_keys)
+        return set_duration_curves(values=np.asarray(self.values, dtype=float).reshape(1, -1),
+                                   case_keys=[self.name])
+
     def plot_duration_curve(self, output_dir: str, as_a_percentage: bool = False, fig_style: FigureStyle = None,
                             per_dim_plot_params: Dict[str, PlotParams] = None,
-                            extra_params_labels: Dict[int, str] = None, dt_suffix_for_output: str = None):
+                            extra_params_labels: Dict[int, str] = None, dt_suffix_for_output: str = None,
+                            save_stats: bool = True):
         """
         Plot (UC) timeseries duration curve(s)
         :param output_dir: in which figure will be saved
@@ -366,45 +440,39 @@ class UCTimeseries:
         defined in plot_params.json file)
         :param extra_params_labels: corresp. between extra. parameters index and labels
         :param dt_suffix_for_output: suffix to be added to datatype in output files to identify them in specific cases
+        :param save_stats: save also characteristic points (peak, quantiles, etc.) of the curves to a .csv file
         """
-        y = self.set_output_values(is_plot=True)
-        # sort values in descending order
-        # per (country, year, climatic year) values
-        if isinstance(y, dict):
-            y_desc_order = {key: np.sort(vals)[::-1] for key, vals in y.items()}
-            first_key = list(y)[0]
-            n_vals = len(y_desc_order[first_key])
+        duration_curves = self.get_duration_curves()
+        # per (country, year, climatic year) values -> labels for plot legend
+        if isinstance(self.values, dict) and len(self.values) > 1:
             attrs_in_legend = self.set_attrs_in_plot_legend()
-            y_desc_order = set_y_with_label_as_key(y=y_desc_order, extra_params_labels=extra_params_labels,
-                                                   attrs_in_legend=attrs_in_legend)
+            curve_labels = list(set_y_with_label_as_key(y=self.values, extra_params_labels=extra_params_labels,
+                                                        attrs_in_legend=attrs_in_legend))
         else:
-            y_desc_order = np.sort(y)[::-1]
-            n_vals = len(y_desc_order)
-        # this calculation is done assuming uniform time-slot duration
-        duration_curve = np.arange(1, n_vals + 1)
-        if as_a_percentage:
-            duration_curve = np.cumsum(duration_curve) / len(duration_curve)
-            xlabel = 'Duration (%)'
-        else:
-            xlabel = 'Duration (nber of time-slots - hours)'
+            curve_labels = ['']
         # get name with added suffix to identify this specific file
         name_with_added_dt_suffix = self.get_name_with_added_dt_suffix(data_type_suffix=dt_suffix_for_output)
         fig_file = os.path.join(output_dir, f'{name_with_added_dt_suffix.lower()}_duration_curve.png')
         if fig_style is None:
             fig_style = FigureStyle()
             fig_style.process()
-            print_legend = isinstance(y, dict) and len(y) > 1
-            fig_style.set_print_legend(value=print_legend)
+            fig_style.set_print_legend(value=len(curve_labels) > 1)
         # set curve styles (color, linestyle, marker)
-        curve_labels = list(y_desc_order) if isinstance(y_desc_order, dict) else None
         curve_style_attrs = self.set_curve_style_attrs(fig_style=fig_style, per_dim_plot_params=per_dim_plot_params,
-                                                       curve_labels=curve_labels)
-        # catch DeprecationWarnings TODO: fix/more robust way to catch them?
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            simple_plot(x=duration_curve, y=y_desc_order, fig_file=fig_file,
-                        title=f'{self.set_plot_title(dt_suffix="duration curve")}', xlabel=xlabel,
-                        ylabel=self.set_plot_ylabel(), fig_style=fig_style, curve_style_attrs=curve_style_attrs)
+                                                       curve_labels=curve_labels if len(curve_labels) > 1 else None)
+        duration_curves.plot(fig_file=fig_file, title=f'{self.set_plot_title(dt_suffix="duration curve")}',
+                             ylabel=self.set_plot_ylabel(), curve_labels=curve_labels,
+                             as_a_percentage=as_a_percentage, fig_style=fig_style,
+                             curve_style_attrs=curve_style_attrs)
+        if save_stats:
+            if isinstance(self.values, dict):
+                # without extra-params/aggreg. prod. type key columns if unique value is None
+                key_table = self.get_key_table(extra_params_labels=extra_params_labels).dropna(axis=1, how='all')
+                duration_curves.case_keys = list(key_table.itertuples(index=False, name=None))
+                index_names = list(key_table.columns)
+            else:
+                index_names = None
+            duration_curves.save_stats(output_file=fig_file.replace('.png', '_stats.csv'), index_names=index_names)
 
     def plot_rolling_horizon_avg(self):
         bob = 1
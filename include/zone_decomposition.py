@@ -0,0 +1,227 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import highspy
+import numpy as np
+from scipy import sparse
+
+from common.constants.optimisation import OPTIM_RESOL_STATUS, ZoneDecompositionParams
+from common.constants.pypsa_params import GEN_UNITS_PYPSA_PARAMS
+from include.dataset_builder import PYPSA_RESULT_TYPE
+from include.direct_lp_model import VAR_BLOCKS, DirectLPModel, set_highs_lp
+from utils.basic_utils import format_with_spaces
+
+# number of iterations without improvement of the Lagrangian dual bound after which subgradient step is halved
+STEP_STALL_ITER = 5
+# relative gap assumed in Polyak step, as long as no feasible solution (upper bound) has been obtained
+DEFAULT_POLYAK_GAP = 0.01
+
+
+@dataclass
+class ZoneSubproblem:
+    """
+    UC LP restricted to the variables/constraints of a zone (bus) - with its own copy of the flows of incident
+    interco. links. Coupling constraints (equality of the copies of the two zones of a link) are dualized
+    """
+    bus_name: str
+    cols: np.ndarray  # indices of the zone variables in the full LP
+    rows: np.ndarray  # idem for constraints
+    link_pos: np.ndarray  # positions - in cols - of (the local copy of) interco. flows
+    link_signs: np.ndarray  # +1 (resp. -1) if zone is origin (resp. destination) of the link
+    cost: np.ndarray
+    highs: highspy.Highs
+    col_values: np.ndarray = None
+    row_duals: np.ndarray = None
+    lagrangian_value: float = None  # with multipliers terms
+
+    def get_link_vars(self, link_offset: int) -> np.ndarray:
+        # indices of local interco. flows in the link flow block of the full LP
+        return self.cols[self.link_pos] - link_offset
+
+    def solve(self, link_cost: np.ndarray) -> highspy.HighsModelStatus:
+        self.highs.changeColsCost(len(self.link_pos), self.link_pos, self.cost[self.link_pos] + link_cost)
+        self.highs.run()
+        model_status = self.highs.getModelStatus()
+        if model_status == highspy.HighsModelStatus.kOptimal:
+            solution = self.highs.getSolution()
+            self.col_values = np.array(solution.col_value)
+            self.row_duals = np.array(solution.row_dual)
+            self.lagrangian_value = self.highs.getInfo().objective_function_value
+        return model_status
+
+    def set_link_flows_bounds(self, lb: np.ndarray, ub: np.ndarray):
+        self.highs.changeColsBounds(len(self.link_pos), self.link_pos, lb, ub)
+
+    def get_link_flows(self) -> np.ndarray:
+        return self.col_values[self.link_pos]
+
+    def get_obj_value(self) -> float:
+        # without multipliers terms
+        return float(self.cost @ self.col_values)
+
+
+def set_zone_subproblems(direct_lp_model: DirectLPModel, cost: np.ndarray, lb: np.ndarray, ub: np.ndarray,
+                         a_matrix: sparse.csc_matrix, b: np.ndarray) -> List[ZoneSubproblem]:
+    zone_subproblems = []
+    bus0_col = direct_lp_model.links[f'{GEN_UNITS_PYPSA_PARAMS.bus}0']
+    n_ts = len(direct_lp_model.snapshots)
+    link_offset = direct_lp_model.get_var_blocks_offsets()[VAR_BLOCKS.link_flow][0]
+    for bus_name in direct_lp_model.bus_names:
+        cols, rows, link_cols = direct_lp_model.get_zone_cols_and_rows(bus_name=bus_name)
+        zone_a_matrix = a_matrix[:, cols].tocsr()[rows].tocsc()
+        highs = highspy.Highs()
+        highs.setOptionValue('output_flag', False)
+        highs.passModel(set_highs_lp(cost=cost[cols], lb=lb[cols], ub=ub[cols], a_matrix=zone_a_matrix, b=b[rows]))
+        link_pos = np.flatnonzero(np.isin(cols, link_cols))
+        is_origin = (bus0_col.values[(cols[link_pos] - link_offset) // n_ts] == bus_name)
+        zone_subproblems.append(ZoneSubproblem(bus_name=bus_name, cols=cols, rows=rows, link_pos=link_pos,
+                                               link_signs=np.where(is_origin, 1.0, -1.0), cost=cost[cols],
+                                               highs=highs))
+    return zone_subproblems
+
+
+def solve_monolithic_lp(cost: np.ndarray, lb: np.ndarray, ub: np.ndarray, a_matrix: sparse.csc_matrix,
+                        b: np.ndarray) -> Optional[float]:
+    highs = highspy.Highs()
+    highs.setOptionValue('output_flag', False)
+    highs.passModel(set_highs_lp(cost=cost, lb=lb, ub=ub, a_matrix=a_matrix, b=b))
+    highs.run()
+    if not highs.getModelStatus() == highspy.HighsModelStatus.kOptimal:
+        return None
+    return highs.getInfo().objective_function_value
+
+
+def recover_primal_solution(zone_subproblems: List[ZoneSubproblem], executor: ThreadPoolExecutor,
+                            link_flows: np.ndarray, link_offset: int, lb: np.ndarray, ub: np.ndarray,
+                            n_cols: int, n_rows: int) -> Optional[Tuple[float, np.ndarray, np.ndarray]]:
+    """
+    Get a feasible solution of the full LP, fixing interco. flows and solving zone LPs
+    :returns (objective value, column values, row duals) if all zone LPs are feasible with these flows; else None
+    """
+    for zone_subproblem in zone_subproblems:
+        link_cols = zone_subproblem.cols[zone_subproblem.link_pos]
+        fixed_flows = np.clip(link_flows[link_cols - link_offset], lb[link_cols], ub[link_cols])
+        zone_subproblem.set_link_flows_bounds(lb=fixed_flows, ub=fixed_flows)
+    models_status = list(executor.map(lambda sp: sp.solve(link_cost=np.zeros(len(sp.link_pos))),
+                                      zone_subproblems))
+    # release interco. flows for next Lagrangian iterations
+    for zone_subproblem in zone_subproblems:
+        link_cols = zone_subproblem.cols[zone_subproblem.link_pos]
+        zone_subproblem.set_link_flows_bounds(lb=lb[link_cols], ub=ub[link_cols])
+    if not all(model_status == highspy.HighsModelStatus.kOptimal for model_status in models_status):
+        return None
+    col_values = np.zeros(n_cols)
+    row_duals = np.zeros(n_rows)
+    for zone_subproblem in zone_subproblems:
+        col_values[zone_subproblem.cols] = zone_subproblem.col_values
+        row_duals[zone_subproblem.rows] = zone_subproblem.row_duals
+    return sum(sp.get_obj_value() for sp in zone_subproblems), col_values, row_duals
+
+
+def solve_with_zone_decomposition(direct_lp_model: DirectLPModel,
+                                  params: ZoneDecompositionParams = None) -> PYPSA_RESULT_TYPE:
+    """
+    Solve UC LP of a direct LP model by decomposition into per-zone subproblems - solved in parallel - with
+    interco. flows coordinated via Lagrangian relaxation of the coupling constraints (multipliers updated by
+    subgradient steps). Feasible solutions are regularly recovered by fixing flows to their average over last
+    iterations; iterations stop when the gap between best feasible and Lagrangian dual values is below tolerance
+    :returns a tuple (status, status of resolution), as PyPSA
+    """
+    if params is None:
+        params = ZoneDecompositionParams()
+    n_workers = params.n_workers if params.n_workers is not None else os.cpu_count()
+    logging.info('Build direct LP model - as sparse matrices - and its per-zone subproblems')
+    cost, lb, ub, a_matrix, b = direct_lp_model.build_lp()
+    zone_subproblems = set_zone_subproblems(direct_lp_model=direct_lp_model, cost=cost, lb=lb, ub=ub,
+                                            a_matrix=a_matrix, b=b)
+    # multipliers of coupling constraints, indexed as the link flow block of the full LP
+    link_offset, n_links = direct_lp_model.get_var_blocks_offsets()[VAR_BLOCKS.link_flow]
+    n_link_vars = n_links * len(direct_lp_model.snapshots)
+    multipliers = np.zeros(n_link_vars)
+    logging.info(f'Solve UC by zone decomposition: {len(zone_subproblems)} zones, {n_links} interco. links, '
+                 f'{n_workers} workers')
+
+    best_lower_bound, best_upper_bound, best_solution = -np.inf, np.inf, None
+    step_size_factor = params.step_size_factor
+    n_stall_iter = 0
+    sum_link_flows, n_summed_iter = np.zeros(n_link_vars), 0
+    rel_gap = np.inf
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        for n_iter in range(1, params.max_iter + 1):
+            models_status = list(executor.map(
+                lambda sp: sp.solve(link_cost=sp.link_signs * multipliers[sp.get_link_vars(link_offset)]),
+                zone_subproblems))
+            for zone_subproblem, model_status in zip(zone_subproblems, models_status):
+                if not model_status == highspy.HighsModelStatus.kOptimal:
+                    result = ('warning', zone_subproblem.highs.modelStatusToString(model_status).lower())
+                    logging.warning(f'Subproblem of zone {zone_subproblem.bus_name} not solved at iteration '
+                                    f'{n_iter}: {result}')
+                    return result
+            lagrangian_value = sum(sp.lagrangian_value for sp in zone_subproblems)
+            if lagrangian_value > best_lower_bound:
+                best_lower_bound = lagrangian_value
+                n_stall_iter = 0
+            else:
+                n_stall_iter += 1
+                if n_stall_iter >= STEP_STALL_ITER:
+                    step_size_factor /= 2
+                    n_stall_iter = 0
+            # subgradient = mismatch between origin and destination copies of the flows; and their midpoint
+            subgradient = np.zeros(n_link_vars)
+            for zone_subproblem in zone_subproblems:
+                link_vars = zone_subproblem.get_link_vars(link_offset=link_offset)
+                subgradient[link_vars] += zone_subproblem.link_signs * zone_subproblem.get_link_flows()
+                sum_link_flows[link_vars] += zone_subproblem.get_link_flows() / 2
+            n_summed_iter += 1
+            subgradient_sq_norm = float(subgradient @ subgradient)
+            # primal recovery, periodically - or directly if copies of the flows coincide
+            if n_iter % params.recovery_period == 0 or subgradient_sq_norm == 0:
+                recovered_flows = sum_link_flows / n_summed_iter
+                sum_link_flows, n_summed_iter = np.zeros(n_link_vars), 0
+                recovered_solution = recover_primal_solution(zone_subproblems=zone_subproblems, executor=executor,
+                                                             link_flows=recovered_flows, link_offset=link_offset,
+                                                             lb=lb, ub=ub, n_cols=len(cost), n_rows=len(b))
+                if recovered_solution is not None and recovered_solution[0] < best_upper_bound:
+                    best_upper_bound, best_solution = recovered_solution[0], recovered_solution
+                rel_gap = (best_upper_bound - best_lower_bound) / max(abs(best_upper_bound), 1)
+                logging.debug(f'Zone decomposition iteration {n_iter}: lower (resp. upper) bound '
+                              f'{best_lower_bound:.6g} (resp. {best_upper_bound:.6g}), relative gap {rel_gap:.3g}')
+                if rel_gap <= params.tolerance or subgradient_sq_norm == 0:
+                    break
+            # Polyak subgradient step on multipliers
+            target_value = best_upper_bound if best_solution is not None \
+                else lagrangian_value + DEFAULT_POLYAK_GAP * abs(lagrangian_value)
+            multipliers += step_size_factor * (target_value - lagrangian_value) / subgradient_sq_norm * subgradient
+
+    if best_solution is None:
+        result = ('warning', 'no feasible solution')
+        logging.warning(f'No feasible solution obtained by zone decomposition after {n_iter} iterations: {result}')
+        return result
+    is_converged = rel_gap <= params.tolerance
+    if is_converged:
+        logging.info(f'Zone decomposition converged after {n_iter} iterations, with relative gap {rel_gap:.3g}')
+    else:
+        logging.warning(f'Zone decomposition not converged after {n_iter} iterations: relative gap {rel_gap:.3g} '
+                        f'above tolerance {params.tolerance} -> best feasible solution used, with '
+                        f'{OPTIM_RESOL_STATUS.suboptimal} status (increase max_iter to get an optimal one)')
+    direct_lp_model.objective_value, col_values, row_duals = best_solution
+    direct_lp_model.set_opt_results(col_values=col_values, row_duals=row_duals)
+    direct_lp_model.solver_stats = {'solver': 'highs', 'n_iter': n_iter, 'rel_gap': float(rel_gap)}
+    if params.calc_monolithic_gap:
+        logging.info('Solve monolithic LP, to calculate gap of zone decomposition')
+        monolithic_obj_value = solve_monolithic_lp(cost=cost, lb=lb, ub=ub, a_matrix=a_matrix, b=b)
+        if monolithic_obj_value is None:
+            logging.warning('Monolithic LP not solved to optimality -> no gap calculated')
+        else:
+            monolithic_gap = (direct_lp_model.objective_value - monolithic_obj_value) / abs(monolithic_obj_value)
+            direct_lp_model.solver_stats['monolithic_gap'] = monolithic_gap
+            logging.info(f'Zone decomposition objective value '
+                         f'{format_with_spaces(number=int(direct_lp_model.objective_value))} vs monolithic one '
+                         f'{format_with_spaces(number=int(monolithic_obj_value))} -> relative gap '
+                         f'{100 * monolithic_gap:.4f}%')
+    result = ('ok', OPTIM_RESOL_STATUS.optimal) if is_converged else ('warning', OPTIM_RESOL_STATUS.suboptimal)
+    logging.info(f'Obtained result: {result}')
+    return result
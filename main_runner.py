@@ -0,0 +1,142 @@
+import logging
+import time
+import traceback
+from dataclasses import asdict
+from typing import Dict, Tuple
+
+import pandas as pd
+
+from common.constants.campaign import JOB_STATUSES, CampaignParams
+from common.constants.usage_params_json import EnvPhaseNames
+from common.fuel_sources import set_fuel_sources_from_json
+from common.logger import init_logger, logged_process_pool, stop_logger, \
+    deactivate_verbose_warnings, TITLE_LOG_SEP
+from common.long_term_uc_io import get_run_trace_file, get_uc_summary_file, lt_uc_output_subfolder, \
+    set_full_lt_uc_output_folder
+from common.uc_run_params import UCRunParams
+from include.campaign import JOB_RUN_PARAMS_FIELDS, get_job_name, get_job_output_subfolder, get_n_workers, \
+    set_campaign_jobs_inputs, set_job_uc_run_params
+from include.job_queue import Job, JobQueue, get_worker_name
+from my_little_europe_lt_uc import run
+from utils.read import read_and_check_uc_run_params, read_campaign_params, read_solver_params, read_usage_params
+
+# max. time (s) between two looks at the queue of a worker waiting for the retry delay of a failed job
+MAX_QUEUE_POLL_PERIOD = 30
+
+
+def run_job(job: Job, base_uc_run_params: UCRunParams, with_outputs: bool) -> Tuple[Dict[str, str], dict]:
+    """
+    N.B. outputs of a job written in its own subfolder, for the jobs run by concurrent workers not to write the same
+    files (e.g. columnar output schema)
+    :returns: output locations and UC summary metrics of the UC run of a job
+    """
+    output_subfolder = get_job_output_subfolder(campaign=job.campaign, job_id=job.job_id, job_inputs=job.inputs)
+    with lt_uc_output_subfolder(subfolder=output_subfolder) as output_folder:
+        job_model = run(network_name=f'campaign job {get_job_name(job_inputs=job.inputs)}',
+                        fixed_uc_run_params=set_job_uc_run_params(base_uc_run_params=base_uc_run_params,
+                                                                  job_inputs=job.inputs),
+                        fixed_run_params_fields=JOB_RUN_PARAMS_FIELDS,
+                        extra_params={'skip_outputs': not with_outputs, 'use_caller_logger': True})
+        if job_model.uc_summary_metrics is None:
+            raise Exception(f'UC problem of job {job.job_id} not solved to optimality -> STOP')
+        output_file_kwargs = {'country': 'europe', 'year': job.inputs['target_year'],
+                              'climatic_year': job.inputs['climatic_year'],
+                              'start_horizon': base_uc_run_params.uc_period_start}
+        output_locations = {'run_trace': get_run_trace_file(**output_file_kwargs)}
+        if with_outputs:
+            output_locations['uc_summary'] = get_uc_summary_file(**output_file_kwargs)
+            output_locations['output_folder'] = output_folder
+    return output_locations, asdict(job_model.uc_summary_metrics)
+
+
+def run_queue_worker(params: CampaignParams, base_uc_run_params: UCRunParams) -> int:
+    """
+    Pull jobs of the campaign from the queue and run them, until there is no pending job anymore - waiting for the
+    retry delay of failed ones
+    :returns: number of jobs done by this worker
+    """
+    job_queue = JobQueue(db_file=params.queue_file, max_attempts=params.max_attempts, retry_delay=params.retry_delay)
+    worker = get_worker_name()
+    n_done_jobs = 0
+    while True:
+        job = job_queue.claim_job(campaign=params.name, worker=worker)
+        if job is None:
+            next_attempt_wait = job_queue.get_next_attempt_wait(campaign=params.name)
+            if next_attempt_wait is None:
+                return n_done_jobs
+            time.sleep(min(next_attempt_wait, MAX_QUEUE_POLL_PERIOD))
+            continue
+        job_name = get_job_name(job_inputs=job.inputs)
+        logging.info(f'{TITLE_LOG_SEP} Job {job.job_id} ({job_name}), attempt {job.n_attempts}, by worker {worker} '
+                     f'{TITLE_LOG_SEP}')
+        try:
+            with job_queue.keep_lease(job_id=job.job_id, worker=worker):
+                output_locations, result = run_job(job=job, base_uc_run_params=base_uc_run_params,
+                                                   with_outputs=params.with_outputs)
+        # N.B. SystemExit, as raised on uncoherent params
+        except (Exception, SystemExit):
+            retry_delay = job_queue.mark_failed(job_id=job.job_id, error=traceback.format_exc())
+            retry_msg = f'retried in {retry_delay:.0f}s' if retry_delay is not None \
+                else f'no more attempt ({params.max_attempts} made)'
+            logging.exception(f'Job {job.job_id} ({job_name}) failed -> {retry_msg}')
+            continue
+        job_queue.mark_done(job_id=job.job_id, output_locations=output_locations, result=result)
+        n_done_jobs += 1
+
+
+def run_campaign(params: CampaignParams = None) -> pd.DataFrame:
+    """
+    Run a campaign of UC runs - over (target year, climatic year, capacity variant) combinations - through a
+    persistent job queue pulled by local worker processes; when run again, only the jobs not done yet (or with
+    changed inputs) are run - to resume an interrupted campaign
+    :returns: done and failed jobs of the campaign, with their output locations and result (UC summary metrics)
+    """
+    if params is None:
+        params = read_campaign_params()
+    usage_params = read_usage_params()
+    eraa_data_descr, base_uc_run_params = (
+        read_and_check_uc_run_params(phase_name=EnvPhaseNames.multizones_uc_model, usage_params=usage_params)
+    )
+    jobs_inputs = set_campaign_jobs_inputs(params=params, base_uc_run_params=base_uc_run_params,
+                                           eraa_data_descr=eraa_data_descr, fuel_sources=set_fuel_sources_from_json(),
+                                           solver_params=read_solver_params())
+    job_queue = JobQueue(db_file=params.queue_file, max_attempts=params.max_attempts, retry_delay=params.retry_delay)
+    n_added_jobs = job_queue.add_jobs(campaign=params.name, jobs_inputs=jobs_inputs)
+    n_requeued_jobs = job_queue.requeue_interrupted_jobs(campaign=params.name)
+    n_reset_jobs = job_queue.reset_failed_jobs(campaign=params.name) if params.retry_failed_jobs else 0
+    jobs_count = job_queue.count_jobs(campaign=params.name)
+    logging.info(f'Campaign {params.name} with {len(jobs_inputs)} job(s) in queue {job_queue.get_db_file()}: '
+                 f'{n_added_jobs} new one(s), {n_requeued_jobs} interrupted one(s) and {n_reset_jobs} failed one(s) '
+                 f'requeued -> job count per status {jobs_count}')
+
+    n_workers = get_n_workers(params=params, n_jobs=jobs_count.get(JOB_STATUSES.pending, 0))
+    if n_workers == 1:
+        run_queue_worker(params=params, base_uc_run_params=base_uc_run_params)
+    else:
+        logging.info(f'Run jobs of campaign {params.name} in a pool of {n_workers} processes')
+        with logged_process_pool(n_workers=n_workers, log_level=usage_params.log_level) as executor:
+            futures = [executor.submit(run_queue_worker, params=params, base_uc_run_params=base_uc_run_params)
+                       for _ in range(n_workers)]
+            for future in futures:
+                future.result()
+
+    # N.B. only current jobs, not the done ones of previous versions of the campaign params
+    campaign_jobs = job_queue.get_jobs(campaign=params.name, statuses=[JOB_STATUSES.done, JOB_STATUSES.failed],
+                                       inputs_hashes=list(jobs_inputs))
+    failed_jobs = campaign_jobs[campaign_jobs['status'] == JOB_STATUSES.failed]
+    logging.info(f'Campaign {params.name} ended -> job count per status {job_queue.count_jobs(campaign=params.name)}')
+    if len(failed_jobs) > 0:
+        logging.warning(f'{len(failed_jobs)} failed job(s) - to be put back in the queue with retry_failed_jobs in '
+                        f'JSON campaign params: {failed_jobs["inputs"].to_list()}')
+    return campaign_jobs
+
+
+if __name__ == '__main__':
+    deactivate_verbose_warnings()
+    usage_params = read_usage_params()
+    logger = init_logger(logger_dir=set_full_lt_uc_output_folder(), logger_name='main_runner.log',
+                         log_level=usage_params.log_level)
+    logging.info('START campaign runner')
+    run_campaign()
+    logging.info('THE END of campaign runner!')
+    stop_logger()
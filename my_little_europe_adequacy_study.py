@@ -0,0 +1,126 @@
+import logging
+from typing import Dict, List
+
+import pandas as pd
+
+from common.constants.adequacy_study import AdequacyStudyParams
+from common.constants.usage_params_json import EnvPhaseNames
+from common.logger import init_logger, logged_process_pool, stop_logger, \
+    deactivate_verbose_warnings, TITLE_LOG_SEP
+from common.long_term_uc_io import set_full_lt_uc_output_folder
+from common.uc_run_params import UCRunParams
+from include.adequacy_accumulator import AdequacyAccumulator
+from include.adequacy_study import CHUNK_RUN_PARAMS_FIELDS, AdequacyScenario, get_n_workers, \
+    set_adequacy_scenarios, set_period_chunks, set_scenario_uc_run_params
+from include.uc_summary_metrics import FAILURE_UNIT_SUFFIX, sum_uc_summary_metrics
+from my_little_europe_lt_uc import run
+from utils.read import read_adequacy_study_params, read_and_check_uc_run_params, read_usage_params
+from utils.solver_stats import get_process_peak_rss_mb
+
+
+def run_adequacy_scenario(scenario: AdequacyScenario, base_uc_run_params: UCRunParams,
+                          params: AdequacyStudyParams) -> AdequacyAccumulator:
+    """
+    Run the chunks of the period of a scenario successively - final storage State-of-Charge of a chunk being the
+    initial one of the next chunk, and at least its own initial one (not to drain storages at the end of each chunk,
+    which would bias LOLE/EENS upwards at chunk boundaries) -, then add the concatenated results of the full period
+    to an accumulator
+    """
+    chunks = set_period_chunks(period_start=params.period_start, period_end=params.period_end,
+                               chunk_days=params.chunk_days)
+    logging.info(f'{TITLE_LOG_SEP} Adequacy scenario {scenario.name}: {len(chunks)} chunk(s) of (up to) '
+                 f'{params.chunk_days} days {TITLE_LOG_SEP}')
+    # first chunk: non-cyclic storages, with default initial SoC
+    storage_soc_init = {}
+    failure_prod, prices, chunks_uc_summary_metrics = [], [], []
+    memory_budget_exceeded = False
+    for i_chunk, (chunk_start, chunk_end) in enumerate(chunks):
+        chunk_name = f'adequacy {scenario.name} chunk {i_chunk + 1}/{len(chunks)}'
+        chunk_uc_run_params = set_scenario_uc_run_params(base_uc_run_params=base_uc_run_params, scenario=scenario,
+                                                         period_start=chunk_start, period_end=chunk_end)
+        chunk_model = run(network_name=chunk_name, fixed_uc_run_params=chunk_uc_run_params,
+                          fixed_run_params_fields=CHUNK_RUN_PARAMS_FIELDS,
+                          extra_params={'skip_outputs': True, 'use_caller_logger': True},
+                          storage_soc_init=storage_soc_init)
+        if chunk_model.uc_summary_metrics is None:
+            raise Exception(f'UC problem of {chunk_name} not solved to optimality -> adequacy metrics of this '
+                            f'scenario cannot be computed -> STOP')
+        if chunk_model.storage_soc_opt is not None and len(chunk_model.storage_soc_opt.columns) > 0:
+            storage_soc_init = chunk_model.storage_soc_opt.iloc[-1].to_dict()
+        prod_var_opt = chunk_model.prod_var_opt
+        failure_prod.append(prod_var_opt[[col for col in prod_var_opt.columns if col.endswith(FAILURE_UNIT_SUFFIX)]])
+        prices.append(chunk_model.sde_dual_var_opt)
+        chunks_uc_summary_metrics.append(chunk_model.uc_summary_metrics)
+        peak_rss = get_process_peak_rss_mb()
+        if params.memory_budget_per_worker_mb is not None and peak_rss is not None \
+                and peak_rss > params.memory_budget_per_worker_mb and not memory_budget_exceeded:
+            logging.warning(f'Peak memory of adequacy worker ({peak_rss:.0f}MB) above the budget per worker '
+                            f'({params.memory_budget_per_worker_mb}MB) -> reduce chunk_days (now '
+                            f'{params.chunk_days}) or increase the budget in JSON adequacy study params')
+            memory_budget_exceeded = True
+
+    scenario_accumulator = AdequacyAccumulator()
+    scenario_accumulator.update(uc_run_params=set_scenario_uc_run_params(base_uc_run_params=base_uc_run_params,
+                                                                         scenario=scenario,
+                                                                         period_start=params.period_start,
+                                                                         period_end=params.period_end),
+                                prod_var_opt=pd.concat(failure_prod), sde_dual_var_opt=pd.concat(prices),
+                                uc_summary_metrics=sum_uc_summary_metrics(chunks_uc_summary_metrics))
+    return scenario_accumulator
+
+
+def run_adequacy_scenarios(scenarios: List[AdequacyScenario], base_uc_run_params: UCRunParams,
+                           params: AdequacyStudyParams, log_level: str) -> List[AdequacyAccumulator]:
+    """
+    Run the scenarios, in a pool of processes if more than one worker - their logs being merged into the ones of
+    current process through a queue
+    """
+    n_workers = get_n_workers(params=params, n_scenarios=len(scenarios))
+    if n_workers == 1:
+        return [run_adequacy_scenario(scenario=scenario, base_uc_run_params=base_uc_run_params, params=params)
+                for scenario in scenarios]
+
+    logging.info(f'Run {len(scenarios)} adequacy scenario(s) in a pool of {n_workers} processes')
+    with logged_process_pool(n_workers=n_workers, log_level=log_level) as executor:
+        futures = [executor.submit(run_adequacy_scenario, scenario=scenario, base_uc_run_params=base_uc_run_params,
+                                   params=params)
+                   for scenario in scenarios]
+        # results in submission order, to stop on the first failed scenario as in a sequential run
+        return [future.result() for future in futures]
+
+
+def run_adequacy_study(params: AdequacyStudyParams = None) -> Dict[int, AdequacyAccumulator]:
+    """
+    Full-year adequacy study: UC runs over all (target year, climatic year) scenarios, each split in chunks, with
+    adequacy metrics - and their confidence intervals - saved in a report per target year
+    :returns: adequacy accumulator per target year
+    """
+    if params is None:
+        params = read_adequacy_study_params()
+    usage_params = read_usage_params()
+    eraa_data_descr, base_uc_run_params = (
+        read_and_check_uc_run_params(phase_name=EnvPhaseNames.multizones_uc_model, usage_params=usage_params)
+    )
+    scenarios = set_adequacy_scenarios(params=params, eraa_data_descr=eraa_data_descr)
+    logging.info(f'Run adequacy study over {len(scenarios)} scenario(s): {[scenario.name for scenario in scenarios]}, '
+                 f'period [{params.period_start:%Y/%m/%d}, {params.period_end:%Y/%m/%d}[')
+    scenario_accumulators = run_adequacy_scenarios(scenarios=scenarios, base_uc_run_params=base_uc_run_params,
+                                                   params=params, log_level=usage_params.log_level)
+
+    per_year_accumulator = {}
+    for scenario, scenario_accumulator in zip(scenarios, scenario_accumulators):
+        per_year_accumulator.setdefault(scenario.target_year, AdequacyAccumulator()).merge(other=scenario_accumulator)
+    for target_year, year_accumulator in per_year_accumulator.items():
+        year_accumulator.save_report(year=target_year, confidence_level=params.confidence_level)
+    return per_year_accumulator
+
+
+if __name__ == '__main__':
+    deactivate_verbose_warnings()
+    usage_params = read_usage_params()
+    logger = init_logger(logger_dir=set_full_lt_uc_output_folder(), logger_name='adequacy_study.log',
+                         log_level=usage_params.log_level)
+    logging.info('START full-year adequacy study')
+    run_adequacy_study()
+    logging.info('THE END of full-year adequacy study!')
+    stop_logger()
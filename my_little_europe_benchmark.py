@@ -0,0 +1,192 @@
+import logging
+import os
+import sys
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from common.constants.benchmark import BENCHMARK_HORIZON_N_DAYS, BENCHMARK_STAGES, BenchmarkParams
+from common.constants.countries import set_country_trigram
+from common.constants.datadims import DataDimensions
+from common.constants.extract_eraa_data import ERAADatasetDescr
+from common.constants.optimisation import OPTIM_RESOL_STATUS, SolverParams
+from common.fuel_sources import FuelSource, set_fuel_sources_from_json
+from common.logger import init_logger, stop_logger, deactivate_verbose_warnings, TITLE_LOG_SEP
+from common.long_term_uc_io import OUTPUT_BENCHMARK_FOLDER, get_json_fixed_params_file, \
+    get_synthetic_eraa_avail_values_file
+from common.plot_params import PlotParams
+from common.uc_run_params import UCRunParams
+from include.dataset import Dataset
+from include.synthetic_eraa_data import N_HOURS_IN_YEAR, SyntheticDataParams, generate_synthetic_eraa_data
+from include.uc_benchmark import BENCHMARK_PROFILING, BenchmarkCase, BenchmarkRegression, BenchmarkResults, \
+    set_benchmark_cases
+from my_little_europe_lt_uc import create_pypsa_network_model
+from utils.read import check_and_load_json_file, read_benchmark_params, read_plot_params, read_usage_params, \
+    set_eraa_data_descr, set_json_params_fixed_synthetic_data, set_json_params_tb_modif
+from utils.run_trace import start_run_trace, stop_run_trace, trace_span
+
+BENCHMARK_FIRST_CLIMATIC_YEAR = 1982
+BENCHMARK_TARGET_YEAR = 2025
+BENCHMARK_PERIOD_START = datetime(year=1900, month=1, day=1)
+# fixed solver params, for durations to be comparable over time - whatever the ones in JSON solver params
+BENCHMARK_SOLVER_PARAMS = SolverParams(name='highs', io_api='direct', save_lp_file=False)
+
+
+def get_case_data_folder(case: BenchmarkCase, seed: int, aggreg_prod_types_def: Dict[str, Dict[str, List[str]]]) \
+        -> str:
+    """
+    Synthetic data of a benchmark case - generated if not already in the output folder (data of a case only
+    depending on its params)
+    """
+    n_days = BENCHMARK_HORIZON_N_DAYS[case.horizon]
+    data_params = SyntheticDataParams(n_zones=case.n_zones,
+                                      climatic_years=[BENCHMARK_FIRST_CLIMATIC_YEAR + i_cy
+                                                      for i_cy in range(case.n_climatic_years)],
+                                      target_years=[BENCHMARK_TARGET_YEAR],
+                                      n_hours=min(N_HOURS_IN_YEAR, (n_days + 1) * 24), seed=seed)
+    data_params.process()
+    # N.B. available values JSON file written last -> complete data if present
+    if os.path.exists(get_synthetic_eraa_avail_values_file(data_folder=data_params.output_folder)):
+        logging.info(f'Use synthetic data previously generated in {data_params.output_folder}')
+        return data_params.output_folder
+    return generate_synthetic_eraa_data(params=data_params, aggreg_prod_types_def=aggreg_prod_types_def)
+
+
+def set_synthetic_zone_plot_params(plot_params_zone: PlotParams, zones: List[str]) -> PlotParams:
+    """
+    Zone plot params for synthetic zones - whose trigrams are unknown in JSON plot params -, cycling over the colors of real zones
+    """
+    colors = list(plot_params_zone.per_case_color.values())
+    zone_trigrams = [set_country_trigram(country=zone) for zone in zones]
+    return replace(plot_params_zone, order=zone_trigrams,
+                   per_case_color={trigram: colors[i_zone % len(colors)]
+                                   for i_zone, trigram in enumerate(zone_trigrams)})
+
+
+def run_uc_stages(uc_run_params: UCRunParams, eraa_data_descr: ERAADatasetDescr, data_folder: str,
+                  fuel_sources: Dict[str, FuelSource], with_figures: bool) -> dict:
+    """
+    Main stages of a UC run - as in my_little_europe_lt_uc, without result cache/warehouse and with synchronous
+    outputs -, each in a top-level span of current run trace
+    :returns: size of the UC problem
+    """
+    eraa_dataset = Dataset(source='synthetic', agg_prod_types_with_cf_data=eraa_data_descr.agg_prod_types_with_cf_data,
+                           data_folder=data_folder)
+    with trace_span(BENCHMARK_STAGES.get_countries_data):
+        eraa_dataset.get_countries_data(uc_run_params=uc_run_params,
+                                        aggreg_prod_types_def=eraa_data_descr.aggreg_prod_types_def)
+        eraa_dataset.complete_data()
+    with trace_span(BENCHMARK_STAGES.get_generation_units_data):
+        eraa_dataset.get_generation_units_data(uc_run_params=uc_run_params,
+                                               pypsa_unit_params_per_agg_pt=
+                                               eraa_data_descr.pypsa_unit_params_per_agg_pt,
+                                               units_complem_params_per_agg_pt=
+                                               eraa_data_descr.units_complem_params_per_agg_pt)
+        eraa_dataset.set_committable_param_to_false()
+    with trace_span(BENCHMARK_STAGES.create_pypsa_network_model):
+        pypsa_model = create_pypsa_network_model(name='benchmark', uc_run_params=uc_run_params,
+                                                 eraa_dataset=eraa_dataset,
+                                                 zones_gps_coords=eraa_data_descr.gps_coordinates,
+                                                 fuel_sources=fuel_sources)
+    with trace_span(BENCHMARK_STAGES.optimize_network):
+        pypsa_model.set_optim_solver(solver_params=BENCHMARK_SOLVER_PARAMS)
+        result = pypsa_model.optimize_network(year=uc_run_params.selected_target_year,
+                                              n_countries=len(uc_run_params.selected_countries),
+                                              period_start=uc_run_params.uc_period_start, save_lp_file=False)
+    if result[1] != OPTIM_RESOL_STATUS.optimal:
+        raise Exception(f'Benchmark UC problem not solved to optimality (status {result[1]}) -> STOP')
+    with trace_span(BENCHMARK_STAGES.result_extraction):
+        objective_value = pypsa_model.get_opt_value(pypsa_resol_status=OPTIM_RESOL_STATUS.optimal)
+        pypsa_model.get_prod_var_opt()
+        pypsa_model.get_storage_vars_opt()
+        pypsa_model.get_link_flow_vars_opt()
+        pypsa_model.get_sde_dual_var_opt()
+    with trace_span(BENCHMARK_STAGES.set_uc_summary_metrics):
+        pypsa_model.set_uc_summary_metrics(total_cost=objective_value, failure_penalty=uc_run_params.failure_penalty)
+    run_output_kwargs = {'year': uc_run_params.selected_target_year,
+                         'climatic_year': uc_run_params.selected_climatic_year,
+                         'start_horizon': uc_run_params.uc_period_start}
+    with trace_span(BENCHMARK_STAGES.csv_writers):
+        pypsa_model.save_opt_decisions_to_csv(**run_output_kwargs)
+        pypsa_model.save_marginal_prices_to_csv(**run_output_kwargs)
+        pypsa_model.json_dump_uc_summary_metrics(**run_output_kwargs)
+    if with_figures:
+        per_dim_plot_params = read_plot_params()
+        plot_params_zone = set_synthetic_zone_plot_params(plot_params_zone=per_dim_plot_params[DataDimensions.zone],
+                                                          zones=uc_run_params.selected_countries)
+        with trace_span(BENCHMARK_STAGES.figure_writers):
+            for country in uc_run_params.selected_countries:
+                pypsa_model.plot_opt_prod_var(plot_params_agg_pt=per_dim_plot_params[DataDimensions.agg_prod_type],
+                                              country=country, **run_output_kwargs)
+                pypsa_model.plot_link_flows_at_opt(origin_country=country, **run_output_kwargs)
+            pypsa_model.plot_marginal_price(plot_params_zone=plot_params_zone, **run_output_kwargs)
+            pypsa_model.save_duration_curves(plot_params_zone=plot_params_zone, **run_output_kwargs)
+    network = pypsa_model.network
+    return {'n_snapshots': len(network.snapshots), 'n_generators': len(network.generators),
+            'n_storage_units': len(network.storage_units), 'n_links': len(network.links)}
+
+
+def run_benchmark_case(case: BenchmarkCase, params: BenchmarkParams, json_params_fixed: dict,
+                       json_params_tb_modif: dict, results: BenchmarkResults):
+    logging.info(f'{TITLE_LOG_SEP} Benchmark case {case.name} {TITLE_LOG_SEP}')
+    data_folder = get_case_data_folder(case=case, seed=params.seed,
+                                       aggreg_prod_types_def=json_params_fixed['aggreg_prod_types_def'])
+    eraa_data_descr = set_eraa_data_descr(json_params_fixed=set_json_params_fixed_synthetic_data(data_folder))
+    zones = eraa_data_descr.available_countries
+    run_traces = []
+    problem_size = None
+    for i_repeat in range(params.n_repeats):
+        run_trace = start_run_trace(name=f'benchmark {case.name} (repeat {i_repeat + 1})',
+                                    profiling=BENCHMARK_PROFILING[params.memory_mode])
+        for climatic_year in eraa_data_descr.available_climatic_years:
+            uc_run_params = UCRunParams(selected_climatic_year=climatic_year, selected_countries=zones,
+                                        selected_target_year=BENCHMARK_TARGET_YEAR,
+                                        selected_prod_types={zone: ['all'] for zone in zones},
+                                        uc_period_start=BENCHMARK_PERIOD_START,
+                                        uc_period_end=BENCHMARK_PERIOD_START
+                                        + timedelta(days=BENCHMARK_HORIZON_N_DAYS[case.horizon]),
+                                        failure_power_capa=json_params_tb_modif['failure_power_capa'],
+                                        failure_penalty=json_params_tb_modif['failure_penalty'])
+            uc_run_params.process(available_countries=zones)
+            uc_run_params.set_is_stress_test(avail_cy_stress_test=eraa_data_descr.available_climatic_years_stress_test)
+            uc_run_params.coherence_check(eraa_data_descr=eraa_data_descr)
+            problem_size = run_uc_stages(uc_run_params=uc_run_params, eraa_data_descr=eraa_data_descr,
+                                         data_folder=data_folder, fuel_sources=set_fuel_sources_from_json(),
+                                         with_figures=params.with_figures)
+        stop_run_trace()
+        run_trace.log_summary(max_depth=0)
+        run_traces.append(run_trace)
+    results.add_case(case=case, run_traces=run_traces, problem_size=problem_size)
+
+
+def run_benchmark(params: BenchmarkParams = None) -> List[BenchmarkRegression]:
+    """
+    Run the matrix of benchmark cases - on synthetic data -, save results and compare them to baseline
+    :returns: list of performance regressions w.r.t. baseline
+    """
+    if params is None:
+        params = read_benchmark_params()
+    json_params_fixed = check_and_load_json_file(json_file=get_json_fixed_params_file(),
+                                                 file_descr='JSON fixed params')
+    json_params_tb_modif = set_json_params_tb_modif()
+    results = BenchmarkResults(params=params)
+    cases = set_benchmark_cases(params=params)
+    logging.info(f'Run {len(cases)} benchmark case(s): {[case.name for case in cases]}')
+    for case in cases:
+        run_benchmark_case(case=case, params=params, json_params_fixed=json_params_fixed,
+                           json_params_tb_modif=json_params_tb_modif, results=results)
+    return results.compare_to_baseline_and_save()
+
+
+if __name__ == '__main__':
+    deactivate_verbose_warnings()
+    usage_params = read_usage_params()
+    logger = init_logger(logger_dir=OUTPUT_BENCHMARK_FOLDER, logger_name='uc_benchmark.log',
+                         log_level=usage_params.log_level)
+    logging.info('START UC benchmark, on synthetic data')
+    regressions = run_benchmark()
+    logging.info('THE END of UC benchmark!')
+    stop_logger()
+    # non-zero exit code for performance regressions to be caught, e.g. in CI
+    if len(regressions) > 0:
+        sys.exit(1)
@@ -8,22 +8,32 @@ from datetime import datetime
 
 from common.constants.datadims import DataDimensions
 from common.constants.extract_eraa_data import ERAADatasetDescr
-from common.constants.optimisation import OPTIM_RESOL_STATUS, DEFAULT_OPTIM_SOLVER_PARAMS, SolverParams
+from common.constants.output_params import OUTPUT_FORMATS, OutputParams
+from common.constants.optimisation import OPTIM_RESOL_STATUS, DEFAULT_OPTIM_SOLVER_PARAMS, ModelBackends, SolverParams
 from common.constants.usage_params_json import EnvPhaseNames
 from common.fuel_sources import set_fuel_sources_from_json, DUMMY_FUEL_SOURCES, FuelSource
 from common.logger import init_logger, stop_logger, deactivate_verbose_warnings, TITLE_LOG_SEP
-from common.long_term_uc_io import set_full_lt_uc_output_folder
+from common.long_term_uc_io import get_run_profile_file, get_run_trace_file, set_full_lt_uc_output_folder
 from common.uc_run_params import UCRunParams
+from include.adequacy_accumulator import AdequacyAccumulator
 from include.dataset import Dataset
 from include.dataset_builder import PypsaModel
+from include.direct_lp_model import DirectLPModel
+from include.zone_decomposition import solve_with_zone_decomposition
+from include.uc_output_writer import OUTPUT_TASK_KINDS, UCOutputWriter
+from include.uc_result_cache import UCResultCache, set_uc_run_hash
+from include.uc_results_warehouse import UCResultsWarehouse, get_param_overrides, set_uc_config_hash
 from include.uc_summary_metrics import UCSummaryMetrics
 from include_runner.overwrite_uc_run_params import apply_fixed_uc_run_params
 from utils.basic_utils import print_non_default
 from utils.dates import get_period_str
 from utils.read import (read_and_check_uc_run_params, read_and_check_pypsa_static_params, read_given_phase_plot_params,
-                        read_plot_params, read_usage_params, read_solver_params)
+                        read_plot_params, read_usage_params, read_solver_params, read_result_cache_params,
+                        read_output_params, read_results_warehouse_params)
+from utils.run_trace import PROFILING_MODES, start_run_trace, stop_run_trace, trace_span, traced
 
 
+@traced('ERAA data')
 def get_needed_eraa_data(uc_run_params: UCRunParams, eraa_data_descr: ERAADatasetDescr,
                          debug_mode: bool = False, debug_output_folder: str = None) -> Dataset:
     """
@@ -43,19 +53,22 @@ def get_needed_eraa_data(uc_run_params: UCRunParams, eraa_data_descr: ERAADatase
                            agg_prod_types_with_cf_data=eraa_data_descr.agg_prod_types_with_cf_data,
                            is_stress_test=uc_run_params.is_stress_test)
 
-    eraa_dataset.get_countries_data(uc_run_params=uc_run_params,
-                                    aggreg_prod_types_def=eraa_data_descr.aggreg_prod_types_def)
-    eraa_dataset.complete_data()
+    with trace_span('data reading', n_countries=len(uc_run_params.selected_countries)):
+        eraa_dataset.get_countries_data(uc_run_params=uc_run_params,
+                                        aggreg_prod_types_def=eraa_data_descr.aggreg_prod_types_def)
+        eraa_dataset.complete_data()
     logging.info(f'{TITLE_LOG_SEP} II)2) Check data coherence {TITLE_LOG_SEP}')
     logging.info('Get generation units data, from both ERAA data - read just before '
                  '- and complementary JSON parameter files')
-    eraa_dataset.get_generation_units_data(uc_run_params=uc_run_params,
-                                           pypsa_unit_params_per_agg_pt=eraa_data_descr.pypsa_unit_params_per_agg_pt,
-                                           units_complem_params_per_agg_pt=
-                                           eraa_data_descr.units_complem_params_per_agg_pt)
+    with trace_span('generation units preparation'):
+        eraa_dataset.get_generation_units_data(uc_run_params=uc_run_params,
+                                               pypsa_unit_params_per_agg_pt=
+                                               eraa_data_descr.pypsa_unit_params_per_agg_pt,
+                                               units_complem_params_per_agg_pt=
+                                               eraa_data_descr.units_complem_params_per_agg_pt)
 
-    # set 'committable' attribute to False, i.e. no 'dynamic constraints' modeled in the considered modeled
-    eraa_dataset.set_committable_param_to_false()
+        # set 'committable' attribute to False, i.e. no 'dynamic constraints' modeled in the considered modeled
+        eraa_dataset.set_committable_param_to_false()
 
     if debug_mode:
         gen_units_data_json = os.path.join(debug_output_folder, 'pypsa_gen_units_data.json')
@@ -72,17 +85,22 @@ def check_min_pypsa_params_provided(eraa_dataset: Dataset):
         pypsa_min_unit_params_per_agg_pt=pypsa_static_params.min_unit_params_per_agg_pt)
 
 
-def create_pypsa_network_model(name: str, uc_run_params: UCRunParams, eraa_dataset: Dataset,
-                               zones_gps_coords: Dict[str, Tuple[float, float]],
-                               fuel_sources: Dict[str, FuelSource]) -> PypsaModel:
-    logging.info(f'{TITLE_LOG_SEP} III) Create PyPSA UC model {TITLE_LOG_SEP}')
-    pypsa_model = PypsaModel(name=name)
-    date_idx = eraa_dataset.demand[uc_run_params.selected_countries[0]].index
-    horizon = pd.date_range(
+def get_uc_horizon(uc_run_params: UCRunParams) -> pd.DatetimeIndex:
+    return pd.date_range(
         start=uc_run_params.uc_period_start.replace(year=uc_run_params.selected_target_year),
         end=uc_run_params.uc_period_end.replace(year=uc_run_params.selected_target_year),
         freq='h'
     )
+
+
+@traced('network build')
+def create_pypsa_network_model(name: str, uc_run_params: UCRunParams, eraa_dataset: Dataset,
+                               zones_gps_coords: Dict[str, Tuple[float, float]],
+                               fuel_sources: Dict[str, FuelSource], storage_final_soc_min: bool = False) -> PypsaModel:
+    logging.info(f'{TITLE_LOG_SEP} III) Create PyPSA UC model {TITLE_LOG_SEP}')
+    pypsa_model = PypsaModel(name=name, storage_final_soc_min=storage_final_soc_min)
+    date_idx = eraa_dataset.demand[uc_run_params.selected_countries[0]].index
+    horizon = get_uc_horizon(uc_run_params=uc_run_params)
     pypsa_model.init_pypsa_network(date_idx=date_idx, date_range=horizon)
     # add GPS coordinates
     selec_countries_gps_coords = \
@@ -101,10 +119,28 @@ def create_pypsa_network_model(name: str, uc_run_params: UCRunParams, eraa_datas
     phase_name = EnvPhaseNames.multizones_uc_model
     fig_style = read_given_phase_plot_params(phase_name=phase_name)
     print_non_default(obj=fig_style, obj_name=f'FigureStyle - for phase {phase_name}', log_level='debug')
-    pypsa_model.plot_network(toy_model_output=False)
+    with trace_span('network figure'):
+        pypsa_model.plot_network(toy_model_output=False)
     return pypsa_model
 
 
+@traced('network build')
+def create_direct_lp_model(name: str, uc_run_params: UCRunParams, eraa_dataset: Dataset,
+                           fuel_sources: Dict[str, FuelSource], storage_final_soc_min: bool = False) -> DirectLPModel:
+    logging.info(f'{TITLE_LOG_SEP} III) Create direct LP UC model {TITLE_LOG_SEP}')
+    direct_lp_model = DirectLPModel(name=name, storage_final_soc_min=storage_final_soc_min)
+    # last date of horizon excluded, as in PyPSA network
+    direct_lp_model.set_snapshots(date_range=get_uc_horizon(uc_run_params=uc_run_params)[:-1])
+    direct_lp_model.add_buses(countries=uc_run_params.selected_countries)
+    direct_lp_model.add_energy_carriers(fuel_sources=fuel_sources | DUMMY_FUEL_SOURCES)
+    direct_lp_model.add_generators(generators_data=eraa_dataset.generation_units_data)
+    direct_lp_model.add_loads(demand=eraa_dataset.demand)
+    direct_lp_model.add_interco_links(countries=uc_run_params.selected_countries,
+                                      interco_capas=eraa_dataset.interco_capas)
+    return direct_lp_model
+
+
+@traced('solve')
 def solve_pypsa_network_model(pypsa_model: PypsaModel, year: int, n_countries: int, uc_period_start: datetime,
                               solver_params: SolverParams = DEFAULT_OPTIM_SOLVER_PARAMS) \
         -> Tuple[str, str]:
@@ -114,61 +150,122 @@ def solve_pypsa_network_model(pypsa_model: PypsaModel, year: int, n_countries: i
     :param year: of considered UC pb
     :param n_countries: in the considered network
     :param uc_period_start: date of the beginning of UC pb
-    :param solver_params: name/license file, if not default solver (highs) used
+    :param solver_params: name/license file, if not default solver (highs) used; and way the model is passed to
+    the solver (io_api, e.g. 'direct' for in-memory), and if it must be saved in an .lp file
     """
     logging.info(f'{TITLE_LOG_SEP} IV) Get a solution for European UC model {TITLE_LOG_SEP}')
     # use alternatively set_optim_solver(name='gurobi', license_file='gurobi.lic') to use Gurobi,
     # with gurobi.lic file provided at root of this project (see readme.md on procedure to obtain such a lic file)
     pypsa_model.set_optim_solver(solver_params=solver_params)
-    result = pypsa_model.optimize_network(year=year, n_countries=n_countries, period_start=uc_period_start)
+    result = pypsa_model.optimize_network(year=year, n_countries=n_countries, period_start=uc_period_start,
+                                          save_lp_file=pypsa_model.optim_solver_params.save_lp_file)
     return result
 
 
-def save_data_and_fig_results(pypsa_model: PypsaModel, uc_run_params: UCRunParams, result_optim_status: str) -> Optional[UCSummaryMetrics]:
+def submit_output_tasks(results_model: PypsaModel, uc_run_params: UCRunParams, output_params: OutputParams,
+                        output_writer: UCOutputWriter):
+    """
+    Submit figure/data output tasks of a solved UC run to an output writer
+    :param results_model: model with the optimal results of the run
+    :param uc_run_params
+    :param output_params
+    :param output_writer
+    """
+    run_output_kwargs = {'year': uc_run_params.selected_target_year,
+                         'climatic_year': uc_run_params.selected_climatic_year,
+                         'start_horizon': uc_run_params.uc_period_start}
+    uc_period_msg = get_period_str(period_start=uc_run_params.uc_period_start,
+                                   period_end=uc_run_params.uc_period_end)
+    run_descr = f'{uc_run_params.selected_target_year}, cy {uc_run_params.selected_climatic_year}, {uc_period_msg}'
+    # get plot parameters associated to aggreg. production types
+    per_dim_plot_params = read_plot_params()
+    plot_params_agg_pt = per_dim_plot_params[DataDimensions.agg_prod_type]
+    plot_params_zone = per_dim_plot_params[DataDimensions.zone]
+
+    # plot - per country - opt prod profiles 'stacked'
+    for country in uc_run_params.selected_countries:
+        output_writer.submit(task_name=f'production figure {country} ({run_descr})',
+                             task_kind=OUTPUT_TASK_KINDS.figure, func=results_model.plot_opt_prod_var,
+                             plot_params_agg_pt=plot_params_agg_pt, country=country, **run_output_kwargs)
+        output_writer.submit(task_name=f'link flows figure {country} ({run_descr})',
+                             task_kind=OUTPUT_TASK_KINDS.figure, func=results_model.plot_link_flows_at_opt,
+                             origin_country=country, **run_output_kwargs)
+    # plot 'marginal price' figure
+    output_writer.submit(task_name=f'marginal prices figure ({run_descr})', task_kind=OUTPUT_TASK_KINDS.figure,
+                         func=results_model.plot_marginal_price, plot_params_zone=plot_params_zone,
+                         **run_output_kwargs)
+    # and per-zone price/failure duration curves - with their characteristic points
+    output_writer.submit(task_name=f'duration curves ({run_descr})', task_kind=OUTPUT_TASK_KINDS.figure,
+                         func=results_model.save_duration_curves, plot_params_zone=plot_params_zone,
+                         **run_output_kwargs)
+
+    # save optimal prod. decision and marginal prices to output files
+    if output_params.output_format == OUTPUT_FORMATS.csv:
+        output_writer.submit(task_name=f'opt. decisions csv ({run_descr})', task_kind=OUTPUT_TASK_KINDS.data,
+                             func=results_model.save_opt_decisions_to_csv, **run_output_kwargs)
+        output_writer.submit(task_name=f'marginal prices csv ({run_descr})', task_kind=OUTPUT_TASK_KINDS.data,
+                             func=results_model.save_marginal_prices_to_csv, **run_output_kwargs)
+    else:
+        output_writer.submit(task_name=f'{output_params.output_format} results ({run_descr})',
+                             task_kind=OUTPUT_TASK_KINDS.data, func=results_model.save_results_to_columnar_files,
+                             output_params=output_params, **run_output_kwargs)
+    output_writer.submit(task_name=f'UC summary metrics json ({run_descr})', task_kind=OUTPUT_TASK_KINDS.data,
+                         func=results_model.json_dump_uc_summary_metrics, **run_output_kwargs)
+    if results_model.solver_stats is not None:
+        output_writer.submit(task_name=f'solver stats json ({run_descr})', task_kind=OUTPUT_TASK_KINDS.data,
+                             func=results_model.json_dump_solver_stats, **run_output_kwargs)
+
+
+@traced('results and outputs')
+def save_data_and_fig_results(pypsa_model: PypsaModel, uc_run_params: UCRunParams, result_optim_status: str,
+                              opt_results_loaded: bool = False, output_writer: UCOutputWriter = None,
+                              with_outputs: bool = True) -> Optional[UCSummaryMetrics]:
+    """
+    :param pypsa_model
+    :param uc_run_params
+    :param result_optim_status
+    :param opt_results_loaded: if True, optimal decisions and UC summary metrics have already been set in
+    pypsa_model (e.g. from result cache) -> they are not obtained from the (solved) network
+    :param output_writer: to which figure/data output tasks are submitted - possibly run in background; if None,
+    one is set from JSON output params and flushed before returning
+    :param with_outputs: if False, optimal results and UC summary metrics are only set in pypsa_model - no
+    figure/data output
+    """
     pypsa_opt_resol_status = OPTIM_RESOL_STATUS.optimal
-    # if optimal resolution status, save output data and plot associated figures
-    if result_optim_status == pypsa_opt_resol_status:
-        # get objective value, and associated optimal decisions / dual variables
-        objective_value = pypsa_model.get_opt_value(pypsa_resol_status=pypsa_opt_resol_status)
-        pypsa_model.get_prod_var_opt()
-        pypsa_model.get_storage_vars_opt()
-        pypsa_model.get_link_flow_vars_opt()
-        pypsa_model.get_sde_dual_var_opt()
-        pypsa_model.get_link_capa_dual_var_opt()
-        # get plot parameters associated to aggreg. production types
-        per_dim_plot_params = read_plot_params()
-        plot_params_agg_pt = per_dim_plot_params[DataDimensions.agg_prod_type]
-        plot_params_zone = per_dim_plot_params[DataDimensions.zone]
-
-        # plot - per country - opt prod profiles 'stacked'
-        for country in uc_run_params.selected_countries:
-            pypsa_model.plot_opt_prod_var(plot_params_agg_pt=plot_params_agg_pt, country=country,
-                                          year=uc_run_params.selected_target_year,
-                                          climatic_year=uc_run_params.selected_climatic_year,
-                                          start_horizon=uc_run_params.uc_period_start)
-            pypsa_model.plot_link_flows_at_opt(origin_country=country, 
-                                               year=uc_run_params.selected_target_year,
-                                               climatic_year=uc_run_params.selected_climatic_year,
-                                               start_horizon=uc_run_params.uc_period_start)
-        # plot 'marginal price' figure
-        pypsa_model.plot_marginal_price(plot_params_zone=plot_params_zone, year=uc_run_params.selected_target_year,
-                                        climatic_year=uc_run_params.selected_climatic_year,
-                                        start_horizon=uc_run_params.uc_period_start)
-
-        # save optimal prod. decision to an output file
-        pypsa_model.save_opt_decisions_to_csv(year=uc_run_params.selected_target_year,
-                                              climatic_year=uc_run_params.selected_climatic_year,
-                                              start_horizon=uc_run_params.uc_period_start)
-
-        # save marginal prices to an output file
-        pypsa_model.save_marginal_prices_to_csv(year=uc_run_params.selected_target_year,
-                                                climatic_year=uc_run_params.selected_climatic_year,
-                                                start_horizon=uc_run_params.uc_period_start)
-        # set UC summary metrics (Energy Not Served, number of failure hours, costs)
-        pypsa_model.set_uc_summary_metrics(total_cost=objective_value, failure_penalty=uc_run_params.failure_penalty)
-        pypsa_model.json_dump_uc_summary_metrics(year=uc_run_params.selected_target_year,
-                                                climatic_year=uc_run_params.selected_climatic_year,
-                                                start_horizon=uc_run_params.uc_period_start)
+    # if optimal (or suboptimal, with results already set) resolution status, save output data and plot associated
+    # figures
+    if result_optim_status == pypsa_opt_resol_status \
+            or (opt_results_loaded and result_optim_status == OPTIM_RESOL_STATUS.suboptimal):
+        if not opt_results_loaded:
+            with trace_span('result extraction'):
+                # get objective value, and associated optimal decisions / dual variables
+                objective_value = pypsa_model.get_opt_value(pypsa_resol_status=pypsa_opt_resol_status)
+                pypsa_model.get_prod_var_opt()
+                pypsa_model.get_storage_vars_opt()
+                pypsa_model.get_link_flow_vars_opt()
+                pypsa_model.get_sde_dual_var_opt()
+                pypsa_model.get_link_capa_dual_var_opt()
+                # set UC summary metrics (Energy Not Served, number of failure hours, costs) - before output
+                # tasks, so that they are available whatever the outcome of the latter
+                pypsa_model.set_uc_summary_metrics(total_cost=objective_value,
+                                                   failure_penalty=uc_run_params.failure_penalty)
+        if not with_outputs:
+            return pypsa_model.uc_summary_metrics
+
+        output_params = read_output_params()
+        # output tasks run in background are given a results-only copy, pypsa_model staying available to caller
+        results_model = pypsa_model.get_results_copy() if output_params.async_output else pypsa_model
+        flush_at_end = output_writer is None
+        if flush_at_end:
+            output_writer = UCOutputWriter(params=output_params)
+        try:
+            submit_output_tasks(results_model=results_model, uc_run_params=uc_run_params, output_params=output_params,
+                                output_writer=output_writer)
+        finally:
+            # own writer closed even if a task fails at submission (e.g. in synchronous mode), not to leave its
+            # worker pools running
+            if flush_at_end:
+                output_writer.close()
         return pypsa_model.uc_summary_metrics
     else:
         logging.info(f'Optimisation resolution status is not {pypsa_opt_resol_status} '
@@ -177,7 +274,9 @@ def save_data_and_fig_results(pypsa_model: PypsaModel, uc_run_params: UCRunParam
 
 
 def run(network_name: str = 'my little europe', solver_params: SolverParams = None,
-        fixed_uc_run_params: UCRunParams = None, fixed_run_params_fields: List[str] = None, extra_params: dict = None):
+        fixed_uc_run_params: UCRunParams = None, fixed_run_params_fields: List[str] = None, extra_params: dict = None,
+        output_writer: UCOutputWriter = None, adequacy_accumulator: AdequacyAccumulator = None,
+        storage_soc_init: Dict[str, float] = None) -> PypsaModel:
     """
     Run N-zones European Unit Commitment model
     :param network_name: just to set associated attribute in PyPSA network
@@ -189,6 +288,23 @@ def run(network_name: str = 'my little europe', solver_params: SolverParams = No
         - log_level: it will overwrite the one defined in usage parameters JSON file
         - debug_mode: activated to save some intermediate data/results in (JSON) output files
     to more easily debug the code
+        - profiling: list of profiling modes to be applied over the run, among 'cprofile' (stats saved in a .prof
+    file, and top entries in run trace), 'tracemalloc' (peak memory and top allocation sites in run trace),
+    'memory' (peak RSS and Python allocations per stage, with top allocation sites of each stage, in run trace) and
+    'rss' (peak RSS per stage only, without slowing the run down)
+        - skip_outputs: if True, no figure/data output - results being only returned (e.g. for chained runs)
+        - use_caller_logger: if True, logger is neither initialized nor stopped by this function - its logs going
+    to the caller's ones (e.g. when run in a worker process)
+    :param output_writer: to share background output workers between successive runs - the caller then closing
+    it after the last one; if None, one is set for this run and closed (i.e. waiting for output tasks) at its end
+    :param adequacy_accumulator: if provided, updated with the results of this run - to aggregate adequacy
+    metrics over a set of (climatic year) scenarios
+    :param storage_soc_init: if provided, storage units are not cyclic - e.g. to chain their State-of-Charge over
+    successive periods -, with initial SoC (MWh) per unit name from this dict (default share of their energy
+    capacity for units not in it); and their final SoC at least the initial one, not to drain them at the end of
+    each period
+    :returns: model with the optimal results (and UC summary metrics) of this run - None attributes if not solved
+    to optimality
     """
     if extra_params is None:
         extra_params = {}
@@ -206,55 +322,163 @@ def run(network_name: str = 'my little europe', solver_params: SolverParams = No
     else:
         log_level = extra_params['log_level']
 
-    logger = init_logger(logger_dir=output_folder, logger_name='eraa_lt_uc_pb.log', log_level=log_level)
+    use_caller_logger = extra_params.get('use_caller_logger', False)
+    if not use_caller_logger:
+        init_logger(logger_dir=output_folder, logger_name='eraa_lt_uc_pb.log', log_level=log_level)
     logging.info(f'Start ERAA-PyPSA long-term European Unit Commitment (UC) simulation for network: {network_name}')
-
-    logging.info(f'{TITLE_LOG_SEP} I) Read UC run parameters - from European and per-countries JSON input '
-                 f'files {TITLE_LOG_SEP}')
-
-    # set fuel sources objects from JSON
-    fuel_sources = set_fuel_sources_from_json()
-
-    eraa_data_descr, uc_run_params = (
-        read_and_check_uc_run_params(phase_name=EnvPhaseNames.multizones_uc_model, usage_params=usage_params)
-    )
-
-    if fixed_uc_run_params is not None:
-        uc_run_params = (
-            apply_fixed_uc_run_params(uc_run_params=uc_run_params, fixed_uc_run_params=fixed_uc_run_params,
-                                      eraa_data_descr=eraa_data_descr, fixed_run_params_fields=fixed_run_params_fields)
-        )
-
-    # Get needed data (demand, RES Capa. Factors, installed generation capacities)
-    if 'debug_mode' in extra_params:
-        debug_mode = extra_params['debug_mode']
-    else:
-        debug_mode = False
-    eraa_dataset = get_needed_eraa_data(uc_run_params=uc_run_params, eraa_data_descr=eraa_data_descr,
-                                        debug_mode=debug_mode, debug_output_folder=output_folder)
-    # and check that minimal parameters needed for model creation have been provided
-    # -> to avoid 'obscure crash' hereafter
-    check_min_pypsa_params_provided(eraa_dataset=eraa_dataset)
-
-    # create PyPSA network
-    pypsa_model = create_pypsa_network_model(name=network_name, uc_run_params=uc_run_params, eraa_dataset=eraa_dataset,
-                                             zones_gps_coords=eraa_data_descr.gps_coordinates,
-                                             fuel_sources=fuel_sources)
-
-    # get solver params from JSON file if not provided in arg of this function
-    if solver_params is None:
-        solver_params = read_solver_params()
-    result = solve_pypsa_network_model(pypsa_model=pypsa_model, year=uc_run_params.selected_target_year,
-                                       n_countries=len(uc_run_params.selected_countries),
-                                       uc_period_start=uc_run_params.uc_period_start, solver_params=solver_params)
-
-    uc_summary_metrics = save_data_and_fig_results(pypsa_model=pypsa_model, uc_run_params=uc_run_params, result_optim_status=result[1])
-
+    # timing spans of the run stages, saved in a JSON trace at its end
+    run_trace = start_run_trace(name=network_name, profiling=extra_params.get('profiling'))
+    profile_file = None
+    close_output_writer = output_writer is None
+    # N.B. run trace stopped even if the run fails, for its profilers (cProfile, tracemalloc, RSS sampler) not to stay
+    # active in current process - and own output writer closed, for its worker pools not to stay running
+    try:
+        logging.info(f'{TITLE_LOG_SEP} I) Read UC run parameters - from European and per-countries JSON input '
+                     f'files {TITLE_LOG_SEP}')
+
+        # set fuel sources objects from JSON
+        fuel_sources = set_fuel_sources_from_json()
+
+        with trace_span('run params reading'):
+            eraa_data_descr, uc_run_params = (
+                read_and_check_uc_run_params(phase_name=EnvPhaseNames.multizones_uc_model, usage_params=usage_params)
+            )
+
+            if fixed_uc_run_params is not None:
+                uc_run_params = (
+                    apply_fixed_uc_run_params(uc_run_params=uc_run_params, fixed_uc_run_params=fixed_uc_run_params,
+                                              eraa_data_descr=eraa_data_descr,
+                                              fixed_run_params_fields=fixed_run_params_fields)
+                )
+
+        # Get needed data (demand, RES Capa. Factors, installed generation capacities)
+        if 'debug_mode' in extra_params:
+            debug_mode = extra_params['debug_mode']
+        else:
+            debug_mode = False
+        eraa_dataset = get_needed_eraa_data(uc_run_params=uc_run_params, eraa_data_descr=eraa_data_descr,
+                                            debug_mode=debug_mode, debug_output_folder=output_folder)
+        # and check that minimal parameters needed for model creation have been provided
+        # -> to avoid 'obscure crash' hereafter
+        check_min_pypsa_params_provided(eraa_dataset=eraa_dataset)
+        if storage_soc_init is not None:
+            eraa_dataset.set_storage_soc_init(soc_init=storage_soc_init)
+
+        # get solver params from JSON file if not provided in arg of this function
+        if solver_params is None:
+            solver_params = read_solver_params()
+
+        with_outputs = not extra_params.get('skip_outputs', False)
+        if close_output_writer:
+            output_writer = UCOutputWriter(params=read_output_params())
+
+        # if result cache activated, look for results of a previous run with exactly the same inputs
+        result_cache_params = read_result_cache_params()
+        warehouse_params = read_results_warehouse_params()
+        uc_result_cache, uc_results_warehouse, run_hash, cached_results = None, None, None, None
+        store_results = True
+        if result_cache_params.activated or warehouse_params.activated:
+            with trace_span('run hash'):
+                run_hash = set_uc_run_hash(uc_run_params=uc_run_params, eraa_dataset=eraa_dataset,
+                                           fuel_sources=fuel_sources, solver_params=solver_params)
+        if warehouse_params.activated:
+            uc_results_warehouse = UCResultsWarehouse(params=warehouse_params)
+        if result_cache_params.activated:
+            uc_result_cache = UCResultCache(params=result_cache_params)
+            with trace_span('result cache lookup'):
+                cached_results = uc_result_cache.load(run_hash=run_hash)
+
+        if cached_results is not None:
+            logging.info(f'{TITLE_LOG_SEP} III-IV) UC results loaded from cache -> PyPSA model neither created '
+                         f'nor solved {TITLE_LOG_SEP}')
+            pypsa_model = PypsaModel(name=network_name)
+            pypsa_model.set_opt_results(opt_results=cached_results.opt_results)
+            pypsa_model.uc_summary_metrics = cached_results.uc_summary_metrics
+            pypsa_model.solver_stats = cached_results.solver_stats
+            uc_summary_metrics = save_data_and_fig_results(pypsa_model=pypsa_model, uc_run_params=uc_run_params,
+                                                           result_optim_status=OPTIM_RESOL_STATUS.optimal,
+                                                           opt_results_loaded=True, output_writer=output_writer,
+                                                           with_outputs=with_outputs)
+        elif solver_params.model_backend in [ModelBackends.direct_lp, ModelBackends.zone_decomposition]:
+            direct_lp_model = create_direct_lp_model(name=network_name, uc_run_params=uc_run_params,
+                                                     eraa_dataset=eraa_dataset, fuel_sources=fuel_sources,
+                                                     storage_final_soc_min=storage_soc_init is not None)
+            logging.info(f'{TITLE_LOG_SEP} IV) Get a solution for European UC model {TITLE_LOG_SEP}')
+            with trace_span('solve', model_backend=solver_params.model_backend):
+                if solver_params.model_backend == ModelBackends.zone_decomposition:
+                    result = solve_with_zone_decomposition(direct_lp_model=direct_lp_model,
+                                                           params=solver_params.zone_decomposition)
+                else:
+                    result = direct_lp_model.solve(solver_params=solver_params)
+            # optimal results are then post-processed as the ones of PyPSA model
+            pypsa_model = PypsaModel(name=network_name)
+            # N.B. suboptimal results (of a non-converged zone decomposition) neither cached nor stored in warehouse
+            store_results = result[1] == OPTIM_RESOL_STATUS.optimal
+            if result[1] in [OPTIM_RESOL_STATUS.optimal, OPTIM_RESOL_STATUS.suboptimal]:
+                with trace_span('result extraction'):
+                    direct_lp_model.set_uc_summary_metrics(failure_penalty=uc_run_params.failure_penalty)
+                    pypsa_model.set_opt_results(opt_results=direct_lp_model.get_opt_results())
+                    pypsa_model.uc_summary_metrics = direct_lp_model.uc_summary_metrics
+                    pypsa_model.solver_stats = direct_lp_model.solver_stats
+            uc_summary_metrics = save_data_and_fig_results(pypsa_model=pypsa_model, uc_run_params=uc_run_params,
+                                                           result_optim_status=result[1], opt_results_loaded=True,
+                                                           output_writer=output_writer, with_outputs=with_outputs)
+            if uc_result_cache is not None and uc_summary_metrics is not None and store_results:
+                uc_result_cache.store(run_hash=run_hash, pypsa_model=pypsa_model)
+        else:
+            # create PyPSA network
+            pypsa_model = create_pypsa_network_model(name=network_name, uc_run_params=uc_run_params,
+                                                     eraa_dataset=eraa_dataset,
+                                                     zones_gps_coords=eraa_data_descr.gps_coordinates,
+                                                     fuel_sources=fuel_sources,
+                                                     storage_final_soc_min=storage_soc_init is not None)
+
+            result = solve_pypsa_network_model(pypsa_model=pypsa_model, year=uc_run_params.selected_target_year,
+                                               n_countries=len(uc_run_params.selected_countries),
+                                               uc_period_start=uc_run_params.uc_period_start,
+                                               solver_params=solver_params)
+
+            uc_summary_metrics = save_data_and_fig_results(pypsa_model=pypsa_model, uc_run_params=uc_run_params,
+                                                           result_optim_status=result[1], output_writer=output_writer,
+                                                           with_outputs=with_outputs)
+            if uc_result_cache is not None and uc_summary_metrics is not None:
+                uc_result_cache.store(run_hash=run_hash, pypsa_model=pypsa_model)
+
+        if adequacy_accumulator is not None and uc_summary_metrics is not None:
+            adequacy_accumulator.update(uc_run_params=uc_run_params, prod_var_opt=pypsa_model.prod_var_opt,
+                                        sde_dual_var_opt=pypsa_model.sde_dual_var_opt,
+                                        uc_summary_metrics=uc_summary_metrics)
+
+        # store results in warehouse, for cross-run queries
+        if uc_results_warehouse is not None and uc_summary_metrics is not None and store_results:
+            config_hash = set_uc_config_hash(uc_run_params=uc_run_params, fuel_sources=fuel_sources,
+                                             solver_params=solver_params)
+            param_overrides = get_param_overrides(uc_run_params=uc_run_params, fixed_uc_run_params=fixed_uc_run_params,
+                                                  fixed_run_params_fields=fixed_run_params_fields)
+            with trace_span('results warehouse ingest'):
+                uc_results_warehouse.ingest(run_hash=run_hash, config_hash=config_hash, uc_run_params=uc_run_params,
+                                            uc_summary_metrics=uc_summary_metrics, param_overrides=param_overrides,
+                                            hourly_series=pypsa_model.get_opt_results(),
+                                            solver_stats=pypsa_model.solver_stats)
+
+        run_output_file_kwargs = {'country': 'europe', 'year': uc_run_params.selected_target_year,
+                                  'climatic_year': uc_run_params.selected_climatic_year,
+                                  'start_horizon': uc_run_params.uc_period_start}
+        profile_file = get_run_profile_file(**run_output_file_kwargs) \
+            if PROFILING_MODES.cprofile in run_trace.profiling else None
+    finally:
+        if close_output_writer and output_writer is not None:
+            output_writer.close()
+        stop_run_trace(profile_file=profile_file)
     run_end = time.time()
+    run_trace.log_summary()
+    run_trace.save(json_file=get_run_trace_file(**run_output_file_kwargs))
 
     logging.info(f'{TITLE_LOG_SEP} THE END of ERAA-PyPSA long-term UC simulation! '
                  f'(after {run_end - run_start:.2f}s) {TITLE_LOG_SEP}:\n{str(uc_summary_metrics)}')
-    stop_logger()
+    if not use_caller_logger:
+        stop_logger()
+    return pypsa_model
 
 
 if __name__ == '__main__':
@@ -0,0 +1,66 @@
+import logging
+import os
+
+import pandas as pd
+
+from common.constants.optimisation import ModelBackends
+from common.constants.stress_test import StressTestsParams
+from common.constants.usage_params_json import EnvPhaseNames
+from common.fuel_sources import set_fuel_sources_from_json
+from common.logger import init_logger, stop_logger, deactivate_verbose_warnings
+from common.long_term_uc_io import get_stress_test_impacts_file, set_full_lt_uc_output_folder
+from include.stress_test import evaluate_stress_tests, set_stress_tests
+from my_little_europe_lt_uc import check_min_pypsa_params_provided, create_pypsa_network_model, get_needed_eraa_data
+from utils.read import read_and_check_uc_run_params, read_solver_params, read_stress_tests_params, read_usage_params
+
+
+def run_stress_tests(params: StressTestsParams = None) -> pd.DataFrame:
+    """
+    Evaluate the stress tests of JSON stress tests params on the UC model of JSON UC run params - built once, each
+    stress test being applied in place to it then reverted - and save their impacts, ranked by ENS impact
+    N.B. PyPSA model used, whatever the model backend in JSON solver params
+    :returns: ranked table of stress test impacts
+    """
+    if params is None:
+        params = read_stress_tests_params()
+    usage_params = read_usage_params()
+    eraa_data_descr, uc_run_params = (
+        read_and_check_uc_run_params(phase_name=EnvPhaseNames.multizones_uc_model, usage_params=usage_params)
+    )
+    eraa_dataset = get_needed_eraa_data(uc_run_params=uc_run_params, eraa_data_descr=eraa_data_descr)
+    check_min_pypsa_params_provided(eraa_dataset=eraa_dataset)
+    pypsa_model = create_pypsa_network_model(name='stress tests', uc_run_params=uc_run_params,
+                                             eraa_dataset=eraa_dataset,
+                                             zones_gps_coords=eraa_data_descr.gps_coordinates,
+                                             fuel_sources=set_fuel_sources_from_json())
+    solver_params = read_solver_params()
+    if solver_params.model_backend != ModelBackends.pypsa:
+        logging.warning(f'Model backend {solver_params.model_backend} of JSON solver params not used for stress '
+                        f'tests -> {ModelBackends.pypsa} one')
+    pypsa_model.set_optim_solver(solver_params=solver_params)
+
+    stress_tests = set_stress_tests(params=params)
+    for stress_test in stress_tests:
+        stress_test.process(all_countries=uc_run_params.selected_countries,
+                            uc_dates=list(pypsa_model.network.snapshots))
+    impacts = evaluate_stress_tests(pypsa_model=pypsa_model, stress_tests=stress_tests,
+                                    failure_penalty=uc_run_params.failure_penalty,
+                                    n_workers=params.n_workers if params.n_workers is not None else os.cpu_count(),
+                                    log_level=usage_params.log_level)
+    impacts_file = get_stress_test_impacts_file(country='europe', year=uc_run_params.selected_target_year,
+                                                climatic_year=uc_run_params.selected_climatic_year,
+                                                start_horizon=uc_run_params.uc_period_start)
+    logging.info(f'Stress test impacts, ranked by ENS impact (saved to {impacts_file}):\n{impacts.to_string()}')
+    impacts.to_csv(impacts_file)
+    return impacts
+
+
+if __name__ == '__main__':
+    deactivate_verbose_warnings()
+    usage_params = read_usage_params()
+    logger = init_logger(logger_dir=set_full_lt_uc_output_folder(), logger_name='stress_tests.log',
+                         log_level=usage_params.log_level)
+    logging.info('START evaluation of stress tests on European UC model')
+    run_stress_tests()
+    logging.info('THE END of evaluation of stress tests!')
+    stop_logger()
@@ -0,0 +1,65 @@
+import os
+import sys
+from datetime import datetime
+from typing import Tuple
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from common.constants.extract_eraa_data import ERAADatasetDescr
+from common.constants.optimisation import SolverParams
+from common.constants.usage_params_json import EnvPhaseNames
+from common.fuel_sources import set_fuel_sources_from_json
+from common.uc_run_params import UCRunParams
+from include.dataset import Dataset
+from include.dataset_builder import PypsaModel
+from my_little_europe_lt_uc import check_min_pypsa_params_provided, create_pypsa_network_model, get_needed_eraa_data
+from utils.read import read_and_check_uc_run_params, read_usage_params
+
+
+@pytest.fixture(autouse=True)
+def run_from_repo_root(monkeypatch):
+    # input/output paths of the project are relative to its root
+    monkeypatch.chdir(REPO_ROOT)
+
+
+# small UC case used in model tests: 3 countries over 2 days of January
+SMALL_CASE_COUNTRIES = ['france', 'germany', 'italy']
+SMALL_CASE_PERIOD = (datetime(1900, 1, 1), datetime(1900, 1, 3))
+
+
+@pytest.fixture
+def small_uc_case(run_from_repo_root) -> Tuple[UCRunParams, Dataset, ERAADatasetDescr]:
+    """
+    (UC run params, ERAA dataset, ERAA data description) of the small UC case - other params being the ones of
+    JSON UC run params
+    """
+    eraa_data_descr, uc_run_params = (
+        read_and_check_uc_run_params(phase_name=EnvPhaseNames.multizones_uc_model, usage_params=read_usage_params())
+    )
+    uc_run_params.selected_countries = SMALL_CASE_COUNTRIES
+    uc_run_params.uc_period_start, uc_run_params.uc_period_end = SMALL_CASE_PERIOD
+    eraa_dataset = get_needed_eraa_data(uc_run_params=uc_run_params, eraa_data_descr=eraa_data_descr)
+    check_min_pypsa_params_provided(eraa_dataset=eraa_dataset)
+    return uc_run_params, eraa_dataset, eraa_data_descr
+
+
+@pytest.fixture
+def build_small_pypsa_model(small_uc_case, monkeypatch):
+    """
+    Factory of (not solved) PyPSA models of the small UC case, with HiGHS solver
+    """
+    uc_run_params, eraa_dataset, eraa_data_descr = small_uc_case
+    # no network figure written to the output folder of the repo
+    monkeypatch.setattr(PypsaModel, 'plot_network', lambda self, toy_model_output=False, country=None: None)
+
+    def build(name: str = 'small case') -> PypsaModel:
+        pypsa_model = create_pypsa_network_model(name=name, uc_run_params=uc_run_params, eraa_dataset=eraa_dataset,
+                                                 zones_gps_coords=eraa_data_descr.gps_coordinates,
+                                                 fuel_sources=set_fuel_sources_from_json())
+        pypsa_model.set_optim_solver(solver_params=SolverParams(name='highs', io_api='direct'))
+        return pypsa_model
+    return build
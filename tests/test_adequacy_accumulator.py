@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+from common.uc_run_params import UCRunParams
+from include.adequacy_accumulator import ADEQUACY_REPORT_COLS, AdequacyAccumulator
+from include.duration_curves import get_n_above_threshold_col, set_duration_curves_from_df
+from include.uc_summary_metrics import FAILURE_POWER_TOL, calc_uc_summary_metrics, set_gen_units_index
+
+# failure power with LP noise in its 2nd and 3rd hours
+FAILURE_PROD_VAR_OPT = pd.DataFrame({'fra_failure': [0., FAILURE_POWER_TOL / 10, 1e-7, 500., 250.]})
+
+
+def test_lp_noise_not_counted_as_failure_hours():
+    uc_run_params = UCRunParams(selected_climatic_year=1989, selected_countries=['france'],
+                                selected_target_year=2025, selected_prod_types={},
+                                uc_period_start='1900/1/1')
+    sde_dual_var_opt = pd.DataFrame({'fra': [10., 20., 30., 3000., 3000.]})
+    adequacy_accumulator = AdequacyAccumulator()
+    adequacy_accumulator.update(uc_run_params=uc_run_params, prod_var_opt=FAILURE_PROD_VAR_OPT,
+                                sde_dual_var_opt=sde_dual_var_opt)
+    report = adequacy_accumulator.get_report()
+    assert report.loc['france', ADEQUACY_REPORT_COLS.lole] == 2
+    assert report.loc['france', ADEQUACY_REPORT_COLS.eens] == pytest.approx(0.75, rel=1e-6)
+
+
+def test_same_failure_hours_in_summary_metrics_and_duration_curves():
+    gen_units_index = set_gen_units_index(buses=pd.Series({'fra_failure': 'fra'}),
+                                          marginal_costs=pd.Series({'fra_failure': 0.}),
+                                          co2_emissions=pd.Series({'fra_failure': 0.}))
+    uc_summary_metrics = calc_uc_summary_metrics(prod_var_opt=FAILURE_PROD_VAR_OPT, gen_units_index=gen_units_index,
+                                                 total_cost=0.)
+    assert uc_summary_metrics.per_country_n_failure_hours == {'fra': 2}
+    failure_stats = set_duration_curves_from_df(df=FAILURE_PROD_VAR_OPT).get_stats()
+    assert failure_stats[get_n_above_threshold_col(threshold=FAILURE_POWER_TOL)].to_list() == [2]
@@ -0,0 +1,119 @@
+import os
+import shutil
+from copy import deepcopy
+from dataclasses import replace
+
+import pytest
+
+import my_little_europe_lt_uc
+from common.constants.campaign import CampaignParams
+from common.constants.optimisation import ModelBackends, SolverParams
+from common.constants.output_params import OutputParams
+from common.constants.usage_params_json import EnvPhaseNames
+from common.fuel_sources import set_fuel_sources_from_json
+from common.long_term_uc_io import FigNamesPrefix, OutputFolderNames, set_full_lt_uc_output_folder
+from include.campaign import get_job_name, get_job_output_subfolder, get_n_workers, set_campaign_jobs_inputs, \
+    set_job_uc_run_params
+from include.job_queue import Job
+from main_runner import run_job
+from utils.read import read_and_check_uc_run_params, read_usage_params
+
+CAPACITY_VARIANTS = {'base': {}, 'low-nuclear-fra': {'france': {'nuclear': 40000}}}
+
+
+@pytest.fixture
+def campaign_inputs():
+    """
+    (campaign params, ERAA data description, base UC run params) of a campaign with 2 climatic years and 2 capacity
+    variants
+    """
+    eraa_data_descr, base_uc_run_params = (
+        read_and_check_uc_run_params(phase_name=EnvPhaseNames.multizones_uc_model, usage_params=read_usage_params())
+    )
+    params = CampaignParams(target_years=[2025], climatic_years=[1989, 1996], capacity_variants=CAPACITY_VARIANTS)
+    params.process()
+    return params, eraa_data_descr, base_uc_run_params
+
+
+def get_jobs_inputs(params: CampaignParams, eraa_data_descr, base_uc_run_params, solver_name: str = 'highs') \
+        -> dict:
+    return set_campaign_jobs_inputs(params=params, base_uc_run_params=base_uc_run_params,
+                                    eraa_data_descr=eraa_data_descr, fuel_sources=set_fuel_sources_from_json(),
+                                    solver_params=SolverParams(name=solver_name))
+
+
+def test_one_job_per_year_and_variant(campaign_inputs):
+    jobs_inputs = get_jobs_inputs(*campaign_inputs)
+    assert sorted(get_job_name(job_inputs=job_inputs) for job_inputs in jobs_inputs.values()) == \
+        ['2025-cy1989-base', '2025-cy1989-low-nuclear-fra', '2025-cy1996-base', '2025-cy1996-low-nuclear-fra']
+    # same hashes when the campaign is resumed with the same params - to skip its done jobs
+    assert get_jobs_inputs(*campaign_inputs) == jobs_inputs
+
+
+def test_jobs_hash_changed_with_their_inputs(campaign_inputs):
+    params, eraa_data_descr, base_uc_run_params = campaign_inputs
+    jobs_inputs = get_jobs_inputs(params, eraa_data_descr, base_uc_run_params)
+    params.capacity_variants = {**CAPACITY_VARIANTS, 'low-nuclear-fra': {'france': {'nuclear': 30000}}}
+    changed_jobs_inputs = get_jobs_inputs(params, eraa_data_descr, base_uc_run_params)
+    unchanged_hashes = set(jobs_inputs) & set(changed_jobs_inputs)
+    assert sorted(jobs_inputs[inputs_hash]['capacity_variant'] for inputs_hash in unchanged_hashes) == ['base'] * 2
+    # params common to all jobs
+    solver_jobs_inputs = get_jobs_inputs(params, eraa_data_descr, base_uc_run_params, solver_name='gurobi')
+    assert len(set(solver_jobs_inputs) & set(changed_jobs_inputs)) == 0
+
+
+def test_job_capacities_on_top_of_json_ones(campaign_inputs):
+    params, eraa_data_descr, base_uc_run_params = campaign_inputs
+    job_inputs = next(job_inputs for job_inputs in get_jobs_inputs(*campaign_inputs).values()
+                      if job_inputs['capacity_variant'] == 'low-nuclear-fra')
+    job_uc_run_params = set_job_uc_run_params(base_uc_run_params=base_uc_run_params, job_inputs=job_inputs)
+    assert job_uc_run_params.capacities_tb_overwritten['france']['nuclear'] == 40000
+    assert job_uc_run_params.capacities_tb_overwritten.get('germany') == \
+        base_uc_run_params.capacities_tb_overwritten.get('germany')
+    assert (job_uc_run_params.selected_target_year, job_uc_run_params.selected_climatic_year) == \
+        (job_inputs['target_year'], job_inputs['climatic_year'])
+    # base params unchanged, shared by all jobs
+    assert base_uc_run_params.capacities_tb_overwritten.get('france', {}).get('nuclear') != 40000
+
+
+def test_jobs_output_subfolders_unique(campaign_inputs):
+    jobs_inputs = get_jobs_inputs(*campaign_inputs)
+    output_subfolders = {get_job_output_subfolder(campaign='campaign', job_id=job_id, job_inputs=job_inputs)
+                         for job_id, job_inputs in enumerate(jobs_inputs.values())}
+    assert len(output_subfolders) == len(jobs_inputs)
+
+
+def test_n_workers_bounded_by_n_jobs():
+    assert get_n_workers(params=CampaignParams(n_workers=4), n_jobs=2) == 2
+    assert get_n_workers(params=CampaignParams(n_workers=4), n_jobs=0) == 1
+    assert get_n_workers(params=CampaignParams(n_workers=2), n_jobs=10) == 2
+
+
+def test_async_job_figures_in_job_output_folder(monkeypatch, small_uc_case):
+    uc_run_params, eraa_dataset, eraa_data_descr = small_uc_case
+    # job of the small UC case, solved with the direct LP backend and figures rendered in a process pool
+    uc_run_params = replace(uc_run_params, selected_prod_types={country: uc_run_params.selected_prod_types[country]
+                                                                for country in uc_run_params.selected_countries})
+    monkeypatch.setattr(my_little_europe_lt_uc, 'read_and_check_uc_run_params',
+                        lambda **kwargs: (eraa_data_descr, deepcopy(uc_run_params)))
+    monkeypatch.setattr(my_little_europe_lt_uc, 'get_needed_eraa_data', lambda **kwargs: eraa_dataset)
+    monkeypatch.setattr(my_little_europe_lt_uc, 'read_solver_params',
+                        lambda: SolverParams(name='highs', model_backend=ModelBackends.direct_lp))
+    monkeypatch.setattr(my_little_europe_lt_uc, 'read_output_params',
+                        lambda: OutputParams(async_output=True, n_figure_processes=1))
+    job = Job(job_id=1, campaign='test-async-outputs', inputs_hash='hash', n_attempts=1,
+              inputs={'target_year': uc_run_params.selected_target_year,
+                      'climatic_year': uc_run_params.selected_climatic_year, 'is_stress_test': False,
+                      'capacity_variant': 'base', 'capacities_tb_overwritten': {}})
+    figures_folder = set_full_lt_uc_output_folder(folder_type=OutputFolderNames.figures)
+    figures_before_job = set(os.listdir(figures_folder)) if os.path.isdir(figures_folder) else set()
+    campaign_folder = os.path.join(set_full_lt_uc_output_folder(), job.campaign)
+    try:
+        output_locations, _ = run_job(job=job, base_uc_run_params=uc_run_params, with_outputs=True)
+        job_figures = os.listdir(os.path.join(output_locations['output_folder'], OutputFolderNames.figures))
+        assert any(fig_file.startswith(FigNamesPrefix.production) for fig_file in job_figures)
+        # no figure of the job in the output folder shared by all runs
+        figures_after_job = set(os.listdir(figures_folder)) if os.path.isdir(figures_folder) else set()
+        assert figures_after_job == figures_before_job
+    finally:
+        shutil.rmtree(campaign_folder, ignore_errors=True)
@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+
+from common.constants.optimisation import OPTIM_RESOL_STATUS, SolverParams
+from common.fuel_sources import set_fuel_sources_from_json
+from my_little_europe_lt_uc import create_direct_lp_model
+
+
+def test_direct_lp_model_same_optimum_as_pypsa(small_uc_case, build_small_pypsa_model):
+    uc_run_params, eraa_dataset, _ = small_uc_case
+    pypsa_model = build_small_pypsa_model()
+    result = pypsa_model.optimize_network(year=2025, n_countries=3, period_start=pypsa_model.network.snapshots[0],
+                                          save_lp_file=False)
+    assert result[1] == OPTIM_RESOL_STATUS.optimal
+    pypsa_model.get_sde_dual_var_opt()
+
+    direct_lp_model = create_direct_lp_model(name='small case', uc_run_params=uc_run_params,
+                                             eraa_dataset=eraa_dataset, fuel_sources=set_fuel_sources_from_json())
+    result = direct_lp_model.solve(solver_params=SolverParams(name='highs'))
+    assert result[1] == OPTIM_RESOL_STATUS.optimal
+
+    assert direct_lp_model.get_opt_value() == pytest.approx(pypsa_model.network.objective, rel=1e-6)
+    pypsa_prices = pypsa_model.sde_dual_var_opt
+    direct_lp_prices = direct_lp_model.sde_dual_var_opt[pypsa_prices.columns]
+    pd.testing.assert_frame_equal(direct_lp_prices, pypsa_prices, check_names=False, check_freq=False,
+                                  rtol=1e-4, atol=1e-2)
@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.hasher import get_hash, to_canonical_repr
+
+
+@dataclass
+class DummyParams:
+    name: str
+    values: dict
+
+
+def test_hash_independent_of_dict_order():
+    assert get_hash(obj={'a': 1, 'b': [1, 2]}) == get_hash(obj={'b': [1, 2], 'a': 1})
+
+
+def test_hash_of_equal_dataclasses():
+    params_1 = DummyParams(name='x', values={('fra', 'ger'): 1.5, ('ger', 'fra'): 2.})
+    params_2 = DummyParams(name='x', values={('ger', 'fra'): 2., ('fra', 'ger'): 1.5})
+    assert get_hash(obj=params_1) == get_hash(obj=params_2)
+    assert get_hash(obj=params_1) != get_hash(obj=DummyParams(name='y', values=params_1.values))
+
+
+def test_hash_depends_on_dataframe_content():
+    df = pd.DataFrame({'fra': [1., 2.], 'ger': [3., 4.]}, index=pd.date_range('1900-01-01', periods=2, freq='h'))
+    df_copy = df.copy()
+    assert get_hash(obj=df) == get_hash(obj=df_copy)
+    df_copy.iloc[1, 1] = 4.5
+    assert get_hash(obj=df) != get_hash(obj=df_copy)
+    assert get_hash(obj=df) != get_hash(obj=df.rename(columns={'ger': 'ita'}))
+
+
+def test_hash_depends_on_array_content_and_dtype():
+    array = np.arange(6).reshape(2, 3)
+    assert get_hash(obj=array) == get_hash(obj=array.copy())
+    assert get_hash(obj=array) != get_hash(obj=array.astype(float))
+    assert get_hash(obj=array) != get_hash(obj=array.T)
+
+
+def test_canonical_repr_of_sets_and_dates():
+    assert to_canonical_repr({3, 1, 2}) == [1, 2, 3]
+    assert to_canonical_repr(datetime(1900, 1, 1)) == '1900-01-01T00:00:00'
+    assert to_canonical_repr(np.float64(1.5)) == 1.5
@@ -0,0 +1,23 @@
+import json
+import subprocess
+import sys
+
+# data analysis entry points, to be imported without the UC model stack
+DATA_ANALYSIS_MODULES = ['my_little_europe_data_analysis', 'include.data_analysis_runner', 'include.dataset']
+HEAVY_MODULES = ['pypsa', 'linopy', 'matplotlib.pyplot']
+# s, versus about 0.6s measured - and 2.75s when PyPSA stack was imported
+IMPORT_TIME_BUDGET = 1.5
+
+
+def test_data_analysis_imports_light():
+    # N.B. in a fresh interpreter - run from repo. root -, for modules not to be already imported by other tests
+    code = (f'import importlib, json, sys, time\n'
+            f't_start = time.perf_counter()\n'
+            f'for module in {DATA_ANALYSIS_MODULES}:\n'
+            f'    importlib.import_module(module)\n'
+            f'print(json.dumps({{"import_time": time.perf_counter() - t_start, '
+            f'"heavy_modules": [m for m in {HEAVY_MODULES} if m in sys.modules]}}))')
+    completed = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    import_stats = json.loads(completed.stdout.strip().splitlines()[-1])
+    assert import_stats['heavy_modules'] == []
+    assert import_stats['import_time'] < IMPORT_TIME_BUDGET
@@ -0,0 +1,136 @@
+import sqlite3
+import time
+
+import pytest
+
+import include.job_queue as job_queue_module
+from common.constants.campaign import JOB_STATUSES
+from include.job_queue import JobQueue, get_worker_name
+
+CAMPAIGN = 'test-campaign'
+WORKER = get_worker_name()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Controlled current time (s) of the job queue - to test retry delays without waiting
+    """
+    current_time = [1e9]
+    monkeypatch.setattr(job_queue_module.time, 'time', lambda: current_time[0])
+    return current_time
+
+
+def get_job_status(job_queue: JobQueue, job_id: int) -> str:
+    return job_queue.get_jobs(campaign=CAMPAIGN).loc[job_id, 'status']
+
+
+def test_jobs_claimed_once_in_order(tmp_path):
+    job_queue = JobQueue(db_file=str(tmp_path / 'queue.sqlite'))
+    assert job_queue.add_jobs(campaign=CAMPAIGN, jobs_inputs={'h1': {'cy': 1989}, 'h2': {'cy': 1996}}) == 2
+    first_job = job_queue.claim_job(campaign=CAMPAIGN, worker=WORKER)
+    second_job = job_queue.claim_job(campaign=CAMPAIGN, worker=WORKER)
+    assert (first_job.inputs_hash, first_job.inputs, first_job.n_attempts) == ('h1', {'cy': 1989}, 1)
+    assert second_job.inputs_hash == 'h2'
+    assert job_queue.claim_job(campaign=CAMPAIGN, worker=WORKER) is None
+    assert job_queue.count_jobs(campaign=CAMPAIGN) == {JOB_STATUSES.running: 2}
+    assert job_queue.claim_job(campaign='other-campaign', worker=WORKER) is None
+
+
+def test_failed_job_retried_with_backoff(tmp_path, clock):
+    job_queue = JobQueue(db_file=str(tmp_path / 'queue.sqlite'), max_attempts=3, retry_delay=10)
+    job_queue.add_jobs(campaign=CAMPAIGN, jobs_inputs={'h1': {}})
+    for expected_delay in [10, 20]:
+        job = job_queue.claim_job(campaign=CAMPAIGN, worker=WORKER)
+        assert job_queue.mark_failed(job_id=job.job_id, error='error') == expected_delay
+        assert job_queue.claim_job(campaign=CAMPAIGN, worker=WORKER) is None
+        assert job_queue.get_next_attempt_wait(campaign=CAMPAIGN) == pytest.approx(expected_delay)
+        clock[0] += expected_delay
+    job = job_queue.claim_job(campaign=CAMPAIGN, worker=WORKER)
+    assert job.n_attempts == 3
+    assert job_queue.mark_failed(job_id=job.job_id, error='error') is None
+    assert get_job_status(job_queue=job_queue, job_id=job.job_id) == JOB_STATUSES.failed
+    assert job_queue.get_next_attempt_wait(campaign=CAMPAIGN) is None
+    # failed jobs put back in the queue on demand, with a new set of attempts
+    assert job_queue.reset_failed_jobs(campaign=CAMPAIGN) == 1
+    assert job_queue.claim_job(campaign=CAMPAIGN, worker=WORKER).n_attempts == 1
+
+
+def test_resume_does_not_rerun_done_jobs(tmp_path):
+    db_file = str(tmp_path / 'queue.sqlite')
+    jobs_inputs = {'h1': {'cy': 1989}, 'h2': {'cy': 1996}}
+    job_queue = JobQueue(db_file=db_file)
+    job_queue.add_jobs(campaign=CAMPAIGN, jobs_inputs=jobs_inputs)
+    job = job_queue.claim_job(campaign=CAMPAIGN, worker=WORKER)
+    job_queue.mark_done(job_id=job.job_id, output_locations={'run_trace': 'trace.json'}, result={'total_cost': 1.})
+    # campaign run again, e.g. after an interruption
+    resumed_job_queue = JobQueue(db_file=db_file)
+    assert resumed_job_queue.add_jobs(campaign=CAMPAIGN, jobs_inputs=jobs_inputs) == 0
+    assert resumed_job_queue.claim_job(campaign=CAMPAIGN, worker=WORKER).inputs_hash == 'h2'
+    assert resumed_job_queue.claim_job(campaign=CAMPAIGN, worker=WORKER) is None
+    done_jobs = resumed_job_queue.get_jobs(campaign=CAMPAIGN, statuses=[JOB_STATUSES.done])
+    assert done_jobs['output_locations'].to_list() == ['{"run_trace": "trace.json"}']
+
+
+def test_jobs_not_in_campaign_anymore_set_obsolete(tmp_path):
+    job_queue = JobQueue(db_file=str(tmp_path / 'queue.sqlite'))
+    job_queue.add_jobs(campaign=CAMPAIGN, jobs_inputs={'h1': {}, 'h2': {}})
+    done_job = job_queue.claim_job(campaign=CAMPAIGN, worker=WORKER)
+    job_queue.mark_done(job_id=done_job.job_id)
+    # e.g. change of the campaign params
+    assert job_queue.add_jobs(campaign=CAMPAIGN, jobs_inputs={'h3': {}}) == 1
+    jobs = job_queue.get_jobs(campaign=CAMPAIGN).set_index('inputs_hash')
+    assert jobs['status'].to_dict() == {'h1': JOB_STATUSES.done, 'h2': JOB_STATUSES.obsolete,
+                                        'h3': JOB_STATUSES.pending}
+    current_jobs = job_queue.get_jobs(campaign=CAMPAIGN, inputs_hashes=['h3'])
+    assert current_jobs['inputs_hash'].to_list() == ['h3']
+    # back to previous params -> obsolete job back in the queue, done one kept as is
+    assert job_queue.add_jobs(campaign=CAMPAIGN, jobs_inputs={'h1': {}, 'h2': {}}) == 1
+    jobs = job_queue.get_jobs(campaign=CAMPAIGN).set_index('inputs_hash')
+    assert jobs['status'].to_dict() == {'h1': JOB_STATUSES.done, 'h2': JOB_STATUSES.pending,
+                                        'h3': JOB_STATUSES.obsolete}
+
+
+def test_running_job_requeued_on_lease_expiry(tmp_path, clock):
+    job_queue = JobQueue(db_file=str(tmp_path / 'queue.sqlite'), lease_duration=60)
+    job_queue.add_jobs(campaign=CAMPAIGN, jobs_inputs={'h1': {}})
+    job = job_queue.claim_job(campaign=CAMPAIGN, worker=WORKER)
+    # worker (this process) alive, with a valid lease
+    assert job_queue.requeue_interrupted_jobs(campaign=CAMPAIGN) == 0
+    clock[0] += 30
+    assert job_queue.renew_lease(job_id=job.job_id, worker=WORKER)
+    clock[0] += 59
+    assert job_queue.requeue_interrupted_jobs(campaign=CAMPAIGN) == 0
+    # lease not renewed anymore, e.g. crashed worker with its PID reused
+    clock[0] += 2
+    assert job_queue.requeue_interrupted_jobs(campaign=CAMPAIGN) == 1
+    assert get_job_status(job_queue=job_queue, job_id=job.job_id) == JOB_STATUSES.pending
+    # interrupted attempt counted
+    assert job_queue.claim_job(campaign=CAMPAIGN, worker=WORKER).n_attempts == 2
+    assert not job_queue.renew_lease(job_id=job.job_id, worker='other-host:1')
+
+
+def test_lease_kept_while_job_runs(tmp_path):
+    job_queue = JobQueue(db_file=str(tmp_path / 'queue.sqlite'), lease_duration=0.5)
+    job_queue.add_jobs(campaign=CAMPAIGN, jobs_inputs={'h1': {}})
+    job = job_queue.claim_job(campaign=CAMPAIGN, worker=WORKER)
+    with job_queue.keep_lease(job_id=job.job_id, worker=WORKER):
+        time.sleep(1.5)
+        assert job_queue.requeue_interrupted_jobs(campaign=CAMPAIGN) == 0
+    time.sleep(1)
+    assert job_queue.requeue_interrupted_jobs(campaign=CAMPAIGN) == 1
+
+
+def test_lease_column_added_to_existing_queue_file(tmp_path):
+    db_file = str(tmp_path / 'queue.sqlite')
+    with sqlite3.connect(db_file) as connection:
+        connection.execute('CREATE TABLE jobs (job_id INTEGER PRIMARY KEY, campaign TEXT NOT NULL, '
+                           'inputs_hash TEXT NOT NULL, inputs TEXT NOT NULL, status TEXT NOT NULL, '
+                           'n_attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at REAL NOT NULL DEFAULT 0, '
+                           'worker TEXT, started_at TEXT, ended_at TEXT, error TEXT, output_locations TEXT, '
+                           'result TEXT, created_at TEXT NOT NULL, UNIQUE (campaign, inputs_hash))')
+    connection.close()
+    job_queue = JobQueue(db_file=db_file)
+    job_queue.add_jobs(campaign=CAMPAIGN, jobs_inputs={'h1': {}})
+    job = job_queue.claim_job(campaign=CAMPAIGN, worker=WORKER)
+    assert job_queue.get_jobs(campaign=CAMPAIGN).loc[job.job_id, 'lease_expires_at'] > 0
@@ -0,0 +1,18 @@
+import logging
+import multiprocessing
+
+from common.logger import logged_process_pool
+
+
+def log_and_square(x: int) -> int:
+    logging.info(f'Square of {x} in worker process')
+    return x ** 2
+
+
+def test_logged_process_pool_merges_worker_logs(caplog):
+    caplog.set_level(logging.INFO)
+    with logged_process_pool(n_workers=2, log_level='info') as executor:
+        assert list(executor.map(log_and_square, [2, 3])) == [4, 9]
+    assert {'Square of 2 in worker process', 'Square of 3 in worker process'} <= set(caplog.messages)
+    # manager process of the log queue shut down when leaving the pool
+    assert len(multiprocessing.active_children()) == 0
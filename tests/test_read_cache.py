@@ -0,0 +1,43 @@
+import json
+import os
+
+from common.constants.result_cache import ResultCacheParams
+from utils.read import VALIDATED_PARAMS_CACHE, cached_on_input_files, check_and_load_json_file, \
+    clear_validated_params_cache, read_and_check_params
+
+
+def test_touched_json_file_invalidates_cached_params(tmp_path):
+    json_file = str(tmp_path / 'params.json')
+    n_reads = []
+
+    @cached_on_input_files(get_input_files=lambda: [json_file])
+    def read_test_params() -> dict:
+        n_reads.append(1)
+        return check_and_load_json_file(json_file=json_file)
+
+    clear_validated_params_cache()
+    with open(json_file, 'w') as f:
+        json.dump({'max_iter': 10}, f)
+    assert read_test_params() == {'max_iter': 10}
+    assert read_test_params() == {'max_iter': 10}
+    assert len(n_reads) == 1
+
+    # same size, only modification time changed
+    with open(json_file, 'w') as f:
+        json.dump({'max_iter': 20}, f)
+    file_stat = os.stat(json_file)
+    os.utime(json_file, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10 ** 9))
+    assert read_test_params() == {'max_iter': 20}
+    assert len(n_reads) == 2
+    # params of previous file version dropped
+    assert len(VALIDATED_PARAMS_CACHE) == 1
+    clear_validated_params_cache()
+
+
+def test_params_read_without_unknown_keys_and_processed(tmp_path):
+    json_file = str(tmp_path / 'result_cache_params.json')
+    with open(json_file, 'w') as f:
+        json.dump({'activated': 'true', 'max_n_entries': 5, 'unknown_key': 1}, f)
+    params = read_and_check_params(json_file=json_file, params_cls=ResultCacheParams,
+                                   file_descr='result cache params')
+    assert params == ResultCacheParams(activated=True, max_n_entries=5)
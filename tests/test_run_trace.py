@@ -0,0 +1,40 @@
+import sys
+import tracemalloc
+
+import pytest
+
+import my_little_europe_lt_uc
+import utils.run_trace
+
+
+def test_run_trace_stopped_on_failed_run(monkeypatch):
+    def fail_reading():
+        raise Exception('Unreadable fuel sources -> STOP')
+
+    monkeypatch.setattr(my_little_europe_lt_uc, 'set_fuel_sources_from_json', fail_reading)
+    with pytest.raises(Exception, match='Unreadable fuel sources'):
+        my_little_europe_lt_uc.run(extra_params={'profiling': ['cprofile', 'tracemalloc', 'rss'],
+                                                 'use_caller_logger': True})
+    assert utils.run_trace.CURRENT_RUN_TRACE is None
+    assert not tracemalloc.is_tracing()
+    # no cProfile profiler left enabled
+    assert sys.getprofile() is None
+
+
+def test_tracemalloc_run_peak_kept_with_memory_tracker():
+    run_trace = utils.run_trace.RunTrace(name='memory test',
+                                         profiling=[utils.run_trace.PROFILING_MODES.tracemalloc,
+                                                    utils.run_trace.PROFILING_MODES.memory])
+    run_trace.start()
+    try:
+        with run_trace.span('big allocation'):
+            big_buffer = bytearray(50 * 10 ** 6)
+            del big_buffer
+        with run_trace.span('small allocation'):
+            small_buffer = bytearray(10 ** 6)
+            del small_buffer
+    finally:
+        run_trace.stop()
+    # peak of the first stage, despite the reset of tracemalloc peak at span boundaries
+    assert run_trace.profiling_results[utils.run_trace.PROFILING_MODES.tracemalloc]['peak_mb'] >= 50
+    assert run_trace.spans[0].memory['traced_peak_increase_mb'] >= 50
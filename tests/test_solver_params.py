@@ -0,0 +1,17 @@
+from common.constants.optimisation import SolverParams
+from include.dataset_builder import PypsaModel
+
+
+def test_unknown_io_api_does_not_modify_caller_params():
+    solver_params = SolverParams(name='highs', io_api='unknown')
+    pypsa_model = PypsaModel(name='test')
+    pypsa_model.set_optim_solver(solver_params=solver_params)
+    assert pypsa_model.optim_solver_params.io_api is None
+    assert solver_params.io_api == 'unknown'
+    assert pypsa_model.get_solve_kwargs() == {}
+
+
+def test_known_io_api_kept():
+    pypsa_model = PypsaModel(name='test')
+    pypsa_model.set_optim_solver(solver_params=SolverParams(name='highs', io_api='direct'))
+    assert pypsa_model.get_solve_kwargs() == {'io_api': 'direct'}
@@ -0,0 +1,36 @@
+import resource
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from common.constants.optimisation import OPTIM_RESOL_STATUS
+from common.fuel_sources import set_fuel_sources_from_json
+from my_little_europe_lt_uc import create_direct_lp_model
+from utils.run_trace import start_run_trace, stop_run_trace
+from utils.solver_stats import get_process_peak_rss_mb
+
+
+@pytest.mark.parametrize('platform, max_rss', [('linux', 2 * 10 ** 6), ('darwin', 2 * 10 ** 9)])
+def test_process_peak_rss_unit_per_platform(monkeypatch, platform, max_rss):
+    monkeypatch.setattr(sys, 'platform', platform)
+    monkeypatch.setattr(resource, 'getrusage', lambda who: SimpleNamespace(ru_maxrss=max_rss))
+    assert get_process_peak_rss_mb() == pytest.approx(2000)
+
+
+def test_presolved_size_in_solver_stats(small_uc_case):
+    uc_run_params, eraa_dataset, _ = small_uc_case
+    direct_lp_model = create_direct_lp_model(name='small case', uc_run_params=uc_run_params,
+                                             eraa_dataset=eraa_dataset, fuel_sources=set_fuel_sources_from_json())
+    start_run_trace(name='solver stats test')
+    try:
+        result = direct_lp_model.solve()
+    finally:
+        run_trace = stop_run_trace()
+    assert result[1] == OPTIM_RESOL_STATUS.optimal
+    assert 'presolved_n_cols' in direct_lp_model.solver_stats
+    assert direct_lp_model.solver_stats['presolved_n_cols'] <= direct_lp_model.solver_stats['n_cols']
+    # solution kept after presolve run again for stats
+    assert direct_lp_model.get_opt_value() == pytest.approx(direct_lp_model.solver_stats['objective_value'])
+    solver_span = next(elt_span for elt_span in run_trace.spans if elt_span.name == 'solver')
+    assert solver_span.attrs['presolved_n_cols'] == direct_lp_model.solver_stats['presolved_n_cols']
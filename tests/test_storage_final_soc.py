@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from common.constants.optimisation import OPTIM_RESOL_STATUS, SolverParams
+from common.constants.pypsa_params import GEN_UNITS_PYPSA_PARAMS
+from common.fuel_sources import set_fuel_sources_from_json
+from my_little_europe_lt_uc import create_direct_lp_model
+
+
+def test_noncyclic_storages_not_drained(small_uc_case, build_small_pypsa_model):
+    uc_run_params, eraa_dataset, _ = small_uc_case
+    # non-cyclic storages, with default initial SoC - as in the first chunk of an adequacy scenario
+    eraa_dataset.set_storage_soc_init(soc_init={})
+    pypsa_model = build_small_pypsa_model()
+    pypsa_model.storage_final_soc_min = True
+    result = pypsa_model.optimize_network(year=2025, n_countries=3, period_start=pypsa_model.network.snapshots[0],
+                                          save_lp_file=False)
+    assert result[1] == OPTIM_RESOL_STATUS.optimal
+    storage_units = pypsa_model.network.storage_units
+    assert not storage_units['cyclic_state_of_charge'].any()
+    final_soc = pypsa_model.network.storage_units_t.state_of_charge.iloc[-1]
+    final_soc_min = np.minimum(storage_units[GEN_UNITS_PYPSA_PARAMS.soc_init],
+                               storage_units[GEN_UNITS_PYPSA_PARAMS.nominal_power]
+                               * storage_units[GEN_UNITS_PYPSA_PARAMS.max_hours])
+    assert (final_soc >= final_soc_min[final_soc.index] - 1e-3).all()
+
+    # same terminal condition in direct LP model
+    direct_lp_model = create_direct_lp_model(name='small case', uc_run_params=uc_run_params,
+                                             eraa_dataset=eraa_dataset, fuel_sources=set_fuel_sources_from_json(),
+                                             storage_final_soc_min=True)
+    result = direct_lp_model.solve(solver_params=SolverParams(name='highs'))
+    assert result[1] == OPTIM_RESOL_STATUS.optimal
+    assert direct_lp_model.get_opt_value() == pytest.approx(pypsa_model.network.objective, rel=1e-6)
+    assert (direct_lp_model.storage_soc_opt.iloc[-1] >= final_soc_min[final_soc.index] - 1e-3).all()
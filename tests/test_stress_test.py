@@ -0,0 +1,61 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from include.stress_test import STRESS_TEST_IMPACT_COLS, DemandScaling, PerUnitBoundsStressTest, StressTest, \
+    StressTestRunResults, UnitOutage, evaluate_stress_tests, set_stress_test_impacts
+from include.uc_summary_metrics import UCSummaryMetrics
+
+UC_DATES = list(pd.date_range(start=datetime(1900, 1, 1), end=datetime(1900, 1, 3), freq='h', inclusive='left'))
+
+
+def set_run_results(per_country_ens: dict) -> StressTestRunResults:
+    uc_summary_metrics = UCSummaryMetrics(per_country_ens={c: int(val / 1e3) for c, val in per_country_ens.items()},
+                                          per_country_n_failure_hours={c: 0 for c in per_country_ens},
+                                          total_cost=0, total_operational_cost=0, total_co2_emissions=0)
+    return StressTestRunResults(uc_summary_metrics=uc_summary_metrics, per_country_ens=per_country_ens)
+
+
+def test_stress_test_classes_abstract():
+    with pytest.raises(TypeError):
+        StressTest(name='no type')
+    with pytest.raises(TypeError):
+        PerUnitBoundsStressTest(name='no assets', factor=0.)
+
+
+def test_stress_test_window_end_excluded():
+    stress_test = UnitOutage(name='one day outage', countries=['france'],
+                             per_country_prod_types={'france': ['nuclear']}, start_date=datetime(1900, 1, 1),
+                             end_date=datetime(1900, 1, 2))
+    stress_test.process(all_countries=['france'], uc_dates=UC_DATES)
+    factors = stress_test.get_window_factors(snapshots=pd.DatetimeIndex(UC_DATES))
+    assert (factors[:24] == 0).all() and (factors[24:] == 1).all()
+    # default window: whole UC period, last time-slot included
+    stress_test = DemandScaling(name='whole period', factor=1.1)
+    stress_test.process(all_countries=['france'], uc_dates=UC_DATES)
+    assert (stress_test.get_window_factors(snapshots=pd.DatetimeIndex(UC_DATES)) == 1.1).all()
+
+
+def test_small_ens_impacts_ranked():
+    stress_tests = [DemandScaling(name='small impact', factor=1.01), DemandScaling(name='larger impact', factor=1.02)]
+    # ENS impacts below 1 GWh, i.e. 0 in (rounded) UC summary metrics
+    impacts = set_stress_test_impacts(stress_tests=stress_tests, base_results=set_run_results({'fra': 100.}),
+                                      per_test_results=[set_run_results({'fra': 300.}),
+                                                        set_run_results({'fra': 700.})])
+    assert impacts[STRESS_TEST_IMPACT_COLS.stress_test].to_list() == ['larger impact', 'small impact']
+    assert impacts[STRESS_TEST_IMPACT_COLS.ens_impact].to_list() == pytest.approx([0.6, 0.2])
+    assert impacts.loc[1, STRESS_TEST_IMPACT_COLS.most_impacted_country] == 'fra'
+
+
+def test_evaluate_stress_tests(small_uc_case, build_small_pypsa_model):
+    uc_run_params, _, _ = small_uc_case
+    pypsa_model = build_small_pypsa_model()
+    stress_tests = [DemandScaling(name='french demand +30%', countries=['france'], factor=1.3)]
+    for stress_test in stress_tests:
+        stress_test.process(all_countries=uc_run_params.selected_countries,
+                            uc_dates=list(pypsa_model.network.snapshots))
+    impacts = evaluate_stress_tests(pypsa_model=pypsa_model, stress_tests=stress_tests,
+                                    failure_penalty=uc_run_params.failure_penalty)
+    assert impacts.loc[1, STRESS_TEST_IMPACT_COLS.ens_impact] >= 0
+    assert impacts.loc[1, STRESS_TEST_IMPACT_COLS.operational_cost_impact] > 0
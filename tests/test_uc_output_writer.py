@@ -0,0 +1,43 @@
+import pytest
+
+import my_little_europe_lt_uc
+from common.constants.optimisation import OPTIM_RESOL_STATUS
+from include.dataset_builder import PypsaModel
+from include.uc_output_writer import UCOutputWriter
+
+
+@pytest.fixture
+def closed_writers(monkeypatch) -> list:
+    closed_writers = []
+    monkeypatch.setattr(UCOutputWriter, 'close', lambda self: closed_writers.append(self))
+    return closed_writers
+
+
+def fail(**kwargs):
+    raise Exception('Run failure -> STOP')
+
+
+def test_own_output_writer_closed_on_failed_outputs(monkeypatch, small_uc_case, closed_writers):
+    uc_run_params, _, _ = small_uc_case
+    monkeypatch.setattr(my_little_europe_lt_uc, 'submit_output_tasks', fail)
+    with pytest.raises(Exception, match='Run failure'):
+        my_little_europe_lt_uc.save_data_and_fig_results(pypsa_model=PypsaModel(name='no results'),
+                                                         uc_run_params=uc_run_params,
+                                                         result_optim_status=OPTIM_RESOL_STATUS.optimal,
+                                                         opt_results_loaded=True)
+    assert len(closed_writers) == 1
+
+
+def test_own_output_writer_closed_on_failed_run(monkeypatch, small_uc_case, closed_writers):
+    _, eraa_dataset, _ = small_uc_case
+    monkeypatch.setattr(my_little_europe_lt_uc, 'get_needed_eraa_data', lambda **kwargs: eraa_dataset)
+    # failure after output writer creation
+    monkeypatch.setattr(my_little_europe_lt_uc, 'read_result_cache_params', fail)
+    with pytest.raises(Exception, match='Run failure'):
+        my_little_europe_lt_uc.run(extra_params={'use_caller_logger': True})
+    assert len(closed_writers) == 1
+    # writer of the caller left open
+    output_writer = UCOutputWriter(params=my_little_europe_lt_uc.read_output_params())
+    with pytest.raises(Exception, match='Run failure'):
+        my_little_europe_lt_uc.run(extra_params={'use_caller_logger': True}, output_writer=output_writer)
+    assert len(closed_writers) == 1
@@ -0,0 +1,50 @@
+import os
+
+import pandas as pd
+
+from common.constants.result_cache import ResultCacheParams
+from include.dataset_builder import OPT_RESULT_ATTRS, PypsaModel
+from include.uc_result_cache import UCResultCache
+from include.uc_summary_metrics import UCSummaryMetrics
+
+
+def set_solved_model() -> PypsaModel:
+    pypsa_model = PypsaModel(name='test')
+    dates = pd.date_range('1900-01-01', periods=3, freq='h')
+    pypsa_model.set_opt_results(opt_results={attr_name: pd.DataFrame({'fra': [1., 2., 3.]}, index=dates)
+                                             for attr_name in OPT_RESULT_ATTRS})
+    pypsa_model.uc_summary_metrics = UCSummaryMetrics(per_country_ens={'fra': 0.},
+                                                      per_country_n_failure_hours={'fra': 0}, total_cost=10.,
+                                                      total_operational_cost=10., total_co2_emissions=1.)
+    pypsa_model.solver_stats = {'solver': 'highs', 'simplex_iterations': 12}
+    return pypsa_model
+
+
+def test_cache_miss_then_hit(tmp_path):
+    uc_result_cache = UCResultCache(params=ResultCacheParams(cache_dir=str(tmp_path)))
+    assert uc_result_cache.load(run_hash='abc') is None
+    pypsa_model = set_solved_model()
+    uc_result_cache.store(run_hash='abc', pypsa_model=pypsa_model)
+    cached_results = uc_result_cache.load(run_hash='abc')
+    assert cached_results is not None
+    assert cached_results.uc_summary_metrics == pypsa_model.uc_summary_metrics
+    assert cached_results.solver_stats == pypsa_model.solver_stats
+    for attr_name in OPT_RESULT_ATTRS:
+        pd.testing.assert_frame_equal(cached_results.opt_results[attr_name], getattr(pypsa_model, attr_name))
+    assert uc_result_cache.load(run_hash='other') is None
+
+
+def test_unsolved_model_not_stored(tmp_path):
+    uc_result_cache = UCResultCache(params=ResultCacheParams(cache_dir=str(tmp_path)))
+    uc_result_cache.store(run_hash='abc', pypsa_model=PypsaModel(name='not solved'))
+    assert uc_result_cache.load(run_hash='abc') is None
+
+
+def test_lru_eviction(tmp_path):
+    uc_result_cache = UCResultCache(params=ResultCacheParams(cache_dir=str(tmp_path), max_n_entries=2))
+    pypsa_model = set_solved_model()
+    for i_run, run_hash in enumerate(['first', 'second']):
+        uc_result_cache.store(run_hash=run_hash, pypsa_model=pypsa_model)
+        os.utime(uc_result_cache.get_results_file(run_hash=run_hash), (i_run, i_run))
+    uc_result_cache.store(run_hash='third', pypsa_model=pypsa_model)
+    assert sorted(entry[0] for entry in uc_result_cache.get_entries()) == ['second', 'third']
@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+from common.constants.optimisation import OPTIM_RESOL_STATUS
+from include.uc_summary_metrics import FAILURE_UNIT_SUFFIX
+
+FAILURE_PENALTY = 1e5
+
+
+def test_warm_started_resolve_equals_cold_solve(build_small_pypsa_model):
+    warm_model = build_small_pypsa_model(name='warm')
+    result = warm_model.optimize_network(year=2025, n_countries=3, period_start=warm_model.network.snapshots[0],
+                                         save_lp_file=False, save_basis=True)
+    assert result[1] == OPTIM_RESOL_STATUS.optimal
+    base_objective = warm_model.network.objective
+    basis_file = warm_model.basis_file
+    assert os.path.isfile(basis_file)
+    generators = warm_model.network.generators
+    # largest (non-failure) unit, for the capacity change to be binding
+    generators = generators[~generators.index.str.endswith(FAILURE_UNIT_SUFFIX)]
+    changed_unit = generators['p_nom'].idxmax()
+    new_p_nom = 0.5 * generators.at[changed_unit, 'p_nom']
+    warm_uc_summary_metrics = warm_model.resolve_with_capacity_changes(failure_penalty=FAILURE_PENALTY,
+                                                                       capacity_changes={changed_unit: new_p_nom})
+    assert warm_uc_summary_metrics is not None
+    assert warm_model.network.objective > base_objective
+    warm_model.delete_basis_file()
+    assert warm_model.basis_file is None and not os.path.isfile(basis_file)
+
+    cold_model = build_small_pypsa_model(name='cold')
+    cold_model.network.generators.at[changed_unit, 'p_nom'] = new_p_nom
+    result = cold_model.optimize_network(year=2025, n_countries=3, period_start=cold_model.network.snapshots[0],
+                                         save_lp_file=False)
+    assert result[1] == OPTIM_RESOL_STATUS.optimal
+    assert warm_model.network.objective == pytest.approx(cold_model.network.objective, rel=1e-6)
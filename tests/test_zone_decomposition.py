@@ -0,0 +1,35 @@
+import pytest
+
+from common.constants.optimisation import OPTIM_RESOL_STATUS, ZoneDecompositionParams
+from common.fuel_sources import set_fuel_sources_from_json
+from include.zone_decomposition import solve_with_zone_decomposition
+from my_little_europe_lt_uc import create_direct_lp_model
+
+
+def test_non_converged_zone_decomposition_is_suboptimal(small_uc_case):
+    uc_run_params, eraa_dataset, _ = small_uc_case
+    direct_lp_model = create_direct_lp_model(name='small case', uc_run_params=uc_run_params,
+                                             eraa_dataset=eraa_dataset, fuel_sources=set_fuel_sources_from_json())
+    result = solve_with_zone_decomposition(direct_lp_model=direct_lp_model,
+                                           params=ZoneDecompositionParams(tolerance=1e-9, max_iter=1,
+                                                                          recovery_period=1))
+    assert result[1] == OPTIM_RESOL_STATUS.suboptimal
+    # best feasible solution still available, e.g. to be output
+    assert direct_lp_model.get_opt_value() is not None
+
+
+def test_converged_zone_decomposition_close_to_pypsa_optimum(small_uc_case, build_small_pypsa_model):
+    uc_run_params, eraa_dataset, _ = small_uc_case
+    pypsa_model = build_small_pypsa_model()
+    result = pypsa_model.optimize_network(year=2025, n_countries=3, period_start=pypsa_model.network.snapshots[0],
+                                          save_lp_file=False)
+    assert result[1] == OPTIM_RESOL_STATUS.optimal
+    direct_lp_model = create_direct_lp_model(name='small case', uc_run_params=uc_run_params,
+                                             eraa_dataset=eraa_dataset, fuel_sources=set_fuel_sources_from_json())
+    params = ZoneDecompositionParams(calc_monolithic_gap=True)
+    result = solve_with_zone_decomposition(direct_lp_model=direct_lp_model, params=params)
+    assert result[1] == OPTIM_RESOL_STATUS.optimal
+    pypsa_gap = (direct_lp_model.get_opt_value() - pypsa_model.network.objective) / pypsa_model.network.objective
+    assert -1e-6 <= pypsa_gap <= params.tolerance
+    # monolithic LP being the same as the PyPSA one
+    assert direct_lp_model.solver_stats['monolithic_gap'] == pytest.approx(pypsa_gap, abs=1e-6)
@@ -5,7 +5,7 @@ import numpy as np
 
 from common.constants.pypsa_params import GEN_UNITS_PYPSA_PARAMS
 from common.fuel_sources import FuelSource, FuelNames, DummyFuelNames
-from include.dataset_builder import GenerationUnitData
+from include.generation_unit_data import GenerationUnitData
 
 GENERATOR_DICT_TYPE = Dict[str, Union[float, int, str]]
 gps_coords = (12.5674, 41.8719)
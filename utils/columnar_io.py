@@ -0,0 +1,78 @@
+import json
+import logging
+import os
+import threading
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from common.constants.output_params import OUTPUT_FORMATS
+from common.long_term_uc_io import COLUMNAR_PARTITION_COLS
+
+# schema file being read-modified-written, its update is protected when output is written by background threads
+# N.B. threads of a process only -> concurrent processes (e.g. campaign workers) must write in different folders
+SCHEMA_FILE_LOCK = threading.Lock()
+
+
+def cast_to_float32_if_lossless(df: pd.DataFrame, abs_tol: Optional[float]) -> pd.DataFrame:
+    """
+    Cast float64 columns to float32 if the max. absolute error of this cast is below abs_tol; otherwise (or if
+    abs_tol is None) df is returned unchanged
+    """
+    float_cols = df.select_dtypes(include='float64').columns
+    if abs_tol is None or len(float_cols) == 0:
+        return df
+    float64_values = df[float_cols].values
+    max_abs_error = np.nanmax(np.abs(float64_values.astype(np.float32).astype(np.float64) - float64_values),
+                              initial=0)
+    if max_abs_error > abs_tol:
+        logging.info(f'Max. error of float32 cast {max_abs_error:.3g} above tolerance {abs_tol} -> float64 kept')
+        return df
+    return df.astype({col: np.float32 for col in float_cols})
+
+
+def downcast_int_cols(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast int64 columns to int32 when their values fit (e.g. MW values of optimal decisions)
+    """
+    int_cols = df.select_dtypes(include='int64').columns
+    if len(int_cols) == 0:
+        return df
+    int32_info = np.iinfo(np.int32)
+    int_values = df[int_cols].values
+    if int_values.size > 0 and (int_values.min() < int32_info.min or int_values.max() > int32_info.max):
+        return df
+    return df.astype({col: np.int32 for col in int_cols})
+
+
+def write_columnar_file(df: pd.DataFrame, file: str, output_format: str, compression: str):
+    # index (dates) stored as a regular column - feather not supporting non-default indexes
+    df = df.reset_index()
+    df.columns = [str(col) for col in df.columns]
+    if output_format == OUTPUT_FORMATS.parquet:
+        df.to_parquet(file, compression=None if compression == 'none' else compression, index=False)
+    elif output_format == OUTPUT_FORMATS.feather:
+        df.to_feather(file, compression=compression)
+    else:
+        raise Exception(f'Unknown columnar output format {output_format} -> STOP')
+
+
+def update_columnar_schema(schema_file: str, table_name: str, df: pd.DataFrame, output_format: str,
+                           compression: str):
+    """
+    Add/update the description of a table in the schema file of columnar output - columns and dtypes (union over
+    the different runs written in this folder), format and partitioning
+    """
+    with SCHEMA_FILE_LOCK:
+        if os.path.isfile(schema_file):
+            with open(schema_file, mode='r', encoding='utf-8') as f:
+                schema = json.load(f)
+        else:
+            schema = {}
+        schema.update({'format': output_format, 'compression': compression,
+                       'partition_cols': COLUMNAR_PARTITION_COLS})
+        table_columns = schema.setdefault('tables', {}).setdefault(table_name, {}).setdefault('columns', {})
+        table_columns.update({str(col): str(dtype) for col, dtype in df.reset_index().dtypes.items()})
+        with open(schema_file, mode='w', encoding='utf-8') as f:
+            json.dump(schema, f, indent=2)
@@ -0,0 +1,50 @@
+import hashlib
+import json
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+def to_canonical_repr(obj):
+    """
+    Convert (nested) object into a canonical JSON-serializable representation - i.e. independent of dict. order,
+    and with arrays/dataframes summarized by a hash of their content - to be hashed hereafter
+    """
+    if is_dataclass(obj):
+        return {'__class__': type(obj).__name__,
+                **{elt_field.name: to_canonical_repr(getattr(obj, elt_field.name)) for elt_field in fields(obj)}}
+    if isinstance(obj, dict):
+        # N.B. keys can be tuples (e.g., interco. capas) -> str of their canonical repr.
+        return {json.dumps(to_canonical_repr(key)): to_canonical_repr(val)
+                for key, val in sorted(obj.items(), key=lambda x: str(x[0]))}
+    if isinstance(obj, (list, tuple)):
+        return [to_canonical_repr(elt) for elt in obj]
+    if isinstance(obj, (set, frozenset)):
+        return sorted([to_canonical_repr(elt) for elt in obj], key=str)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, np.ndarray):
+        contiguous_array = np.ascontiguousarray(obj)
+        return {'__ndarray__': str(contiguous_array.dtype), 'shape': list(contiguous_array.shape),
+                'sha256': hashlib.sha256(contiguous_array.tobytes()).hexdigest()}
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        pd_hash = pd.util.hash_pandas_object(obj, index=True).values
+        columns = list(obj.columns) if isinstance(obj, pd.DataFrame) else [obj.name]
+        return {'__pandas__': type(obj).__name__, 'columns': [str(col) for col in columns],
+                'sha256': hashlib.sha256(pd_hash.tobytes()).hexdigest()}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    # last resort, for objects not covered above
+    return repr(obj)
+
+
+def get_hash(obj) -> str:
+    """
+    Deterministic hash (SHA-256 hex digest) of an object, based on its canonical repr.
+    """
+    canonical_str = json.dumps(to_canonical_repr(obj), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical_str.encode('utf-8')).hexdigest()
@@ -0,0 +1,188 @@
+import linecache
+import logging
+import os
+import threading
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+DEFAULT_RSS_SAMPLING_PERIOD = 0.05  # s
+DEFAULT_N_TOP_ALLOC_SITES = 10
+# allocations of the import machinery, of source lines caching (tracebacks) and of tracemalloc itself are not of
+# interest in per-stage top sites
+IGNORED_ALLOC_FILES = [tracemalloc.__file__, linecache.__file__, '<frozen importlib._bootstrap>',
+                       '<frozen importlib._bootstrap_external>', '<unknown>']
+
+
+def get_process_rss() -> Optional[int]:
+    """
+    Resident Set Size (bytes) of current process - from /proc on Linux, else from psutil if installed;
+    None if not available
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+def get_available_memory() -> Optional[int]:
+    """
+    Memory (bytes) available for new processes without swapping - from /proc on Linux, else from psutil if
+    installed; None if not available
+    """
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.virtual_memory().available
+
+
+def filter_snapshot(snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+    return snapshot.filter_traces([tracemalloc.Filter(inclusive=False, filename_pattern=filename)
+                                   for filename in IGNORED_ALLOC_FILES])
+
+
+@dataclass
+class SpanMemoryState:
+    rss_start: Optional[int]
+    traced_start: int
+    rss_peak: Optional[int]
+    traced_peak: int
+    snapshot: Optional[tracemalloc.Snapshot] = None
+
+
+def max_with_none(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    if a is None or b is None:
+        return a if b is None else b
+    return max(a, b)
+
+
+@dataclass
+class MemoryTracker:
+    """
+    Peak memory per (nested) span: RSS - sampled in a background thread - and Python allocations traced by
+    tracemalloc, whose snapshots at top-level span (stage) boundaries give the top allocating call sites of each
+    stage. Memory being process-wide, only spans of the main thread are tracked
+    N.B. tracemalloc slows the run down noticeably -> to be used for diagnostics only; with trace_allocations
+    False only RSS is tracked, at almost no cost (e.g. for benchmarks)
+    """
+    trace_allocations: bool = True
+    rss_sampling_period: float = DEFAULT_RSS_SAMPLING_PERIOD
+    n_top_alloc_sites: int = DEFAULT_N_TOP_ALLOC_SITES
+    rss_peak_since_reset: Optional[int] = None
+    # traced peak over the whole run, tracemalloc peak being reset at each span boundary
+    traced_run_peak: int = 0
+    span_states: List[SpanMemoryState] = field(default_factory=list)
+    rss_available: bool = True
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    stop_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    sampler: threading.Thread = field(default=None, repr=False)
+
+    def start(self):
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.rss_peak_since_reset = get_process_rss()
+        self.rss_available = self.rss_peak_since_reset is not None
+        if not self.rss_available:
+            logging.warning('Process RSS not available on this platform (no /proc, nor psutil installed) '
+                            '-> only Python allocations (tracemalloc) tracked')
+            return
+        self.stop_event.clear()
+        self.sampler = threading.Thread(target=self.sample_rss, name='rss_sampler', daemon=True)
+        self.sampler.start()
+
+    def stop(self):
+        if self.sampler is not None:
+            self.stop_event.set()
+            self.sampler.join()
+            self.sampler = None
+
+    def sample_rss(self):
+        while not self.stop_event.wait(timeout=self.rss_sampling_period):
+            rss = get_process_rss()
+            with self.lock:
+                self.rss_peak_since_reset = max_with_none(self.rss_peak_since_reset, rss)
+
+    def get_and_reset_peaks(self) -> Tuple[Optional[int], Optional[int], int, int]:
+        """
+        :return: (current RSS, RSS peak, current traced size, traced peak) - peaks since last reset - then reset
+        peaks to current values
+        """
+        current_rss = get_process_rss() if self.rss_available else None
+        with self.lock:
+            rss_peak = max_with_none(self.rss_peak_since_reset, current_rss)
+            self.rss_peak_since_reset = current_rss
+        current_traced, traced_peak = 0, 0
+        if self.trace_allocations:
+            current_traced, traced_peak = tracemalloc.get_traced_memory()
+            self.traced_run_peak = max(self.traced_run_peak, traced_peak)
+            tracemalloc.reset_peak()
+        return current_rss, rss_peak, current_traced, traced_peak
+
+    def get_traced_run_peak(self) -> int:
+        """
+        :return: peak (bytes) of Python traced allocations since the start of the tracker
+        """
+        if not self.trace_allocations or not tracemalloc.is_tracing():
+            return self.traced_run_peak
+        return max(self.traced_run_peak, tracemalloc.get_traced_memory()[1])
+
+    def update_parent_peaks(self, rss_peak: Optional[int], traced_peak: int):
+        if len(self.span_states) > 0:
+            parent_state = self.span_states[-1]
+            parent_state.rss_peak = max_with_none(parent_state.rss_peak, rss_peak)
+            parent_state.traced_peak = max(parent_state.traced_peak, traced_peak)
+
+    def on_span_start(self, take_snapshot: bool):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        current_rss, rss_peak, current_traced, traced_peak = self.get_and_reset_peaks()
+        # peaks of enclosing span, until this one starts
+        self.update_parent_peaks(rss_peak=rss_peak, traced_peak=traced_peak)
+        self.span_states.append(
+            SpanMemoryState(rss_start=current_rss, traced_start=current_traced, rss_peak=current_rss,
+                            traced_peak=current_traced,
+                            snapshot=filter_snapshot(tracemalloc.take_snapshot())
+                            if take_snapshot and self.trace_allocations else None)
+        )
+
+    def on_span_end(self) -> Optional[dict]:
+        """
+        :return: memory stats of the span just ended - None if not tracked
+        """
+        if threading.current_thread() is not threading.main_thread() or len(self.span_states) == 0:
+            return None
+        current_rss, rss_peak, current_traced, traced_peak = self.get_and_reset_peaks()
+        span_state = self.span_states.pop()
+        span_state.rss_peak = max_with_none(span_state.rss_peak, rss_peak)
+        span_state.traced_peak = max(span_state.traced_peak, traced_peak)
+        self.update_parent_peaks(rss_peak=span_state.rss_peak, traced_peak=span_state.traced_peak)
+        memory_stats = {}
+        if self.trace_allocations:
+            memory_stats |= {'traced_peak_mb': span_state.traced_peak / 1e6,
+                             'traced_peak_increase_mb': (span_state.traced_peak - span_state.traced_start) / 1e6,
+                             'traced_increase_mb': (current_traced - span_state.traced_start) / 1e6}
+        if span_state.rss_peak is not None:
+            memory_stats |= {'rss_peak_mb': span_state.rss_peak / 1e6,
+                             'rss_peak_increase_mb': (span_state.rss_peak - span_state.rss_start) / 1e6,
+                             'rss_increase_mb': (current_rss - span_state.rss_start) / 1e6}
+        if span_state.snapshot is not None:
+            end_snapshot = filter_snapshot(tracemalloc.take_snapshot())
+            top_diffs = [stat for stat in end_snapshot.compare_to(span_state.snapshot, 'lineno')
+                         if stat.size_diff > 0][:self.n_top_alloc_sites]
+            memory_stats['top_alloc_sites'] = [{'site': str(stat.traceback), 'size_diff_mb': stat.size_diff / 1e6,
+                                                'count_diff': stat.count_diff} for stat in top_diffs]
+        return memory_stats
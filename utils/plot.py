@@ -2,8 +2,8 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
-import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
 from typing import Union, Dict, List, Tuple, Optional
 
 from common.constants.datadims import DataDimensions
@@ -273,14 +273,87 @@ def add_fig_style_marker_to_curve_attrs(curve_style_attrs: Dict[str, str],
     return curve_style_attrs
 
 
+def get_fig_width_in_pixels(fig_width: float) -> int:
+    """
+    Width (in pixels) of a figure saved with matplotlib savefig default dpi
+    :param fig_width: in inches
+    """
+    from matplotlib import rcParams
+    dpi = rcParams['savefig.dpi']
+    if dpi == 'figure':
+        dpi = rcParams['figure.dpi']
+    return int(np.ceil(fig_width * dpi))
+
+
+def get_minmax_downsampling_idx(values: np.ndarray, n_buckets: int) -> Optional[np.ndarray]:
+    """
+    Indices of points to be kept to plot curves with a (min, max) envelope per bucket of successive points - one
+    bucket per pixel column giving the same rendering as with all points
+    :param values: (n_points, n_curves) array - or vector for a unique curve; all curves sharing same indices
+    :param n_buckets: number of buckets, typically figure width in pixels
+    :return: sorted indices - union over curves of per-bucket argmin/argmax, and first/last points -; None if no
+    downsampling needed (n_points <= 2 * n_buckets)
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values.reshape(-1, 1)
+    n_points, n_curves = values.shape
+    if n_buckets < 1 or n_points <= 2 * n_buckets:
+        return None
+    bucket_size = int(np.ceil(n_points / n_buckets))
+    n_buckets = int(np.ceil(n_points / bucket_size))
+    # pad last bucket - with values never selected as min. (resp. max.) - to reshape to (bucket, point, curve)
+    n_pad = n_buckets * bucket_size - n_points
+    values_for_min = np.where(np.isnan(values), np.inf, values)
+    values_for_max = np.where(np.isnan(values), -np.inf, values)
+    values_for_min = np.pad(values_for_min, ((0, n_pad), (0, 0)), constant_values=np.inf)
+    values_for_max = np.pad(values_for_max, ((0, n_pad), (0, 0)), constant_values=-np.inf)
+    bucket_start = (np.arange(n_buckets) * bucket_size).reshape(-1, 1)
+    argmin_idx = values_for_min.reshape(n_buckets, bucket_size, n_curves).argmin(axis=1) + bucket_start
+    argmax_idx = values_for_max.reshape(n_buckets, bucket_size, n_curves).argmax(axis=1) + bucket_start
+    kept_idx = np.unique(np.concatenate([argmin_idx.ravel(), argmax_idx.ravel(), [0, n_points - 1]]))
+    return kept_idx[kept_idx < n_points]
+
+
+def downsample_df_for_plot(df: pd.DataFrame, fig_width: float = None) -> pd.DataFrame:
+    """
+    Downsample df rows - with common indices for all columns (e.g. for stacked plots) - to the (min, max) envelope
+    per pixel column of the figure
+    :param fig_width: in inches; matplotlib default one if None
+    """
+    if fig_width is None:
+        from matplotlib import rcParams
+        fig_width = rcParams['figure.figsize'][0]
+    kept_idx = get_minmax_downsampling_idx(values=df.to_numpy(dtype=float),
+                                           n_buckets=get_fig_width_in_pixels(fig_width=fig_width))
+    if kept_idx is None:
+        return df
+    logging.debug(f'Data downsampled from {len(df)} to {len(kept_idx)} points for plot')
+    return df.iloc[kept_idx]
+
+
+def downsample_curve(x: Union[np.ndarray, list], y: Union[np.ndarray, list], n_buckets: int) \
+        -> Tuple[Union[np.ndarray, list], Union[np.ndarray, list]]:
+    kept_idx = get_minmax_downsampling_idx(values=y, n_buckets=n_buckets)
+    if kept_idx is None:
+        return x, y
+    return np.asarray(x)[kept_idx], np.asarray(y)[kept_idx]
+
+
 def simple_plot(x: Union[np.ndarray, list], y: Union[np.ndarray, list, Dict[str, np.ndarray], Dict[str, list]],
                 fig_file: str, title: str, xlabel: str, ylabel: str, fig_style: FigureStyle = None,
                 curve_style_attrs: Union[Dict[str, CurveStyleAttrs], CurveStyleAttrs] = None):
+    # pyplot imported at first plot, not to be paid by modules only importing this one (e.g. for data extraction)
+    import matplotlib.pyplot as plt
     if fig_style is None:
         fig_style = FigureStyle()
         fig_style.process()
 
     plt.figure(figsize=fig_style.size)
+    # downsample curves to a number of points proportional to figure width -> constant rendering time whatever
+    # the number of time-slots. N.B. not when markers are plotted, all points being then visible
+    n_buckets = get_fig_width_in_pixels(fig_width=fig_style.size[0]) \
+        if fig_style.downsample and fig_style.marker is None else 0
     # TODO: merge all cases in a unique call of plt.plot
     if isinstance(y, dict):
         for key_label, values in y.items():
@@ -288,12 +361,15 @@ def simple_plot(x: Union[np.ndarray, list], y: Union[np.ndarray, list, Dict[str,
             curve_style_attrs_dict = curve_style_attrs[key_label].__dict__ if curve_style_attrs is not None else {}
             curve_style_attrs_dict = add_fig_style_marker_to_curve_attrs(curve_style_attrs=curve_style_attrs_dict,
                                                                          fig_style_marker=fig_style.marker)
-            plt.plot(x, values, label=current_label, **curve_style_attrs_dict)
+            n_curve_buckets = n_buckets if curve_style_attrs_dict.get('marker') is None else 0
+            plt.plot(*downsample_curve(x=x, y=values, n_buckets=n_curve_buckets), label=current_label,
+                     **curve_style_attrs_dict)
     else:
         curve_style_attrs_dict = curve_style_attrs.__dict__ if curve_style_attrs is not None else {}
         curve_style_attrs_dict = add_fig_style_marker_to_curve_attrs(curve_style_attrs=curve_style_attrs_dict,
                                                                      fig_style_marker=fig_style.marker)
-        plt.plot(x, y, **curve_style_attrs_dict)
+        n_curve_buckets = n_buckets if curve_style_attrs_dict.get('marker') is None else 0
+        plt.plot(*downsample_curve(x=x, y=y, n_buckets=n_curve_buckets), **curve_style_attrs_dict)
 
     # add xtick date labels
     first_x = x[0]
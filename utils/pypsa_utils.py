@@ -14,3 +14,19 @@ def generators_opt_p_to_csv():
 
 def get_network_obj_value(network: Network) -> float:
     return network.objective
+
+
+def set_constraint_rhs(linopy_model, cstr_name: str, per_asset_rhs: Dict[str, np.ndarray]):
+    """
+    Overwrite - in place - the right-hand side of a (snapshot, asset) constraint of a built linopy model, for a
+    subset of the assets
+    :param linopy_model: e.g. network.model, after a first optimisation
+    :param cstr_name: name of the constraint in this model, e.g. 'Generator-fix-p-upper'
+    :param per_asset_rhs: {asset name: new rhs values - scalar or one value per snapshot}
+    """
+    cstr = linopy_model.constraints[cstr_name]
+    rhs = cstr.rhs.copy()
+    asset_dim = [dim for dim in rhs.dims if dim != 'snapshot'][0]
+    for asset_name, asset_rhs in per_asset_rhs.items():
+        rhs.loc[{asset_dim: asset_name}] = asset_rhs
+    cstr.rhs = rhs
@@ -1,13 +1,26 @@
 import json
-from typing import List, Dict, Optional
+import os
+from copy import deepcopy
+from functools import wraps
+from typing import Callable, List, Dict, Optional
 import logging
 
-from common.constants.optimisation import SolverParams
+from common.constants.adequacy_study import AdequacyStudyParams
+from common.constants.benchmark import BenchmarkParams
+from common.constants.campaign import CampaignParams
+from common.constants.optimisation import ModelBackends, SolverParams, ZoneDecompositionParams
+from common.constants.output_params import OutputParams
+from common.constants.result_cache import ResultCacheParams
+from common.constants.results_warehouse import ResultsWarehouseParams
+from common.constants.stress_test import StressTestsParams
 from common.long_term_uc_io import get_json_usage_params_file, get_json_fixed_params_file, \
     get_json_eraa_avail_values_file, get_json_params_tb_modif_file, get_json_pypsa_static_params_file, \
     get_json_params_modif_country_files, get_json_fuel_sources_tb_modif_file, \
     get_json_data_analysis_params_file, get_json_plot_params_file, get_json_solver_params_file, \
-    check_uc_input_folder_content
+    get_json_result_cache_params_file, get_json_output_params_file, get_json_results_warehouse_params_file, \
+    get_synthetic_eraa_avail_values_file, get_synthetic_gps_coordinates_file, get_json_benchmark_params_file, \
+    get_json_adequacy_study_params_file, get_json_stress_tests_params_file, get_json_campaign_params_file, \
+    check_uc_input_folder_content, INPUT_LT_UC_COUNTRY_SUBFOLDER
 from common.constants.extract_eraa_data import ERAADatasetDescr, \
     PypsaStaticParams, UsageParameters
 from common.constants.uc_json_inputs import CountryJsonParamNames, EuropeJsonParamNames, ALL_KEYWORD
@@ -15,21 +28,72 @@ from common.constants.usage_params_json import USAGE_PARAMS_SHORT_NAMES, EnvPhas
 from common.uc_run_params import UCRunParams
 from include.dataset_analyzer import DataAnalysis
 from common.plot_params import PlotParams, DEFAULT_PLOT_DIMS_ORDER
+from utils.basic_utils import is_str_bool, cast_str_to_bool
 from utils.dir_utils import check_file_existence
 from utils.plot import FigureStyle
 
 
+# validated parameter objects, per (reader function, arguments, fingerprint of the input files read)
+# {(reader name, args, kwargs): (input files fingerprint, validated params)} - only the params of the last input
+# files versions being kept, for the cache not to grow when these files are modified in a long-running process
+VALIDATED_PARAMS_CACHE = {}
+
+
+def get_files_fingerprint(files: List[str]) -> tuple:
+    """
+    (file, modification time, size) of files - or folders, whose modification time changes with the files they
+    contain -; None values for missing ones
+    """
+    fingerprint = []
+    for file in files:
+        try:
+            file_stat = os.stat(file)
+            fingerprint.append((file, file_stat.st_mtime_ns, file_stat.st_size))
+        except FileNotFoundError:
+            fingerprint.append((file, None, None))
+    return tuple(fingerprint)
+
+
+def cached_on_input_files(get_input_files: Callable[[], List[str]]):
+    """
+    Decorator of JSON params readers: read and validate params once, then reuse the validated object while the
+    input files - given by get_input_files - are unchanged (e.g. multiple UC runs in the same process)
+    N.B. a copy of the cached object is returned, so that it can be modified by the caller
+    """
+    def decorator(read_func: Callable):
+        @wraps(read_func)
+        def cached_read_func(*args, **kwargs):
+            cache_key = (read_func.__name__, repr(args), repr(sorted(kwargs.items())))
+            files_fingerprint = get_files_fingerprint(files=get_input_files())
+            if cache_key in VALIDATED_PARAMS_CACHE and VALIDATED_PARAMS_CACHE[cache_key][0] == files_fingerprint:
+                logging.debug(f'Input files of {read_func.__name__} unchanged -> previously validated params used')
+            else:
+                VALIDATED_PARAMS_CACHE[cache_key] = (files_fingerprint, read_func(*args, **kwargs))
+            return deepcopy(VALIDATED_PARAMS_CACHE[cache_key][1])
+        return cached_read_func
+    return decorator
+
+
+def clear_validated_params_cache():
+    VALIDATED_PARAMS_CACHE.clear()
+
+
 def check_and_load_json_file(json_file: str, file_descr: str = None) -> dict:
     check_file_existence(file=json_file, file_descr=file_descr)
 
-    f = open(json_file, mode='r', encoding='utf-8')
-
-    # rk: when reading null values in a JSON file they are converted to None
-    json_data = json.loads(f.read())
+    with open(json_file, mode='r', encoding='utf-8') as f:
+        # rk: when reading null values in a JSON file they are converted to None
+        json_data = json.loads(f.read())
 
     return json_data
 
 
+def get_uc_run_params_input_files() -> List[str]:
+    return [get_json_fixed_params_file(), get_json_eraa_avail_values_file(), get_json_params_tb_modif_file(),
+            get_json_fuel_sources_tb_modif_file(), INPUT_LT_UC_COUNTRY_SUBFOLDER,
+            *sorted(get_json_params_modif_country_files())]
+
+
 def apply_per_country_json_file_params(countries_data: dict, available_countries: List[str],
                                        mode_name: str, team_name: str) -> dict:
     for file in get_json_params_modif_country_files():
@@ -85,10 +149,14 @@ def set_json_usage_params_data() -> dict:
     return json_usage_params_data
 
 
-def set_json_eraa_avail_values() -> dict:
+def set_json_eraa_avail_values(json_file: str = None) -> dict:
+    """
+    :param json_file: of available values; the one of ERAA data if None
+    """
     # read
-    json_eraa_avail_values = check_and_load_json_file(json_file=get_json_eraa_avail_values_file(),
-                                                      file_descr='JSON ERAA available values')
+    if json_file is None:
+        json_file = get_json_eraa_avail_values_file()
+    json_eraa_avail_values = check_and_load_json_file(json_file=json_file, file_descr='JSON ERAA available values')
     # add 'available_' to the different keys of JSON available values to make them more explicit in the following
     json_eraa_avail_values = {f'available_{key}': val for key, val in json_eraa_avail_values.items()}
     return json_eraa_avail_values
@@ -102,6 +170,20 @@ def set_json_params_fixed() -> dict:
     return json_params_fixed
 
 
+def set_json_params_fixed_synthetic_data(data_folder: str) -> dict:
+    """
+    Fixed params - aggreg. prod. types def., PyPSA unit params, etc. - of ERAA data, with available values and GPS
+    coordinates of the synthetic dataset in data_folder
+    """
+    json_params_fixed = check_and_load_json_file(json_file=get_json_fixed_params_file(), file_descr='JSON fixed params')
+    json_params_fixed |= set_json_eraa_avail_values(json_file=get_synthetic_eraa_avail_values_file(data_folder))
+    json_params_fixed['gps_coordinates'] = (
+        check_and_load_json_file(json_file=get_synthetic_gps_coordinates_file(data_folder),
+                                 file_descr='JSON synthetic data GPS coordinates')
+    )
+    return json_params_fixed
+
+
 def set_json_solver_params() -> dict:
     return check_and_load_json_file(json_file=get_json_solver_params_file(), file_descr='JSON solver params')
 
@@ -163,11 +245,13 @@ def set_countries_data(usage_params: UsageParameters, phase_name: str, available
     return countries_data, json_params_tb_modif
 
 
+@cached_on_input_files(get_input_files=lambda: [get_json_usage_params_file()])
 def read_usage_params() -> UsageParameters:
     # Get JSON usage params, the ones to control the behaviour of the UC run -> UsageParameters object
     return set_usage_params(json_usage_params_data=set_json_usage_params_data())
 
 
+@cached_on_input_files(get_input_files=get_uc_run_params_input_files)
 def read_and_check_uc_run_params(phase_name: str, usage_params: UsageParameters,
                                  get_only_eraa_data_descr: bool = False) \
         -> tuple[ERAADatasetDescr, Optional[UCRunParams]]:
@@ -215,6 +299,7 @@ def read_and_check_uc_run_params(phase_name: str, usage_params: UsageParameters,
     return eraa_data_descr, uc_run_params
 
 
+@cached_on_input_files(get_input_files=lambda: [get_json_pypsa_static_params_file()])
 def read_and_check_pypsa_static_params() -> PypsaStaticParams:
     json_pypsa_static_params_file = get_json_pypsa_static_params_file()
     logging.debug(f'Read and check PyPSA static parameters file {json_pypsa_static_params_file}')
@@ -226,6 +311,9 @@ def read_and_check_pypsa_static_params() -> PypsaStaticParams:
     return pypsa_static_params
 
 
+DATA_ANALYSIS_N_WORKERS_KEY = 'n_workers'
+
+
 def read_and_check_data_analysis_params(eraa_data_descr: ERAADatasetDescr, n_curves_max: int = 6) -> List[DataAnalysis]:
     """
 
@@ -252,12 +340,31 @@ def read_and_check_data_analysis_params(eraa_data_descr: ERAADatasetDescr, n_cur
     return data_analyses
 
 
+def read_data_analysis_n_workers() -> int:
+    """
+    Number of processes in which data analyses are run - optional "n_workers" in data analysis JSON file,
+    default 1 (sequential run)
+    """
+    json_data_analysis_params = check_and_load_json_file(json_file=get_json_data_analysis_params_file(),
+                                                         file_descr='JSON data analysis params')
+    n_workers = json_data_analysis_params.get(DATA_ANALYSIS_N_WORKERS_KEY, 1)
+    if not isinstance(n_workers, int) or n_workers < 1:
+        raise Exception(f'{DATA_ANALYSIS_N_WORKERS_KEY} in data analysis JSON file must be a positive int; '
+                        f'not {n_workers} -> STOP')
+    return n_workers
+
+
+@cached_on_input_files(get_input_files=lambda: [get_json_solver_params_file()])
 def read_solver_params() -> SolverParams:
     solver_params_data = set_json_solver_params()
     # a few tests on read JSON file
     name_key = 'name'
     lic_file_key = 'license_file'
-    known_keys = [name_key, lic_file_key]
+    io_api_key = 'io_api'
+    save_lp_file_key = 'save_lp_file'
+    model_backend_key = 'model_backend'
+    zone_decomposition_key = 'zone_decomposition'
+    known_keys = [name_key, lic_file_key, io_api_key, save_lp_file_key, model_backend_key, zone_decomposition_key]
     solver_params_file = get_json_solver_params_file()
     if name_key not in solver_params_data:
         raise Exception(f'Mandatory param {name_key} missing in {solver_params_file} -> STOP')
@@ -266,10 +373,83 @@ def read_solver_params() -> SolverParams:
     unknown_params = list(set(solver_params_data) - set(known_keys))
     if len(unknown_params) > 0:
         logging.warning(f'There are unknown parameters in {solver_params_file}: {unknown_params} -> will not be used')
-    solver_params_data = {key: solver_params_data[key] for key in known_keys}
+    solver_params_data = {key: solver_params_data[key] for key in known_keys if key in solver_params_data}
+    if is_str_bool(bool_str=solver_params_data.get(save_lp_file_key)):
+        solver_params_data[save_lp_file_key] = cast_str_to_bool(bool_str=solver_params_data[save_lp_file_key])
+    all_model_backends = list(ModelBackends().__dict__.values())
+    if solver_params_data.get(model_backend_key, ModelBackends.pypsa) not in all_model_backends:
+        raise Exception(f'Unknown {model_backend_key} {solver_params_data[model_backend_key]} in '
+                        f'{solver_params_file}; allowed values are {all_model_backends} -> STOP')
+    if zone_decomposition_key in solver_params_data:
+        zone_decomposition_params = ZoneDecompositionParams(**solver_params_data[zone_decomposition_key])
+        zone_decomposition_params.process()
+        zone_decomposition_params.coherence_check()
+        solver_params_data[zone_decomposition_key] = zone_decomposition_params
     return SolverParams(**solver_params_data)
 
 
+def read_and_check_params(json_file: str, params_cls: type, file_descr: str):
+    """
+    Read a JSON params file into a params dataclass, unknown keys being dropped, then process and check it
+    :param json_file
+    :param params_cls: params dataclass, with process and coherence_check methods
+    :param file_descr: description of the file, for logs and errors
+    """
+    logging.debug(f'Read and check {file_descr} file: {json_file}')
+    params_data = check_and_load_json_file(json_file=json_file, file_descr=f'JSON {file_descr}')
+    unknown_params = list(set(params_data) - set(params_cls.__dataclass_fields__))
+    if len(unknown_params) > 0:
+        logging.warning(f'There are unknown parameters in {json_file}: {unknown_params} -> will not be used')
+        params_data = {key: val for key, val in params_data.items() if key not in unknown_params}
+    params = params_cls(**params_data)
+    params.process()
+    params.coherence_check()
+    return params
+
+
+@cached_on_input_files(get_input_files=lambda: [get_json_result_cache_params_file()])
+def read_result_cache_params() -> ResultCacheParams:
+    return read_and_check_params(json_file=get_json_result_cache_params_file(), params_cls=ResultCacheParams,
+                                 file_descr='result cache params')
+
+
+@cached_on_input_files(get_input_files=lambda: [get_json_results_warehouse_params_file()])
+def read_results_warehouse_params() -> ResultsWarehouseParams:
+    return read_and_check_params(json_file=get_json_results_warehouse_params_file(),
+                                 params_cls=ResultsWarehouseParams, file_descr='results warehouse params')
+
+
+@cached_on_input_files(get_input_files=lambda: [get_json_benchmark_params_file()])
+def read_benchmark_params() -> BenchmarkParams:
+    return read_and_check_params(json_file=get_json_benchmark_params_file(), params_cls=BenchmarkParams,
+                                 file_descr='benchmark params')
+
+
+@cached_on_input_files(get_input_files=lambda: [get_json_adequacy_study_params_file()])
+def read_adequacy_study_params() -> AdequacyStudyParams:
+    return read_and_check_params(json_file=get_json_adequacy_study_params_file(), params_cls=AdequacyStudyParams,
+                                 file_descr='adequacy study params')
+
+
+@cached_on_input_files(get_input_files=lambda: [get_json_stress_tests_params_file()])
+def read_stress_tests_params() -> StressTestsParams:
+    return read_and_check_params(json_file=get_json_stress_tests_params_file(), params_cls=StressTestsParams,
+                                 file_descr='stress tests params')
+
+
+@cached_on_input_files(get_input_files=lambda: [get_json_campaign_params_file()])
+def read_campaign_params() -> CampaignParams:
+    return read_and_check_params(json_file=get_json_campaign_params_file(), params_cls=CampaignParams,
+                                 file_descr='campaign params')
+
+
+@cached_on_input_files(get_input_files=lambda: [get_json_output_params_file()])
+def read_output_params() -> OutputParams:
+    return read_and_check_params(json_file=get_json_output_params_file(), params_cls=OutputParams,
+                                 file_descr='output params')
+
+
+@cached_on_input_files(get_input_files=lambda: [get_json_plot_params_file()])
 def read_given_phase_plot_params(phase_name: str) -> FigureStyle:
     json_plot_params_file = get_json_plot_params_file()
     logging.debug(f'Read and check {phase_name} plot parameters file: {json_plot_params_file}')
@@ -278,6 +458,7 @@ def read_given_phase_plot_params(phase_name: str) -> FigureStyle:
     return FigureStyle(**json_data_analysis_plot_params[f'fig_style_{phase_name}'])
 
 
+@cached_on_input_files(get_input_files=lambda: [get_json_plot_params_file()])
 def read_plot_params() -> Dict[str, PlotParams]:
     json_plot_params_file = get_json_plot_params_file()
     logging.debug(f'Read and check plot parameters file: {json_plot_params_file}')
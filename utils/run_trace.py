@@ -0,0 +1,258 @@
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional
+
+from utils.memory_tracker import MemoryTracker
+
+N_PROFILE_TOP_ENTRIES = 30
+
+
+@dataclass
+class ProfilingModes:
+    cprofile: str = 'cprofile'
+    tracemalloc: str = 'tracemalloc'
+    memory: str = 'memory'  # peak memory (RSS and tracemalloc) and top allocation sites per stage
+    rss: str = 'rss'  # peak RSS per stage only, without tracemalloc overhead on durations
+
+
+PROFILING_MODES = ProfilingModes()
+
+
+SPAN_PATH_SEP = ' > '
+
+
+@dataclass
+class TraceSpan:
+    name: str
+    path: str  # names of enclosing spans and of this one, e.g. 'data reading > read demand'
+    start: float  # s, since the beginning of the trace
+    depth: int  # 0 for top-level stages
+    duration: float = None  # s, None while span is open
+    attrs: dict = field(default_factory=dict)
+    memory: dict = None  # peak memory stats, if memory profiling activated
+
+    def to_dict(self) -> dict:
+        span_dict = {'name': self.name, 'path': self.path, 'start': round(self.start, 6), 'depth': self.depth,
+                     'duration': round(self.duration, 6) if self.duration is not None else None, 'attrs': self.attrs}
+        if self.memory is not None:
+            span_dict['memory'] = self.memory
+        return span_dict
+
+
+@dataclass
+class RunTrace:
+    """
+    Timing spans of a (UC) run - nested stages, e.g. data reading > demand data of a country - with optional
+    profiling: cProfile and/or tracemalloc over the whole run, peak memory per span (with top allocation sites
+    per top-level span, i.e. stage)
+    N.B. spans are nested per thread; output tasks run in background processes are not traced individually
+    """
+    name: str
+    profiling: List[str] = field(default_factory=list)
+    spans: List[TraceSpan] = field(default_factory=list)
+    profiling_results: dict = field(default_factory=dict)
+    start_datetime: str = None
+    start_time: float = None
+    duration: float = None
+    profiler: cProfile.Profile = field(default=None, repr=False)
+    memory_tracker: MemoryTracker = field(default=None, repr=False)
+    open_spans: threading.local = field(default_factory=threading.local, repr=False)
+
+    def __post_init__(self):
+        unknown_modes = [mode for mode in self.profiling if mode not in PROFILING_MODES.__dict__.values()]
+        if len(unknown_modes) > 0:
+            logging.warning(f'Unknown profiling mode(s) {unknown_modes} ignored; available ones are '
+                            f'{list(PROFILING_MODES.__dict__.values())}')
+            self.profiling = [mode for mode in self.profiling if mode not in unknown_modes]
+
+    def get_open_spans(self) -> List[TraceSpan]:
+        if not hasattr(self.open_spans, 'stack'):
+            self.open_spans.stack = []
+        return self.open_spans.stack
+
+    def start(self):
+        self.start_datetime = datetime.now().isoformat(timespec='seconds')
+        self.start_time = time.perf_counter()
+        if PROFILING_MODES.tracemalloc in self.profiling and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if PROFILING_MODES.memory in self.profiling or PROFILING_MODES.rss in self.profiling:
+            self.memory_tracker = MemoryTracker(trace_allocations=PROFILING_MODES.memory in self.profiling)
+            self.memory_tracker.start()
+        if PROFILING_MODES.cprofile in self.profiling:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop(self, profile_file: str = None):
+        """
+        :param profile_file: where raw cProfile stats are dumped - to be read with pstats/snakeviz - if cProfile
+        profiling activated
+        """
+        if self.profiler is not None:
+            self.profiler.disable()
+            stats_stream = io.StringIO()
+            stats = pstats.Stats(self.profiler, stream=stats_stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(N_PROFILE_TOP_ENTRIES)
+            self.profiling_results[PROFILING_MODES.cprofile] = stats_stream.getvalue().splitlines()
+            if profile_file is not None:
+                logging.info(f'Save cProfile stats to {profile_file}')
+                stats.dump_stats(profile_file)
+            self.profiler = None
+        if self.memory_tracker is not None:
+            self.memory_tracker.stop()
+        if PROFILING_MODES.tracemalloc in self.profiling and tracemalloc.is_tracing():
+            current_size, peak_size = tracemalloc.get_traced_memory()
+            # N.B. tracemalloc peak reset at span boundaries by memory tracker -> run peak kept by the latter
+            if self.memory_tracker is not None:
+                peak_size = max(peak_size, self.memory_tracker.get_traced_run_peak())
+            top_stats = tracemalloc.take_snapshot().statistics('lineno')[:N_PROFILE_TOP_ENTRIES]
+            self.profiling_results[PROFILING_MODES.tracemalloc] = {
+                'current_mb': current_size / 1e6, 'peak_mb': peak_size / 1e6,
+                'top_allocations': [{'site': str(stat.traceback), 'size_mb': stat.size / 1e6, 'count': stat.count}
+                                    for stat in top_stats]
+            }
+        if tracemalloc.is_tracing() and (PROFILING_MODES.tracemalloc in self.profiling
+                                         or PROFILING_MODES.memory in self.profiling):
+            tracemalloc.stop()
+        self.duration = time.perf_counter() - self.start_time
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[TraceSpan]:
+        open_spans = self.get_open_spans()
+        path = SPAN_PATH_SEP.join([elt_span.name for elt_span in open_spans] + [name])
+        current_span = TraceSpan(name=name, path=path, start=time.perf_counter() - self.start_time,
+                                 depth=len(open_spans), attrs=attrs)
+        self.spans.append(current_span)
+        open_spans.append(current_span)
+        if self.memory_tracker is not None:
+            self.memory_tracker.on_span_start(take_snapshot=current_span.depth == 0)
+        try:
+            yield current_span
+        finally:
+            if self.memory_tracker is not None:
+                current_span.memory = self.memory_tracker.on_span_end()
+            current_span.duration = time.perf_counter() - self.start_time - current_span.start
+            open_spans.pop()
+            logging.debug(f'[trace] {current_span.depth * "  "}{name} done in {current_span.duration:.3f}s')
+
+    def add_attrs(self, **attrs):
+        """
+        Add attributes - e.g. solver stats - to the innermost open span (of current thread)
+        """
+        open_spans = self.get_open_spans()
+        if len(open_spans) > 0:
+            open_spans[-1].attrs.update(attrs)
+
+    def get_per_stage_durations(self, max_depth: int = None) -> Dict[str, dict]:
+        """
+        Total duration and number of calls per span path - in order of first call -, for spans up to max_depth
+        (all if None)
+        """
+        per_stage_durations = {}
+        for elt_span in self.spans:
+            if (max_depth is None or elt_span.depth <= max_depth) and elt_span.duration is not None:
+                stage_durations = per_stage_durations.setdefault(elt_span.path, {'duration': 0, 'n_calls': 0})
+                stage_durations['duration'] += elt_span.duration
+                stage_durations['n_calls'] += 1
+        return per_stage_durations
+
+    def log_summary(self, max_depth: int = 1):
+        total_duration = self.duration if self.duration is not None else time.perf_counter() - self.start_time
+        summary_lines = []
+        for path, stage_durations in self.get_per_stage_durations(max_depth=max_depth).items():
+            path_names = path.split(SPAN_PATH_SEP)
+            share = 100 * stage_durations['duration'] / total_duration if total_duration > 0 else 0
+            n_calls_msg = f', {stage_durations["n_calls"]} calls' if stage_durations['n_calls'] > 1 else ''
+            summary_lines.append(f'{(len(path_names) - 1) * "  "}- {path_names[-1]}: '
+                                 f'{stage_durations["duration"]:.2f}s ({share:.1f}%{n_calls_msg})')
+        logging.info(f'Run {self.name} timing ({total_duration:.2f}s in total), per stage:\n'
+                     + '\n'.join(summary_lines))
+        if self.memory_tracker is not None:
+            self.log_memory_summary()
+
+    def log_memory_summary(self):
+        summary_lines = []
+        for elt_span in self.spans:
+            if elt_span.depth == 0 and elt_span.memory is not None:
+                rss_msg = f'RSS peak {elt_span.memory["rss_peak_mb"]:.0f} MB ' \
+                          f'({elt_span.memory["rss_increase_mb"]:+.0f} MB), ' if 'rss_peak_mb' in elt_span.memory \
+                    else ''
+                traced_msg = f'Python allocations peak {elt_span.memory["traced_peak_mb"]:.0f} MB ' \
+                             f'({elt_span.memory["traced_increase_mb"]:+.0f} MB)' \
+                    if 'traced_peak_mb' in elt_span.memory else ''
+                summary_lines.append(f'- {elt_span.name}: {rss_msg}{traced_msg}'.rstrip(', '))
+        logging.info(f'Run {self.name} memory, per stage:\n' + '\n'.join(summary_lines))
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'start_datetime': self.start_datetime,
+                'duration': round(self.duration, 6) if self.duration is not None else None,
+                'profiling': self.profiling, 'per_stage_durations': self.get_per_stage_durations(),
+                'spans': [elt_span.to_dict() for elt_span in self.spans],
+                'profiling_results': self.profiling_results}
+
+    def save(self, json_file: str):
+        logging.info(f'Save run trace ({len(self.spans)} spans) to {json_file}')
+        with open(json_file, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+
+
+# trace of the run in progress, in which spans of nested functions are recorded - None if no run traced
+CURRENT_RUN_TRACE: Optional[RunTrace] = None
+
+
+def start_run_trace(name: str, profiling: List[str] = None) -> RunTrace:
+    global CURRENT_RUN_TRACE
+    CURRENT_RUN_TRACE = RunTrace(name=name, profiling=profiling if profiling is not None else [])
+    CURRENT_RUN_TRACE.start()
+    return CURRENT_RUN_TRACE
+
+
+def stop_run_trace(profile_file: str = None) -> Optional[RunTrace]:
+    global CURRENT_RUN_TRACE
+    run_trace = CURRENT_RUN_TRACE
+    if run_trace is not None:
+        run_trace.stop(profile_file=profile_file)
+    CURRENT_RUN_TRACE = None
+    return run_trace
+
+
+@contextmanager
+def trace_span(name: str, **attrs) -> Iterator[Optional[TraceSpan]]:
+    """
+    Span in current run trace - no-op if no run traced, e.g. when Dataset used in data analyses
+    """
+    if CURRENT_RUN_TRACE is None:
+        yield None
+        return
+    with CURRENT_RUN_TRACE.span(name, **attrs) as current_span:
+        yield current_span
+
+
+def add_span_attrs(**attrs):
+    if CURRENT_RUN_TRACE is not None:
+        CURRENT_RUN_TRACE.add_attrs(**attrs)
+
+
+def traced(span_name: str = None) -> Callable:
+    """
+    Decorator recording each call of the decorated function as a span of current run trace
+    :param span_name: function name if None
+    """
+    def decorator(func: Callable) -> Callable:
+        name = span_name if span_name is not None else func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,107 @@
+import logging
+import math
+import sys
+from typing import Optional
+
+import highspy
+
+# Gurobi model attributes reported after a run -> name in solver stats. N.B. MaxMemUsed only from Gurobi 9.5, and
+# ObjBound only for MIPs -> attributes not available being skipped
+GUROBI_RUN_ATTRS = {'NumVars': 'n_cols', 'NumConstrs': 'n_rows', 'NumNZs': 'n_nonzeros',
+                    'Runtime': 'solver_run_time', 'IterCount': 'simplex_iterations', 'BarIterCount': 'ipm_iterations',
+                    'ObjVal': 'objective_value', 'ObjBound': 'objective_bound', 'MaxMemUsed': 'solver_peak_memory_gb'}
+
+
+def get_process_peak_rss_mb() -> Optional[float]:
+    """
+    Peak Resident Set Size of current process since its start - None if not available (e.g. on Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    # N.B. in bytes on macOS, in kB on Linux
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / 1e6 if sys.platform == 'darwin' else max_rss / 1e3
+
+
+def get_highs_run_stats(highs) -> dict:
+    """
+    Main statistics reported by HiGHS after a run
+    :param highs: highspy.Highs object, after run()
+    """
+    info = highs.getInfo()
+    run_stats = {'solver_run_time': highs.getRunTime(), 'n_cols': highs.getNumCol(), 'n_rows': highs.getNumRow(),
+                 'n_nonzeros': highs.getNumNz(), 'simplex_iterations': info.simplex_iteration_count,
+                 'ipm_iterations': info.ipm_iteration_count, 'crossover_iterations': info.crossover_iteration_count,
+                 'objective_value': info.objective_function_value,
+                 'presolve_status': highs.getModelPresolveStatus().name}
+    if info.mip_node_count > 0 and math.isfinite(info.mip_dual_bound):
+        run_stats |= {'objective_bound': info.mip_dual_bound, 'mip_gap': info.mip_gap,
+                      'mip_nodes': info.mip_node_count}
+    return run_stats
+
+
+def get_highs_presolved_size(highs) -> dict:
+    """
+    Size of the problem actually solved by HiGHS, if presolve has reduced it
+    N.B. presolved model not kept by HiGHS after the run -> presolve run again (solution and info being kept); to
+    be called out of the timed solve
+    :param highs: highspy.Highs object, after run()
+    """
+    presolve_status = highs.getModelPresolveStatus()
+    if presolve_status == highspy.HighsPresolveStatus.kReduced:
+        highs.presolve()
+        presolved_lp = highs.getPresolvedLp()
+        return {'presolved_n_cols': presolved_lp.num_col_, 'presolved_n_rows': presolved_lp.num_row_,
+                'presolved_n_nonzeros': len(presolved_lp.a_matrix_.value_)}
+    if presolve_status == highspy.HighsPresolveStatus.kReducedToEmpty:
+        return {'presolved_n_cols': 0, 'presolved_n_rows': 0, 'presolved_n_nonzeros': 0}
+    return {}
+
+
+def get_gurobi_run_stats(model) -> dict:
+    """
+    Main statistics reported by Gurobi after a run. N.B. size after presolve not available without presolving
+    again the model -> not reported
+    :param model: gurobipy.Model object, after optimize()
+    """
+    run_stats = {}
+    for attr_name, stat_name in GUROBI_RUN_ATTRS.items():
+        try:
+            run_stats[stat_name] = model.getAttr(attr_name)
+        except Exception:
+            continue
+    return run_stats
+
+
+def get_solver_run_stats(solver_model) -> Optional[dict]:
+    """
+    Run statistics of the solvers supported (HiGHS and Gurobi), completed with the peak memory of the process -
+    the solver running in it with the direct IO API. None if solver model not available, e.g. with file-based IO API
+    :param solver_model: solver object after the run, e.g. solver_model attribute of a linopy model
+    """
+    if solver_model is None:
+        return None
+    if isinstance(solver_model, highspy.Highs):
+        run_stats = {'solver': 'highs'} | get_highs_run_stats(highs=solver_model)
+    # N.B. gurobipy not imported, being an optional dependency
+    elif type(solver_model).__module__.startswith('gurobipy'):
+        run_stats = {'solver': 'gurobi'} | get_gurobi_run_stats(model=solver_model)
+    else:
+        logging.warning(f'Run statistics not available for solver model of type {type(solver_model)}')
+        return None
+    process_peak_rss = get_process_peak_rss_mb()
+    if process_peak_rss is not None:
+        run_stats['process_peak_rss_mb'] = process_peak_rss
+    return run_stats
+
+
+def get_solver_presolved_size(solver_model) -> dict:
+    """
+    Size of the presolved problem - only for HiGHS, empty for other solvers (or if not reduced by presolve)
+    :param solver_model: solver object after the run, as in get_solver_run_stats
+    """
+    if isinstance(solver_model, highspy.Highs):
+        return get_highs_presolved_size(highs=solver_model)
+    return {}
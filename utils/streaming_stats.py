@@ -0,0 +1,59 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+
+@dataclass
+class StreamingHistogram:
+    """
+    Mergeable quantile sketch of a stream of values: counts per fixed-width bin, stored sparsely -> memory in
+    the number of distinct bins (and not of values), quantiles with an absolute error <= bin_width / 2;
+    with exact count, sum, min and max
+    """
+    bin_width: float
+    bin_counts: Dict[int, int] = field(default_factory=dict)
+    n_values: int = 0
+    sum_values: float = 0.0
+    min_value: float = np.inf
+    max_value: float = -np.inf
+
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        bin_idx, counts = np.unique(np.floor(values / self.bin_width).astype(np.int64), return_counts=True)
+        for idx, count in zip(bin_idx.tolist(), counts.tolist()):
+            self.bin_counts[idx] = self.bin_counts.get(idx, 0) + count
+        self.n_values += len(values)
+        self.sum_values += float(values.sum())
+        self.min_value = min(self.min_value, float(values.min()))
+        self.max_value = max(self.max_value, float(values.max()))
+
+    def merge(self, other: 'StreamingHistogram'):
+        if other.bin_width != self.bin_width:
+            raise Exception(f'Streaming histograms with different bin widths ({self.bin_width} and '
+                            f'{other.bin_width}) cannot be merged -> STOP')
+        for idx, count in other.bin_counts.items():
+            self.bin_counts[idx] = self.bin_counts.get(idx, 0) + count
+        self.n_values += other.n_values
+        self.sum_values += other.sum_values
+        self.min_value = min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+
+    def mean(self) -> float:
+        return self.sum_values / self.n_values if self.n_values > 0 else np.nan
+
+    def quantiles(self, q_values: List[float]) -> List[float]:
+        """
+        Quantiles, as centres of the bins in which they fall - clipped to [min, max] values
+        """
+        if self.n_values == 0:
+            return [np.nan] * len(q_values)
+        bin_idx = np.array(sorted(self.bin_counts))
+        cum_counts = np.cumsum([self.bin_counts[idx] for idx in bin_idx])
+        # rank of each quantile (1-based), then first bin reaching it
+        ranks = np.maximum(np.ceil(np.asarray(q_values) * self.n_values), 1)
+        quantile_bins = bin_idx[np.searchsorted(cum_counts, ranks)]
+        return np.clip((quantile_bins + 0.5) * self.bin_width, self.min_value, self.max_value).tolist()